@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the thread and process code search backends.
+
+Generates synthetic source trees of increasing size and times a CPU-heavy
+regex search with each backend, then reports the smallest tree size at which
+the process pool wins.  Use the result to tune
+``CodeSearchEngine(process_threshold=...)`` for your machine.
+
+Usage:
+    python benchmarks/bench_search_backends.py [--sizes 250,1000,4000] [--lines 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from codexa.search.code_search import CodeSearchEngine, SearchMode  # noqa: E402
+
+WORDS = ["config", "loader", "parse", "token", "result", "value", "handler", "client", "cache"]
+PATTERN = r"def\s+(\w+)_(\w+)\s*\(.*(token|cache).*\)"
+
+
+def build_tree(root: Path, file_count: int, lines_per_file: int):
+    """Write ``file_count`` Python-like files below ``root``."""
+    rng = random.Random(file_count)
+    for i in range(file_count):
+        directory = root / f"pkg{i % 50}"
+        directory.mkdir(exist_ok=True)
+        lines = []
+        for _ in range(lines_per_file):
+            a, b, c = rng.sample(WORDS, 3)
+            lines.append(f"def {a}_{b}(self, {c}=None):  # {rng.random():.6f}")
+        (directory / f"module_{i}.py").write_text("\n".join(lines) + "\n")
+
+
+def time_backend(engine: CodeSearchEngine, repeats: int) -> float:
+    """Return the best wall time of ``repeats`` searches."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        engine.search_code(PATTERN, SearchMode.REGEX, max_matches=10 ** 9)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100,500,1000,2000,4000,8000",
+                        help="Comma-separated file counts to benchmark")
+    parser.add_argument("--lines", type=int, default=200, help="Lines per generated file")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"CPUs: {os.cpu_count()}  lines/file: {args.lines}  pattern: {PATTERN}")
+    print(f"{'files':>8} {'thread (s)':>12} {'process (s)':>12} {'speedup':>9}")
+
+    crossover = None
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            build_tree(root, size, args.lines)
+
+            thread_engine = CodeSearchEngine(root, backend=CodeSearchEngine.BACKEND_THREAD)
+            process_engine = CodeSearchEngine(root, backend=CodeSearchEngine.BACKEND_PROCESS)
+            try:
+                # Warm up the pool so worker start-up is not counted
+                process_engine.search_code("warmup", max_matches=1)
+                thread_time = time_backend(thread_engine, args.repeats)
+                process_time = time_backend(process_engine, args.repeats)
+            finally:
+                process_engine.shutdown()
+
+        speedup = thread_time / process_time if process_time else float("inf")
+        print(f"{size:>8} {thread_time:>12.3f} {process_time:>12.3f} {speedup:>8.2f}x")
+        if crossover is None and speedup > 1.0:
+            crossover = size
+
+    if crossover is None:
+        print("\nThe process backend did not win at any tested size on this machine.")
+    else:
+        print(f"\nProcess backend wins from about {crossover} files; "
+              f"pass process_threshold={crossover} to CodeSearchEngine to match.")
+
+
+if __name__ == "__main__":
+    main()
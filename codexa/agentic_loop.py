@@ -19,6 +19,8 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.live import Live
 from rich.text import Text
 
+from .display.stream_renderer import StreamRenderer
+
 try:
     from .enhanced_providers import EnhancedProviderFactory
     from .tools.base.tool_manager import ToolManager
@@ -361,7 +363,7 @@ Remember:
             
             if self.provider and hasattr(self.provider, 'ask'):
                 # Use the provider's ask method (works with OpenRouter)
-                response = self.provider.ask(thinking_prompt)
+                response = await self._ask_provider(thinking_prompt, show_stream=True)
                 # Detect refusal-like responses and retry once with reinforcement
                 markers = [
                     "i must decline",
@@ -372,7 +374,7 @@ Remember:
                 ]
                 if isinstance(response, str) and any(m in response.lower() for m in markers):
                     reinforcement = thinking_prompt + "\n\nDo not refuse benign coding tasks. Do not mention policies or jailbreak. Provide THINKING and PLAN exactly as specified."
-                    response = self.provider.ask(reinforcement)
+                    response = await self._ask_provider(reinforcement, show_stream=True)
             elif self.provider and hasattr(self.provider, 'generate_response'):
                 # Alternative method if available
                 response = await self.provider.generate_response(thinking_prompt)
@@ -457,6 +459,16 @@ Analyze the task requirements and take the first logical step to complete it."""
                 "provider_used": False
             }
 
+    async def _ask_provider(self, prompt: str, show_stream: bool = False) -> Union[str, Dict]:
+        """Ask the provider without blocking the event loop, optionally showing the answer as it streams in."""
+        if show_stream and self.verbose and hasattr(self.provider, 'ask_stream'):
+            # Transient: the parsed thinking and plan panels replace the raw stream
+            renderer = StreamRenderer(self.console, markdown=False, transient=True)
+            return await renderer.render_async(self.provider.ask_stream(prompt))
+        if hasattr(self.provider, 'ask_async'):
+            return await self.provider.ask_async(prompt)
+        return self.provider.ask(prompt)
+
     async def _execute_step(self, plan: str, iteration: int) -> Dict[str, Any]:
         """
         Execute the planned action.
@@ -975,7 +987,7 @@ Consider:
 - Is the result relevant to the original task?
 - Would a user consider this task "done"?"""
 
-            response = self.provider.ask(evaluation_prompt)
+            response = await self._ask_provider(evaluation_prompt)
             
             # Parse LLM response
             success = False
@@ -1127,7 +1139,7 @@ Respond in this format:
 COMPLETE: true/false
 FEEDBACK: [If not complete, what specifically still needs to be done? If complete, confirm what was accomplished]"""
                 
-                response = self.provider.ask(check_prompt)
+                response = await self._ask_provider(check_prompt)
                 
                 complete = False
                 feedback = ""
@@ -1198,7 +1210,7 @@ Focus on the most essential part first, break it into the smallest possible step
 
 SIMPLER APPROACH: [Describe a much simpler first step that's almost certain to work]"""
                 
-                response = self.provider.ask(simplify_prompt)
+                response = await self._ask_provider(simplify_prompt)
                 if "SIMPLER APPROACH:" in response:
                     simplified = response.split("SIMPLER APPROACH:")[1].strip()
                 else:
@@ -1240,7 +1252,7 @@ Please refine the task approach based on this feedback. Be more specific and act
 REFINED APPROACH: [Your refined approach that addresses the feedback]"""
                 
                 try:
-                    response = self.provider.ask(refine_prompt)
+                    response = await self._ask_provider(refine_prompt)
                     if "REFINED APPROACH:" in response:
                         refined = response.split("REFINED APPROACH:")[1].strip()
                     else:
@@ -9,6 +9,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
 
+from ..search.fuzzy import FuzzyMatcher
+
 
 class CommandCategory(Enum):
     """Command categories for organization."""
@@ -343,11 +345,13 @@ class CommandRegistry:
             if alias.startswith(partial_name):
                 suggestions.append(alias)
         
-        # Fuzzy matches (contains)
+        # Fuzzy matches (characters in order, best first)
         if len(suggestions) < limit:
-            for name in self.commands.keys():
-                if partial_name in name and name not in suggestions:
-                    suggestions.append(name)
+            for result in FuzzyMatcher().rank(partial_name, list(self.commands.keys())):
+                if result.candidate not in suggestions:
+                    suggestions.append(result.candidate)
+                    if len(suggestions) >= limit:
+                        break
         
         return suggestions[:limit]
     
@@ -208,10 +208,15 @@ Examples:
             if duplicates:
                 output_parts.append("\n[bold]🔄 Duplicate Code:[/bold]")
                 for i, dup in enumerate(duplicates[:5]):
-                    output_parts.append(f"\n[yellow]Duplicate {i+1}:[/yellow]")
-                    output_parts.append(f"  Original: {dup['original']['file']}:{dup['original']['start_line']}")
-                    output_parts.append(f"  Duplicate: {dup['duplicate']['file']}:{dup['duplicate']['start_line']}")
-                    output_parts.append(f"  Content: {dup['duplicate']['content'][:100]}...")
+                    output_parts.append(
+                        f"\n[yellow]Duplicate {i+1}:[/yellow] {dup['lines']} lines, "
+                        f"{len(dup['occurrences'])} occurrences"
+                    )
+                    for occurrence in dup['occurrences'][:5]:
+                        output_parts.append(
+                            f"  {occurrence['file']}:{occurrence['start_line']}-{occurrence['end_line']}"
+                        )
+                    output_parts.append(f"  Content: {dup['content'][:100]}...")
         
         return "\n".join(output_parts)
     
@@ -400,45 +405,46 @@ Examples:
             if 'extensions' in options:
                 search_kwargs['extensions'] = set(f'.{ext.lstrip(".")}' for ext in options['extensions'])
             
-            # Perform search
+            # Perform search, rendering matches as soon as they are found
             console.print(f"[cyan]Grepping for: '{pattern}'[/cyan]")
             
-            with console.status("[bold green]Searching..."):
-                result = self.search_manager.search(pattern, SearchType.CODE, **search_kwargs)
+            match_count = 0
+            async for match in self.search_manager.search_code_stream(pattern, **search_kwargs):
+                match_count += 1
+                if match_count <= 50:  # Limit display
+                    console.print("\n".join(self._format_match(match)))
             
-            # Format results
-            if not result.code_matches:
+            if not match_count:
                 return CommandResult(success=True, output="[yellow]No matches found[/yellow]")
             
-            output_parts = [f"[green]Found {len(result.code_matches)} matches:[/green]\n"]
-            
-            for match in result.code_matches[:50]:  # Limit display
-                # File and line
-                file_line = f"{match.file_path.name}:{match.line_number}"
-                output_parts.append(f"[cyan]{file_line}[/cyan]")
-                
-                # Context before
-                for ctx in match.context_before:
-                    output_parts.append(f"[dim]  {ctx}[/dim]")
-                
-                # Match line (highlighted)
-                highlighted = match.line_content.replace(
-                    match.match_text, 
-                    f"[bold red]{match.match_text}[/bold red]"
-                )
-                output_parts.append(f"  {highlighted}")
-                
-                # Context after  
-                for ctx in match.context_after:
-                    output_parts.append(f"[dim]  {ctx}[/dim]")
-                
-                output_parts.append("")  # Blank line between matches
-            
-            return CommandResult(success=True, output="\n".join(output_parts))
+            return CommandResult(success=True, output=f"[green]Found {match_count} matches[/green]")
         
         except Exception as e:
             return CommandResult(success=False, error=f"Grep failed: {e}")
     
+    def _format_match(self, match: CodeMatch) -> List[str]:
+        """Format a single grep match with its context."""
+        # File and line
+        output_parts = [f"[cyan]{match.file_path.name}:{match.line_number}[/cyan]"]
+        
+        # Context before
+        for ctx in match.context_before:
+            output_parts.append(f"[dim]  {ctx}[/dim]")
+        
+        # Match line (highlighted)
+        highlighted = match.line_content.replace(
+            match.match_text, 
+            f"[bold red]{match.match_text}[/bold red]"
+        )
+        output_parts.append(f"  {highlighted}")
+        
+        # Context after  
+        for ctx in match.context_after:
+            output_parts.append(f"[dim]  {ctx}[/dim]")
+        
+        output_parts.append("")  # Blank line between matches
+        return output_parts
+    
     def _parse_grep_options(self, args: List[str]) -> Dict[str, Any]:
         """Parse grep command options."""
         options = {}
@@ -33,6 +33,14 @@ class Config:
         # OpenRouter preferences  
         openrouter_config = self.user_config.get("openrouter", {})
         self.openrouter_use_oai_client = openrouter_config.get("use_oai_client", True)
+        self.openrouter_base_url = openrouter_config.get("base_url")
+        self.openrouter_http = openrouter_config.get("http", {})
+        
+        # Anthropic preferences
+        self.anthropic_prompt_caching = self.user_config.get("anthropic", {}).get("prompt_caching", True)
+        
+        # Token budget for prompts, history and tool results
+        self.context_window = self.user_config.get("context_window", {})
     
     def _load_user_config(self) -> Dict:
         """Load user configuration from ~/.codexarc if it exists."""
@@ -142,7 +150,22 @@ class Config:
             "openrouter": {
                 "site_name": "https://myapp.com",
                 "app_name": "Codexa",
-                "use_oai_client": True  # Use OpenAI client approach by default (True) or HTTP requests (False)
+                "use_oai_client": True,  # Use OpenAI client approach by default (True) or HTTP requests (False)
+                "http": {
+                    "pool_size": 10,  # Keep-alive connections kept per host
+                    "max_retries": 3,  # Retries for connection failures and 429/5xx responses
+                    "backoff_factor": 0.5,  # Exponential backoff between retries (seconds)
+                    "timeout": 60
+                }
+            },
+            "anthropic": {
+                "prompt_caching": True  # Cache the system prompt, tools and earlier turns between requests
+            },
+            "context_window": {
+                "max_input_tokens": 16000,  # Budget for system prompt, history and tool results
+                "max_message_tokens": 4000,  # Longer messages are cut in the middle
+                "elision_block": 8,  # History turns elided at a time, keeping the cached prefix stable
+                "models": {}  # Per-model budgets, e.g. {"gpt-4o": 60000}
             },
             "guidelines": {
                 "coding_style": "clean and readable",
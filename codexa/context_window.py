@@ -0,0 +1,236 @@
+"""
+Token-budgeted context window management for Codexa's AI providers.
+
+Providers used to keep the last ten history turns regardless of their size,
+so a few huge turns could overflow the model's context while many small ones
+left it mostly empty.  :class:`ContextWindow` instead counts tokens and packs
+the system prompt, the history and tool results into a configurable budget:
+
+- the system prompt, the new prompt and the tool schemas always fit first;
+- history is kept newest first for as long as it fits, and the older turns
+  are elided, leaving a short summary of them in the system prompt;
+- turns are elided in blocks of ``elision_block``, so the summary and the kept
+  history (the prefix a prompt cache reuses) stay unchanged for several turns;
+- a single oversized message (typically a tool result) is cut in the middle.
+
+Tokens are counted with ``tiktoken`` when it is installed, and estimated from
+the text otherwise.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# Tokens a chat API adds around every message (role, separators)
+MESSAGE_OVERHEAD = 4
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+_logger = logging.getLogger("codexa.context_window")
+
+
+@lru_cache(maxsize=32)
+def _encoding(model: Optional[str]):
+    """The tiktoken encoding of a model (None when tiktoken is unavailable)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model or "")
+    except Exception:
+        pass
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The encoding files could not be loaded (e.g. offline)
+        _logger.debug(f"Falling back to token estimates: {e}")
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _count(text: str, model: Optional[str]) -> int:
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # Roughly four characters per token, but never fewer tokens than words and symbols
+    return max(len(text) // 4, len(_WORD_PATTERN.findall(text)))
+
+
+def count_tokens(text: Any, model: Optional[str] = None) -> int:
+    """Count (or estimate) the tokens of a text, or of the JSON form of anything else."""
+    if not text:
+        return 0
+    if not isinstance(text, str):
+        text = json.dumps(text, default=str)
+    # Model names only matter to the tokenizer, so estimates share one cache entry
+    return _count(text, model if tiktoken is not None else None)
+
+
+@dataclass
+class ContextWindow:
+    """Packs a request into a token budget."""
+
+    max_input_tokens: int = 16000
+    max_message_tokens: int = 4000
+    summary_tokens: int = 300
+    elision_block: int = 8
+    model_budgets: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, settings: Optional[Dict[str, Any]]) -> "ContextWindow":
+        """Create a window from the ``context_window`` config section."""
+        settings = settings or {}
+        defaults = cls()
+        return cls(
+            max_input_tokens=int(settings.get("max_input_tokens", defaults.max_input_tokens)),
+            max_message_tokens=int(settings.get("max_message_tokens", defaults.max_message_tokens)),
+            summary_tokens=int(settings.get("summary_tokens", defaults.summary_tokens)),
+            elision_block=int(settings.get("elision_block", defaults.elision_block)),
+            model_budgets=dict(settings.get("models") or {}),
+        )
+
+    def budget(self, model: Optional[str] = None) -> int:
+        """Input token budget for a model."""
+        return int(self.model_budgets.get(model, self.max_input_tokens))
+
+    def pack(self, system: str, history: Optional[List[Dict]], prompt: str,
+             model: Optional[str] = None, tools: Optional[List[Dict]] = None) -> Tuple[str, List[Dict]]:
+        """
+        Fit conversation history around a system prompt and a new prompt.
+
+        Args:
+            system: System prompt
+            history: Turns as ``{"user": ..., "assistant": ...}`` dicts, oldest first
+            prompt: The new user prompt
+            model: Model the request is for
+            tools: Tool schemas sent with the request
+
+        Returns:
+            The system prompt (with a summary of elided turns appended) and the kept turns
+        """
+        if not history:
+            return system, []
+
+        fixed = (count_tokens(system, model) + count_tokens(prompt, model)
+                 + count_tokens(tools, model) + 2 * MESSAGE_OVERHEAD)
+        remaining = self.budget(model) - fixed - self.summary_tokens
+
+        kept: List[Dict] = []
+        for turn in reversed(history):
+            turn = {role: self.truncate(turn.get(role) or "", model) for role in ("user", "assistant")}
+            cost = sum(count_tokens(text, model) + MESSAGE_OVERHEAD for text in turn.values() if text)
+            if cost > remaining:
+                break
+            kept.append(turn)
+            remaining -= cost
+        kept.reverse()
+
+        elided = history[:self._round_to_block(len(history) - len(kept), len(history))]
+        kept = kept[len(kept) - (len(history) - len(elided)):]
+        if elided:
+            _logger.debug(f"Elided {len(elided)} of {len(history)} history turns to fit {self.budget(model)} tokens")
+            summary = self._summarize(f"{len(elided)} turns", [turn.get('user') or '' for turn in elided], model)
+            system = f"{system}\n\n{summary}"
+        return system, kept
+
+    def fit_messages(self, messages: List[Dict], tools: Optional[List[Dict]] = None,
+                     model: Optional[str] = None) -> List[Dict]:
+        """
+        Fit a chat-format message list (as used for tool calling) into the budget.
+
+        System messages and the first user message (the task) are always kept.
+        Oversized messages are truncated, then the oldest exchanges are dropped;
+        an assistant tool call and its tool results are kept or dropped together.
+        """
+        messages = [self._truncate_message(message, model) for message in messages]
+
+        pinned = [i for i, message in enumerate(messages) if message.get('role') == 'system']
+        first_user = next((i for i, message in enumerate(messages) if message.get('role') == 'user'), None)
+        if first_user is not None:
+            pinned.append(first_user)
+
+        units: List[List[int]] = []
+        for i, message in enumerate(messages):
+            if i in pinned:
+                continue
+            if message.get('role') == 'tool' and units and messages[units[-1][0]].get('tool_calls'):
+                units[-1].append(i)
+            else:
+                units.append([i])
+
+        cost = {i: count_tokens(message.get('content'), model)
+                   + count_tokens(message.get('tool_calls'), model) + MESSAGE_OVERHEAD
+                for i, message in enumerate(messages)}
+        total = sum(cost.values()) + count_tokens(tools, model)
+        budget = self.budget(model) - self.summary_tokens
+
+        dropped: List[int] = []
+        # Always keep the latest exchange
+        dropped_units = 0
+        while total > budget and len(units) > 1:
+            unit = units.pop(0)
+            dropped.extend(unit)
+            dropped_units += 1
+            total -= sum(cost[i] for i in unit)
+        # Finish the block so the note and the kept prefix stay put for a while
+        while dropped_units and dropped_units % max(self.elision_block, 1) and len(units) > 1:
+            dropped.extend(units.pop(0))
+            dropped_units += 1
+        if not dropped:
+            return messages
+
+        _logger.debug(f"Dropped {len(dropped)} of {len(messages)} messages to fit {self.budget(model)} tokens")
+        kept = sorted(pinned + [i for unit in units for i in unit])
+        fitted = [messages[i] for i in kept]
+        requests = [messages[i]['content'] for i in dropped
+                    if messages[i].get('role') == 'user' and isinstance(messages[i].get('content'), str)]
+        note = self._summarize(f"{len(dropped)} messages", requests, model)
+        system_index = next((i for i, message in enumerate(fitted) if message.get('role') == 'system'), None)
+        if system_index is not None and isinstance(fitted[system_index].get('content'), str):
+            fitted[system_index] = {**fitted[system_index],
+                                    'content': f"{fitted[system_index]['content']}\n\n{note}"}
+        return fitted
+
+    def _round_to_block(self, count: int, limit: int) -> int:
+        """Round a number of elided items up to whole ``elision_block`` blocks."""
+        block = max(self.elision_block, 1)
+        return min(-(-count // block) * block, limit)
+
+    def truncate(self, text: str, model: Optional[str] = None, limit: Optional[int] = None) -> str:
+        """Cut the middle out of a text longer than ``limit`` tokens."""
+        limit = limit or self.max_message_tokens
+        tokens = count_tokens(text, model)
+        if tokens <= limit:
+            return text
+        # Keep the same share of characters as of tokens, from both ends
+        keep = int(len(text) * limit / tokens) // 2
+        return f"{text[:keep]}\n... [{tokens - limit} tokens elided] ...\n{text[len(text) - keep:]}"
+
+    def _truncate_message(self, message: Dict, model: Optional[str]) -> Dict:
+        content = message.get('content')
+        if isinstance(content, str) and count_tokens(content, model) > self.max_message_tokens:
+            return {**message, 'content': self.truncate(content, model)}
+        return message
+
+    def _summarize(self, elided: str, requests: List[str], model: Optional[str]) -> str:
+        """Short extractive summary of elided history: the first line of each user request."""
+        lines = [f"Earlier conversation ({elided} elided to fit the context window):"]
+        used = count_tokens(lines[0], model)
+        for request in requests:
+            first_line = request.strip().splitlines()[0][:120] if request.strip() else ""
+            if not first_line:
+                continue
+            line = f"- {first_line}"
+            used += count_tokens(line, model) + 1
+            if used > self.summary_tokens:
+                lines.append("- ...")
+                break
+            lines.append(line)
+        return "\n".join(lines)
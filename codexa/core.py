@@ -11,13 +11,13 @@ from rich.console import Console
 from rich.prompt import Confirm, Prompt
 from rich.panel import Panel
 from rich.syntax import Syntax
-from rich.markdown import Markdown
 
 from .config import Config
 from .providers import ProviderFactory
 from .planning import PlanningManager
 from .execution import TaskExecutionManager
 from .codegen import CodeGenerator
+from .display.stream_renderer import StreamRenderer
 
 console = Console()
 
@@ -218,16 +218,13 @@ Ready to help you build amazing software! 🚀"""
         if self._is_code_generation_request(request):
             self._handle_code_generation_request(request, context)
         else:
-            # Handle as regular natural language request
-            response = self.provider.ask(
+            # Handle as regular natural language request, displaying the answer as it streams in
+            console.print("\n[bold green]Codexa:[/bold green]")
+            response = StreamRenderer(console).render(self.provider.stream(
                 prompt=request,
                 history=self.history,
                 context=context
-            )
-            
-            # Display response
-            console.print("\n[bold green]Codexa:[/bold green]")
-            console.print(Markdown(response))
+            ))
             
             # Save to history
             self.history.append({
@@ -410,14 +407,12 @@ Large requests trigger planning, code requests create files."""
                 console.print(f"[red]Failed to create {file_path}[/red]")
         else:
             # General code assistance
-            response = self.provider.ask(
+            console.print("\n[bold green]Codexa:[/bold green]")
+            StreamRenderer(console).render(self.provider.stream(
                 prompt=f"Code generation request: {request}\n\nProvide implementation guidance and code examples.\n\n{context}",
                 history=self.history,
                 context=context
-            )
-            
-            console.print("\n[bold green]Codexa:[/bold green]")
-            console.print(Markdown(response))
+            ))
         
         # Save to history
         self.history.append({
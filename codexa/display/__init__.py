@@ -5,6 +5,7 @@ Display and UI components for Codexa.
 from .ascii_art import ASCIIArtRenderer, ASCIIAnimation, LogoTheme
 from .animations import AnimationEngine, StartupAnimation
 from .themes import ThemeManager, ColorTheme
+from .stream_renderer import StreamRenderer
 
 __all__ = [
     "ASCIIArtRenderer",
@@ -13,5 +14,6 @@ __all__ = [
     "AnimationEngine",
     "StartupAnimation",
     "ThemeManager",
-    "ColorTheme"
+    "ColorTheme",
+    "StreamRenderer"
 ]
\ No newline at end of file
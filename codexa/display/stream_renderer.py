@@ -0,0 +1,93 @@
+"""
+Live rendering of streamed AI responses for Codexa.
+"""
+
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Union
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.text import Text
+
+from ..providers import StreamChunk
+
+
+class StreamRenderer:
+    """Render streamed response chunks to the console as they arrive."""
+
+    def __init__(self, console: Optional[Console] = None, markdown: bool = True,
+                 transient: bool = False, refresh_per_second: int = 12):
+        """
+        Initialize the renderer.
+
+        Args:
+            console: Console to render to
+            markdown: Render the text as Markdown (plain text otherwise)
+            transient: Clear the live output once the stream ends
+            refresh_per_second: Maximum redraws per second while streaming
+        """
+        self.console = console or Console()
+        self.markdown = markdown
+        self.transient = transient
+        self.refresh_per_second = refresh_per_second
+
+        self.text_parts: List[str] = []
+        self.tool_names: Dict[int, str] = {}
+        self.response: Optional[Union[str, Dict]] = None
+
+    @property
+    def text(self) -> str:
+        """The answer text received so far."""
+        return ''.join(self.text_parts)
+
+    def render(self, chunks: Iterable[StreamChunk]) -> Optional[Union[str, Dict]]:
+        """Render a blocking stream and return the final response."""
+        with self._live() as live:
+            for chunk in chunks:
+                self._handle(chunk, live)
+        return self._result()
+
+    async def render_async(self, chunks: AsyncIterable[StreamChunk]) -> Optional[Union[str, Dict]]:
+        """Render an async stream and return the final response."""
+        with self._live() as live:
+            async for chunk in chunks:
+                self._handle(chunk, live)
+        return self._result()
+
+    def _live(self) -> Live:
+        return Live(
+            Text(""),
+            console=self.console,
+            refresh_per_second=self.refresh_per_second,
+            transient=self.transient,
+            vertical_overflow="visible"
+        )
+
+    def _handle(self, chunk: StreamChunk, live: Live) -> None:
+        if chunk.type == 'text':
+            self.text_parts.append(chunk.text)
+        elif chunk.type == 'tool_call' and chunk.tool_call:
+            name = chunk.tool_call.get('name')
+            if name:
+                self.tool_names[chunk.tool_call.get('index', 0)] = name
+        elif chunk.type == 'done':
+            self.response = chunk.response
+        else:
+            return
+        live.update(self._renderable())
+
+    def _renderable(self):
+        text = self.text
+        if not text and isinstance(self.response, str):
+            # Providers report errors as the final response without streaming any text
+            text = self.response
+
+        parts = [Markdown(text) if self.markdown else Text(text)]
+        for index in sorted(self.tool_names):
+            parts.append(Text(f"🛠️ Calling {self.tool_names[index]}...", style="dim"))
+        return Group(*parts)
+
+    def _result(self) -> Optional[Union[str, Dict]]:
+        if self.response is None and self.text_parts:
+            return self.text
+        return self.response
@@ -49,6 +49,8 @@ class MCPServerConfig:
     timeout: int = 30
     priority: int = 1
     capabilities: List[str] = field(default_factory=list)
+    replicas: int = 1
+    batching: bool = False
 
 
 class EnhancedConfig:
@@ -84,6 +86,26 @@ class EnhancedConfig:
         # OpenRouter preferences  
         openrouter_config = self.user_config.get("openrouter", {})
         self.openrouter_use_oai_client = openrouter_config.get("use_oai_client", True)
+        self.openrouter_base_url = openrouter_config.get("base_url")
+        self.openrouter_http = openrouter_config.get("http", {})
+        
+        # Anthropic preferences
+        self.anthropic_prompt_caching = self.user_config.get("anthropic", {}).get("prompt_caching", True)
+        
+        # Token budget for prompts, history and tool results
+        self.context_window = self.user_config.get("context_window", {})
+        
+        # Latency-aware routing and hedged requests
+        self.routing = self.user_config.get("routing", {})
+        
+        # Opt-in cache of provider responses
+        self.response_cache = self.user_config.get("response_cache", {})
+        
+        # MCP server startup (eager or lazy) and idle shutdown
+        self.mcp = self.user_config.get("mcp", {})
+        
+        # Cache of read-only MCP tool results
+        self.mcp_cache = self.user_config.get("mcp_cache", {})
         
         # Initialize runtime state
         self._update_availability()
@@ -212,7 +234,8 @@ class EnhancedConfig:
                 "context7": {
                     "command": ["npx", "-y", "@modelcontextprotocol/server-context7"],
                     "enabled": False,
-                    "timeout": 30
+                    "timeout": 30,
+                    "replicas": 1  # Server processes to run; requests go to the least-loaded one
                 },
                 "sequential": {
                     "command": ["python", "-m", "sequential_server"],
@@ -220,6 +243,38 @@ class EnhancedConfig:
                     "timeout": 30
                 }
             },
+            "mcp": {
+                "startup": "eager",  # "eager" starts all servers concurrently at launch, "lazy" on first use
+                "startup_timeout": 60,  # Seconds launch waits for servers; slower ones finish in the background
+                "idle_timeout": None  # Stop servers unused for this many seconds (None keeps them running)
+            },
+            "mcp_cache": {
+                "enabled": True,  # Answer repeated read-only MCP tool calls (read_file, find_symbol, ...) from memory
+                "ttl": 120,  # Seconds before tree, search and project-wide results expire
+                "max_entries": 512,  # Results kept per server
+                "max_result_bytes": 1048576,  # Larger results are not cached
+                "watch": False,  # Watch the project with watchdog to catch changes made outside Codexa
+                "idempotent_tools": []  # Extra read-only tool names to cache
+            },
+            "context_window": {
+                "max_input_tokens": 16000,  # Budget for system prompt, history and tool results
+                "max_message_tokens": 4000,  # Longer messages are cut in the middle
+                "elision_block": 8,  # History turns elided at a time, keeping the cached prefix stable
+                "models": {}  # Per-model budgets, e.g. {"gpt-4o": 60000}
+            },
+            "routing": {
+                "latency_window": 200,  # Recent requests kept per provider and model for p50/p95/p99
+                "hedging": False,  # Send a backup request to a second provider when the first is slower than its p95
+                "hedge_min_delay": 0.5,  # Never hedge sooner than this (seconds)
+                "hedge_default_delay": 5.0  # Hedge delay before a provider has enough latency samples
+            },
+            "response_cache": {
+                "enabled": False,  # Replay identical requests from .codexa/cache instead of calling the API again
+                "ttl": 86400,  # Seconds a cached response stays valid
+                "max_memory_entries": 256,
+                "max_disk_entries": 5000,
+                "max_temperature": 0.0  # Only cache requests at or below this temperature (null caches any)
+            },
             "slash_commands": {
                 "enabled": True,
                 "custom_commands": {}
@@ -363,6 +418,8 @@ class EnhancedConfig:
                     server.enabled = config.get("enabled", server.enabled)
                     server.command = config.get("command", server.command)
                     server.args = config.get("args", server.args)
+                    server.replicas = int(config.get("replicas", server.replicas))
+                    server.batching = bool(config.get("batching", server.batching))
     
     def _update_availability(self):
         """Update available providers and models based on API keys."""
@@ -28,6 +28,7 @@ from .commands.built_in_commands import BuiltInCommands
 from .enhanced_config import EnhancedConfig
 from .enhanced_providers import EnhancedProviderFactory
 from .mcp_service import MCPService
+from .display.stream_renderer import StreamRenderer
 
 # Session memory integration
 try:
@@ -438,7 +439,6 @@ class EnhancedCodexaAgent:
                 try:
                     fallback_response = await self._process_with_ai_fallback(request)
                     if fallback_response:
-                        console.print(fallback_response)
                         # Save fallback response to history
                         self.history.append({
                             "user": request,
@@ -608,7 +608,7 @@ class EnhancedCodexaAgent:
         return ""
 
     async def _process_with_ai_fallback(self, request: str) -> Optional[str]:
-        """Fallback to direct AI processing when tool system fails."""
+        """Fallback to direct AI processing when tool system fails (displays the answer)."""
         try:
             # Get project context
             context_parts = []
@@ -633,12 +633,32 @@ class EnhancedCodexaAgent:
 
             project_context = "\n\n".join(context_parts)
 
-            # Use AI provider directly
-            response = await self.provider.ask_async(
-                prompt=request,
-                history=self.history,
-                context=project_context
-            )
+            # Use AI provider directly, streaming the answer as it is generated
+            provider_factory = getattr(self, 'provider_factory', None)
+            if provider_factory and provider_factory.hedging_enabled and hasattr(self.provider, 'config'):
+                # A slow first token gets a backup request to the next fastest provider
+                renderer = StreamRenderer(console)
+                response = await renderer.render_async(provider_factory.ask_stream_hedged(
+                    prompt=request,
+                    history=self.history,
+                    context=project_context,
+                    primary=self.provider.config.name
+                ))
+            elif hasattr(self.provider, 'ask_stream'):
+                renderer = StreamRenderer(console)
+                response = await renderer.render_async(self.provider.ask_stream(
+                    prompt=request,
+                    history=self.history,
+                    context=project_context
+                ))
+            else:
+                response = await self.provider.ask_async(
+                    prompt=request,
+                    history=self.history,
+                    context=project_context
+                )
+                if response:
+                    console.print(response)
 
             if response:
                 return response
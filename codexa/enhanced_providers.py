@@ -2,15 +2,23 @@
 Enhanced AI provider system for Codexa with runtime switching and intelligent routing.
 """
 
+import asyncio
+import inspect
 import logging
-from typing import Dict, List, Optional, Any, Union
+import math
+import threading
+from collections import deque
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 
-from .providers import AIProvider, OpenAIProvider, AnthropicProvider, OpenRouterProvider, OpenRouterOAIProvider
+from .providers import (AIProvider, OpenAIProvider, AnthropicProvider, OpenRouterProvider, OpenRouterOAIProvider,
+                        ProviderError, StreamChunk)
 from .enhanced_config import EnhancedConfig, ModelConfig, ProviderConfig
 from .config import Config
+from .request_coalescing import RequestCoalescer
+from .response_cache import ResponseCache
 
 
 class ConfigAdapter:
@@ -56,6 +64,67 @@ class ConfigAdapter:
     def openrouter_use_oai_client(self) -> bool:
         return self.enhanced_config.openrouter_use_oai_client
 
+    @property
+    def openrouter_base_url(self) -> Optional[str]:
+        return self.enhanced_config.openrouter_base_url
+    
+    @property
+    def openrouter_http(self) -> dict:
+        return self.enhanced_config.openrouter_http
+    
+    @property
+    def anthropic_prompt_caching(self) -> bool:
+        return self.enhanced_config.anthropic_prompt_caching
+    
+    @property
+    def context_window(self) -> dict:
+        return self.enhanced_config.context_window
+
+
+class LatencyWindow:
+    """Response times and outcomes of the most recent requests."""
+
+    def __init__(self, size: int = 200):
+        self._lock = threading.Lock()
+        self._samples: "deque[Tuple[float, bool]]" = deque(maxlen=size)
+
+    def add(self, seconds: float, success: bool = True) -> None:
+        """Record one request."""
+        with self._lock:
+            self._samples.append((seconds, success))
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    @property
+    def error_rate(self) -> float:
+        """Share of failed requests in the window."""
+        with self._lock:
+            if not self._samples:
+                return 0.0
+            return sum(1 for _, success in self._samples if not success) / len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Response time below which ``q`` percent of successful requests finished (None without data)."""
+        with self._lock:
+            times = sorted(seconds for seconds, success in self._samples if success)
+        if not times:
+            return None
+        # Nearest-rank percentile
+        rank = max(1, math.ceil(q / 100 * len(times)))
+        return times[rank - 1]
+
+    def summary(self) -> Dict[str, Any]:
+        """Percentiles, error rate and sample count."""
+        return {
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "error_rate": self.error_rate,
+            "samples": self.count,
+        }
+
 
 @dataclass
 class ProviderMetrics:
@@ -67,6 +136,15 @@ class ProviderMetrics:
     average_response_time: float = 0.0
     last_request_time: Optional[datetime] = None
     uptime_start: Optional[datetime] = None
+    window_size: int = 200
+    # Rolling windows of recent requests, overall, per model and until the first streamed token
+    latency: Optional[LatencyWindow] = None
+    first_token: Optional[LatencyWindow] = None
+    model_latency: Dict[str, LatencyWindow] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.latency = self.latency or LatencyWindow(self.window_size)
+        self.first_token = self.first_token or LatencyWindow(self.window_size)
     
     @property
     def success_rate(self) -> float:
@@ -80,7 +158,7 @@ class ProviderMetrics:
         """Calculate error rate."""
         return 1.0 - self.success_rate
     
-    def update_request(self, success: bool, response_time: float):
+    def update_request(self, success: bool, response_time: float, model: Optional[str] = None):
         """Update metrics with new request data."""
         self.total_requests += 1
         if success:
@@ -92,13 +170,33 @@ class ProviderMetrics:
         self.average_response_time = self.total_response_time / self.total_requests
         self.last_request_time = datetime.now()
 
+        self.latency.add(response_time, success)
+        if model:
+            self.model_window(model).add(response_time, success)
+
+    def model_window(self, model: str) -> LatencyWindow:
+        """Latency window of one model."""
+        window = self.model_latency.get(model)
+        if window is None:
+            window = self.model_latency.setdefault(model, LatencyWindow(self.window_size))
+        return window
+
 
 class ProviderRouter:
     """Intelligent router for provider selection."""
     
-    def __init__(self):
+    def __init__(self, min_samples: int = 5, default_latency: float = 2.0):
+        """
+        Initialize the router.
+
+        Args:
+            min_samples: Requests needed before a provider's own latencies are trusted
+            default_latency: Latency assumed for providers without enough samples
+        """
         self.routing_rules = []
         self.provider_scores: Dict[str, float] = {}
+        self.min_samples = min_samples
+        self.default_latency = default_latency
     
     def add_routing_rule(self, rule_func):
         """Add a routing rule function."""
@@ -121,52 +219,74 @@ class ProviderRouter:
             if result:
                 return result
         
-        # Default: select by performance score
-        best_provider = None
-        best_score = -1
-        
-        for name, provider in available_providers.items():
-            score = self._calculate_provider_score(provider)
-            if score > best_score:
-                best_score = score
-                best_provider = name
-        
-        return best_provider
-    
-    def _calculate_provider_score(self, provider: 'EnhancedAIProvider') -> float:
-        """Calculate provider score based on performance metrics."""
-        metrics = provider.metrics
-        
-        # Base score from success rate
-        score = metrics.success_rate * 100
-        
-        # Penalty for high response time (>2s)
-        if metrics.average_response_time > 2.0:
-            score -= (metrics.average_response_time - 2.0) * 10
-        
-        # Bonus for recent activity
-        if metrics.last_request_time:
-            hours_since_last = (datetime.now() - metrics.last_request_time).total_seconds() / 3600
-            if hours_since_last < 1:
-                score += 10
-            elif hours_since_last > 24:
-                score -= 5
-        
-        # Penalty for high error rate
-        score -= metrics.error_rate * 50
-        
-        return max(0, score)
+        # Default: lowest predicted latency
+        ranked = self.rank_providers(available_providers, request_context.get('model'))
+        return ranked[0] if ranked else None
+
+    def rank_providers(self, providers: Dict[str, 'EnhancedAIProvider'],
+                       model: Optional[str] = None) -> List[str]:
+        """Available providers, fastest predicted first (priority breaks ties)."""
+        available = [name for name, provider in providers.items()
+                     if provider.is_available() and provider.enabled]
+        predictions = {name: self.predict_latency(providers[name], model) for name in available}
+        for name, predicted in predictions.items():
+            self.provider_scores[name] = predicted
+        return sorted(available, key=lambda name: (predictions[name], -providers[name].config.priority))
+
+    def predict_latency(self, provider: 'EnhancedAIProvider', model: Optional[str] = None) -> float:
+        """
+        Expected seconds until a successful answer.
+
+        Uses the model's window when it has enough samples, else the provider's.
+        The typical latency (mean of p50 and p95) is scaled by the expected
+        number of attempts, 1 / (1 - error rate).
+        """
+        window = provider.metrics.latency
+        if model and model in provider.metrics.model_latency:
+            model_window = provider.metrics.model_latency[model]
+            if model_window.count >= self.min_samples:
+                window = model_window
+
+        if window.count < self.min_samples:
+            return self.default_latency
+
+        p50, p95 = window.percentile(50), window.percentile(95)
+        if p50 is None:
+            # Every recent request failed
+            return float('inf')
+        return (p50 + p95) / 2 / max(1.0 - window.error_rate, 0.05)
+
+
+async def _close_quietly(stream: AsyncIterator[Any]) -> None:
+    """Close an abandoned stream, ignoring the errors of its cancelled request."""
+    try:
+        await stream.aclose()
+    except Exception:
+        pass
+
+
+def _is_error_response(response: Any) -> bool:
+    """Whether a provider answered with its error text instead of a response."""
+    # Providers report failures as text rather than raising, typed as ProviderError
+    return isinstance(response, ProviderError)
 
 
 class EnhancedAIProvider(AIProvider):
     """Enhanced AI provider with metrics and advanced features."""
     
-    def __init__(self, base_provider: AIProvider, config: ProviderConfig):
+    def __init__(self, base_provider: AIProvider, config: ProviderConfig,
+                 response_cache: Optional[ResponseCache] = None, latency_window: int = 200):
         self.base_provider = base_provider
         self.config = config
-        self.metrics = ProviderMetrics()
+        self.metrics = ProviderMetrics(window_size=latency_window)
         self.enabled = config.enabled
+        self.response_cache = response_cache
+        self.coalescer = RequestCoalescer()
         self.logger = logging.getLogger(f"provider.{config.name}")
+
+        # Requests are sent with each model's configured temperature
+        if config.models and isinstance(base_provider, AIProvider):
+            base_provider.model_temperatures = {model.name: model.temperature for model in config.models}
         
         # Initialize uptime tracking
         if self.is_available():
@@ -175,80 +295,205 @@ class EnhancedAIProvider(AIProvider):
     def ask(self, prompt: str, history: Optional[List[Dict]] = None,
              context: Optional[str] = None, model: Optional[str] = None, tools: Optional[List[Dict]] = None) -> Union[str, Dict]:
         """Enhanced ask method with metrics tracking and tool support."""
+        key, cache_key = self._request_key(model, {'prompt': prompt, 'history': history, 'context': context}, tools)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        # Identical concurrent requests share one round-trip
+        return self.coalescer.do(key, lambda: self._ask(prompt, history, context, model, tools, cache_key))
+
+    def _ask(self, prompt: str, history: Optional[List[Dict]], context: Optional[str],
+             model: Optional[str], tools: Optional[List[Dict]], cache_key: Optional[str]) -> Union[str, Dict]:
+        """Send a request to the base provider, tracking metrics and caching the response."""
         start_time = datetime.now()
 
         try:
-            # Use specific model if provided
-            if model and hasattr(self.base_provider, 'model'):
-                original_model = self.base_provider.model
-                self.base_provider.model = model
-
-            # Call base provider with tool support
-            if hasattr(self.base_provider, 'ask') and 'tools' in self.base_provider.ask.__code__.co_varnames:
+            # The model is passed per call, so concurrent requests never see each other's model
+            accepted = inspect.signature(self.base_provider.ask).parameters
+            if 'model' in accepted:
+                response = self.base_provider.ask(prompt, history, context, tools, model=model)
+            elif 'tools' in accepted:
+                if model:
+                    self.logger.warning(f"{type(self.base_provider).__name__} does not support per-call models; using its default")
                 response = self.base_provider.ask(prompt, history, context, tools)
             else:
                 # Fallback for providers without tool support
                 response = self.base_provider.ask(prompt, history, context)
 
-            # Restore original model
-            if model and hasattr(self.base_provider, 'model'):
-                self.base_provider.model = original_model
-
             # Update metrics
             response_time = (datetime.now() - start_time).total_seconds()
-            self.metrics.update_request(True, response_time)
+            self.metrics.update_request(not _is_error_response(response), response_time, self._model_name(model))
 
             self.logger.debug(f"Request completed in {response_time:.2f}s")
+            self._store_response(cache_key, response)
             return response
 
         except Exception as e:
             # Update metrics for failure
             response_time = (datetime.now() - start_time).total_seconds()
-            self.metrics.update_request(False, response_time)
+            self.metrics.update_request(False, response_time, self._model_name(model))
 
             self.logger.error(f"Request failed after {response_time:.2f}s: {e}")
             raise
 
+    def stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+               tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Iterator[StreamChunk]:
+        """Stream a response from the base provider with metrics tracking."""
+        start_time = datetime.now()
+        first_chunk_time = None
+        success = True
+        cancelled = False
+
+        try:
+            for chunk in self.base_provider.stream(prompt, history, context, tools, model):
+                if first_chunk_time is None and chunk.type != 'done':
+                    first_chunk_time = (datetime.now() - start_time).total_seconds()
+                    self.metrics.first_token.add(first_chunk_time)
+                    self.logger.debug(f"First token after {first_chunk_time:.2f}s")
+                if chunk.type == 'done' and _is_error_response(chunk.response):
+                    success = False
+                yield chunk
+        except (GeneratorExit, asyncio.CancelledError):
+            # Abandoned by the caller (e.g. a hedged request that lost); not a latency sample
+            cancelled = True
+            raise
+        except Exception as e:
+            success = False
+            self.logger.error(f"Streaming request failed: {e}")
+            raise
+        finally:
+            if not cancelled:
+                response_time = (datetime.now() - start_time).total_seconds()
+                self.metrics.update_request(success, response_time, self._model_name(model))
+                self.logger.debug(f"Stream completed in {response_time:.2f}s")
+
+    async def ask_stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                         tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> AsyncIterator[StreamChunk]:
+        """Stream a response from the base provider's async client with metrics tracking."""
+        start_time = datetime.now()
+        first_chunk_time = None
+        success = True
+        cancelled = False
+
+        try:
+            async for chunk in self.base_provider.ask_stream(prompt, history, context, tools, model):
+                if first_chunk_time is None and chunk.type != 'done':
+                    first_chunk_time = (datetime.now() - start_time).total_seconds()
+                    self.metrics.first_token.add(first_chunk_time)
+                    self.logger.debug(f"First token after {first_chunk_time:.2f}s")
+                if chunk.type == 'done' and _is_error_response(chunk.response):
+                    success = False
+                yield chunk
+        except (GeneratorExit, asyncio.CancelledError):
+            # Abandoned by the caller (e.g. a hedged request that lost); not a latency sample
+            cancelled = True
+            raise
+        except Exception as e:
+            success = False
+            self.logger.error(f"Streaming request failed: {e}")
+            raise
+        finally:
+            if not cancelled:
+                response_time = (datetime.now() - start_time).total_seconds()
+                self.metrics.update_request(success, response_time, self._model_name(model))
+                self.logger.debug(f"Stream completed in {response_time:.2f}s")
+
     async def ask_async(self, prompt: str, history: Optional[List[Dict]] = None,
                        context: Optional[str] = None, model: Optional[str] = None, tools: Optional[List[Dict]] = None) -> Union[str, Dict]:
-        """Async version of ask method for compatibility with async interfaces."""
-        # Since the base provider's ask method is synchronous, we run it in a thread pool
-        import asyncio
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.ask, prompt, history, context, model, tools)
+        """Async ask using the base provider's native async client, with metrics tracking."""
+        key, cache_key = self._request_key(model, {'prompt': prompt, 'history': history, 'context': context}, tools)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self.coalescer.do_async(key, lambda: self._ask_async(prompt, history, context, model, tools, cache_key))
+
+    async def _ask_async(self, prompt: str, history: Optional[List[Dict]], context: Optional[str],
+                         model: Optional[str], tools: Optional[List[Dict]], cache_key: Optional[str]) -> Union[str, Dict]:
+        """Send a request through the base provider's async client, tracking metrics and caching the response."""
+        start_time = datetime.now()
+
+        try:
+            response = await self.base_provider.ask_async(prompt, history, context, tools, model)
+
+            response_time = (datetime.now() - start_time).total_seconds()
+            self.metrics.update_request(not _is_error_response(response), response_time, self._model_name(model))
+            self.logger.debug(f"Request completed in {response_time:.2f}s")
+            self._store_response(cache_key, response)
+            return response
+
+        except Exception as e:
+            response_time = (datetime.now() - start_time).total_seconds()
+            self.metrics.update_request(False, response_time, self._model_name(model))
+            self.logger.error(f"Request failed after {response_time:.2f}s: {e}")
+            raise
 
     async def ask_with_tools_async(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> Union[str, Dict]:
         """Async version of ask_with_tools for tool calling workflow."""
-        import asyncio
-        loop = asyncio.get_event_loop()
+        key, cache_key = self._request_key(model, messages, tools, call='ask_with_tools')
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
 
-        if hasattr(self.base_provider, 'ask_with_tools'):
-            return await loop.run_in_executor(None, self.base_provider.ask_with_tools, messages, tools, model)
-        else:
-            # Fallback - convert to simple ask format
-            if messages:
-                last_message = messages[-1]
-                if last_message.get('role') == 'user':
-                    prompt = last_message.get('content', '')
-                    # Convert messages to history format
-                    history = []
-                    for msg in messages[:-1]:
-                        if msg.get('role') in ['user', 'assistant']:
-                            history.append({
-                                'user' if msg['role'] == 'user' else 'assistant': msg.get('content', '')
-                            })
-                    return await loop.run_in_executor(None, self.ask, prompt, history, None, model, tools)
-            return "Error: Tool calling not supported by base provider"
+        async def send():
+            response = await self.base_provider.ask_with_tools_async(messages, tools, model)
+            self._store_response(cache_key, response)
+            return response
+
+        return await self.coalescer.do_async(key, send)
 
     async def continue_with_tool_results_async(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> str:
         """Async version of continue_with_tool_results."""
-        import asyncio
-        loop = asyncio.get_event_loop()
+        key, cache_key = self._request_key(model, messages, tools, call='continue_with_tool_results')
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
 
-        if hasattr(self.base_provider, 'continue_with_tool_results'):
-            return await loop.run_in_executor(None, self.base_provider.continue_with_tool_results, messages, tools, model)
-        else:
-            return "Error: Tool result continuation not supported by base provider"
+        async def send():
+            response = await self.base_provider.continue_with_tool_results_async(messages, tools, model)
+            self._store_response(cache_key, response)
+            return response
+
+        return await self.coalescer.do_async(key, send)
+
+    def _model_name(self, model: Optional[str]) -> Optional[str]:
+        """Model a request runs on."""
+        return model or getattr(self.base_provider, 'model', None)
+
+    def _request_key(self, model: Optional[str], messages: Any, tools: Optional[List[Dict]],
+                     **extra: Any) -> Tuple[str, Optional[str]]:
+        """
+        Identify a request.
+
+        Returns:
+            The request key, and the same key if the response may be cached (None otherwise)
+        """
+        model = self._model_name(model)
+        # Key on the temperature actually sent (None if the provider does not say)
+        temperature_for = getattr(self.base_provider, 'temperature_for', None)
+        temperature = temperature_for(model) if temperature_for else None
+
+        key = ResponseCache.make_key(model, messages, tools, temperature,
+                                     provider=self.config.name, **extra)
+        cacheable = self.response_cache is not None and self.response_cache.accepts(temperature)
+        return key, key if cacheable else None
+
+    def _cached_response(self, cache_key: Optional[str]) -> Optional[Union[str, Dict]]:
+        """Return a cached response for the key, if any."""
+        if cache_key is None:
+            return None
+        response = self.response_cache.get(cache_key)
+        if response is not None:
+            self.logger.debug("Response served from cache")
+        return response
+
+    def _store_response(self, cache_key: Optional[str], response: Any) -> None:
+        """Cache a successful response."""
+        if cache_key is None or not response or _is_error_response(response):
+            # Never replay a failure
+            return
+        self.response_cache.put(cache_key, response)
 
     def is_available(self) -> bool:
         """Check if provider is available."""
@@ -298,6 +543,7 @@ class EnhancedAIProvider(AIProvider):
         uptime = None
         if self.metrics.uptime_start:
             uptime = str(datetime.now() - self.metrics.uptime_start)
+        base_cache_usage = getattr(self.base_provider, 'prompt_cache_usage', None)
         
         return {
             "name": self.config.name,
@@ -310,8 +556,14 @@ class EnhancedAIProvider(AIProvider):
                 "success_rate": self.metrics.success_rate,
                 "average_response_time": self.metrics.average_response_time,
                 "last_request": self.metrics.last_request_time.isoformat() if self.metrics.last_request_time else None,
-                "uptime": uptime
-            }
+                "uptime": uptime,
+                "latency": self.metrics.latency.summary(),
+                "first_token_latency": self.metrics.first_token.summary(),
+                "model_latency": {name: window.summary() for name, window in list(self.metrics.model_latency.items())},
+                "prompt_cache": base_cache_usage.as_dict() if base_cache_usage else None
+            },
+            "response_cache": self.response_cache.get_stats() if self.response_cache else None,
+            "coalescing": self.coalescer.get_stats()
         }
 
 
@@ -321,8 +573,13 @@ class EnhancedProviderFactory:
     def __init__(self, config: EnhancedConfig):
         self.config = config
         self.providers: Dict[str, EnhancedAIProvider] = {}
-        self.router = ProviderRouter()
+        self.routing = dict(getattr(config, "routing", None) or {})
+        self.router = ProviderRouter(
+            min_samples=int(self.routing.get("min_samples", 5)),
+            default_latency=float(self.routing.get("default_latency", 2.0))
+        )
         self.logger = logging.getLogger("provider.factory")
+        self.response_cache = ResponseCache.from_config(getattr(config, "response_cache", None))
         
         self._initialize_providers()
         self._setup_routing_rules()
@@ -337,7 +594,8 @@ class EnhancedProviderFactory:
                     continue
                 
                 # Wrap with enhanced provider
-                enhanced_provider = EnhancedAIProvider(base_provider, provider_config)
+                enhanced_provider = EnhancedAIProvider(base_provider, provider_config, self.response_cache,
+                                                       int(self.routing.get("latency_window", 200)))
                 self.providers[name] = enhanced_provider
                 
                 self.logger.info(f"Initialized provider: {name}")
@@ -382,32 +640,9 @@ class EnhancedProviderFactory:
                         return name
             return None
         
-        # Rule 2: Simple tasks prefer fast/cheap models
-        def simple_task_rule(providers, context):
-            if context.get('complexity', 'medium') == 'low':
-                # Prefer providers with better response times
-                best_provider = None
-                best_time = float('inf')
-                
-                for name, provider in providers.items():
-                    avg_time = provider.metrics.average_response_time
-                    if avg_time > 0 and avg_time < best_time:
-                        best_time = avg_time
-                        best_provider = name
-                
-                return best_provider
-            return None
-        
-        # Rule 3: Fallback to highest priority available provider
-        def priority_fallback_rule(providers, context):
-            if providers:
-                return max(providers.keys(), 
-                          key=lambda name: providers[name].config.priority)
-            return None
-        
+        # Everything else goes to the provider with the lowest predicted latency
+        # (highest priority among providers without enough samples)
         self.router.add_routing_rule(code_analysis_rule)
-        self.router.add_routing_rule(simple_task_rule)
-        self.router.add_routing_rule(priority_fallback_rule)
     
     def get_provider(self, name: Optional[str] = None, 
                     context: Optional[Dict[str, Any]] = None) -> Optional[EnhancedAIProvider]:
@@ -525,6 +760,147 @@ class EnhancedProviderFactory:
             return True
         return False
     
+    @property
+    def hedging_enabled(self) -> bool:
+        """Whether slow requests get a backup request to a second provider."""
+        return bool(self.routing.get("hedging", False))
+
+    async def ask_hedged(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                         model: Optional[str] = None, tools: Optional[List[Dict]] = None,
+                         primary: Optional[str] = None) -> Union[str, Dict]:
+        """
+        Ask the primary provider, and a backup provider too if the answer is slow.
+
+        The backup request starts once the primary has taken longer than its
+        p95 latency (or has failed); whichever answers first wins and the
+        other is abandoned.
+
+        Args:
+            primary: Provider to ask first (defaults to the router's choice)
+            model: Model for the primary provider; the backup uses its default model
+        """
+        primary_name, backup_name = self._hedge_pair(primary)
+        if primary_name is None:
+            raise RuntimeError("No AI provider available")
+        first = self.providers[primary_name]
+        if not self.hedging_enabled or backup_name is None:
+            return await first.ask_async(prompt, history, context, model, tools)
+
+        attempts = {asyncio.ensure_future(first.ask_async(prompt, history, context, model, tools)): primary_name}
+        delay = self._hedge_delay(first.metrics.latency)
+        backup_started = False
+        failure: Any = None
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            while True:
+                if not done and not backup_started:
+                    self.logger.info(f"No answer from {primary_name} after {delay:.2f}s; hedging with {backup_name}")
+                    backup = self.providers[backup_name]
+                    attempts[asyncio.ensure_future(backup.ask_async(prompt, history, context, None, tools))] = backup_name
+                    backup_started = True
+                if not attempts:
+                    break
+                done, _ = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = attempts.pop(task)
+                    if task.exception() is not None:
+                        failure = task.exception()
+                    elif _is_error_response(task.result()):
+                        failure = task.result()
+                    else:
+                        self.logger.debug(f"Hedged request answered by {name}")
+                        return task.result()
+                # Only failures so far: fall through to the backup if it has not started
+                done = set() if not attempts else done
+        finally:
+            for task in attempts:
+                task.cancel()
+
+        # Every attempt failed: surface the last failure as a single provider would
+        if isinstance(failure, BaseException):
+            raise failure
+        return failure
+
+    async def ask_stream_hedged(self, prompt: str, history: Optional[List[Dict]] = None,
+                                context: Optional[str] = None, tools: Optional[List[Dict]] = None,
+                                model: Optional[str] = None, primary: Optional[str] = None) -> AsyncIterator[StreamChunk]:
+        """
+        Stream from the primary provider, hedging with a backup on a slow first token.
+
+        The backup stream starts once the primary's first token is later than
+        its p95 time to first token (or the primary has failed). The stream
+        that produces a token first is followed to the end; the other is closed.
+        """
+        primary_name, backup_name = self._hedge_pair(primary)
+        if primary_name is None:
+            raise RuntimeError("No AI provider available")
+        first = self.providers[primary_name]
+        if not self.hedging_enabled or backup_name is None:
+            async for chunk in first.ask_stream(prompt, history, context, tools, model):
+                yield chunk
+            return
+
+        streams = {primary_name: first.ask_stream(prompt, history, context, tools, model)}
+        pending = {asyncio.ensure_future(streams[primary_name].__anext__()): primary_name}
+        delay = self._hedge_delay(first.metrics.first_token)
+        winner, first_chunk, failure = None, None, None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            while winner is None:
+                if not done and backup_name not in streams:
+                    self.logger.info(f"No first token from {primary_name} after {delay:.2f}s; hedging with {backup_name}")
+                    streams[backup_name] = self.providers[backup_name].ask_stream(prompt, history, context, tools, None)
+                    pending[asyncio.ensure_future(streams[backup_name].__anext__())] = backup_name
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is not None:
+                        failure = task.exception()
+                    elif task.result().type == 'done' and _is_error_response(task.result().response):
+                        failure = task.result()
+                    else:
+                        winner, first_chunk = name, task.result()
+                        break
+                # Only failures so far: fall through to the backup if it has not started
+                done = set() if not pending else done
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for name, stream in streams.items():
+                if name != winner:
+                    await _close_quietly(stream)
+
+        if winner is None:
+            if isinstance(failure, StreamChunk):
+                yield failure
+            elif failure is not None and not isinstance(failure, StopAsyncIteration):
+                raise failure
+            return
+
+        self.logger.debug(f"Hedged stream answered by {winner}")
+        yield first_chunk
+        async for chunk in streams[winner]:
+            yield chunk
+
+    def _hedge_pair(self, primary: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """The provider to ask first and the fastest other provider as its backup."""
+        ranked = self.router.rank_providers(self.providers)
+        if primary is None or primary not in ranked:
+            primary = self.router.select_provider(self.providers, {})
+        backups = [name for name in ranked if name != primary]
+        return primary, backups[0] if backups else None
+
+    def _hedge_delay(self, window: LatencyWindow) -> float:
+        """How long to wait before sending the backup request."""
+        minimum = float(self.routing.get("hedge_min_delay", 0.5))
+        p95 = window.percentile(95) if window.count >= self.router.min_samples else None
+        if p95 is None:
+            return max(minimum, float(self.routing.get("hedge_default_delay", 5.0)))
+        return max(minimum, p95)
+    
     def get_recommendation(self, task_description: str) -> Dict[str, Any]:
         """Get provider/model recommendation for a task."""
         context = self._analyze_task(task_description)
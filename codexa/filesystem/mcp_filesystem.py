@@ -56,7 +56,7 @@ class MCPFileSystem:
     
     async def read_multiple_files(self, paths: List[Union[str, Path]]) -> Dict[str, str]:
         """
-        Read multiple files in a single operation for efficiency.
+        Read multiple files in a single round-trip to the server.
         
         Args:
             paths: List of file paths to read
@@ -67,17 +67,9 @@ class MCPFileSystem:
         Raises:
             MCPError: If any files cannot be read
         """
-        try:
-            str_paths = [str(p) for p in paths]
-            result = await self.mcp_service.query_server(
-                f"read_multiple_files",
-                preferred_server=self.server_name,
-                context={"paths": str_paths, "operation": "read_multiple_files"}
-            )
-            return result.get("files", {})
-        except Exception as e:
-            self.logger.error(f"Failed to read multiple files: {e}")
-            raise MCPError(f"Cannot read multiple files: {e}")
+        str_paths = [str(p) for p in paths]
+        results = await self._call_many("read_file", str_paths, "read multiple files")
+        return {path: self._text_of(result) for path, result in zip(str_paths, results)}
     
     async def write_file(self, path: Union[str, Path], content: str) -> bool:
         """
@@ -254,7 +246,7 @@ class MCPFileSystem:
                 preferred_server=self.server_name,
                 context={"path": str(path), "operation": "list_directory"}
             )
-            return result.get("entries", [])
+            return self._parse_listing(str(path), result)
         except Exception as e:
             self.logger.error(f"Failed to list directory {path}: {e}")
             raise MCPError(f"Cannot list directory {path}: {e}")
@@ -398,29 +390,115 @@ class MCPFileSystem:
                 preferred_server=self.server_name,
                 context={"path": str(path)}
             )
-            # Parse MCP tool response format
-            if result and "content" in result and result["content"]:
-                text = result["content"][0].get("text", "")
-                # Parse file info from text
-                info = {}
-                for line in text.split('\n'):
-                    if ':' in line and not line.startswith('File information'):
-                        key, value = line.split(':', 1)
-                        key = key.strip().lower().replace(' ', '_')
-                        value = value.strip()
-                        info[key] = value
-                        # Convert size to bytes if available
-                        if key == 'size' and 'bytes' in value:
-                            try:
-                                info['size'] = int(value.split()[0])
-                            except:
-                                pass
-                return info
-            return {}
+            return self._parse_file_info(result)
         except Exception as e:
             self.logger.error(f"Failed to get file info for {path}: {e}")
             raise MCPError(f"Cannot get file info for {path}: {e}")
     
+    async def get_multiple_file_info(self, paths: List[Union[str, Path]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve metadata about several files or directories in a single round-trip.
+        
+        Args:
+            paths: Paths to the files or directories
+            
+        Returns:
+            Dictionary mapping paths to their metadata
+            
+        Raises:
+            MCPError: If the info of any path cannot be retrieved
+        """
+        str_paths = [str(p) for p in paths]
+        results = await self._call_many("get_file_info", str_paths, "get file info")
+        return {path: self._parse_file_info(result) for path, result in zip(str_paths, results)}
+    
+    async def list_directories(self, paths: List[Union[str, Path]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        List several directories in a single round-trip, e.g. one level of a tree walk.
+        
+        Args:
+            paths: Paths of the directories to list
+            
+        Returns:
+            Dictionary mapping directory paths to their entries
+            
+        Raises:
+            MCPError: If any directory cannot be listed
+        """
+        str_paths = [str(p) for p in paths]
+        results = await self._call_many("list_directory", str_paths, "list directories")
+        return {path: self._parse_listing(path, result) for path, result in zip(str_paths, results)}
+    
+    async def _call_many(self, tool_name: str, paths: List[str], description: str) -> List[Any]:
+        """Call one tool for each path in a single batched request, failing if any call fails."""
+        if not paths:
+            return []
+        try:
+            results = await self.mcp_service.call_tools(
+                self.server_name,
+                [(tool_name, {"path": path}) for path in paths],
+                return_exceptions=True
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to {description}: {e}")
+            raise MCPError(f"Cannot {description}: {e}")
+        
+        failed = {path: result for path, result in zip(paths, results) if isinstance(result, Exception)}
+        if failed:
+            details = "; ".join(f"{path}: {error}" for path, error in failed.items())
+            self.logger.error(f"Failed to {description}: {details}")
+            raise MCPError(f"Cannot {description}: {details}")
+        return results
+    
+    @staticmethod
+    def _text_of(result: Any) -> str:
+        """Text of the first content block of an MCP tool result."""
+        if result and "content" in result and result["content"]:
+            return result["content"][0].get("text", "")
+        return ""
+    
+    @classmethod
+    def _parse_listing(cls, path: str, result: Any) -> List[Dict[str, Any]]:
+        """Parse the "[FILE] name" / "[DIR] name" lines of a list_directory result."""
+        entries = []
+        for line in cls._text_of(result).split('\n'):
+            line = line.strip()
+            if line.startswith('[DIR]'):
+                entry_type = 'directory'
+            elif line.startswith('[FILE]'):
+                entry_type = 'file'
+            else:
+                continue
+            name = line.split(']', 1)[1].strip()
+            entries.append({
+                "name": name,
+                "type": entry_type,
+                "path": str(Path(path) / name)
+            })
+        return entries
+    
+    @staticmethod
+    def _parse_file_info(result: Any) -> Dict[str, Any]:
+        """Parse the text of a get_file_info result into a dictionary."""
+        if result and "content" in result and result["content"]:
+            text = result["content"][0].get("text", "")
+            # Parse file info from text
+            info = {}
+            for line in text.split('\n'):
+                if ':' in line and not line.startswith('File information'):
+                    key, value = line.split(':', 1)
+                    key = key.strip().lower().replace(' ', '_')
+                    value = value.strip()
+                    info[key] = value
+                    # Convert size to bytes if available
+                    if key == 'size' and 'bytes' in value:
+                        try:
+                            info['size'] = int(value.split()[0])
+                        except:
+                            pass
+            return info
+        return {}
+    
     async def list_allowed_directories(self) -> List[str]:
         """
         Returns the list of directories that this server is allowed to access.
@@ -457,7 +535,7 @@ class MCPFileSystem:
     def is_server_available(self) -> bool:
         """Check if the MCP filesystem server is available."""
         return (self.mcp_service.is_running and 
-                self.server_name in self.mcp_service.get_available_servers())
+                self.server_name in self.mcp_service.get_routable_servers())
     
     async def validate_server(self) -> bool:
         """Validate that the MCP filesystem server is working correctly."""
@@ -0,0 +1,255 @@
+"""
+Pooled HTTP sessions for Codexa's HTTP-based providers.
+
+Calling ``requests.post`` opens a new connection (TCP and TLS handshake) for
+every request.  Providers instead share a :class:`requests.Session` whose
+connection pool keeps connections to the API host alive between calls, and
+whose adapter retries failed connection attempts and throttled or temporarily
+unavailable responses with exponential backoff.
+
+A POST (a completion, which is billed) is only resent when the server cannot
+have processed it: after a failed connection attempt, or after a 429/503
+that carries a ``Retry-After`` header.  A 500, 502 or 504 may come from a
+proxy after the model already ran, so it is only retried for GET.
+
+Sessions are shared per settings, so providers recreated on a provider or
+model switch keep reusing the same warm connections.
+
+Async code gets the same from an :class:`aiohttp.ClientSession` per event
+loop (async clients cannot be shared across loops), with
+:func:`request_with_retries` applying the same retry policy.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger("codexa.http_session")
+
+# Statuses retried for requests that are safe to resend
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Statuses after which a POST is resent, if the server also says when (Retry-After)
+POST_RETRY_STATUSES = (429, 503)
+
+
+def _may_resend(method: str, status: int, has_retry_after: bool) -> bool:
+    """Whether a response with this status says the request was not processed and may be resent."""
+    if method.upper() != "POST":
+        return True
+    return status in POST_RETRY_STATUSES and has_retry_after
+
+
+@dataclass(frozen=True)
+class HTTPSessionSettings:
+    """Connection pool and retry settings for a pooled session."""
+    pool_size: int = 10
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    timeout: float = 60.0
+    retry_statuses: Tuple[int, ...] = field(default=RETRY_STATUSES)
+
+    @classmethod
+    def from_dict(cls, values: Optional[Dict]) -> "HTTPSessionSettings":
+        """Build settings from a config mapping, ignoring unknown keys."""
+        values = values or {}
+        defaults = cls()
+        return cls(
+            pool_size=int(values.get("pool_size", defaults.pool_size)),
+            max_retries=int(values.get("max_retries", defaults.max_retries)),
+            backoff_factor=float(values.get("backoff_factor", defaults.backoff_factor)),
+            timeout=float(values.get("timeout", defaults.timeout)),
+            retry_statuses=tuple(values.get("retry_statuses", defaults.retry_statuses)),
+        )
+
+
+class _Retry(Retry):
+    """urllib3 retry policy that never resends a POST the server may have processed."""
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if not _may_resend(method or "", status_code, has_retry_after):
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def create_session(settings: Optional[HTTPSessionSettings] = None) -> requests.Session:
+    """
+    Create a session with a keep-alive connection pool and retry/backoff.
+
+    Args:
+        settings: Pool and retry settings (defaults if None)
+
+    Returns:
+        A new session with the pooled adapter mounted for http and https
+    """
+    settings = settings or HTTPSessionSettings()
+    retry = _Retry(
+        total=settings.max_retries,
+        connect=settings.max_retries,
+        # A request that may have reached the server is not resent: completions are billed
+        read=0,
+        other=0,
+        status=settings.max_retries,
+        status_forcelist=settings.retry_statuses,
+        allowed_methods=frozenset({"GET", "POST"}),
+        backoff_factor=settings.backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.pool_size,
+        pool_maxsize=settings.pool_size,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_shared_sessions: Dict[HTTPSessionSettings, requests.Session] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_session(settings: Optional[HTTPSessionSettings] = None) -> requests.Session:
+    """Get the process-wide session for ``settings``, creating it on first use."""
+    settings = settings or HTTPSessionSettings()
+    with _shared_lock:
+        session = _shared_sessions.get(settings)
+        if session is None:
+            logger.debug(f"Creating pooled HTTP session: {settings}")
+            session = create_session(settings)
+            _shared_sessions[settings] = session
+        return session
+
+
+def close_shared_sessions() -> None:
+    """Close every shared session and its pooled connections."""
+    with _shared_lock:
+        sessions = list(_shared_sessions.values())
+        _shared_sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+class LoopLocal:
+    """One lazily created object per running event loop."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        """
+        Initialize the holder.
+
+        Args:
+            factory: Creates the object; called from inside the running loop
+        """
+        self.factory = factory
+        self._values: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Get the object for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            value = self._values.get(loop)
+            if value is None:
+                value = self.factory()
+                self._values[loop] = value
+            return value
+
+    def pop(self) -> Optional[Any]:
+        """Forget and return the object for the running event loop, if any."""
+        with self._lock:
+            return self._values.pop(asyncio.get_running_loop(), None)
+
+
+def create_async_session(settings: Optional[HTTPSessionSettings] = None) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session with keep-alive connections (call from a running loop).
+
+    Concurrency is not capped by the pool size: every in-flight request gets a
+    connection, and released connections are kept alive for reuse.
+    """
+    settings = settings or HTTPSessionSettings()
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=0),
+        # Connect/read timeouts like requests', so long streams are not cut off
+        timeout=aiohttp.ClientTimeout(total=None, sock_connect=settings.timeout, sock_read=settings.timeout),
+    )
+
+
+_shared_async_sessions: Dict[HTTPSessionSettings, LoopLocal] = {}
+
+
+def get_shared_async_session(settings: Optional[HTTPSessionSettings] = None) -> aiohttp.ClientSession:
+    """Get the running loop's shared aiohttp session for ``settings``."""
+    settings = settings or HTTPSessionSettings()
+    with _shared_lock:
+        holder = _shared_async_sessions.get(settings)
+        if holder is None:
+            holder = LoopLocal(lambda: create_async_session(settings))
+            _shared_async_sessions[settings] = holder
+    session = holder.get()
+    if session.closed:
+        holder.pop()
+        session = holder.get()
+    return session
+
+
+async def close_shared_async_sessions() -> None:
+    """Close the running loop's shared aiohttp sessions."""
+    with _shared_lock:
+        holders = list(_shared_async_sessions.values())
+    for holder in holders:
+        session = holder.pop()
+        if session is not None:
+            await session.close()
+
+
+def _retry_delay(settings: HTTPSessionSettings, attempt: int, response: Optional[aiohttp.ClientResponse]) -> float:
+    """Seconds to wait before retry number ``attempt`` (0-based), honouring Retry-After."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    return settings.backoff_factor * (2 ** attempt)
+
+
+async def request_with_retries(session: aiohttp.ClientSession, method: str, url: str,
+                               settings: Optional[HTTPSessionSettings] = None,
+                               **kwargs) -> aiohttp.ClientResponse:
+    """
+    Send a request, retrying connection failures and retryable statuses with backoff.
+
+    Like the sync sessions, a request that may have reached the server is not
+    resent after a read error, and a POST is resent after an error status only
+    for a 429/503 with ``Retry-After``.  The caller must release the returned
+    response (``async with response:``).
+    """
+    settings = settings or HTTPSessionSettings()
+    attempt = 0
+    while True:
+        response = None
+        try:
+            response = await session.request(method, url, **kwargs)
+        except aiohttp.ClientConnectorError:
+            if attempt >= settings.max_retries:
+                raise
+        else:
+            retryable = (response.status in settings.retry_statuses
+                         and _may_resend(method, response.status, "Retry-After" in response.headers))
+            if not retryable or attempt >= settings.max_retries:
+                return response
+            response.release()
+
+        delay = _retry_delay(settings, attempt, response)
+        logger.debug(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt + 1})")
+        await asyncio.sleep(delay)
+        attempt += 1
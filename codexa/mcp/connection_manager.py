@@ -3,10 +3,11 @@ MCP server connection manager with health monitoring and automatic reconnection.
 """
 
 import asyncio
-import subprocess
 import json
 import logging
-from typing import Dict, List, Optional, Any, Callable
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any, Callable, Tuple
 from pathlib import Path
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
@@ -14,6 +15,19 @@ from enum import Enum
 
 from .protocol import MCPProtocol, MCPMessage, MCPError
 
+# Buffer size of the stdio stream readers; longer lines are read in chunks
+STREAM_LIMIT = 64 * 1024
+# Lines of server stderr kept for error reports
+STDERR_TAIL_LINES = 50
+# "eager" starts every server with the manager, "lazy" on its first request
+STARTUP_MODES = ("eager", "lazy")
+# MCP protocol revisions with JSON-RPC batch support (added in 2025-03-26, removed in 2025-06-18)
+BATCH_PROTOCOL_VERSIONS = ("2025-03-26",)
+
+
+class _BatchRejected(MCPError):
+    """Placeholder response for requests in a batch the server refused as a whole."""
+
 
 class ConnectionState(Enum):
     """Connection state enumeration."""
@@ -37,6 +51,9 @@ class MCPServerConfig:
     enabled: bool = True
     priority: int = 1  # Higher priority = preferred server
     capabilities: List[str] = field(default_factory=list)  # Expected capabilities
+    max_message_size: int = 16 * 1024 * 1024  # Largest JSON-RPC message accepted, in bytes
+    replicas: int = 1  # Server processes; requests go to the least-loaded one
+    batching: bool = False  # Send JSON-RPC batch arrays to servers on a batch revision (opt-in)
 
 
 @dataclass
@@ -46,28 +63,40 @@ class ConnectionMetrics:
     last_request_time: Optional[datetime] = None
     total_requests: int = 0
     failed_requests: int = 0
+    transport_failures: int = 0  # Timeouts and lost connections, not error replies
     average_response_time: float = 0.0
     uptime: timedelta = timedelta()
+    startup_seconds: Optional[float] = None  # Spawn to completed handshake
 
 
 class MCPConnection:
-    """Individual MCP server connection."""
+    """Individual MCP server connection over the server's stdio."""
     
     def __init__(self, config: MCPServerConfig):
         self.config = config
         self.state = ConnectionState.DISCONNECTED
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.metrics = ConnectionMetrics()
         self.capabilities: Dict[str, Any] = {}
         self.pending_requests: Dict[str, asyncio.Future] = {}
         self.retry_count = 0
         self.last_error: Optional[str] = None
+        # Last lines the server wrote to stderr, for diagnosing failures
+        self.stderr_tail: Deque[str] = deque(maxlen=STDERR_TAIL_LINES)
         
         # Logging
         self.logger = logging.getLogger(f"mcp.{config.name}")
         
-        # Message reading task
-        self._read_task = None
+        # Message reading and stderr draining tasks
+        self._read_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        # Serializes writes so messages are never interleaved
+        self._write_lock: Optional[asyncio.Lock] = None
+        # Protocol revision the server answered initialize with, and whether it takes batches
+        self.protocol_version: Optional[str] = None
+        self._batch_supported = False
+        # Request ids of batches sent and not yet answered, oldest first
+        self._pending_batches: List[List[str]] = []
     
     async def connect(self) -> bool:
         """Establish connection to MCP server."""
@@ -77,6 +106,7 @@ class MCPConnection:
         self.state = ConnectionState.CONNECTING
         self.logger.info(f"Connecting to MCP server: {self.config.name}")
         
+        started = time.monotonic()
         try:
             # Start server process
             full_command = self.config.command + (self.config.args or [])
@@ -104,31 +134,41 @@ class MCPConnection:
                         env['PATH'] = path
                     current_path = env['PATH']
             
-            self.process = subprocess.Popen(
-                full_command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env=env
+            self.process = await asyncio.create_subprocess_exec(
+                *full_command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                limit=STREAM_LIMIT
             )
+            self._write_lock = asyncio.Lock()
+            self.stderr_tail.clear()
             
-            # Start message reading loop
+            # Start message reading loop and stderr drain
             self._read_task = asyncio.create_task(self._message_read_loop())
+            self._stderr_task = asyncio.create_task(self._stderr_drain_loop())
             
             # Initialize MCP protocol
             if await self._initialize():
                 self.state = ConnectionState.CONNECTED
                 self.metrics.connection_time = datetime.now()
+                self.metrics.startup_seconds = time.monotonic() - started
                 self.retry_count = 0
                 self.last_error = None
-                self.logger.info(f"Successfully connected to {self.config.name}")
+                self.logger.info(f"Successfully connected to {self.config.name} "
+                                 f"in {self.metrics.startup_seconds:.2f}s")
                 return True
             else:
                 await self._cleanup()
                 self.state = ConnectionState.ERROR
                 return False
-                
+        
+        except asyncio.CancelledError:
+            # Startup abandoned (e.g. the service stopped): do not leave the process behind
+            self.state = ConnectionState.DISCONNECTED
+            await self._cleanup()
+            raise
         except Exception as e:
             self.logger.error(f"Failed to connect to {self.config.name}: {e}")
             self.last_error = str(e)
@@ -171,60 +211,126 @@ class MCPConnection:
             if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(f"Sending request to {self.config.name}: {MCPProtocol.debug_format_message(request, 'SEND')}")
 
-            # Send request
-            await self._write_message(request)
-
-            # Create future for response
-            future = asyncio.Future()
-            self.pending_requests[request.id] = future
-
-            # Wait for response with timeout
+            # Send request and wait for response with timeout
             try:
-                response = await asyncio.wait_for(future, timeout=self.config.timeout)
-
-                # Update metrics
-                response_time = (datetime.now() - start_time).total_seconds()
-                self.metrics.total_requests += 1
-                self.metrics.last_request_time = datetime.now()
-                self._update_average_response_time(response_time)
-
-                # Return the result from the MCPMessage, handling errors
-                if response.error:
-                    error_code = response.error.get("code", -1)
-                    error_message = response.error.get("message", "Unknown error")
-
-                    # Provide more specific error messages for common MCP errors
-                    if error_code == -32602:  # INVALID_PARAMS
-                        self.logger.warning(f"Invalid parameters for {method} on {self.config.name}: {error_message}")
-                        # For parameter errors, try to provide more context
-                        if method == "initialize":
-                            raise MCPError(f"Initialize failed on {self.config.name}: Check server configuration and protocol version compatibility. Error: {error_message}", error_code)
-                        else:
-                            raise MCPError(f"Invalid parameters for {method}: {error_message}. Check parameter format and required fields.", error_code)
-                    elif error_code == -32601:  # METHOD_NOT_FOUND
-                        raise MCPError(f"Method {method} not found on server {self.config.name}. Server may not support this operation.", error_code)
-                    elif error_code == -32600:  # INVALID_REQUEST
-                        raise MCPError(f"Invalid request to server {self.config.name}: {error_message}. Check request format.", error_code)
-                    else:
-                        raise MCPError(f"Server error from {self.config.name}: {error_message}", error_code)
-
-                return response.result
-
+                response = await self._exchange(request)
             except asyncio.TimeoutError:
+                self.metrics.transport_failures += 1
                 self.metrics.failed_requests += 1
                 self.logger.error(f"Request timeout for {self.config.name} after {self.config.timeout}s (method: {method})")
                 # Mark connection as potentially unhealthy after timeout
                 if self.metrics.failed_requests > self.metrics.total_requests * 0.3:  # 30% failure rate
                     self.logger.warning(f"High failure rate detected for {self.config.name}, connection may be unstable")
                 raise MCPError(f"Request timeout for {self.config.name} (method: {method}, timeout: {self.config.timeout}s)", MCPProtocol.TIMEOUT_ERROR)
-            finally:
-                self.pending_requests.pop(request.id, None)
+            except MCPError:
+                # The process exited or closed its pipes
+                self.metrics.transport_failures += 1
+                raise
+
+            # Update metrics
+            response_time = (datetime.now() - start_time).total_seconds()
+            self.metrics.total_requests += 1
+            self.metrics.last_request_time = datetime.now()
+            self._update_average_response_time(response_time)
+
+            # Return the result from the MCPMessage, handling errors
+            return self._result_of(method, response)
 
         except Exception as e:
             self.metrics.failed_requests += 1
             self.logger.error(f"Request failed for {self.config.name}: {e}")
             raise
     
+    async def send_many(self, requests: List[Tuple[str, Optional[Dict[str, Any]]]],
+                        return_exceptions: bool = False) -> List[Any]:
+        """
+        Send several requests at once and collect their results in order.
+        
+        Requests are pipelined on the connection before any response is
+        awaited, or sent as one JSON-RPC batch array when ``batching`` is
+        configured and the server speaks a batch revision.  Either way the
+        requests cost one round-trip instead of one each.  A batch the server
+        rejects, or one that times out entirely (servers that cannot parse
+        arrays often drop them silently), turns batching off for the
+        connection and the requests are re-sent pipelined.
+        
+        Args:
+            requests: (method, params) pairs
+            return_exceptions: Return failed requests' exceptions in place of
+                their results instead of raising the first one
+            
+        Returns:
+            Results in the order of ``requests``
+        """
+        if self.state != ConnectionState.CONNECTED:
+            raise MCPError(f"Server {self.config.name} not connected (state: {self.state.value})", MCPProtocol.SERVER_UNAVAILABLE)
+        if not requests:
+            return []
+        
+        messages = [MCPProtocol.create_request(method, params) for method, params in requests]
+        start_time = datetime.now()
+        try:
+            responses = await self._exchange_many(messages, batch=self.supports_batch)
+        except MCPError:
+            self.metrics.transport_failures += len(messages)
+            raise
+        if self.supports_batch and (any(isinstance(r, _BatchRejected) for r in responses)
+                                    or all(isinstance(r, asyncio.TimeoutError) for r in responses)):
+            self.logger.info(f"{self.config.name} did not answer a JSON-RPC batch; pipelining requests instead")
+            self._batch_supported = False
+            messages = [MCPProtocol.create_request(method, params) for method, params in requests]
+            responses = await self._exchange_many(messages, batch=False)
+        
+        response_time = (datetime.now() - start_time).total_seconds()
+        results = []
+        for (method, _), response in zip(requests, responses):
+            try:
+                if isinstance(response, BaseException):
+                    self.metrics.transport_failures += 1
+                if isinstance(response, asyncio.TimeoutError):
+                    raise MCPError(f"Request timeout for {self.config.name} (method: {method}, timeout: {self.config.timeout}s)",
+                                   MCPProtocol.TIMEOUT_ERROR)
+                if isinstance(response, BaseException):
+                    raise response
+                self.metrics.total_requests += 1
+                self.metrics.last_request_time = datetime.now()
+                self._update_average_response_time(response_time)
+                results.append(self._result_of(method, response))
+            except MCPError as e:
+                self.metrics.failed_requests += 1
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+    
+    @property
+    def supports_batch(self) -> bool:
+        """Whether requests are sent as JSON-RPC batch arrays."""
+        return bool(self.config.batching) and self._batch_supported
+    
+    def _result_of(self, method: str, response: MCPMessage) -> Any:
+        """The result of a response, or the MCPError its error describes."""
+        if response.error:
+            error_code = response.error.get("code", -1)
+            error_message = response.error.get("message", "Unknown error")
+
+            # Provide more specific error messages for common MCP errors
+            if error_code == -32602:  # INVALID_PARAMS
+                self.logger.warning(f"Invalid parameters for {method} on {self.config.name}: {error_message}")
+                # For parameter errors, try to provide more context
+                if method == "initialize":
+                    raise MCPError(f"Initialize failed on {self.config.name}: Check server configuration and protocol version compatibility. Error: {error_message}", error_code)
+                else:
+                    raise MCPError(f"Invalid parameters for {method}: {error_message}. Check parameter format and required fields.", error_code)
+            elif error_code == -32601:  # METHOD_NOT_FOUND
+                raise MCPError(f"Method {method} not found on server {self.config.name}. Server may not support this operation.", error_code)
+            elif error_code == -32600:  # INVALID_REQUEST
+                raise MCPError(f"Invalid request to server {self.config.name}: {error_message}. Check request format.", error_code)
+            else:
+                raise MCPError(f"Server error from {self.config.name}: {error_message}", error_code)
+
+        return response.result
+    
     async def _initialize(self) -> bool:
         """Initialize MCP protocol handshake."""
         try:
@@ -235,14 +341,19 @@ class MCPConnection:
             }
             
             init_request = MCPProtocol.create_initialize_request(client_info)
-            await self._write_message(init_request)
             
-            # Wait for initialize response
-            response = await self._read_message()
-            if not response or response.error:
-                self.logger.error(f"Initialize failed: {response.error if response else 'No response'}")
+            # Wait for initialize response; the read loop delivers it
+            response = await self._exchange(init_request)
+            if response.error:
+                self.logger.error(f"Initialize failed: {response.error}")
                 return False
             
+            # JSON-RPC batches are part of exactly the revision we request, if the server accepts it
+            self.protocol_version = (response.result or {}).get("protocolVersion")
+            if self.protocol_version not in MCPProtocol.SUPPORTED_PROTOCOL_VERSIONS:
+                self.logger.warning(f"Server {self.config.name} uses unknown protocol version {self.protocol_version}")
+            self._batch_supported = self.protocol_version in BATCH_PROTOCOL_VERSIONS
+            
             # Parse capabilities
             if response.result and "capabilities" in response.result:
                 self.capabilities = MCPProtocol.parse_capabilities(response.result["capabilities"])
@@ -254,62 +365,204 @@ class MCPConnection:
             
             return True
             
+        except asyncio.TimeoutError:
+            self.last_error = f"No initialize response within {self.config.timeout}s"
+            self.logger.error(f"Initialization failed: {self.last_error}{self._stderr_hint()}")
+            return False
         except Exception as e:
-            self.logger.error(f"Initialization failed: {e}")
+            self.last_error = str(e)
+            self.logger.error(f"Initialization failed: {e}{self._stderr_hint()}")
             return False
     
-    async def _write_message(self, message: MCPMessage):
-        """Write message to server process."""
-        if not self.process or not self.process.stdin:
-            raise MCPError("Process not available")
+    async def _exchange(self, request: MCPMessage) -> MCPMessage:
+        """
+        Send a request and wait for its response.
+        
+        The future is registered before the request is written, so a fast
+        response cannot arrive before anyone is waiting for it.
         
-        json_str = message.to_json()
-        self.process.stdin.write(json_str + "\n")
-        self.process.stdin.flush()
+        Raises:
+            asyncio.TimeoutError: No response within the configured timeout
+            MCPError: The connection closed before the response arrived
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending_requests[request.id] = future
+        try:
+            await self._write_message(request)
+            return await asyncio.wait_for(future, timeout=self.config.timeout)
+        finally:
+            self.pending_requests.pop(request.id, None)
     
-    async def _read_message(self) -> Optional[MCPMessage]:
-        """Read message from server process."""
-        if not self.process or not self.process.stdout:
-            return None
+    async def _exchange_many(self, requests: List[MCPMessage], batch: bool) -> List[Any]:
+        """
+        Send requests in one write and wait for all responses.
         
+        Returns:
+            A response or an exception (timeout, closed connection, rejected batch) per request
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for request in requests:
+            future = loop.create_future()
+            self.pending_requests[request.id] = future
+            futures.append(future)
+        ids = [request.id for request in requests]
+        if batch:
+            self._pending_batches.append(ids)
         try:
-            line = self.process.stdout.readline()
-            if not line:
-                return None
+            if batch:
+                data = json.dumps([request.to_dict() for request in requests]).encode("utf-8") + b"\n"
+            else:
+                data = b"".join(request.to_json().encode("utf-8") + b"\n" for request in requests)
+            await self._write(data)
+            return await asyncio.gather(
+                *(asyncio.wait_for(future, timeout=self.config.timeout) for future in futures),
+                return_exceptions=True
+            )
+        finally:
+            for request_id in ids:
+                self.pending_requests.pop(request_id, None)
+            if batch and ids in self._pending_batches:
+                self._pending_batches.remove(ids)
+    
+    async def _write_message(self, message: MCPMessage):
+        """Write one newline-delimited message, waiting while the pipe is full."""
+        await self._write(message.to_json().encode("utf-8") + b"\n")
+    
+    async def _write(self, data: bytes):
+        """Write raw bytes to the server, waiting while the pipe is full."""
+        if not self.process or not self.process.stdin or self.process.stdin.is_closing():
+            raise MCPError("Process not available", MCPProtocol.SERVER_UNAVAILABLE)
+        
+        async with self._write_lock:
+            self.process.stdin.write(data)
+            try:
+                # Backpressure: wait until the server has consumed the buffer
+                await self.process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                raise MCPError(f"Server {self.config.name} closed its input: {e}", MCPProtocol.SERVER_UNAVAILABLE)
+    
+    async def _read_line(self, stream: asyncio.StreamReader) -> Optional[bytes]:
+        """
+        Read one newline-terminated line of any length up to ``max_message_size``.
+        
+        ``StreamReader.readline`` fails on lines longer than the stream limit,
+        so long lines are collected chunk by chunk.  A line over the size
+        limit is discarded and an empty line returned in its place.
+        
+        Returns:
+            The line without its newline, or None at end of stream
+        """
+        chunks: List[bytes] = []
+        size = 0
+        oversized = False
+        while True:
+            try:
+                chunk = await stream.readuntil(b"\n")
+                chunk = chunk[:-1]
+                complete = True
+            except asyncio.IncompleteReadError as e:
+                # End of stream; a final unterminated line still counts
+                if not e.partial and not chunks:
+                    return None
+                chunk = e.partial
+                complete = True
+            except asyncio.LimitOverrunError as e:
+                chunk = await stream.readexactly(e.consumed)
+                complete = False
             
-            return MCPMessage.from_json(line.strip())
-        except Exception as e:
-            self.logger.error(f"Failed to read message: {e}")
-            return None
+            size += len(chunk)
+            if size > self.config.max_message_size:
+                oversized = True
+                chunks.clear()
+            elif not oversized:
+                chunks.append(chunk)
+            
+            if complete:
+                break
+        
+        if oversized:
+            self.logger.error(f"Discarded a {size}-byte message from {self.config.name} "
+                              f"(limit {self.config.max_message_size} bytes)")
+            return b""
+        return b"".join(chunks)
     
     async def _message_read_loop(self):
         """Async message reading loop to handle responses from the server."""
         try:
-            while self.process and self.process.poll() is None:
+            while self.process and self.process.stdout:
+                line = await self._read_line(self.process.stdout)
+                if line is None:
+                    break
+                
+                line = line.strip()
+                if not line:
+                    continue
+                
                 try:
-                    # Use asyncio to read from stdout without blocking
-                    loop = asyncio.get_event_loop()
-                    line = await loop.run_in_executor(None, self.process.stdout.readline)
-                    
-                    if not line:
-                        break
-                        
-                    message = MCPMessage.from_json(line.strip())
-                    if message and hasattr(message, 'id') and message.id in self.pending_requests:
-                        # Complete the pending request
-                        future = self.pending_requests.pop(message.id)
-                        if not future.done():
-                            future.set_result(message)
-                    
+                    data = json.loads(line.decode("utf-8", errors="replace"))
+                    # A batch request is answered with an array of responses
+                    messages = [MCPMessage.from_dict(item) for item in (data if isinstance(data, list) else [data])]
                 except Exception as e:
-                    self.logger.error(f"Error in message read loop: {e}")
-                    break
+                    # Servers sometimes print logs to stdout; skip them
+                    self.logger.debug(f"Ignoring non-JSON output from {self.config.name}: {e}")
+                    continue
+                
+                for message in messages:
+                    self._dispatch(message)
                     
         except asyncio.CancelledError:
-            pass  # Task cancelled, exit gracefully
+            return  # Task cancelled, exit gracefully
         except Exception as e:
             self.logger.error(f"Message read loop failed: {e}")
+        
+        # The server closed its output: fail waiting requests instead of letting them time out
+        if self.state == ConnectionState.CONNECTED:
+            self.logger.warning(f"Server {self.config.name} closed the connection{self._stderr_hint()}")
             self.state = ConnectionState.ERROR
+        self._fail_pending(MCPError(f"Server {self.config.name} closed the connection",
+                                    MCPProtocol.SERVER_UNAVAILABLE))
+    
+    def _dispatch(self, message: MCPMessage):
+        """Complete the pending request a response belongs to."""
+        if message.id is not None and message.id in self.pending_requests:
+            future = self.pending_requests.pop(message.id)
+            if not future.done():
+                future.set_result(message)
+        elif message.id is None and message.error and self._pending_batches:
+            # An error without id answers a batch the server could not handle as a whole
+            rejected = _BatchRejected(f"Server {self.config.name} rejected a batch: {message.error.get('message')}")
+            for request_id in self._pending_batches.pop(0):
+                future = self.pending_requests.get(request_id)
+                if future and not future.done():
+                    future.set_result(rejected)
+    
+    async def _stderr_drain_loop(self):
+        """Keep reading the server's stderr so a chatty server never blocks on a full pipe."""
+        try:
+            while self.process and self.process.stderr:
+                line = await self._read_line(self.process.stderr)
+                if line is None:
+                    break
+                text = line.decode("utf-8", errors="replace").rstrip()
+                if text:
+                    self.stderr_tail.append(text)
+                    self.logger.debug(f"[stderr] {text}")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.debug(f"Stopped reading stderr of {self.config.name}: {e}")
+    
+    def _stderr_hint(self) -> str:
+        """The last stderr line of the server, for error messages."""
+        return f" (stderr: {self.stderr_tail[-1]})" if self.stderr_tail else ""
+    
+    def _fail_pending(self, error: Exception):
+        """Fail every request still waiting for a response."""
+        for future in self.pending_requests.values():
+            if not future.done():
+                future.set_exception(error)
+        self.pending_requests.clear()
     
     def _update_average_response_time(self, response_time: float):
         """Update average response time metric."""
@@ -319,24 +572,34 @@ class MCPConnection:
     
     async def _cleanup(self):
         """Clean up connection resources."""
-        # Cancel read task
-        if hasattr(self, '_read_task') and self._read_task:
-            self._read_task.cancel()
-            try:
-                await self._read_task
-            except asyncio.CancelledError:
-                pass
+        # Cancel read and stderr tasks
+        for task in (self._read_task, self._stderr_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._read_task = None
+        self._stderr_task = None
         
         if self.process:
+            process = self.process
+            self.process = None
             try:
-                self.process.terminate()
-                self.process.wait(timeout=5)
-            except:
+                if process.stdin and not process.stdin.is_closing():
+                    process.stdin.close()
+                if process.returncode is None:
+                    process.terminate()
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except ProcessLookupError:
+                pass
+            except Exception:
                 try:
-                    self.process.kill()
-                except:
+                    process.kill()
+                    await process.wait()
+                except Exception:
                     pass
-            self.process = None
         
         # Cancel pending requests
         for future in self.pending_requests.values():
@@ -351,27 +614,291 @@ class MCPConnection:
             return False
         
         # Check if process is still running
-        if not self.process or self.process.poll() is not None:
+        if not self.process or self.process.returncode is not None:
             return False
         
-        # Check error rate
-        if self.metrics.total_requests > 0:
-            error_rate = self.metrics.failed_requests / self.metrics.total_requests
-            if error_rate > 0.5:  # 50% error rate threshold
+        # Check the rate of requests lost in transport; error replies come from
+        # a working server and do not count
+        failures = self.metrics.transport_failures
+        if failures:
+            failure_rate = failures / (self.metrics.total_requests + failures)
+            if failure_rate > 0.5:  # 50% failure rate threshold
                 return False
         
         return True
 
 
+class MCPConnectionPool:
+    """
+    Several processes (replicas) of one MCP server behind a single connection interface.
+    
+    Each request goes to the healthy replica with the lowest expected wait:
+    its in-flight request count times its average response time.  A replica
+    that fails is taken out of rotation, allowed to finish its in-flight
+    requests, and replaced by a fresh process while the others keep serving.
+    """
+    
+    def __init__(self, config: MCPServerConfig):
+        self.config = config
+        self.replicas: List[MCPConnection] = [MCPConnection(config) for _ in range(max(1, config.replicas))]
+        self.metrics = ConnectionMetrics()
+        self.retry_count = 0
+        self.logger = logging.getLogger(f"mcp.{config.name}")
+        # Requests in flight per replica, keyed by the replica itself
+        self._in_flight: Dict[MCPConnection, int] = {}
+        self._draining: set = set()
+        self._respawn_tasks: Dict[int, asyncio.Task] = {}
+        # State set from outside (e.g. RECONNECTING by the manager) while no replica is connected
+        self._state_override: Optional[ConnectionState] = None
+    
+    @property
+    def state(self) -> ConnectionState:
+        """CONNECTED while any replica is connected."""
+        states = [replica.state for replica in self.replicas]
+        if ConnectionState.CONNECTED in states:
+            return ConnectionState.CONNECTED
+        if self._state_override is not None:
+            return self._state_override
+        if ConnectionState.CONNECTING in states:
+            return ConnectionState.CONNECTING
+        if ConnectionState.ERROR in states:
+            return ConnectionState.ERROR
+        return ConnectionState.DISCONNECTED
+    
+    @state.setter
+    def state(self, value: ConnectionState):
+        self._state_override = value
+    
+    @property
+    def capabilities(self) -> Dict[str, Any]:
+        """Capabilities of the first connected replica (all run the same server)."""
+        for replica in self.replicas:
+            if replica.state == ConnectionState.CONNECTED:
+                return replica.capabilities
+        return {}
+    
+    @property
+    def pending_requests(self) -> Dict[str, asyncio.Future]:
+        """Requests awaiting a response on any replica."""
+        pending: Dict[str, asyncio.Future] = {}
+        for replica in self.replicas:
+            pending.update(replica.pending_requests)
+        return pending
+    
+    @property
+    def last_error(self) -> Optional[str]:
+        """Last error of any replica."""
+        return next((replica.last_error for replica in self.replicas if replica.last_error), None)
+    
+    @property
+    def is_healthy(self) -> bool:
+        """Healthy while at least one replica is."""
+        return any(replica.is_healthy for replica in self.replicas)
+    
+    async def connect(self) -> bool:
+        """Start all replicas concurrently; succeeds when at least one connects."""
+        if self.state in [ConnectionState.CONNECTED, ConnectionState.CONNECTING]:
+            return True
+        
+        # Stop what is left of a previous run first
+        await self.disconnect()
+        self.logger.info(f"Starting {len(self.replicas)} replicas of {self.config.name}")
+        started = time.monotonic()
+        # Fresh replicas, so error rates of failed processes do not carry over
+        self.replicas = [MCPConnection(self.config) for _ in self.replicas]
+        results = await asyncio.gather(*(replica.connect() for replica in self.replicas))
+        
+        if not any(results):
+            return False
+        
+        self.metrics.connection_time = datetime.now()
+        self.metrics.startup_seconds = time.monotonic() - started
+        self.retry_count = 0
+        self.logger.info(f"{sum(results)}/{len(results)} replicas of {self.config.name} connected")
+        # Keep trying the replicas that failed to start
+        self.heal()
+        return True
+    
+    async def disconnect(self):
+        """Stop respawning and disconnect all replicas."""
+        self._state_override = None
+        for task in list(self._respawn_tasks.values()):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._respawn_tasks.clear()
+        await asyncio.gather(*(replica.disconnect() for replica in self.replicas))
+        self._draining.clear()
+    
+    async def send_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Send a request to the least-loaded healthy replica."""
+        replica = self._pick_replica()
+        if replica is None:
+            raise MCPError(f"Server {self.config.name} has no connected replica", MCPProtocol.SERVER_UNAVAILABLE)
+        
+        self._in_flight[replica] = self._in_flight.get(replica, 0) + 1
+        start_time = time.monotonic()
+        try:
+            result = await replica.send_request(method, params)
+        except Exception:
+            self.metrics.failed_requests += 1
+            if not replica.is_healthy:
+                self.heal()
+            raise
+        finally:
+            self._in_flight[replica] -= 1
+            if not self._in_flight[replica]:
+                del self._in_flight[replica]
+        
+        self.metrics.total_requests += 1
+        self.metrics.last_request_time = datetime.now()
+        total = self.metrics.total_requests
+        self.metrics.average_response_time += (time.monotonic() - start_time - self.metrics.average_response_time) / total
+        return result
+    
+    async def send_many(self, requests: List[Tuple[str, Optional[Dict[str, Any]]]],
+                        return_exceptions: bool = False) -> List[Any]:
+        """Send several requests to the least-loaded healthy replica in one round-trip."""
+        replica = self._pick_replica()
+        if replica is None:
+            raise MCPError(f"Server {self.config.name} has no connected replica", MCPProtocol.SERVER_UNAVAILABLE)
+        
+        self._in_flight[replica] = self._in_flight.get(replica, 0) + len(requests)
+        start_time = time.monotonic()
+        try:
+            results = await replica.send_many(requests, return_exceptions=return_exceptions)
+        except Exception:
+            self.metrics.failed_requests += len(requests)
+            if not replica.is_healthy:
+                self.heal()
+            raise
+        finally:
+            self._in_flight[replica] -= len(requests)
+            if not self._in_flight[replica]:
+                del self._in_flight[replica]
+        
+        elapsed = time.monotonic() - start_time
+        for result in results:
+            if isinstance(result, Exception):
+                self.metrics.failed_requests += 1
+                continue
+            self.metrics.total_requests += 1
+            self.metrics.average_response_time += (elapsed - self.metrics.average_response_time) / self.metrics.total_requests
+        self.metrics.last_request_time = datetime.now()
+        return results
+    
+    def heal(self):
+        """Replace every unhealthy replica that is not being replaced already."""
+        if self.state != ConnectionState.CONNECTED:
+            # Nothing left to serve from; the manager reconnects the whole pool
+            return
+        for index, replica in enumerate(self.replicas):
+            if replica.is_healthy or replica.state == ConnectionState.CONNECTING:
+                continue
+            task = self._respawn_tasks.get(index)
+            if task is None or task.done():
+                self._respawn_tasks[index] = asyncio.create_task(self._respawn(index))
+    
+    def get_replica_status(self) -> List[Dict[str, Any]]:
+        """State, load and latency of each replica."""
+        return [
+            {
+                "state": replica.state.value,
+                "in_flight": self._in_flight.get(replica, 0),
+                "draining": replica in self._draining,
+                "total_requests": replica.metrics.total_requests,
+                "average_response_time": replica.metrics.average_response_time,
+            }
+            for replica in self.replicas
+        ]
+    
+    def _pick_replica(self) -> Optional[MCPConnection]:
+        """The healthy replica with the lowest expected wait (in-flight count times latency)."""
+        candidates = [
+            replica for replica in self.replicas
+            if replica.is_healthy and replica not in self._draining
+        ]
+        if not candidates:
+            return None
+        
+        # Replicas without requests yet are assumed to be as fast as the others
+        measured = [replica.metrics.average_response_time for replica in candidates
+                    if replica.metrics.total_requests]
+        typical = sum(measured) / len(measured) if measured else 1.0
+        
+        def expected_wait(replica: MCPConnection) -> Tuple[float, int]:
+            latency = replica.metrics.average_response_time if replica.metrics.total_requests else typical
+            in_flight = self._in_flight.get(replica, 0)
+            return (in_flight + 1) * max(latency, 1e-3), in_flight
+        
+        return min(candidates, key=expected_wait)
+    
+    async def _respawn(self, index: int):
+        """Drain a failed replica, then start a fresh process in its place."""
+        old = self.replicas[index]
+        self._draining.add(old)
+        try:
+            # Let requests already sent to the old process finish (or time out)
+            deadline = time.monotonic() + self.config.timeout
+            while self._in_flight.get(old) and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            await old.disconnect()
+        finally:
+            self._draining.discard(old)
+        
+        for attempt in range(1, self.config.max_retries + 1):
+            replacement = MCPConnection(self.config)
+            self.replicas[index] = replacement
+            if await replacement.connect():
+                self.logger.info(f"Respawned replica {index} of {self.config.name}")
+                return
+            self.logger.warning(f"Failed to respawn replica {index} of {self.config.name} (attempt {attempt})")
+            await asyncio.sleep(self.config.retry_delay)
+        self.logger.error(f"Giving up on replica {index} of {self.config.name}")
+
+
+def create_connection(config: MCPServerConfig):
+    """A single connection, or a replica pool when the server is configured with several replicas."""
+    if config.replicas > 1:
+        return MCPConnectionPool(config)
+    return MCPConnection(config)
+
+
 class MCPConnectionManager:
-    """Manager for multiple MCP server connections."""
+    """
+    Manager for multiple MCP server connections.
+    
+    Servers are either all started concurrently by :meth:`start` ("eager"
+    startup) or spawned on their first request ("lazy" startup).  With an
+    ``idle_timeout``, servers that received no request for that long are
+    stopped and spawned again on their next request.
+    """
     
-    def __init__(self):
+    def __init__(self, startup_mode: str = "eager", startup_timeout: Optional[float] = 60.0,
+                 idle_timeout: Optional[float] = None):
+        """
+        Args:
+            startup_mode: "eager" to start all servers in :meth:`start`, "lazy" to start them on first use
+            startup_timeout: Seconds :meth:`start` waits for servers; slower ones finish in the background
+            idle_timeout: Seconds without requests after which a server is stopped (None or 0 keeps them running)
+        """
+        if startup_mode not in STARTUP_MODES:
+            raise ValueError(f"Unknown MCP startup mode '{startup_mode}', expected one of {STARTUP_MODES}")
         self.connections: Dict[str, MCPConnection] = {}
         self.server_configs: Dict[str, MCPServerConfig] = {}
         self.logger = logging.getLogger("mcp.manager")
         self.health_check_interval = 30  # seconds
+        self.startup_mode = startup_mode
+        self.startup_timeout = startup_timeout
+        self.idle_timeout = idle_timeout
         self._health_task: Optional[asyncio.Task] = None
+        self._idle_task: Optional[asyncio.Task] = None
+        # In-progress connections, shared by everyone waiting for the same server
+        self._connect_tasks: Dict[str, asyncio.Task] = {}
+        # time.monotonic() of the last request (or connection) per server
+        self._last_used: Dict[str, float] = {}
         self._running = False
     
     def add_server(self, config: MCPServerConfig):
@@ -389,30 +916,33 @@ class MCPConnectionManager:
         self.logger.info(f"Removed MCP server: {name}")
     
     async def start(self):
-        """Start connection manager and connect to all servers."""
+        """Start connection manager and connect to all servers (unless startup is lazy)."""
         self._running = True
-        self.logger.info("Starting MCP connection manager")
+        self.logger.info(f"Starting MCP connection manager ({self.startup_mode} startup)")
         
-        # Connect to all enabled servers
-        for config in self.server_configs.values():
-            if config.enabled:
-                await self.connect_server(config.name)
+        if self.startup_mode == "eager":
+            await self.connect_all(self.startup_timeout)
         
         # Start health monitoring
         self._health_task = asyncio.create_task(self._health_monitor_loop())
+        if self.idle_timeout:
+            self._idle_task = asyncio.create_task(self._idle_monitor_loop())
     
     async def stop(self):
         """Stop connection manager and disconnect all servers."""
         self._running = False
         self.logger.info("Stopping MCP connection manager")
         
-        # Stop health monitoring
-        if self._health_task:
-            self._health_task.cancel()
-            try:
-                await self._health_task
-            except asyncio.CancelledError:
-                pass
+        # Stop health and idle monitoring, and abandon startups still in progress
+        tasks = [self._health_task, self._idle_task] + list(self._connect_tasks.values())
+        for task in tasks:
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._connect_tasks.clear()
         
         # Disconnect all servers
         for connection in self.connections.values():
@@ -420,6 +950,66 @@ class MCPConnectionManager:
         
         self.connections.clear()
     
+    async def connect_all(self, timeout: Optional[float] = None) -> Dict[str, bool]:
+        """
+        Connect all enabled servers concurrently.
+        
+        Args:
+            timeout: Seconds to wait; servers still starting afterwards keep connecting in the background
+            
+        Returns:
+            Whether each server connected within the timeout
+        """
+        tasks = {
+            name: self._connect_task(name)
+            for name, config in self.server_configs.items() if config.enabled
+        }
+        if not tasks:
+            return {}
+        
+        started = time.monotonic()
+        _, pending = await asyncio.wait(list(tasks.values()), timeout=timeout)
+        if pending:
+            slow = [name for name, task in tasks.items() if task in pending]
+            self.logger.warning(f"MCP servers still starting after {timeout}s, continuing in background: {slow}")
+        
+        results = {
+            name: task.done() and not task.cancelled() and task.exception() is None and bool(task.result())
+            for name, task in tasks.items()
+        }
+        self.logger.info(f"Started {sum(results.values())}/{len(results)} MCP servers "
+                         f"in {time.monotonic() - started:.2f}s")
+        return results
+    
+    async def ensure_connected(self, name: str) -> bool:
+        """
+        Connect a server unless it is connected already.
+        
+        Concurrent callers share one connection attempt, so a server is
+        spawned once however many requests arrive while it starts.
+        """
+        connection = self.connections.get(name)
+        if connection and connection.state == ConnectionState.CONNECTED:
+            return True
+        config = self.server_configs.get(name)
+        if not config or not config.enabled:
+            return False
+        # Shielded: a caller giving up does not abort the startup for the others
+        return await asyncio.shield(self._connect_task(name))
+    
+    def _connect_task(self, name: str) -> asyncio.Task:
+        """The in-progress connection of a server, starting one if needed."""
+        task = self._connect_tasks.get(name)
+        if task is None or task.done():
+            task = asyncio.create_task(self.connect_server(name))
+            self._connect_tasks[name] = task
+            task.add_done_callback(lambda done: self._forget_connect_task(name, done))
+        return task
+    
+    def _forget_connect_task(self, name: str, task: asyncio.Task):
+        if self._connect_tasks.get(name) is task:
+            del self._connect_tasks[name]
+    
     async def connect_server(self, name: str) -> bool:
         """Connect to specific MCP server."""
         if name not in self.server_configs:
@@ -431,12 +1021,15 @@ class MCPConnectionManager:
             self.logger.info(f"Server {name} is disabled")
             return False
         
-        # Create new connection if needed
+        # Create new connection (or replica pool) if needed
         if name not in self.connections:
-            self.connections[name] = MCPConnection(config)
+            self.connections[name] = create_connection(config)
         
         connection = self.connections[name]
-        return await connection.connect()
+        connected = await connection.connect()
+        if connected:
+            self._last_used[name] = time.monotonic()
+        return connected
     
     async def disconnect_server(self, name: str):
         """Disconnect from specific MCP server."""
@@ -444,13 +1037,59 @@ class MCPConnectionManager:
             await self.connections[name].disconnect()
     
     async def send_request(self, server_name: str, method: str, 
-                          params: Optional[Dict[str, Any]] = None) -> Any:
-        """Send request to specific MCP server."""
+                          params: Optional[Dict[str, Any]] = None,
+                          keep_alive: bool = True) -> Any:
+        """
+        Send request to specific MCP server.
+        
+        A server that was never started (lazy startup) or was stopped while
+        idle is started first, and one still starting is waited for.
+        ``keep_alive=False`` (used by health probes) does not count the
+        request as use of the server.
+        """
+        if server_name in self._connect_tasks or server_name in self._startable_servers():
+            await self.ensure_connected(server_name)
+        
         if server_name not in self.connections:
             raise MCPError(f"Server {server_name} not connected", MCPProtocol.SERVER_UNAVAILABLE)
         
         connection = self.connections[server_name]
-        return await connection.send_request(method, params)
+        if keep_alive:
+            self._last_used[server_name] = time.monotonic()
+        try:
+            return await connection.send_request(method, params)
+        finally:
+            if keep_alive:
+                self._last_used[server_name] = time.monotonic()
+    
+    async def send_many(self, server_name: str, requests: List[Tuple[str, Optional[Dict[str, Any]]]],
+                        return_exceptions: bool = False, keep_alive: bool = True) -> List[Any]:
+        """
+        Send several requests to one MCP server in a single round-trip.
+        
+        Args:
+            server_name: Server to send to (started first if needed, as in :meth:`send_request`)
+            requests: (method, params) pairs
+            return_exceptions: Return failed requests' exceptions in place of their results
+            keep_alive: Whether the requests count as use of the server for idle shutdown
+            
+        Returns:
+            Results in the order of ``requests``
+        """
+        if server_name in self._connect_tasks or server_name in self._startable_servers():
+            await self.ensure_connected(server_name)
+        
+        if server_name not in self.connections:
+            raise MCPError(f"Server {server_name} not connected", MCPProtocol.SERVER_UNAVAILABLE)
+        
+        connection = self.connections[server_name]
+        if keep_alive:
+            self._last_used[server_name] = time.monotonic()
+        try:
+            return await connection.send_many(requests, return_exceptions=return_exceptions)
+        finally:
+            if keep_alive:
+                self._last_used[server_name] = time.monotonic()
     
     def get_available_servers(self) -> List[str]:
         """Get list of available (connected) servers."""
@@ -459,6 +1098,42 @@ class MCPConnectionManager:
             if conn.state == ConnectionState.CONNECTED
         ]
     
+    def get_routable_servers(self) -> List[str]:
+        """Servers a request may be routed to: connected ones and those started on first use."""
+        return self.get_available_servers() + self._startable_servers()
+    
+    def _startable_servers(self) -> List[str]:
+        """Enabled servers that are not running but are started on demand."""
+        if not self._running:
+            return []
+        return [
+            name for name, config in self.server_configs.items()
+            if config.enabled and (name not in self.connections
+                                   or self.connections[name].state == ConnectionState.DISCONNECTED)
+        ]
+    
+    def get_startup_status(self) -> Dict[str, Dict[str, Any]]:
+        """State, startup time and last error of every configured server."""
+        status = {}
+        for name, config in self.server_configs.items():
+            connection = self.connections.get(name)
+            if not config.enabled:
+                state = "disabled"
+            elif connection is None:
+                state = "not_started"
+            else:
+                state = connection.state.value
+            status[name] = {
+                "state": state,
+                "startup_seconds": connection.metrics.startup_seconds if connection else None,
+                "error": connection.last_error if connection else None,
+            }
+            if isinstance(connection, MCPConnectionPool):
+                status[name]["replicas"] = connection.get_replica_status()
+            if name in self._last_used and state == ConnectionState.CONNECTED.value:
+                status[name]["idle_seconds"] = time.monotonic() - self._last_used[name]
+        return status
+    
     def get_server_capabilities(self, server_name: str) -> Dict[str, Any]:
         """Get capabilities for specific server."""
         if server_name in self.connections:
@@ -490,9 +1165,40 @@ class MCPConnectionManager:
                 self.logger.error(f"Health check failed: {e}")
                 await asyncio.sleep(self.health_check_interval)
     
+    async def _idle_monitor_loop(self):
+        """Stop servers that have been idle for longer than ``idle_timeout``."""
+        interval = max(1.0, min(self.idle_timeout / 2, self.health_check_interval))
+        while self._running:
+            try:
+                await asyncio.sleep(interval)
+                await self._stop_idle_servers()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Idle check failed: {e}")
+    
+    async def _stop_idle_servers(self):
+        """Disconnect connected servers without requests for ``idle_timeout`` seconds."""
+        now = time.monotonic()
+        for name, connection in list(self.connections.items()):
+            if (connection.state != ConnectionState.CONNECTED or connection.pending_requests
+                    or name in self._connect_tasks):
+                continue
+            idle = now - self._last_used.get(name, now)
+            if idle >= self.idle_timeout:
+                self.logger.info(f"Stopping MCP server {name} after {idle:.0f}s idle")
+                await connection.disconnect()
+    
     async def _check_server_health(self):
         """Check health of all servers and reconnect if needed."""
         for name, connection in list(self.connections.items()):
+            # Deliberately disconnected servers (stopped while idle, restarting) are left alone
+            if connection.state == ConnectionState.DISCONNECTED or name in self._connect_tasks:
+                continue
+            
+            # Pools replace failed replicas themselves while others still serve
+            if isinstance(connection, MCPConnectionPool):
+                connection.heal()
             if not connection.is_healthy and connection.config.enabled:
                 self.logger.warning(f"Server {name} is unhealthy, attempting reconnection")
                 
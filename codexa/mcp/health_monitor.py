@@ -186,6 +186,12 @@ class MCPHealthMonitor:
         metrics = self.server_health[server_name]
         current_time = datetime.now()
         
+        # Servers stopped while idle (or not started yet) are not down; they start on next use
+        if (server_name not in self.connection_manager.get_available_servers()
+                and server_name in self.connection_manager.get_routable_servers()):
+            self.remove_server(server_name)
+            return
+        
         # Skip if server is not available
         if server_name not in self.connection_manager.get_available_servers():
             self._update_server_status(server_name, HealthStatus.DOWN, "Server not available")
@@ -322,7 +328,8 @@ class MCPHealthMonitor:
                         server_name, "initialize", {
                             "protocolVersion": "2024-11-05",
                             "capabilities": {"roots": {"listChanged": False}}
-                        }
+                        },
+                        keep_alive=False
                     )
                     response_time = time.time() - start_time
                     
@@ -340,7 +347,7 @@ class MCPHealthMonitor:
             else:
                 # Send a lightweight request (tools/list is supported by all MCP servers except Serena)
                 await self.connection_manager.send_request(
-                    server_name, "tools/list", {}
+                    server_name, "tools/list", {}, keep_alive=False
                 )
                 
                 response_time = time.time() - start_time
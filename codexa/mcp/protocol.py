@@ -127,6 +127,10 @@ class MCPProtocol:
     CAPABILITY_NOT_FOUND = -32001
     TIMEOUT_ERROR = -32002
     
+    # Protocol revision requested in initialize; servers answer with it or with one they support
+    PROTOCOL_VERSION = "2025-03-26"
+    SUPPORTED_PROTOCOL_VERSIONS = ("2025-03-26", "2024-11-05")
+    
     @staticmethod
     def create_request(method: str, params: Optional[Dict[str, Any]] = None,
                       request_id: Optional[str] = None) -> MCPMessage:
@@ -218,10 +222,11 @@ class MCPProtocol:
         return parsed
     
     @staticmethod
-    def create_initialize_request(client_info: Dict[str, Any]) -> MCPMessage:
-        """Create MCP initialization request."""
+    def create_initialize_request(client_info: Dict[str, Any],
+                                  protocol_version: Optional[str] = None) -> MCPMessage:
+        """Create MCP initialization request (for ``protocol_version``, default the latest supported)."""
         params = {
-            "protocolVersion": "2024-11-05",
+            "protocolVersion": protocol_version or MCPProtocol.PROTOCOL_VERSION,
             "clientInfo": client_info,
             "capabilities": {
                 "roots": {
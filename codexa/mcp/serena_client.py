@@ -4,7 +4,7 @@ Serena MCP server client with semantic code analysis capabilities.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field
 from pathlib import Path
 import json
@@ -60,6 +60,11 @@ class SerenaClient:
         self.project_capabilities: Dict[str, Any] = {}
         self.onboarding_completed: bool = False
         
+        # Shared cache of read-only tool results (set by MCPService); results are
+        # kept apart from raw query_server results, which have another shape
+        self.result_cache = None
+        self.cache_scope = f"serena-client:{config.name}"
+        
         # Tool categories for intelligent routing
         self.semantic_tools = {
             "find_symbol", "get_symbols_overview", "find_referencing_symbols",
@@ -96,6 +101,8 @@ class SerenaClient:
     async def disconnect(self):
         """Disconnect from Serena server."""
         await self.connection.disconnect()
+        if self.result_cache:
+            self.result_cache.invalidate_server(self.cache_scope)
         self.active_project = None
         self.available_tools.clear()
         self.project_capabilities.clear()
@@ -160,7 +167,25 @@ class SerenaClient:
     
     async def call_tool(self, tool_name: str, parameters: Dict[str, Any],
                         timeout: Optional[float] = None) -> Any:
-        """Call a Serena tool with parameters."""
+        """Call a Serena tool with parameters, answering read-only calls from the result cache."""
+        cache = self.result_cache
+        if cache is None:
+            return await self._call_tool(tool_name, parameters, timeout)
+        
+        cached = cache.get(self.cache_scope, tool_name, parameters)
+        if cached is not None:
+            return cached
+        snapshot = cache.snapshot(parameters) if cache.caches(tool_name) else None
+        try:
+            result = await self._call_tool(tool_name, parameters, timeout)
+        finally:
+            cache.record_call(tool_name, parameters)
+        cache.put(self.cache_scope, tool_name, parameters, result, snapshot)
+        return result
+    
+    async def _call_tool(self, tool_name: str, parameters: Dict[str, Any],
+                         timeout: Optional[float] = None) -> Any:
+        """Call a Serena tool, trying the parameter formats different servers expect."""
         if tool_name not in self.available_tools:
             raise MCPError(f"Tool not available: {tool_name}")
 
@@ -191,19 +216,7 @@ class SerenaClient:
                 try:
                     self.logger.debug(f"Trying parameter format {i+1} for {tool_name}")
                     result = await self.connection.send_request("tools/call", params)
-
-                    # Parse tool result
-                    if isinstance(result, dict):
-                        if "content" in result:
-                            # Extract content from MCP tool response
-                            content = result["content"]
-                            if isinstance(content, list) and len(content) > 0:
-                                # Return first content item data
-                                return content[0].get("text", content[0])
-                            return content
-                        return result
-
-                    return result
+                    return self._parse_tool_result(result)
 
                 except MCPError as e:
                     last_error = e
@@ -239,6 +252,64 @@ class SerenaClient:
             # Restore original timeout
             self.connection.config.timeout = original_timeout
     
+    async def call_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Call several Serena tools in a single round-trip.
+        
+        Calls are sent in the standard MCP format; any the server rejects for
+        their parameters are retried one by one through :meth:`call_tool`,
+        which tries the other formats and fallbacks.
+        
+        Returns:
+            Tool results in the order of ``calls``
+        """
+        for tool_name, _ in calls:
+            if tool_name not in self.available_tools:
+                raise MCPError(f"Tool not available: {tool_name}")
+        
+        cache = self.result_cache
+        parsed: List[Any] = [cache.get(self.cache_scope, tool_name, parameters) if cache else None
+                             for tool_name, parameters in calls]
+        missing = [i for i, result in enumerate(parsed) if result is None]
+        if not missing:
+            return parsed
+        
+        snapshots = {i: cache.snapshot(calls[i][1]) for i in missing if cache and cache.caches(calls[i][0])}
+        requests = [("tools/call", {"name": calls[i][0], "arguments": calls[i][1]}) for i in missing]
+        try:
+            results = await self.connection.send_many(requests, return_exceptions=True)
+        finally:
+            if cache:
+                for i in missing:
+                    cache.record_call(*calls[i])
+        
+        for i, result in zip(missing, results):
+            tool_name, parameters = calls[i]
+            if isinstance(result, MCPError) and "Invalid parameters" in str(result):
+                parsed[i] = await self.call_tool(tool_name, parameters)
+                continue
+            if isinstance(result, Exception):
+                raise MCPError(f"Serena tool call failed: {tool_name} - {result}")
+            parsed[i] = self._parse_tool_result(result)
+            if cache:
+                cache.put(self.cache_scope, tool_name, parameters, parsed[i], snapshots.get(i))
+        return parsed
+    
+    @staticmethod
+    def _parse_tool_result(result: Any) -> Any:
+        """Extract the data of an MCP tool result."""
+        if isinstance(result, dict):
+            if "content" in result:
+                # Extract content from MCP tool response
+                content = result["content"]
+                if isinstance(content, list) and len(content) > 0:
+                    # Return first content item data
+                    return content[0].get("text", content[0])
+                return content
+            return result
+
+        return result
+    
     # Semantic Code Analysis Methods
     
     async def find_symbols(self, query: str, symbol_type: Optional[str] = None, 
@@ -253,10 +324,30 @@ class SerenaClient:
         
         return await self.call_tool("find_symbol", params)
     
+    async def find_symbols_many(self, queries: List[str], symbol_type: Optional[str] = None,
+                                local_only: bool = False) -> Dict[str, Any]:
+        """Find the symbols matching each of several queries in one round-trip."""
+        calls = []
+        for query in queries:
+            params = {
+                "query": query,
+                "local": local_only
+            }
+            if symbol_type:
+                params["type_filter"] = symbol_type
+            calls.append(("find_symbol", params))
+        
+        return dict(zip(queries, await self.call_tools(calls)))
+    
     async def get_file_symbols(self, file_path: str) -> List[Dict[str, Any]]:
         """Get overview of symbols defined in a file."""
         return await self.call_tool("get_symbols_overview", {"file_path": file_path})
     
+    async def get_files_symbols(self, file_paths: List[str]) -> Dict[str, Any]:
+        """Get overviews of the symbols defined in several files in one round-trip."""
+        calls = [("get_symbols_overview", {"file_path": file_path}) for file_path in file_paths]
+        return dict(zip(file_paths, await self.call_tools(calls)))
+    
     async def find_symbol_references(self, file_path: str, line: int, column: int,
                                    reference_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Find symbols that reference the symbol at given location."""
@@ -994,6 +1085,7 @@ class SerenaManager:
         self.clients: Dict[str, SerenaClient] = {}
         self.default_client: Optional[SerenaClient] = None
         self.logger = logging.getLogger("serena.manager")
+        self._connect_tasks: List[asyncio.Task] = []
     
     def add_client(self, name: str, config: MCPServerConfig) -> SerenaClient:
         """Add a Serena client."""
@@ -1020,16 +1112,37 @@ class SerenaManager:
             
             self.logger.info(f"Removed Serena client: {name}")
     
-    async def connect_all(self):
-        """Connect all Serena clients."""
-        for name, client in self.clients.items():
+    async def connect_all(self, timeout: Optional[float] = None):
+        """
+        Connect all Serena clients concurrently.
+        
+        Args:
+            timeout: Seconds to wait; clients still connecting afterwards finish in the background
+        """
+        async def connect(name: str, client: SerenaClient):
             try:
                 await client.connect()
             except Exception as e:
                 self.logger.error(f"Failed to connect Serena client {name}: {e}")
+        
+        self._connect_tasks = [
+            asyncio.create_task(connect(name, client)) for name, client in self.clients.items()
+        ]
+        if self._connect_tasks:
+            _, pending = await asyncio.wait(self._connect_tasks, timeout=timeout)
+            if pending:
+                self.logger.warning(f"{len(pending)} Serena clients still connecting after {timeout}s")
     
     async def disconnect_all(self):
         """Disconnect all Serena clients."""
+        for task in self._connect_tasks:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._connect_tasks = []
         for client in self.clients.values():
             await client.disconnect()
     
@@ -152,8 +152,8 @@ class MCPServerRegistry:
                     filtered_matches.append(match)
             matches = filtered_matches
         
-        # Filter by server availability
-        available_servers = self.connection_manager.get_available_servers()
+        # Filter by server availability (servers started on first use count as available)
+        available_servers = self.connection_manager.get_routable_servers()
         matches = [m for m in matches if m.server_name in available_servers]
         
         return matches
@@ -0,0 +1,365 @@
+"""
+Result cache for idempotent MCP tool calls.
+
+Agent loops read the same files, list the same directories and look up the
+same symbols over and over.  :class:`MCPResultCache` answers repeated calls
+of read-only tools (``read_file``, ``list_directory``, ``get_file_info``,
+``find_symbol``, ``get_symbols_overview``...) without a round-trip to the
+server.  Entries are kept per server and keyed on the tool name and its
+normalized arguments.
+
+A cached result is dropped when the files it was computed from may have
+changed:
+
+- Codexa's own write/edit/move tools, and mutating MCP tools, invalidate the
+  paths they touch (see :func:`invalidate_paths`);
+- every hit re-checks the mtime and size of the paths in the arguments;
+- optionally, a ``watchdog`` file watcher invalidates paths changed by
+  anything else.
+
+Results that depend on a whole tree (searches, recursive listings, anything
+asked about a directory) or on the whole project (symbol queries without a
+path, references to a symbol) cannot be validated by one mtime, so they also
+expire after a short TTL.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+# Read-only tools of the MCP filesystem server and of Serena
+IDEMPOTENT_TOOLS = frozenset({
+    "read_file", "read_multiple_files", "list_directory", "get_file_info", "tree",
+    "search_files", "search_within_files", "list_allowed_directories",
+    "find_symbol", "get_symbols_overview", "find_referencing_symbols",
+    "list_dir", "find_file", "search_for_pattern",
+})
+# Tools whose result depends on a whole directory tree (or project), not only on their path's mtime
+RECURSIVE_TOOLS = frozenset({
+    "tree", "search_files", "search_within_files", "list_dir", "find_file", "search_for_pattern",
+    "find_referencing_symbols",
+})
+# Tools changing the files named in their arguments
+MUTATING_TOOLS = frozenset({
+    "write_file", "modify_file", "copy_file", "move_file", "delete_file", "create_directory",
+    "create_text_file", "replace_regex", "replace_symbol_body", "insert_after_symbol", "insert_before_symbol",
+})
+# Tools that may change any file
+UNSCOPED_MUTATING_TOOLS = frozenset({"execute_shell_command"})
+# Argument names holding file or directory paths
+PATH_ARGUMENTS = ("path", "paths", "file_path", "relative_path", "source", "destination", "directory")
+
+# Every live cache, so that file changes reach all of them
+_caches: "weakref.WeakSet[MCPResultCache]" = weakref.WeakSet()
+_logger = logging.getLogger("codexa.mcp_result_cache")
+
+
+def invalidate_paths(paths: Iterable[str]) -> None:
+    """Drop cached results computed from any of these files or directories, in every cache."""
+    paths = [normalize_path(path) for path in paths if path]
+    if not paths:
+        return
+    for cache in list(_caches):
+        cache.invalidate_paths(paths)
+
+
+def normalize_path(path: Any) -> str:
+    """Absolute, normalized form of a path argument."""
+    return os.path.normpath(os.path.abspath(os.path.expanduser(str(path))))
+
+
+def argument_paths(arguments: Optional[Dict[str, Any]]) -> List[str]:
+    """The normalized paths among a tool call's arguments."""
+    paths = []
+    for name in PATH_ARGUMENTS:
+        value = (arguments or {}).get(name)
+        if isinstance(value, str) and value:
+            paths.append(normalize_path(value))
+        elif isinstance(value, (list, tuple)):
+            paths.extend(normalize_path(item) for item in value if isinstance(item, str) and item)
+    return paths
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _covers(entry_path: str, changed_path: str) -> bool:
+    """Whether a change to ``changed_path`` can affect a result computed from ``entry_path``."""
+    if entry_path == changed_path:
+        return True
+    # A listing or search of a directory containing the change, or a file inside a changed directory
+    return (changed_path.startswith(entry_path.rstrip(os.sep) + os.sep)
+            or entry_path.startswith(changed_path.rstrip(os.sep) + os.sep))
+
+
+class _Entry:
+    __slots__ = ("created", "result", "paths", "stats", "scoped")
+
+    def __init__(self, created: float, result: Any, paths: List[str],
+                 stats: Dict[str, Optional[Tuple[int, int]]], scoped: bool):
+        self.created = created
+        self.result = result
+        self.paths = paths
+        self.stats = stats
+        # False when the result depends on more than the mtimes of its paths
+        self.scoped = scoped
+
+
+class MCPResultCache:
+    """Per-server LRU cache of idempotent MCP tool results."""
+
+    def __init__(self, enabled: bool = True, ttl: float = 120.0, max_entries: int = 512,
+                 max_result_bytes: int = 1024 * 1024, idempotent_tools: Optional[Iterable[str]] = None):
+        """
+        Initialize the result cache.
+
+        Args:
+            enabled: Whether results are cached at all
+            ttl: Seconds before results that mtimes cannot validate (trees, searches, project-wide queries) expire
+            max_entries: Entries kept per server before the least recently used are evicted
+            max_result_bytes: Larger results (as JSON) are not cached
+            idempotent_tools: Extra tool names to treat as read-only
+        """
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_result_bytes = max_result_bytes
+        self.idempotent_tools = IDEMPOTENT_TOOLS | frozenset(idempotent_tools or ())
+        self._entries: Dict[str, "OrderedDict[str, _Entry]"] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; results computed across one are not stored
+        self._generation = 0
+        self._observer = None
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'invalidated': 0, 'evicted': 0, 'oversized': 0}
+        self._server_stats: Dict[str, Dict[str, int]] = {}
+        _caches.add(self)
+
+    @classmethod
+    def from_config(cls, settings: Optional[Dict[str, Any]]) -> "MCPResultCache":
+        """Create a cache from the ``mcp_cache`` config section."""
+        settings = settings or {}
+        return cls(
+            enabled=settings.get("enabled", True),
+            ttl=float(settings.get("ttl", 120.0)),
+            max_entries=int(settings.get("max_entries", 512)),
+            max_result_bytes=int(settings.get("max_result_bytes", 1024 * 1024)),
+            idempotent_tools=settings.get("idempotent_tools"),
+        )
+
+    @staticmethod
+    def make_key(tool_name: str, arguments: Optional[Dict[str, Any]]) -> str:
+        """Key of a tool call: its name and its arguments with paths normalized."""
+        normalized = dict(arguments or {})
+        for name in PATH_ARGUMENTS:
+            value = normalized.get(name)
+            if isinstance(value, str) and value:
+                normalized[name] = normalize_path(value)
+            elif isinstance(value, (list, tuple)):
+                normalized[name] = [normalize_path(item) if isinstance(item, str) else item for item in value]
+        payload = json.dumps([tool_name, normalized], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def caches(self, tool_name: str) -> bool:
+        """Whether results of this tool are cached."""
+        return self.enabled and tool_name in self.idempotent_tools
+
+    def get(self, server: str, tool_name: str, arguments: Optional[Dict[str, Any]]) -> Optional[Any]:
+        """Look up a result (None on a miss or for tools that are not cached)."""
+        if not self.caches(tool_name):
+            return None
+        key = self.make_key(tool_name, arguments)
+        with self._lock:
+            entries = self._entries.get(server)
+            entry = entries.get(key) if entries else None
+            if entry is not None and self._is_fresh(entry):
+                entries.move_to_end(key)
+                self._count(server, 'hits')
+                return copy.deepcopy(entry.result)
+            if entry is not None:
+                del entries[key]
+                self._count(server, 'stale')
+            self._count(server, 'misses')
+            return None
+
+    def snapshot(self, arguments: Optional[Dict[str, Any]]) -> Tuple[int, Dict[str, Optional[Tuple[int, int]]]]:
+        """State of the files a call reads, taken before the call is sent."""
+        with self._lock:
+            generation = self._generation
+        return generation, {path: _stat(path) for path in argument_paths(arguments)}
+
+    def put(self, server: str, tool_name: str, arguments: Optional[Dict[str, Any]], result: Any,
+            snapshot: Optional[Tuple[int, Dict[str, Optional[Tuple[int, int]]]]] = None) -> bool:
+        """
+        Store a result.
+
+        Args:
+            snapshot: :meth:`snapshot` taken before the call; without it the files are stat'ed now
+
+        Returns:
+            False if the result was not stored
+        """
+        if not self.caches(tool_name) or result is None:
+            return False
+        try:
+            size = len(json.dumps(result, default=str))
+        except (TypeError, ValueError):
+            return False
+        if size > self.max_result_bytes:
+            with self._lock:
+                self._count(server, 'oversized')
+            return False
+
+        generation, stats = snapshot or self.snapshot(arguments)
+        key = self.make_key(tool_name, arguments)
+        # A directory's mtime does not move when files below it are edited
+        scoped = (bool(stats) and tool_name not in RECURSIVE_TOOLS
+                  and not any(os.path.isdir(path) for path in stats))
+        with self._lock:
+            if generation != self._generation:
+                # Files changed while the call was in flight
+                return False
+            entries = self._entries.setdefault(server, OrderedDict())
+            entries[key] = _Entry(time.monotonic(), copy.deepcopy(result), list(stats), stats, scoped)
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+                self._count(server, 'evicted')
+        return True
+
+    def record_call(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> None:
+        """Invalidate what a mutating tool call may have changed."""
+        if tool_name in UNSCOPED_MUTATING_TOOLS:
+            self.clear()
+        elif tool_name in MUTATING_TOOLS:
+            paths = argument_paths(arguments)
+            if paths:
+                invalidate_paths(paths)
+            else:
+                self.clear()
+
+    def invalidate_paths(self, paths: List[str]) -> int:
+        """
+        Drop results computed from these (normalized) paths, and all project-wide results.
+
+        Returns:
+            Number of entries dropped
+        """
+        dropped = 0
+        with self._lock:
+            self._generation += 1
+            for server, entries in self._entries.items():
+                for key in [key for key, entry in entries.items()
+                            if not entry.paths or any(_covers(entry_path, changed)
+                                                      for entry_path in entry.paths for changed in paths)]:
+                    del entries[key]
+                    self._count(server, 'invalidated')
+                    dropped += 1
+        if dropped:
+            _logger.debug(f"Invalidated {dropped} cached MCP results for {paths}")
+        return dropped
+
+    def invalidate_server(self, server: str) -> None:
+        """Drop all results of one server (e.g. after it restarted)."""
+        with self._lock:
+            self._generation += 1
+            entries = self._entries.pop(server, None) or {}
+            for _ in entries:
+                self._count(server, 'invalidated')
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._generation += 1
+            for server, entries in self._entries.items():
+                for _ in entries:
+                    self._count(server, 'invalidated')
+            self._entries.clear()
+
+    def watch(self, root: str) -> bool:
+        """
+        Invalidate paths under ``root`` whenever anything changes them.
+
+        Returns:
+            False if ``watchdog`` is not installed
+        """
+        if Observer is None:
+            _logger.debug("watchdog is not installed; relying on mtime checks")
+            return False
+        if self._observer is None:
+            self._observer = Observer()
+            self._observer.daemon = True
+            self._observer.start()
+        self._observer.schedule(_InvalidatingHandler(self), normalize_path(root), recursive=True)
+        return True
+
+    def close(self) -> None:
+        """Stop the file watcher."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss and invalidation counters, hit rate and entry counts, overall and per server."""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            servers = {}
+            for server, counts in self._server_stats.items():
+                server_lookups = counts.get('hits', 0) + counts.get('misses', 0)
+                servers[server] = {
+                    **counts,
+                    'entries': len(self._entries.get(server, ())),
+                    'hit_rate': counts.get('hits', 0) / server_lookups if server_lookups else 0.0,
+                }
+            return {
+                **self.stats,
+                'enabled': self.enabled,
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+                'entries': sum(len(entries) for entries in self._entries.values()),
+                'watching': self._observer is not None,
+                'servers': servers,
+            }
+
+    def _is_fresh(self, entry: _Entry) -> bool:
+        if not entry.scoped and time.monotonic() - entry.created >= self.ttl:
+            return False
+        return all(_stat(path) == stat for path, stat in entry.stats.items())
+
+    def _count(self, server: str, name: str) -> None:
+        self.stats[name] += 1
+        counts = self._server_stats.setdefault(server, {})
+        counts[name] = counts.get(name, 0) + 1
+
+
+class _InvalidatingHandler(FileSystemEventHandler):
+    """Forwards file system events from watchdog to a cache."""
+
+    def __init__(self, cache: MCPResultCache):
+        super().__init__()
+        self.cache = cache
+
+    def on_any_event(self, event):
+        if getattr(event, "event_type", None) in ("opened", "closed_no_write"):
+            return
+        paths = [event.src_path, getattr(event, "dest_path", None)]
+        self.cache.invalidate_paths([normalize_path(path) for path in paths if path])
@@ -4,7 +4,8 @@ MCP integration service for Codexa with intelligent server coordination.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Union
+import time
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 
@@ -14,6 +15,7 @@ from .mcp.health_monitor import MCPHealthMonitor, HealthStatus
 from .mcp.protocol import MCPError
 from .mcp.serena_client import SerenaClient, SerenaManager
 from .enhanced_config import EnhancedConfig, MCPServerConfig as ConfigMCPServer
+from .mcp_result_cache import MCPResultCache
 
 
 class MCPService:
@@ -23,17 +25,31 @@ class MCPService:
         self.config = config
         self.logger = logging.getLogger("codexa.mcp")
         
+        # Startup mode, startup deadline and idle shutdown of MCP servers
+        mcp_settings = getattr(config, "mcp", None) or {}
+        self.startup_mode = mcp_settings.get("startup", "eager")
+        self.startup_timeout = mcp_settings.get("startup_timeout", 60)
+        
         # Core MCP components
-        self.connection_manager = MCPConnectionManager()
+        self.connection_manager = MCPConnectionManager(
+            startup_mode=self.startup_mode,
+            startup_timeout=self.startup_timeout,
+            idle_timeout=mcp_settings.get("idle_timeout")
+        )
         self.server_registry = MCPServerRegistry(self.connection_manager)
         self.health_monitor = MCPHealthMonitor(self.connection_manager)
         
+        # Cache of read-only tool results, invalidated when files change
+        self.cache_settings = getattr(config, "mcp_cache", None) or {}
+        self.result_cache = MCPResultCache.from_config(self.cache_settings)
+        
         # Serena specialized components
         self.serena_manager = SerenaManager()
         
         # Service state
         self.is_running = False
         self.startup_time: Optional[datetime] = None
+        self.startup_seconds: Optional[float] = None
         
         # Initialize from configuration
         self._initialize_from_config()
@@ -52,7 +68,9 @@ class MCPService:
                 timeout=config_server.timeout,
                 enabled=config_server.enabled,
                 priority=config_server.priority,
-                capabilities=config_server.capabilities
+                capabilities=config_server.capabilities,
+                replicas=config_server.replicas,
+                batching=config_server.batching
             )
             
             # Add to connection manager and registry
@@ -62,6 +80,7 @@ class MCPService:
             # Special handling for Serena server
             if name == "serena":
                 serena_client = self.serena_manager.add_client(name, server_config)
+                serena_client.result_cache = self.result_cache
                 self.logger.info(f"Added Serena client: {name}")
             
             self.logger.info(f"Configured MCP server: {name}")
@@ -74,12 +93,21 @@ class MCPService:
         
         try:
             self.logger.info("Starting MCP service...")
+            started = time.monotonic()
             
-            # Start connection manager
-            await self.connection_manager.start()
+            if self.startup_mode == "lazy":
+                # Servers and Serena clients are started on first use
+                await self.connection_manager.start()
+            else:
+                # Start all servers and Serena clients concurrently, within one deadline
+                await asyncio.gather(
+                    self.connection_manager.start(),
+                    self.serena_manager.connect_all(self.startup_timeout)
+                )
             
-            # Start Serena clients
-            await self.serena_manager.connect_all()
+            # Watch the project for changes made outside Codexa
+            if self.result_cache.enabled and self.cache_settings.get("watch", False):
+                self.result_cache.watch(str(Path.cwd()))
             
             # Start health monitoring
             await self.health_monitor.start_monitoring()
@@ -89,8 +117,9 @@ class MCPService:
             
             self.is_running = True
             self.startup_time = datetime.now()
+            self.startup_seconds = time.monotonic() - started
             
-            self.logger.info("MCP service started successfully")
+            self.logger.info(f"MCP service started in {self.startup_seconds:.2f}s ({self.startup_mode} startup)")
             return True
             
         except Exception as e:
@@ -113,6 +142,7 @@ class MCPService:
         # Stop connection manager
         await self.connection_manager.stop()
         
+        self.result_cache.close()
         self.is_running = False
         self.logger.info("MCP service stopped")
     
@@ -129,7 +159,7 @@ class MCPService:
         # Find best server if not specified
         if preferred_server:
             server_name = preferred_server
-            if server_name not in self.connection_manager.get_available_servers():
+            if server_name not in self.connection_manager.get_routable_servers():
                 raise MCPError(f"Preferred server '{server_name}' not available")
         else:
             # Use registry to find best match
@@ -140,19 +170,30 @@ class MCPService:
                 raise MCPError("No suitable MCP server found for request")
             server_name = match.server_name
         
+        # Determine the correct tool name for filesystem operations
+        tool_name = self._map_request_to_tool_name(request)
+        
+        # Read-only calls may be answered from the result cache
+        cached = self.result_cache.get(server_name, tool_name, context)
+        if cached is not None:
+            return cached
+        snapshot = self.result_cache.snapshot(context) if self.result_cache.caches(tool_name) else None
+        
         try:
             start_time = datetime.now()
             
-            # Determine the correct tool name for filesystem operations
-            tool_name = self._map_request_to_tool_name(request)
-            
             # Send request to server using tools/call method
-            result = await self.connection_manager.send_request(
-                server_name, "tools/call", {
-                    "name": tool_name,
-                    "arguments": context
-                }
-            )
+            try:
+                result = await self.connection_manager.send_request(
+                    server_name, "tools/call", {
+                        "name": tool_name,
+                        "arguments": context
+                    }
+                )
+            finally:
+                # Even a failed write may have changed files
+                self.result_cache.record_call(tool_name, context)
+            self.result_cache.put(server_name, tool_name, context, result, snapshot)
             
             # Update performance metrics
             response_time = (datetime.now() - start_time).total_seconds()
@@ -173,6 +214,8 @@ class MCPService:
                 self.logger.info("Trying Serena client fallback")
                 try:
                     serena_client = self.serena_manager.get_client("serena")
+                    if serena_client and not serena_client.is_connected():
+                        await serena_client.connect()
                     if serena_client:
                         # Map the request to appropriate Serena method
                         result = await serena_client.call_tool(tool_name, context)
@@ -199,6 +242,57 @@ class MCPService:
 
             raise
     
+    async def call_tools(self, server_name: str, calls: List[Tuple[str, Dict[str, Any]]],
+                         return_exceptions: bool = False) -> List[Any]:
+        """
+        Call several tools on one server in a single round-trip.
+        
+        Args:
+            server_name: Server to call
+            calls: (tool or request name, arguments) pairs
+            return_exceptions: Return failed calls' exceptions in place of their results
+            
+        Returns:
+            Tool results in the order of ``calls``
+        """
+        if not self.is_running:
+            raise MCPError("MCP service not running")
+        if server_name not in self.connection_manager.get_routable_servers():
+            raise MCPError(f"Server '{server_name}' not available")
+        
+        calls = [(self._map_request_to_tool_name(name), arguments) for name, arguments in calls]
+        results: List[Any] = [self.result_cache.get(server_name, name, arguments) for name, arguments in calls]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        
+        snapshots = {i: self.result_cache.snapshot(calls[i][1]) for i in missing
+                     if self.result_cache.caches(calls[i][0])}
+        requests = [("tools/call", {"name": calls[i][0], "arguments": calls[i][1]}) for i in missing]
+        start_time = datetime.now()
+        try:
+            fetched = await self.connection_manager.send_many(
+                server_name, requests, return_exceptions=return_exceptions
+            )
+        except Exception:
+            response_time = (datetime.now() - start_time).total_seconds()
+            self.server_registry.update_performance(server_name, response_time, False)
+            raise
+        finally:
+            for i in missing:
+                self.result_cache.record_call(*calls[i])
+        
+        response_time = (datetime.now() - start_time).total_seconds()
+        self.server_registry.update_performance(server_name, response_time, True)
+        self.logger.debug(f"Called {len(requests)} tools on {server_name} in {response_time:.2f}s "
+                          f"({len(calls) - len(requests)} cached)")
+        
+        for i, result in zip(missing, fetched):
+            results[i] = result
+            if not isinstance(result, Exception):
+                self.result_cache.put(server_name, calls[i][0], calls[i][1], result, snapshots.get(i))
+        return results
+    
     async def get_documentation(self, library: str, topic: Optional[str] = None) -> str:
         """Get documentation using Context7 or similar documentation server."""
         context = {
@@ -261,6 +355,10 @@ class MCPService:
         """Get list of available MCP servers."""
         return self.connection_manager.get_available_servers()
     
+    def get_routable_servers(self) -> List[str]:
+        """Get list of servers requests can be sent to, including those started on first use."""
+        return self.connection_manager.get_routable_servers()
+    
     def get_serena_client(self, name: Optional[str] = None) -> Optional[SerenaClient]:
         """Get Serena client instance."""
         return self.serena_manager.get_client(name)
@@ -290,12 +388,16 @@ class MCPService:
             "running": self.is_running,
             "startup_time": self.startup_time.isoformat() if self.startup_time else None,
             "uptime": str(datetime.now() - self.startup_time) if self.startup_time else None,
+            "startup_seconds": self.startup_seconds,
             "connection_manager": {
                 "available_servers": self.connection_manager.get_available_servers(),
-                "total_servers": len(self.connection_manager.server_configs)
+                "total_servers": len(self.connection_manager.server_configs),
+                "startup_mode": self.startup_mode,
+                "servers": self.connection_manager.get_startup_status()
             },
             "health_monitor": health_summary,
-            "server_registry": registry_status
+            "server_registry": registry_status,
+            "result_cache": self.result_cache.get_stats()
         }
     
     def enable_server(self, server_name: str) -> bool:
@@ -385,6 +487,7 @@ class MCPService:
         try:
             # Disconnect first
             await self.connection_manager.disconnect_server(server_name)
+            self.result_cache.invalidate_server(server_name)
             
             # Wait a moment
             await asyncio.sleep(1.0)
@@ -0,0 +1,92 @@
+"""
+Anthropic prompt caching helpers.
+
+Long agent sessions resend the same prefix on every turn: the system prompt,
+the tool definitions and the conversation so far.  Marking the end of that
+prefix with ``cache_control`` breakpoints lets Anthropic reuse it, which is
+faster and billed at a fraction of the input price.
+
+Breakpoints are placed on the system prompt, the last tool definition and the
+last message.  On the next turn the conversation grows past the previous last
+message, and Anthropic reads everything up to it from the cache.  Anthropic
+allows at most four breakpoints per request; these helpers use three.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+EPHEMERAL = {"type": "ephemeral"}
+
+
+def cache_system_prompt(system: Union[str, List[Dict], None]) -> Union[str, List[Dict], None]:
+    """Return the system prompt as text blocks ending with a cache breakpoint."""
+    if not system:
+        return system
+    if isinstance(system, str):
+        return [{"type": "text", "text": system, "cache_control": EPHEMERAL}]
+    return _mark_last_block(system)
+
+
+def cache_tools(tools: Optional[List[Dict]]) -> Optional[List[Dict]]:
+    """Return the tool definitions with a cache breakpoint after the last one."""
+    if not tools:
+        return tools
+    return tools[:-1] + [{**tools[-1], "cache_control": EPHEMERAL}]
+
+
+def cache_conversation(messages: List[Dict]) -> List[Dict]:
+    """Return the messages with a cache breakpoint at the end of the last one."""
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last.get("content")
+    if isinstance(content, str):
+        if not content:
+            return messages
+        content = [{"type": "text", "text": content}]
+    elif not isinstance(content, list) or not content or not isinstance(content[-1], dict):
+        # SDK objects and empty messages are sent as they are
+        return messages
+    return messages[:-1] + [{**last, "content": _mark_last_block(content)}]
+
+
+def _mark_last_block(blocks: List[Dict]) -> List[Dict]:
+    return blocks[:-1] + [{**blocks[-1], "cache_control": EPHEMERAL}]
+
+
+class PromptCacheUsage:
+    """Running totals of the cache token counts Anthropic reports per response."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.input_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+
+    def record(self, usage: Any) -> None:
+        """Add the ``usage`` of one response (SDK object or dict)."""
+        if usage is None:
+            return
+
+        def read(name: str) -> int:
+            value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+            return value or 0
+
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += read("input_tokens")
+            self.cache_read_tokens += read("cache_read_input_tokens")
+            self.cache_write_tokens += read("cache_creation_input_tokens")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Totals, and the share of prompt tokens that were read from the cache."""
+        with self._lock:
+            prompt_tokens = self.input_tokens + self.cache_read_tokens + self.cache_write_tokens
+            return {
+                "requests": self.requests,
+                "input_tokens": self.input_tokens,
+                "cache_read_tokens": self.cache_read_tokens,
+                "cache_write_tokens": self.cache_write_tokens,
+                "cache_hit_rate": self.cache_read_tokens / prompt_tokens if prompt_tokens else 0.0,
+            }
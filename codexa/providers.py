@@ -2,22 +2,234 @@
 
 import os
 import json
+import asyncio
+import threading
+import aiohttp
 import requests
 from dotenv import load_dotenv
 load_dotenv()
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Union
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterator, List, Dict, Optional, Union
 import openai
 import anthropic
 from .config import Config
+from .context_window import ContextWindow
+from .prompt_caching import PromptCacheUsage, cache_conversation, cache_system_prompt, cache_tools
+from .http_session import (HTTPSessionSettings, LoopLocal, get_shared_async_session, get_shared_session,
+                           request_with_retries)
+
+
+class ProviderError(str):
+    """An error message returned in place of a response.
+
+    Providers report failures as text so callers can show them as they are;
+    the type lets the caching and routing layers tell them apart from answers
+    whatever their wording.
+    """
+
+
+@dataclass
+class StreamChunk:
+    """One event of a streamed response.
+
+    ``type`` is ``"text"`` for a piece of answer text, ``"tool_call"`` for a
+    piece of a tool call (``tool_call`` holds ``index``, ``id``, ``name`` and
+    an ``arguments`` fragment) and ``"done"`` for the final event, whose
+    ``response`` is what ``ask()`` would have returned.
+    """
+    type: str
+    text: str = ""
+    tool_call: Optional[Dict[str, Any]] = None
+    response: Optional[Union[str, Dict]] = None
+
+
+def _field(obj: Any, name: str) -> Any:
+    """Read ``name`` from an SDK object or a plain dict."""
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+class ToolCallAccumulator:
+    """Assemble OpenAI-format tool calls from streamed deltas."""
+
+    def __init__(self):
+        self.calls: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, delta: Any) -> Dict[str, Any]:
+        """Merge one tool-call delta and return it as a ``tool_call`` event payload."""
+        index = _field(delta, 'index') or 0
+        function = _field(delta, 'function') or {}
+        call_id = _field(delta, 'id')
+        name = _field(function, 'name')
+        arguments = _field(function, 'arguments') or ""
+
+        call = self.calls.setdefault(index, {
+            'id': None,
+            'type': 'function',
+            'function': {'name': "", 'arguments': ""}
+        })
+        if call_id:
+            call['id'] = call_id
+        if name:
+            call['function']['name'] += name
+        call['function']['arguments'] += arguments
+        return {'index': index, 'id': call['id'], 'name': call['function']['name'], 'arguments': arguments}
+
+    def result(self, content: Optional[str], finish_reason: Optional[str]) -> Optional[Dict]:
+        """Build the ``ask()``-style tool call response, or None if no tool was called."""
+        if not self.calls:
+            return None
+        tool_calls = [self.calls[index] for index in sorted(self.calls)]
+        return {
+            'type': 'tool_calls',
+            'message': {'role': 'assistant', 'content': content or None, 'tool_calls': tool_calls},
+            'tool_calls': tool_calls,
+            'finish_reason': finish_reason or 'tool_calls'
+        }
+
+
+async def _iterate_in_thread(factory: Callable[[], Iterator[Any]]) -> AsyncIterator[Any]:
+    """Drive a blocking iterator in a worker thread, yielding its items on the event loop."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+    stopped = threading.Event()
+
+    def put(item: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            stopped.set()  # Event loop already closed
+
+    def produce() -> None:
+        try:
+            for item in factory():
+                if stopped.is_set():
+                    break
+                put(item)
+        except BaseException as e:
+            put(e)
+        finally:
+            put(finished)
+
+    threading.Thread(target=produce, name="codexa-stream", daemon=True).start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is finished:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+
+
+class _ChatStream:
+    """Turn OpenAI-format completion chunks (SDK objects or dicts) into stream events."""
+
+    def __init__(self, empty_response: str):
+        self.empty_response = empty_response
+        self.text_parts: List[str] = []
+        self.tool_calls = ToolCallAccumulator()
+        self.finish_reason = None
+
+    def feed(self, chunk: Any) -> List[StreamChunk]:
+        """Take one completion chunk and return the events it produces."""
+        choices = _field(chunk, 'choices') or []
+        if not choices:
+            return []
+        choice = choices[0]
+        self.finish_reason = _field(choice, 'finish_reason') or self.finish_reason
+        delta = _field(choice, 'delta')
+        if delta is None:
+            return []
+
+        events = []
+        content = _field(delta, 'content')
+        if content:
+            self.text_parts.append(content)
+            events.append(StreamChunk('text', text=content))
+        for tool_call_delta in _field(delta, 'tool_calls') or []:
+            events.append(StreamChunk('tool_call', tool_call=self.tool_calls.add(tool_call_delta)))
+        return events
+
+    def done(self) -> StreamChunk:
+        """The final event, carrying the complete response."""
+        text = ''.join(self.text_parts)
+        response = self.tool_calls.result(text, self.finish_reason)
+        return StreamChunk('done', response=response if response is not None else (text or self.empty_response))
+
+
+def _stream_chat_completion(chunks: Iterator[Any], empty_response: str) -> Iterator[StreamChunk]:
+    """Translate a blocking stream of OpenAI-format completion chunks into stream events."""
+    stream = _ChatStream(empty_response)
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    yield stream.done()
+
+
+async def _astream_chat_completion(chunks: AsyncIterator[Any], empty_response: str) -> AsyncIterator[StreamChunk]:
+    """Translate an async stream of OpenAI-format completion chunks into stream events."""
+    stream = _ChatStream(empty_response)
+    async for chunk in chunks:
+        for event in stream.feed(chunk):
+            yield event
+    yield stream.done()
+
+
+def _chat_completion_result(response: Any, empty_response: str) -> Optional[Union[str, Dict]]:
+    """Convert an OpenAI SDK chat completion into ``ask()``'s return value (None if it has no choices)."""
+    if not response.choices:
+        return None
+
+    choice = response.choices[0]
+    message = choice.message
+
+    # Check if this is a tool call response
+    if message.tool_calls:
+        return {
+            'type': 'tool_calls',
+            'message': {
+                'role': message.role,
+                'content': message.content,
+                'tool_calls': [
+                    {
+                        'id': tool_call.id,
+                        'type': tool_call.type,
+                        'function': {
+                            'name': tool_call.function.name,
+                            'arguments': tool_call.function.arguments
+                        }
+                    } for tool_call in message.tool_calls
+                ]
+            },
+            'tool_calls': message.tool_calls,
+            'finish_reason': choice.finish_reason
+        }
+
+    # Regular text response
+    return message.content or empty_response
 
 
 class AIProvider(ABC):
     """Abstract base class for AI providers."""
 
+    # Sampling temperature of every request, overridable per model
+    temperature: float = 0.3
+    model_temperatures: Optional[Dict[str, float]] = None
+
+    def temperature_for(self, model: Optional[str] = None) -> float:
+        """The temperature a request to ``model`` (default: the provider's model) is sent with."""
+        model = model or getattr(self, 'model', None)
+        return (self.model_temperatures or {}).get(model, self.temperature)
+
     @abstractmethod
-    def ask(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None, tools: Optional[List[Dict]] = None) -> Union[str, Dict]:
-        """Ask the AI provider a question with optional tool support."""
+    def ask(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+            tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Union[str, Dict]:
+        """Ask the AI provider a question with optional tool support (``model`` overrides the default for this call)."""
         pass
 
     @abstractmethod
@@ -33,12 +245,45 @@ class AIProvider(ABC):
     def ask_with_tools(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> Union[str, Dict]:
         """Send a request with tools and handle tool calling responses."""
         # Default implementation - can be overridden by subclasses
-        return "Tool calling not implemented for this provider"
+        return ProviderError("Tool calling not implemented for this provider")
 
     def continue_with_tool_results(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> str:
         """Continue conversation after tool execution with results."""
         # Default implementation - can be overridden by subclasses
-        return "Tool result continuation not implemented for this provider"
+        return ProviderError("Tool result continuation not implemented for this provider")
+
+    def stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+               tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Iterator[StreamChunk]:
+        """Stream a response as it is generated (blocking iterator)."""
+        # Default implementation - providers without streaming deliver the whole answer at once
+        response = self.ask(prompt, history, context, tools, model)
+        if isinstance(response, str):
+            yield StreamChunk('text', text=response)
+        yield StreamChunk('done', response=response)
+
+    async def ask_stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                         tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> AsyncIterator[StreamChunk]:
+        """Stream a response as it is generated, without blocking the event loop."""
+        # Default implementation - drives the blocking stream in a worker thread
+        async for chunk in _iterate_in_thread(lambda: self.stream(prompt, history, context, tools, model)):
+            yield chunk
+
+    async def ask_async(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                        tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Union[str, Dict]:
+        """Async version of ask()."""
+        # Default implementation - providers with async clients override this
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.ask, prompt, history, context, tools, model)
+
+    async def ask_with_tools_async(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> Union[str, Dict]:
+        """Async version of ask_with_tools()."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.ask_with_tools, messages, tools, model)
+
+    async def continue_with_tool_results_async(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> str:
+        """Async version of continue_with_tool_results()."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.continue_with_tool_results, messages, tools, model)
 
 
 class OpenAIProvider(AIProvider):
@@ -48,77 +293,112 @@ class OpenAIProvider(AIProvider):
         self.config = config
         self.api_key = config.get_api_key("openai")
         self.model = config.get_model("openai")
+        self.context_window = ContextWindow.from_config(getattr(config, "context_window", None))
         
         if self.api_key:
             self.client = openai.OpenAI(api_key=self.api_key)
+            # Async clients are bound to the event loop they first run on
+            self.async_clients = LoopLocal(lambda: openai.AsyncOpenAI(api_key=self.api_key))
         else:
             self.client = None
+            self.async_clients = None
 
-    def ask(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None, tools: Optional[List[Dict]] = None) -> Union[str, Dict]:
+    def ask(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+            tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Union[str, Dict]:
         """Ask OpenAI a question with optional tool support."""
         if not self.client:
-            return "Error: OpenAI API key not configured."
+            return ProviderError("Error: OpenAI API key not configured.")
 
         try:
-            messages = [
-                {"role": "system", "content": self._get_system_prompt(context)}
-            ]
-
-            # Add conversation history
-            if history:
-                for msg in history[-10:]:  # Keep last 10 messages to avoid token limits
-                    messages.append({"role": "user", "content": msg.get("user", "")})
-                    messages.append({"role": "assistant", "content": msg.get("assistant", "")})
-
-            messages.append({"role": "user", "content": prompt})
-
-            # Prepare request parameters
-            request_params = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.3,
-                "max_tokens": 2048
-            }
+            response = self.client.chat.completions.create(**self._request_params(prompt, history, context, tools, model))
+            result = _chat_completion_result(response, ProviderError("No response from OpenAI."))
+            return result if result is not None else ProviderError("Unexpected response format from OpenAI.")
 
-            # Add tools if provided
-            if tools:
-                request_params["tools"] = tools
+        except Exception as e:
+            return ProviderError(f"Error calling OpenAI: {str(e)}")
 
-            response = self.client.chat.completions.create(**request_params)
+    async def ask_async(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                        tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Union[str, Dict]:
+        """Ask OpenAI a question using the async client."""
+        if not self.client:
+            return ProviderError("Error: OpenAI API key not configured.")
 
-            if response.choices and len(response.choices) > 0:
-                choice = response.choices[0]
-                message = choice.message
+        try:
+            client = self.async_clients.get()
+            response = await client.chat.completions.create(**self._request_params(prompt, history, context, tools, model))
+            result = _chat_completion_result(response, ProviderError("No response from OpenAI."))
+            return result if result is not None else ProviderError("Unexpected response format from OpenAI.")
 
-                # Check if this is a tool call response
-                if message.tool_calls:
-                    return {
-                        'type': 'tool_calls',
-                        'message': {
-                            'role': message.role,
-                            'content': message.content,
-                            'tool_calls': [
-                                {
-                                    'id': tool_call.id,
-                                    'type': tool_call.type,
-                                    'function': {
-                                        'name': tool_call.function.name,
-                                        'arguments': tool_call.function.arguments
-                                    }
-                                } for tool_call in message.tool_calls
-                            ]
-                        },
-                        'tool_calls': message.tool_calls,
-                        'finish_reason': choice.finish_reason
-                    }
+        except Exception as e:
+            return ProviderError(f"Error calling OpenAI: {str(e)}")
 
-                # Regular text response
-                return message.content or "No response from OpenAI."
-            else:
-                return "Unexpected response format from OpenAI."
+    def stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+               tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Iterator[StreamChunk]:
+        """Stream an answer from OpenAI, including tool call deltas."""
+        if not self.client:
+            yield StreamChunk('done', response=ProviderError("Error: OpenAI API key not configured."))
+            return
+
+        try:
+            params = self._request_params(prompt, history, context, tools, model, stream=True)
+            yield from _stream_chat_completion(self.client.chat.completions.create(**params),
+                                               ProviderError("No response from OpenAI."))
 
         except Exception as e:
-            return f"Error calling OpenAI: {str(e)}"
+            yield StreamChunk('done', response=ProviderError(f"Error calling OpenAI: {str(e)}"))
+
+    async def ask_stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                         tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> AsyncIterator[StreamChunk]:
+        """Stream an answer from OpenAI using the async client."""
+        if not self.client:
+            yield StreamChunk('done', response=ProviderError("Error: OpenAI API key not configured."))
+            return
+
+        try:
+            client = self.async_clients.get()
+            params = self._request_params(prompt, history, context, tools, model, stream=True)
+            async for chunk in _astream_chat_completion(await client.chat.completions.create(**params),
+                                                        ProviderError("No response from OpenAI.")):
+                yield chunk
+
+        except Exception as e:
+            yield StreamChunk('done', response=ProviderError(f"Error calling OpenAI: {str(e)}"))
+
+    def _request_params(self, prompt: str, history: Optional[List[Dict]], context: Optional[str],
+                        tools: Optional[List[Dict]], model: Optional[str] = None, stream: bool = False) -> Dict:
+        """Build the chat completion request parameters."""
+        request_params = {
+            "model": model or self.model,
+            "messages": self._build_messages(prompt, history, context, tools, model),
+            "temperature": self.temperature_for(model),
+            "max_tokens": 2048
+        }
+        if stream:
+            request_params["stream"] = True
+
+        # Add tools if provided
+        if tools:
+            request_params["tools"] = tools
+        return request_params
+
+    def _build_messages(self, prompt: str, history: Optional[List[Dict]], context: Optional[str],
+                        tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> List[Dict]:
+        """Build the chat messages for a prompt, its history and project context."""
+        # Keep as much recent history as fits the token budget
+        system, history = self.context_window.pack(self._get_system_prompt(context), history, prompt,
+                                                   model or self.model, tools)
+        messages = [
+            {"role": "system", "content": system}
+        ]
+
+        # Add conversation history
+        if history:
+            for msg in history:
+                messages.append({"role": "user", "content": msg.get("user", "")})
+                messages.append({"role": "assistant", "content": msg.get("assistant", "")})
+
+        messages.append({"role": "user", "content": prompt})
+        return messages
 
     def is_available(self) -> bool:
         """Check if OpenAI is available."""
@@ -156,6 +436,62 @@ class OpenAIProvider(AIProvider):
         return get_codexa_system_prompt(context)
 
 
+class _AnthropicStream:
+    """Turn Anthropic message stream events into stream events."""
+
+    def __init__(self, usage: Optional[PromptCacheUsage] = None):
+        self.text_parts: List[str] = []
+        self.tool_uses: Dict[int, Dict[str, str]] = {}  # content block index -> id, name, input JSON
+        self.usage = usage
+
+    def feed(self, event: Any) -> List[StreamChunk]:
+        """Take one raw stream event and return the events it produces."""
+        if event.type == 'message_start' and self.usage is not None:
+            self.usage.record(getattr(event.message, 'usage', None))
+            return []
+
+        if event.type == 'content_block_start' and event.content_block.type == 'tool_use':
+            block = event.content_block
+            self.tool_uses[event.index] = {'id': block.id, 'name': block.name, 'input': ""}
+            return [StreamChunk('tool_call', tool_call={
+                'index': event.index, 'id': block.id, 'name': block.name, 'arguments': ""
+            })]
+
+        if event.type == 'content_block_delta':
+            delta = event.delta
+            if delta.type == 'text_delta':
+                self.text_parts.append(delta.text)
+                return [StreamChunk('text', text=delta.text)]
+            if delta.type == 'input_json_delta' and event.index in self.tool_uses:
+                tool_use = self.tool_uses[event.index]
+                tool_use['input'] += delta.partial_json
+                return [StreamChunk('tool_call', tool_call={
+                    'index': event.index, 'id': tool_use['id'], 'name': tool_use['name'],
+                    'arguments': delta.partial_json
+                })]
+        return []
+
+    def done(self) -> StreamChunk:
+        """The final event, carrying the complete response."""
+        if not self.tool_uses:
+            return StreamChunk('done', response=''.join(self.text_parts) or ProviderError("No response from Anthropic."))
+
+        tool_calls = [{
+            'id': tool_use['id'],
+            'type': 'function',
+            'function': {
+                'name': tool_use['name'],
+                'arguments': json.loads(tool_use['input']) if tool_use['input'] else {}
+            }
+        } for _, tool_use in sorted(self.tool_uses.items())]
+        return StreamChunk('done', response={
+            'type': 'tool_calls',
+            'message': {'role': 'assistant', 'content': None, 'tool_calls': tool_calls},
+            'tool_calls': tool_calls,
+            'finish_reason': 'tool_calls'
+        })
+
+
 class AnthropicProvider(AIProvider):
     """Anthropic (Claude) provider implementation."""
 
@@ -163,83 +499,157 @@ class AnthropicProvider(AIProvider):
         self.config = config
         self.api_key = config.get_api_key("anthropic")
         self.model = config.get_model("anthropic")
+        self.context_window = ContextWindow.from_config(getattr(config, "context_window", None))
+        # Cache breakpoints on the system prompt, tools and conversation
+        self.prompt_caching = getattr(config, "anthropic_prompt_caching", True)
+        self.prompt_cache_usage = PromptCacheUsage()
         
         if self.api_key:
             self.client = anthropic.Anthropic(api_key=self.api_key)
+            # Async clients are bound to the event loop they first run on
+            self.async_clients = LoopLocal(lambda: anthropic.AsyncAnthropic(api_key=self.api_key))
         else:
             self.client = None
+            self.async_clients = None
 
-    def ask(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None, tools: Optional[List[Dict]] = None) -> Union[str, Dict]:
+    def ask(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+            tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Union[str, Dict]:
         """Ask Anthropic a question with optional tool support."""
         if not self.client:
-            return "Error: Anthropic API key not configured."
+            return ProviderError("Error: Anthropic API key not configured.")
 
         try:
-            system_prompt = self._get_system_prompt(context)
-
-            messages = []
-
-            # Add conversation history
-            if history:
-                for msg in history[-10:]:  # Keep last 10 messages to avoid token limits
-                    if msg.get("user"):
-                        messages.append({"role": "user", "content": msg["user"]})
-                    if msg.get("assistant"):
-                        messages.append({"role": "assistant", "content": msg["assistant"]})
-
-            messages.append({"role": "user", "content": prompt})
-
-            # Prepare request parameters
-            request_params = {
-                "model": self.model,
-                "max_tokens": 2048,
-                "temperature": 0.3,
-                "system": system_prompt,
-                "messages": messages
-            }
+            response = self.client.messages.create(**self._request_params(prompt, history, context, tools, model))
+            self.prompt_cache_usage.record(getattr(response, 'usage', None))
+            return self._message_result(response)
 
-            # Add tools if provided (Anthropic uses 'tools' parameter)
-            if tools:
-                request_params["tools"] = tools
-
-            response = self.client.messages.create(**request_params)
-
-            if response.content and len(response.content) > 0:
-                # Check for tool calls in Anthropic's response format
-                for content_block in response.content:
-                    if hasattr(content_block, 'type') and content_block.type == 'tool_use':
-                        return {
-                            'type': 'tool_calls',
-                            'message': {
-                                'role': 'assistant',
-                                'content': None,
-                                'tool_calls': [{
-                                    'id': content_block.id,
-                                    'type': 'function',
-                                    'function': {
-                                        'name': content_block.name,
-                                        'arguments': content_block.input
-                                    }
-                                }]
-                            },
-                            'tool_calls': [{
-                                'id': content_block.id,
-                                'type': 'function',
-                                'function': {
-                                    'name': content_block.name,
-                                    'arguments': content_block.input
-                                }
-                            }],
-                            'finish_reason': 'tool_calls'
-                        }
+        except Exception as e:
+            return ProviderError(f"Error calling Anthropic: {str(e)}")
 
-                # Regular text response
-                return response.content[0].text
-            else:
-                return "No response from Anthropic."
+    async def ask_async(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                        tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Union[str, Dict]:
+        """Ask Anthropic a question using the async client."""
+        if not self.client:
+            return ProviderError("Error: Anthropic API key not configured.")
+
+        try:
+            client = self.async_clients.get()
+            response = await client.messages.create(**self._request_params(prompt, history, context, tools, model))
+            self.prompt_cache_usage.record(getattr(response, 'usage', None))
+            return self._message_result(response)
+
+        except Exception as e:
+            return ProviderError(f"Error calling Anthropic: {str(e)}")
+
+    def stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+               tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Iterator[StreamChunk]:
+        """Stream an answer from Anthropic, including tool use input deltas."""
+        if not self.client:
+            yield StreamChunk('done', response=ProviderError("Error: Anthropic API key not configured."))
+            return
+
+        try:
+            stream = _AnthropicStream(self.prompt_cache_usage)
+            params = self._request_params(prompt, history, context, tools, model, stream=True)
+            for event in self.client.messages.create(**params):
+                yield from stream.feed(event)
+            yield stream.done()
+
+        except Exception as e:
+            yield StreamChunk('done', response=ProviderError(f"Error calling Anthropic: {str(e)}"))
+
+    async def ask_stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                         tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> AsyncIterator[StreamChunk]:
+        """Stream an answer from Anthropic using the async client."""
+        if not self.client:
+            yield StreamChunk('done', response=ProviderError("Error: Anthropic API key not configured."))
+            return
+
+        try:
+            client = self.async_clients.get()
+            stream = _AnthropicStream(self.prompt_cache_usage)
+            params = self._request_params(prompt, history, context, tools, model, stream=True)
+            async for event in await client.messages.create(**params):
+                for chunk in stream.feed(event):
+                    yield chunk
+            yield stream.done()
 
         except Exception as e:
-            return f"Error calling Anthropic: {str(e)}"
+            yield StreamChunk('done', response=ProviderError(f"Error calling Anthropic: {str(e)}"))
+
+    def _request_params(self, prompt: str, history: Optional[List[Dict]], context: Optional[str],
+                        tools: Optional[List[Dict]], model: Optional[str] = None, stream: bool = False) -> Dict:
+        """Build the messages request parameters."""
+        # Keep as much recent history as fits the token budget
+        system, history = self.context_window.pack(self._get_system_prompt(context), history, prompt,
+                                                   model or self.model, tools)
+        request_params = {
+            "model": model or self.model,
+            "max_tokens": 2048,
+            "temperature": self.temperature_for(model),
+            "system": system,
+            "messages": self._build_messages(prompt, history)
+        }
+        if stream:
+            request_params["stream"] = True
+
+        # Add tools if provided (Anthropic uses 'tools' parameter)
+        if tools:
+            request_params["tools"] = tools
+
+        if self.prompt_caching:
+            # The system prompt, tools and earlier turns are identical on the next turn
+            request_params["system"] = cache_system_prompt(request_params["system"])
+            request_params["messages"] = cache_conversation(request_params["messages"])
+            if tools:
+                request_params["tools"] = cache_tools(tools)
+        return request_params
+
+    @staticmethod
+    def _message_result(response: Any) -> Union[str, Dict]:
+        """Convert an Anthropic message into ``ask()``'s return value."""
+        if not response.content:
+            return ProviderError("No response from Anthropic.")
+
+        # Check for tool calls in Anthropic's response format
+        for content_block in response.content:
+            if hasattr(content_block, 'type') and content_block.type == 'tool_use':
+                tool_calls = [{
+                    'id': content_block.id,
+                    'type': 'function',
+                    'function': {
+                        'name': content_block.name,
+                        'arguments': content_block.input
+                    }
+                }]
+                return {
+                    'type': 'tool_calls',
+                    'message': {
+                        'role': 'assistant',
+                        'content': None,
+                        'tool_calls': tool_calls
+                    },
+                    'tool_calls': tool_calls,
+                    'finish_reason': 'tool_calls'
+                }
+
+        # Regular text response
+        return response.content[0].text
+
+    def _build_messages(self, prompt: str, history: Optional[List[Dict]]) -> List[Dict]:
+        """Build the conversation messages for a prompt and its history."""
+        messages = []
+
+        # Add conversation history (already fitted to the token budget)
+        if history:
+            for msg in history:
+                if msg.get("user"):
+                    messages.append({"role": "user", "content": msg["user"]})
+                if msg.get("assistant"):
+                    messages.append({"role": "assistant", "content": msg["assistant"]})
+
+        messages.append({"role": "user", "content": prompt})
+        return messages
 
     def is_available(self) -> bool:
         """Check if Anthropic is available."""
@@ -283,6 +693,14 @@ class AnthropicProvider(AIProvider):
         return get_codexa_system_prompt(context)
 
 
+class _OpenRouterStreamError(Exception):
+    """An error event received in the middle of an OpenRouter stream."""
+
+
+# Marks the "data: [DONE]" event that ends a server-sent event stream
+_SSE_DONE = object()
+
+
 class OpenRouterProvider(AIProvider):
     """OpenRouter provider implementation."""
 
@@ -290,7 +708,14 @@ class OpenRouterProvider(AIProvider):
         self.config = config
         self.api_key = config.get_api_key("openrouter")
         self.model = config.get_model("openrouter")
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.context_window = ContextWindow.from_config(getattr(config, "context_window", None))
+        self.api_base = getattr(config, "openrouter_base_url", None) or "https://openrouter.ai/api/v1"
+        self.base_url = f"{self.api_base.rstrip('/')}/chat/completions"
+
+        # Pooled keep-alive connections shared by every OpenRouterProvider with the same settings
+        self.http_settings = HTTPSessionSettings.from_dict(getattr(config, "openrouter_http", None))
+        self.session = get_shared_session(self.http_settings)
+        self.timeout = self.http_settings.timeout
         
         # Set up headers exactly as OpenRouter requires
         self.headers = {
@@ -300,191 +725,257 @@ class OpenRouterProvider(AIProvider):
             "X-Title": "Codexa - AI Coding Assistant",  # Optional site title for rankings
         }
 
-    def ask(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None, tools: Optional[List[Dict]] = None) -> Union[str, Dict]:
+    def ask(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+            tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Union[str, Dict]:
         """Ask OpenRouter a question with optional tool support."""
         if not self.api_key:
-            return "Error: OpenRouter API key not configured."
-
-        try:
-            messages = [
-                {"role": "system", "content": self._get_system_prompt(context)}
-            ]
-
-            # Add conversation history
-            if history:
-                for msg in history[-10:]:  # Keep last 10 messages to avoid token limits
-                    if msg.get("user"):
-                        messages.append({"role": "user", "content": msg["user"]})
-                    if msg.get("assistant"):
-                        messages.append({"role": "assistant", "content": msg["assistant"]})
-
-            messages.append({"role": "user", "content": prompt})
-
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.3,
-                "max_tokens": 2048,
-                "stream": False
-            }
-
-            # Add tools if provided
-            if tools:
-                payload["tools"] = tools
-
-            response = requests.post(
-                self.base_url,
-                json=payload,
-                headers=self.headers,
-                timeout=60  # Increased timeout for OpenRouter
-            )
+            return ProviderError("Error: OpenRouter API key not configured.")
+        return self._complete(self._payload(self._build_messages(prompt, history, context, tools, model), tools or None, model))
 
-            # Check for HTTP errors
-            if response.status_code != 200:
-                error_detail = ""
-                try:
-                    error_data = response.json()
-                    error_detail = error_data.get('error', {}).get('message', str(error_data))
-                except:
-                    error_detail = response.text
-                return f"OpenRouter API error ({response.status_code}): {error_detail}"
+    async def ask_async(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                        tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Union[str, Dict]:
+        """Ask OpenRouter a question over the async HTTP session."""
+        if not self.api_key:
+            return ProviderError("Error: OpenRouter API key not configured.")
+        return await self._complete_async(self._payload(self._build_messages(prompt, history, context, tools, model), tools or None, model))
 
-            data = response.json()
+    def ask_with_tools(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> Union[str, Dict]:
+        """Send a request with tools and handle tool calling responses."""
+        if not self.api_key:
+            return ProviderError("Error: OpenRouter API key not configured.")
+        return self._complete(self._payload(messages, tools, model))
 
-            # Handle OpenRouter error responses
-            if 'error' in data:
-                error_msg = data['error'].get('message', str(data['error']))
-                return f"OpenRouter error: {error_msg}"
+    async def ask_with_tools_async(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> Union[str, Dict]:
+        """Send a request with tools over the async HTTP session."""
+        if not self.api_key:
+            return ProviderError("Error: OpenRouter API key not configured.")
+        return await self._complete_async(self._payload(messages, tools, model))
 
-            if 'choices' in data and len(data['choices']) > 0:
-                choice = data['choices'][0]
-                message = choice['message']
+    def continue_with_tool_results(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> str:
+        """Continue conversation after tool execution with results."""
+        if not self.api_key:
+            return ProviderError("Error: OpenRouter API key not configured.")
+        # Tools must be included in every request
+        return self._complete(self._payload(messages, tools, model), allow_tool_calls=False)
 
-                # Check if this is a tool call response
-                if message.get('tool_calls'):
-                    return {
-                        'type': 'tool_calls',
-                        'message': message,
-                        'tool_calls': message['tool_calls'],
-                        'finish_reason': choice.get('finish_reason', 'tool_calls')
-                    }
+    async def continue_with_tool_results_async(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> str:
+        """Continue conversation after tool execution over the async HTTP session."""
+        if not self.api_key:
+            return ProviderError("Error: OpenRouter API key not configured.")
+        return await self._complete_async(self._payload(messages, tools, model), allow_tool_calls=False)
 
-                # Regular text response
-                return message.get('content', "No response from OpenRouter.")
-            else:
-                return f"Unexpected response format from OpenRouter: {data}"
+    def stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+               tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Iterator[StreamChunk]:
+        """Stream an answer from OpenRouter over server-sent events, including tool call deltas."""
+        if not self.api_key:
+            yield StreamChunk('done', response=ProviderError("Error: OpenRouter API key not configured."))
+            return
 
+        try:
+            payload = self._payload(self._build_messages(prompt, history, context, tools, model), tools or None, model, stream=True)
+            with self.session.post(self.base_url, json=payload, headers=self.headers,
+                                   timeout=self.timeout, stream=True) as response:
+                if response.status_code != 200:
+                    yield StreamChunk('done', response=self._http_error(response.status_code, response.text))
+                    return
+                yield from _stream_chat_completion(self._iter_events(response), ProviderError("No response from OpenRouter."))
+
+        except _OpenRouterStreamError as e:
+            yield StreamChunk('done', response=ProviderError(f"OpenRouter error: {e}"))
         except requests.exceptions.Timeout:
-            return "OpenRouter request timed out. Please try again."
+            yield StreamChunk('done', response=ProviderError("OpenRouter request timed out. Please try again."))
         except requests.exceptions.ConnectionError:
-            return "Failed to connect to OpenRouter. Please check your internet connection."
-        except requests.exceptions.RequestException as e:
-            return f"Network error calling OpenRouter: {str(e)}"
+            yield StreamChunk('done', response=ProviderError("Failed to connect to OpenRouter. Please check your internet connection."))
         except Exception as e:
-            return f"Error calling OpenRouter: {str(e)}"
+            yield StreamChunk('done', response=ProviderError(f"Error calling OpenRouter: {str(e)}"))
 
-    def ask_with_tools(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> Union[str, Dict]:
-        """Send a request with tools and handle tool calling responses."""
+    async def ask_stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                         tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> AsyncIterator[StreamChunk]:
+        """Stream an answer from OpenRouter over the async HTTP session."""
         if not self.api_key:
-            return "Error: OpenRouter API key not configured."
+            yield StreamChunk('done', response=ProviderError("Error: OpenRouter API key not configured."))
+            return
 
         try:
-            payload = {
-                "model": model or self.model,
-                "messages": messages,
-                "tools": tools,
-                "temperature": 0.3,
-                "max_tokens": 2048,
-                "stream": False
-            }
+            payload = self._payload(self._build_messages(prompt, history, context, tools, model), tools or None, model, stream=True)
+            response = await request_with_retries(get_shared_async_session(self.http_settings), "POST",
+                                                  self.base_url, self.http_settings,
+                                                  json=payload, headers=self.headers)
+            async with response:
+                if response.status != 200:
+                    yield StreamChunk('done', response=self._http_error(response.status, await response.text()))
+                    return
+                async for chunk in _astream_chat_completion(self._aiter_events(response), ProviderError("No response from OpenRouter.")):
+                    yield chunk
+
+        except _OpenRouterStreamError as e:
+            yield StreamChunk('done', response=ProviderError(f"OpenRouter error: {e}"))
+        except asyncio.TimeoutError:
+            yield StreamChunk('done', response=ProviderError("OpenRouter request timed out. Please try again."))
+        except aiohttp.ClientConnectionError:
+            yield StreamChunk('done', response=ProviderError("Failed to connect to OpenRouter. Please check your internet connection."))
+        except Exception as e:
+            yield StreamChunk('done', response=ProviderError(f"Error calling OpenRouter: {str(e)}"))
+
+    def _payload(self, messages: List[Dict], tools: Optional[List[Dict]], model: Optional[str] = None,
+                 stream: bool = False) -> Dict:
+        """Build a chat completion request body."""
+        payload = {
+            "model": model or self.model,
+            # Tool-calling conversations grow with every round; keep them within the token budget
+            "messages": self.context_window.fit_messages(messages, tools, model or self.model),
+            "temperature": self.temperature_for(model),
+            "max_tokens": 2048,
+            "stream": stream
+        }
+        if tools is not None:
+            payload["tools"] = tools
+        return payload
 
-            response = requests.post(
+    def _complete(self, payload: Dict, allow_tool_calls: bool = True) -> Union[str, Dict]:
+        """Post a chat completion request on the pooled session."""
+        try:
+            response = self.session.post(
                 self.base_url,
                 json=payload,
                 headers=self.headers,
-                timeout=60
+                timeout=self.timeout
             )
 
+            # Check for HTTP errors
             if response.status_code != 200:
-                error_detail = ""
-                try:
-                    error_data = response.json()
-                    error_detail = error_data.get('error', {}).get('message', str(error_data))
-                except:
-                    error_detail = response.text
-                return f"OpenRouter API error ({response.status_code}): {error_detail}"
+                return self._http_error(response.status_code, response.text)
 
-            data = response.json()
+            return self._completion_result(response.json(), allow_tool_calls)
 
-            if 'error' in data:
-                error_msg = data['error'].get('message', str(data['error']))
-                return f"OpenRouter error: {error_msg}"
+        except requests.exceptions.Timeout:
+            return ProviderError("OpenRouter request timed out. Please try again.")
+        except requests.exceptions.ConnectionError:
+            return ProviderError("Failed to connect to OpenRouter. Please check your internet connection.")
+        except requests.exceptions.RequestException as e:
+            return ProviderError(f"Network error calling OpenRouter: {str(e)}")
+        except Exception as e:
+            return ProviderError(f"Error calling OpenRouter: {str(e)}")
 
-            if 'choices' in data and len(data['choices']) > 0:
-                choice = data['choices'][0]
-                message = choice['message']
+    async def _complete_async(self, payload: Dict, allow_tool_calls: bool = True) -> Union[str, Dict]:
+        """Post a chat completion request on the event loop's shared aiohttp session."""
+        try:
+            response = await request_with_retries(get_shared_async_session(self.http_settings), "POST",
+                                                  self.base_url, self.http_settings,
+                                                  json=payload, headers=self.headers)
+            async with response:
+                body = await response.text()
 
-                # Return tool calls if present
-                if message.get('tool_calls'):
-                    return {
-                        'type': 'tool_calls',
-                        'message': message,
-                        'tool_calls': message['tool_calls'],
-                        'finish_reason': choice.get('finish_reason', 'tool_calls')
-                    }
+            # Check for HTTP errors
+            if response.status != 200:
+                return self._http_error(response.status, body)
 
-                # Regular response
-                return message.get('content', "No response from OpenRouter.")
-            else:
-                return f"Unexpected response format from OpenRouter: {data}"
+            return self._completion_result(json.loads(body), allow_tool_calls)
 
+        except asyncio.TimeoutError:
+            return ProviderError("OpenRouter request timed out. Please try again.")
+        except aiohttp.ClientConnectionError:
+            return ProviderError("Failed to connect to OpenRouter. Please check your internet connection.")
+        except aiohttp.ClientError as e:
+            return ProviderError(f"Network error calling OpenRouter: {str(e)}")
         except Exception as e:
-            return f"Error calling OpenRouter: {str(e)}"
-
-    def continue_with_tool_results(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> str:
-        """Continue conversation after tool execution with results."""
-        if not self.api_key:
-            return "Error: OpenRouter API key not configured."
+            return ProviderError(f"Error calling OpenRouter: {str(e)}")
 
-        try:
-            payload = {
-                "model": model or self.model,
-                "messages": messages,
-                "tools": tools,  # Must include tools in every request
-                "temperature": 0.3,
-                "max_tokens": 2048,
-                "stream": False
-            }
+    @staticmethod
+    def _completion_result(data: Dict, allow_tool_calls: bool = True) -> Union[str, Dict]:
+        """Convert a chat completion response body into ``ask()``'s return value."""
+        # Handle OpenRouter error responses
+        if 'error' in data:
+            error_msg = data['error'].get('message', str(data['error']))
+            return ProviderError(f"OpenRouter error: {error_msg}")
+
+        if 'choices' in data and len(data['choices']) > 0:
+            choice = data['choices'][0]
+            message = choice['message']
+
+            # Check if this is a tool call response
+            if allow_tool_calls and message.get('tool_calls'):
+                return {
+                    'type': 'tool_calls',
+                    'message': message,
+                    'tool_calls': message['tool_calls'],
+                    'finish_reason': choice.get('finish_reason', 'tool_calls')
+                }
 
-            response = requests.post(
-                self.base_url,
-                json=payload,
-                headers=self.headers,
-                timeout=60
-            )
+            # Regular text response
+            return message.get('content', ProviderError("No response from OpenRouter."))
+        else:
+            return ProviderError(f"Unexpected response format from OpenRouter: {data}")
 
-            if response.status_code != 200:
-                error_detail = ""
-                try:
-                    error_data = response.json()
-                    error_detail = error_data.get('error', {}).get('message', str(error_data))
-                except:
-                    error_detail = response.text
-                return f"OpenRouter API error ({response.status_code}): {error_detail}"
+    @staticmethod
+    def _parse_event(line: str) -> Any:
+        """
+        Parse one server-sent event line.
 
-            data = response.json()
+        Returns the completion chunk, None for lines without one, or
+        ``_SSE_DONE`` at the end of the stream.
+        """
+        if not line.startswith('data:'):
+            return None  # Blank separators and ": OPENROUTER PROCESSING" keep-alive comments
+        data = line[5:].strip()
+        if data == '[DONE]':
+            return _SSE_DONE
+        event = json.loads(data)
+        if 'error' in event:
+            error = event['error']
+            raise _OpenRouterStreamError(error.get('message', str(error)) if isinstance(error, dict) else str(error))
+        return event
+
+    def _iter_events(self, response: requests.Response) -> Iterator[Dict]:
+        """Parse the completion chunks out of a blocking server-sent event stream."""
+        response.encoding = 'utf-8'
+        # chunk_size=None hands each line on as soon as its chunk arrives instead of buffering 512 bytes
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            event = self._parse_event(line)
+            if event is _SSE_DONE:
+                return
+            if event is not None:
+                yield event
+
+    async def _aiter_events(self, response: aiohttp.ClientResponse) -> AsyncIterator[Dict]:
+        """Parse the completion chunks out of an async server-sent event stream."""
+        async for raw_line in response.content:
+            event = self._parse_event(raw_line.decode('utf-8', errors='replace').strip())
+            if event is _SSE_DONE:
+                return
+            if event is not None:
+                yield event
+
+    def _build_messages(self, prompt: str, history: Optional[List[Dict]], context: Optional[str],
+                        tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> List[Dict]:
+        """Build the chat messages for a prompt, its history and project context."""
+        # Keep as much recent history as fits the token budget
+        system, history = self.context_window.pack(self._get_system_prompt(context), history, prompt,
+                                                   model or self.model, tools)
+        messages = [
+            {"role": "system", "content": system}
+        ]
 
-            if 'error' in data:
-                error_msg = data['error'].get('message', str(data['error']))
-                return f"OpenRouter error: {error_msg}"
+        # Add conversation history
+        if history:
+            for msg in history:
+                if msg.get("user"):
+                    messages.append({"role": "user", "content": msg["user"]})
+                if msg.get("assistant"):
+                    messages.append({"role": "assistant", "content": msg["assistant"]})
 
-            if 'choices' in data and len(data['choices']) > 0:
-                return data['choices'][0]['message'].get('content', "No response from OpenRouter.")
-            else:
-                return f"Unexpected response format from OpenRouter: {data}"
+        messages.append({"role": "user", "content": prompt})
+        return messages
 
-        except Exception as e:
-            return f"Error calling OpenRouter: {str(e)}"
+    @staticmethod
+    def _http_error(status: int, body: str) -> str:
+        """Describe an unsuccessful OpenRouter HTTP response."""
+        try:
+            error_data = json.loads(body)
+            error_detail = error_data.get('error', {}).get('message', str(error_data))
+        except Exception:
+            error_detail = body
+        return ProviderError(f"OpenRouter API error ({status}): {error_detail}")
 
     def is_available(self) -> bool:
         """Check if OpenRouter is available."""
@@ -496,7 +987,7 @@ class OpenRouterProvider(AIProvider):
             return []
         
         try:
-            models_url = "https://openrouter.ai/api/v1/models"
+            models_url = f"{self.api_base.rstrip('/')}/models"
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
@@ -504,7 +995,7 @@ class OpenRouterProvider(AIProvider):
                 "X-Title": "Codexa - AI Coding Assistant",
             }
             
-            response = requests.get(models_url, headers=headers, timeout=30)
+            response = self.session.get(models_url, headers=headers, timeout=30)
             
             if response.status_code != 200:
                 print(f"Error fetching OpenRouter models: {response.status_code}")
@@ -547,168 +1038,183 @@ class OpenRouterOAIProvider(AIProvider):
         self.config = config
         self.api_key = config.get_api_key("openrouter")
         self.model = config.get_model("openrouter")
+        self.context_window = ContextWindow.from_config(getattr(config, "context_window", None))
 
         if self.api_key:
-            self.client = openai.OpenAI(
-                base_url="https://openrouter.ai/api/v1",
-                api_key=self.api_key,
-                default_headers={
+            client_options = {
+                "base_url": "https://openrouter.ai/api/v1",
+                "api_key": self.api_key,
+                "default_headers": {
                     "HTTP-Referer": "https://codexa.ai",
                     "X-Title": "Codexa - AI Coding Assistant",
                 }
-            )
+            }
+            self.client = openai.OpenAI(**client_options)
+            # Async clients are bound to the event loop they first run on
+            self.async_clients = LoopLocal(lambda: openai.AsyncOpenAI(**client_options))
         else:
             self.client = None
+            self.async_clients = None
 
-    def ask(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None, tools: Optional[List[Dict]] = None) -> Union[str, Dict]:
+    def ask(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+            tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Union[str, Dict]:
         """Ask OpenRouter a question using OpenAI client."""
         if not self.client:
-            return "Error: OpenRouter API key not configured."
+            return ProviderError("Error: OpenRouter API key not configured.")
 
         try:
-            messages = [
-                {"role": "system", "content": self._get_system_prompt(context)}
-            ]
-            
-            # Add conversation history
-            if history:
-                for msg in history[-10:]:  # Keep last 10 messages to avoid token limits
-                    if msg.get("user"):
-                        messages.append({"role": "user", "content": msg["user"]})
-                    if msg.get("assistant"):
-                        messages.append({"role": "assistant", "content": msg["assistant"]})
+            params = self._request_params(self._build_messages(prompt, history, context, tools, model), tools or None, model)
+            response = self.client.chat.completions.create(**params)
+            return _chat_completion_result(response, ProviderError("No response from OpenRouter."))
             
-            messages.append({"role": "user", "content": prompt})
-
-            # Prepare request parameters
-            request_params = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.3,
-                "max_tokens": 2048,
-                "extra_headers": {
-                    "HTTP-Referer": "https://codexa.ai",  # Optional site URL for rankings
-                    "X-Title": "Codexa - AI Coding Assistant",  # Optional site title for rankings
-                },
-                "extra_body": {}
-            }
+        except Exception as e:
+            return ProviderError(f"Error calling OpenRouter (OAI): {str(e)}")
 
-            # Add tools if provided
-            if tools:
-                request_params["tools"] = tools
+    async def ask_async(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                        tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Union[str, Dict]:
+        """Ask OpenRouter a question using the async OpenAI client."""
+        if not self.client:
+            return ProviderError("Error: OpenRouter API key not configured.")
 
-            response = self.client.chat.completions.create(**request_params)
+        try:
+            params = self._request_params(self._build_messages(prompt, history, context, tools, model), tools or None, model)
+            response = await self.async_clients.get().chat.completions.create(**params)
+            return _chat_completion_result(response, ProviderError("No response from OpenRouter."))
 
-            if response.choices and len(response.choices) > 0:
-                choice = response.choices[0]
-                message = choice.message
+        except Exception as e:
+            return ProviderError(f"Error calling OpenRouter (OAI): {str(e)}")
 
-                # Check if this is a tool call response
-                if message.tool_calls:
-                    return {
-                        'type': 'tool_calls',
-                        'message': {
-                            'role': message.role,
-                            'content': message.content,
-                            'tool_calls': [
-                                {
-                                    'id': tool_call.id,
-                                    'type': tool_call.type,
-                                    'function': {
-                                        'name': tool_call.function.name,
-                                        'arguments': tool_call.function.arguments
-                                    }
-                                } for tool_call in message.tool_calls
-                            ]
-                        },
-                        'tool_calls': message.tool_calls,
-                        'finish_reason': choice.finish_reason
-                    }
+    def stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+               tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> Iterator[StreamChunk]:
+        """Stream an answer from OpenRouter using the OpenAI client, including tool call deltas."""
+        if not self.client:
+            yield StreamChunk('done', response=ProviderError("Error: OpenRouter API key not configured."))
+            return
+
+        try:
+            params = self._request_params(self._build_messages(prompt, history, context, tools, model), tools or None, model, stream=True)
+            yield from _stream_chat_completion(self.client.chat.completions.create(**params),
+                                               ProviderError("No response from OpenRouter."))
 
-                # Regular text response
-                return message.content or "No response from OpenRouter."
-            
         except Exception as e:
-            return f"Error calling OpenRouter (OAI): {str(e)}"
+            yield StreamChunk('done', response=ProviderError(f"Error calling OpenRouter (OAI): {str(e)}"))
+
+    async def ask_stream(self, prompt: str, history: Optional[List[Dict]] = None, context: Optional[str] = None,
+                         tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> AsyncIterator[StreamChunk]:
+        """Stream an answer from OpenRouter using the async OpenAI client."""
+        if not self.client:
+            yield StreamChunk('done', response=ProviderError("Error: OpenRouter API key not configured."))
+            return
+
+        try:
+            params = self._request_params(self._build_messages(prompt, history, context, tools, model), tools or None, model, stream=True)
+            stream = await self.async_clients.get().chat.completions.create(**params)
+            async for chunk in _astream_chat_completion(stream, ProviderError("No response from OpenRouter.")):
+                yield chunk
+
+        except Exception as e:
+            yield StreamChunk('done', response=ProviderError(f"Error calling OpenRouter (OAI): {str(e)}"))
+
+    def _request_params(self, messages: List[Dict], tools: Optional[List[Dict]], model: Optional[str] = None,
+                        stream: bool = False) -> Dict:
+        """Build the chat completion request parameters."""
+        request_params = {
+            "model": model or self.model,
+            # Tool-calling conversations grow with every round; keep them within the token budget
+            "messages": self.context_window.fit_messages(messages, tools, model or self.model),
+            "temperature": self.temperature_for(model),
+            "max_tokens": 2048,
+            "extra_headers": {
+                "HTTP-Referer": "https://codexa.ai",  # Optional site URL for rankings
+                "X-Title": "Codexa - AI Coding Assistant",  # Optional site title for rankings
+            }
+        }
+        if stream:
+            request_params["stream"] = True
+
+        # Add tools if provided
+        if tools is not None:
+            request_params["tools"] = tools
+        return request_params
+
+    def _build_messages(self, prompt: str, history: Optional[List[Dict]], context: Optional[str],
+                        tools: Optional[List[Dict]] = None, model: Optional[str] = None) -> List[Dict]:
+        """Build the chat messages for a prompt, its history and project context."""
+        # Keep as much recent history as fits the token budget
+        system, history = self.context_window.pack(self._get_system_prompt(context), history, prompt,
+                                                   model or self.model, tools)
+        messages = [
+            {"role": "system", "content": system}
+        ]
+
+        # Add conversation history
+        if history:
+            for msg in history:
+                if msg.get("user"):
+                    messages.append({"role": "user", "content": msg["user"]})
+                if msg.get("assistant"):
+                    messages.append({"role": "assistant", "content": msg["assistant"]})
+
+        messages.append({"role": "user", "content": prompt})
+        return messages
 
     def ask_with_tools(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> Union[str, Dict]:
         """Send a request with tools and handle tool calling responses."""
         if not self.client:
-            return "Error: OpenRouter API key not configured."
+            return ProviderError("Error: OpenRouter API key not configured.")
 
         try:
-            response = self.client.chat.completions.create(
-                model=model or self.model,
-                messages=messages,
-                tools=tools,
-                temperature=0.3,
-                max_tokens=2048,
-                extra_headers={
-                    "HTTP-Referer": "https://codexa.ai",
-                    "X-Title": "Codexa - AI Coding Assistant",
-                }
-            )
+            response = self.client.chat.completions.create(**self._request_params(messages, tools, model))
+            return _chat_completion_result(response, ProviderError("No response from OpenRouter."))
 
-            if response.choices and len(response.choices) > 0:
-                choice = response.choices[0]
-                message = choice.message
+        except Exception as e:
+            return ProviderError(f"Error calling OpenRouter: {str(e)}")
 
-                # Check if this is a tool call response
-                if message.tool_calls:
-                    return {
-                        'type': 'tool_calls',
-                        'message': {
-                            'role': message.role,
-                            'content': message.content,
-                            'tool_calls': [
-                                {
-                                    'id': tool_call.id,
-                                    'type': tool_call.type,
-                                    'function': {
-                                        'name': tool_call.function.name,
-                                        'arguments': tool_call.function.arguments
-                                    }
-                                } for tool_call in message.tool_calls
-                            ]
-                        },
-                        'tool_calls': message.tool_calls,
-                        'finish_reason': choice.finish_reason
-                    }
+    async def ask_with_tools_async(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> Union[str, Dict]:
+        """Send a request with tools using the async OpenAI client."""
+        if not self.client:
+            return ProviderError("Error: OpenRouter API key not configured.")
 
-                # Regular response
-                return message.content or "No response from OpenRouter."
+        try:
+            response = await self.async_clients.get().chat.completions.create(**self._request_params(messages, tools, model))
+            return _chat_completion_result(response, ProviderError("No response from OpenRouter."))
 
         except Exception as e:
-            return f"Error calling OpenRouter: {str(e)}"
+            return ProviderError(f"Error calling OpenRouter: {str(e)}")
 
     def continue_with_tool_results(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> str:
         """Continue conversation after tool execution with results."""
         if not self.client:
-            return "Error: OpenRouter API key not configured."
+            return ProviderError("Error: OpenRouter API key not configured.")
 
         try:
-            response = self.client.chat.completions.create(
-                model=model or self.model,
-                messages=messages,
-                tools=tools,  # Must include tools in every request
-                temperature=0.3,
-                max_tokens=2048,
-                extra_headers={
-                    "HTTP-Referer": "https://codexa.ai",
-                    "X-Title": "Codexa - AI Coding Assistant",
-                }
-            )
+            # Tools must be included in every request
+            response = self.client.chat.completions.create(**self._request_params(messages, tools, model))
+            return self._continuation_text(response)
 
-            if response.choices and len(response.choices) > 0:
-                return response.choices[0].message.content or "No response from OpenRouter."
-            else:
-                return "Unexpected response format from OpenRouter."
+        except Exception as e:
+            return ProviderError(f"Error calling OpenRouter: {str(e)}")
+
+    async def continue_with_tool_results_async(self, messages: List[Dict], tools: List[Dict], model: Optional[str] = None) -> str:
+        """Continue conversation after tool execution using the async OpenAI client."""
+        if not self.client:
+            return ProviderError("Error: OpenRouter API key not configured.")
+
+        try:
+            response = await self.async_clients.get().chat.completions.create(**self._request_params(messages, tools, model))
+            return self._continuation_text(response)
 
         except Exception as e:
-            return f"Error calling OpenRouter: {str(e)}"
+            return ProviderError(f"Error calling OpenRouter: {str(e)}")
+
+    @staticmethod
+    def _continuation_text(response: Any) -> str:
+        if response.choices and len(response.choices) > 0:
+            return response.choices[0].message.content or ProviderError("No response from OpenRouter.")
+        return ProviderError("Unexpected response format from OpenRouter.")
 
     def call_with_tools(self, messages: List[Dict], tools: Optional[List[Dict]] = None, 
-                       tool_choice: str = "auto", max_iterations: int = 10) -> Dict:
+                       tool_choice: str = "auto", max_iterations: int = 10, model: Optional[str] = None) -> Dict:
         """
         Enhanced tool calling method implementing OpenRouter's 3-step tool calling process.
         
@@ -717,6 +1223,7 @@ class OpenRouterOAIProvider(AIProvider):
             tools: List of tool definitions in OpenRouter format
             tool_choice: "auto", "none", or specific tool selection
             max_iterations: Maximum tool calling iterations
+            model: Model to use for this call (defaults to the provider's model)
             
         Returns:
             Dict with 'content', 'tool_calls', 'messages', and metadata
@@ -727,9 +1234,9 @@ class OpenRouterOAIProvider(AIProvider):
         if not tools:
             # No tools provided, make regular call
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.3,
+                model=model or self.model,
+                messages=self.context_window.fit_messages(messages, None, model or self.model),
+                temperature=self.temperature_for(model),
                 max_tokens=2048,
                 extra_headers={
                     "HTTP-Referer": "https://codexa.ai",
@@ -754,11 +1261,11 @@ class OpenRouterOAIProvider(AIProvider):
             try:
                 # Step 1: Make request with tools
                 response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=current_messages,
+                    model=model or self.model,
+                    messages=self.context_window.fit_messages(current_messages, tools, model or self.model),
                     tools=tools,
                     tool_choice=tool_choice,
-                    temperature=0.3,
+                    temperature=self.temperature_for(model),
                     max_tokens=2048,
                     extra_headers={
                         "HTTP-Referer": "https://codexa.ai",
@@ -842,7 +1349,7 @@ class OpenRouterOAIProvider(AIProvider):
         }
 
     def execute_tool_result(self, messages: List[Dict], tool_call_id: str, tool_result: str, 
-                           tools: List[Dict]) -> Dict:
+                           tools: List[Dict], model: Optional[str] = None) -> Dict:
         """
         Step 3: Continue conversation with tool results.
         
@@ -851,6 +1358,7 @@ class OpenRouterOAIProvider(AIProvider):
             tool_call_id: ID of the executed tool call
             tool_result: Result from tool execution
             tools: Tool definitions
+            model: Model to use for this call (defaults to the provider's model)
             
         Returns:
             Updated response dict
@@ -874,10 +1382,10 @@ class OpenRouterOAIProvider(AIProvider):
         try:
             # Step 3: Make request with tool results
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=updated_messages,
+                model=model or self.model,
+                messages=self.context_window.fit_messages(updated_messages, tools, model or self.model),
                 tools=tools,  # Include tools in follow-up request
-                temperature=0.3,
+                temperature=self.temperature_for(model),
                 max_tokens=2048,
                 extra_headers={
                     "HTTP-Referer": "https://codexa.ai",
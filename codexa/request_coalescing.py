@@ -0,0 +1,98 @@
+"""
+In-flight request coalescing for Codexa's AI providers.
+
+When tool groups or coordinated branches ask a provider the same question at
+the same moment, only the first caller sends the request.  The others wait
+for it and share its result (or its exception), so identical concurrent calls
+cost one round-trip instead of many.
+
+Unlike :mod:`codexa.response_cache`, nothing is kept once the request has
+finished; a later identical call is sent again.
+"""
+
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class RequestCoalescer:
+    """Single-flight deduplication of identical concurrent calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        # (event loop id, key) -> task; tasks are only shared within their loop
+        self._tasks: Dict[Tuple[int, str], "asyncio.Task"] = {}
+        self.stats = {'executed': 0, 'coalesced': 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run ``fn`` unless a call with the same key is in flight, then share its result.
+
+        Args:
+            key: Identity of the request
+            fn: Function sending the request
+
+        Returns:
+            The result of ``fn`` (a copy for callers that joined an in-flight call)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.stats['executed'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            return copy.deepcopy(future.result())
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def do_async(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await ``factory()`` unless a call with the same key is in flight, then share its result.
+
+        The request runs in its own task, so a cancelled caller does not cancel
+        the request for the others waiting on it.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+
+        with self._lock:
+            task = self._tasks.get(flight_key)
+            leader = task is None or task.done()
+            if leader:
+                task = loop.create_task(factory())
+                self._tasks[flight_key] = task
+                task.add_done_callback(lambda done: self._forget(flight_key, done))
+                self.stats['executed'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        result = await asyncio.shield(task)
+        return result if leader else copy.deepcopy(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counts of requests sent and requests that joined one in flight."""
+        with self._lock:
+            return {**self.stats, 'in_flight': len(self._calls) + len(self._tasks)}
+
+    def _forget(self, flight_key: Tuple[int, str], task: "asyncio.Task") -> None:
+        with self._lock:
+            if self._tasks.get(flight_key) is task:
+                del self._tasks[flight_key]
@@ -0,0 +1,250 @@
+"""
+Persistent response cache for Codexa's AI providers.
+
+The agentic loop often sends byte-identical requests (re-evaluations, task
+completion checks on an unchanged result, repeated analyses).  The
+:class:`ResponseCache` answers them without another paid round-trip.
+
+Entries are keyed on a hash of everything that determines the answer: the
+model, the messages, the tools and the temperature the request is sent with.
+Only deterministic (temperature 0) requests are cached unless
+``max_temperature`` allows sampled ones.  A small in-memory LRU
+sits in front of a SQLite table under ``.codexa/cache/``, so answers survive
+restarts.  Entries expire after a TTL, and both tiers evict their least
+recently used entries beyond a size limit.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of provider responses."""
+
+    def __init__(self,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 ttl: float = 24 * 60 * 60,
+                 max_memory_entries: int = 256,
+                 max_disk_entries: int = 5000,
+                 persist: bool = True,
+                 max_temperature: Optional[float] = 0.0):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory of the SQLite file (defaults to .codexa/cache in the current directory)
+            ttl: Seconds an entry stays valid
+            max_memory_entries: Entries kept in the in-memory LRU
+            max_disk_entries: Entries kept on disk
+            persist: Keep a SQLite copy of the entries (memory only if False)
+            max_temperature: Only cache requests at or below this temperature (None caches any temperature)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.cwd() / ".codexa" / "cache"
+        self.db_path = self.cache_dir / "responses.db"
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.persist = persist
+        self.max_temperature = max_temperature
+        self.logger = logging.getLogger("codexa.response_cache")
+
+        self._lock = threading.RLock()
+        # key -> (creation time, response)
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.stats = {
+            'hits': 0, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0,
+            'stores': 0, 'expired': 0, 'evictions': 0
+        }
+
+    @classmethod
+    def from_config(cls, settings: Optional[Dict[str, Any]]) -> Optional["ResponseCache"]:
+        """Create a cache from the ``response_cache`` config section (None unless enabled)."""
+        settings = settings or {}
+        if not settings.get("enabled", False):
+            return None
+        defaults = cls.__init__.__defaults__
+        return cls(
+            cache_dir=settings.get("directory"),
+            ttl=float(settings.get("ttl", defaults[1])),
+            max_memory_entries=int(settings.get("max_memory_entries", defaults[2])),
+            max_disk_entries=int(settings.get("max_disk_entries", defaults[3])),
+            persist=bool(settings.get("persist", defaults[4])),
+            max_temperature=settings.get("max_temperature", defaults[5]),
+        )
+
+    def accepts(self, temperature: Optional[float]) -> bool:
+        """Whether requests at this temperature may be cached."""
+        if temperature is None:
+            # Without the temperature of the request its answer may be sampled
+            return False
+        return self.max_temperature is None or temperature <= self.max_temperature
+
+    @staticmethod
+    def make_key(model: Optional[str], messages: Any, tools: Any = None,
+                 temperature: Optional[float] = None, **extra: Any) -> str:
+        """Hash the parts of a request that determine its response."""
+        request = {'model': model, 'messages': messages, 'tools': tools, 'temperature': temperature}
+        request.update(extra)
+        canonical = json.dumps(request, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up a response (None on a miss)."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, response = entry
+                if now - created < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.stats['hits'] += 1
+                    self.stats['memory_hits'] += 1
+                    return copy.deepcopy(response)
+                del self._memory[key]
+                self.stats['expired'] += 1
+
+            entry = self._load(key, now)
+            if entry is not None:
+                self._remember(key, *entry)
+                self.stats['hits'] += 1
+                self.stats['disk_hits'] += 1
+                return copy.deepcopy(entry[1])
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key: str, response: Any) -> bool:
+        """
+        Store a response.
+
+        Returns:
+            False if the response cannot be stored (not JSON-serializable)
+        """
+        try:
+            serialized = json.dumps(response)
+        except (TypeError, ValueError):
+            return False
+
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, json.loads(serialized))
+            self.stats['stores'] += 1
+            self._save(key, serialized, now)
+        return True
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self.persist and self.db_path.exists():
+                try:
+                    connection = self._connect()
+                    try:
+                        connection.execute("DELETE FROM responses")
+                        connection.commit()
+                    finally:
+                        connection.close()
+                except sqlite3.Error as e:
+                    self.logger.warning(f"Could not clear response cache: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, hit rate and entry counts."""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'disk_entries': self._disk_count(),
+                'ttl': self.ttl,
+            }
+
+    def _remember(self, key: str, created: float, response: Any) -> None:
+        self._memory[key] = (created, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _connect(self) -> sqlite3.Connection:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.db_path))
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT, created REAL, accessed REAL)"
+        )
+        return connection
+
+    def _load(self, key: str, now: float) -> Optional[Tuple[float, Any]]:
+        """Read an entry from disk, dropping it if it expired."""
+        if not self.persist or not self.db_path.exists():
+            return None
+        try:
+            connection = self._connect()
+            try:
+                row = connection.execute(
+                    "SELECT response, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                serialized, created = row
+                if now - created >= self.ttl:
+                    connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    connection.commit()
+                    self.stats['expired'] += 1
+                    return None
+                connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                connection.commit()
+                return created, json.loads(serialized)
+            finally:
+                connection.close()
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.warning(f"Could not read response cache: {e}")
+            return None
+
+    def _save(self, key: str, serialized: str, now: float) -> None:
+        """Write an entry to disk, then drop expired and least recently used entries."""
+        if not self.persist:
+            return
+        try:
+            connection = self._connect()
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, serialized, now, now)
+                )
+                expired = connection.execute("DELETE FROM responses WHERE created <= ?", (now - self.ttl,)).rowcount
+                self.stats['expired'] += max(0, expired)
+
+                overflow = connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_disk_entries
+                if overflow > 0:
+                    connection.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY accessed LIMIT ?)", (overflow,)
+                    )
+                    self.stats['evictions'] += overflow
+                connection.commit()
+            finally:
+                connection.close()
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"Could not save response cache: {e}")
+
+    def _disk_count(self) -> int:
+        if not self.persist or not self.db_path.exists():
+            return 0
+        try:
+            connection = self._connect()
+            try:
+                return connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return 0
@@ -3,14 +3,20 @@ Search utilities for Codexa - comprehensive file and code search capabilities.
 """
 
 from .file_search import FileSearchEngine, SearchResult
+from .file_index import FileIndex
 from .code_search import CodeSearchEngine, CodeMatch
+from .trigram_index import TrigramIndex
 from .pattern_matcher import PatternMatcher
+from .fuzzy import FuzzyMatcher
 from .search_manager import SearchManager
 
 __all__ = [
     'FileSearchEngine',
+    'FileIndex',
     'CodeSearchEngine', 
+    'TrigramIndex',
     'PatternMatcher',
+    'FuzzyMatcher',
     'SearchManager',
     'SearchResult',
     'CodeMatch'
@@ -0,0 +1,179 @@
+"""
+Memory-mapped byte-level scanning for Codexa's code search engine.
+
+Instead of decoding a file and splitting it into lines, the file is mapped
+into memory and a bytes version of the search regex is run over the whole
+buffer.  Lines, line numbers and context are only materialized around real
+hits, so files without a match cost one C-level regex pass and no Python
+allocations per line.
+
+The fast path is exact: it is only used when bytes and text matching are
+guaranteed to agree, i.e. the pattern is ASCII and cannot match a newline,
+and the file is ASCII without carriage returns.  Otherwise the caller falls
+back to the regular line-by-line text scan.
+"""
+
+import mmap
+import re
+import sys
+from typing import List, Optional, Pattern, Tuple
+
+if sys.version_info >= (3, 11):
+    from re import _parser as sre_parse
+else:
+    import sre_parse
+
+# Anything that makes text decoding or universal-newline splitting differ from bytes
+_UNSAFE_BYTES = re.compile(rb'[\x80-\xff\r]')
+
+# (line number, line, match text, column start, column end, context before, context after)
+LineHit = Tuple[int, str, str, int, int, List[str], List[str]]
+
+_SAFE_CATEGORIES = {sre_parse.CATEGORY_DIGIT, sre_parse.CATEGORY_WORD}
+_SAFE_AT_CODES = {
+    sre_parse.AT_BEGINNING, sre_parse.AT_END,
+    sre_parse.AT_BOUNDARY, sre_parse.AT_NON_BOUNDARY,
+}
+
+
+def compile_bytes_pattern(pattern: Pattern) -> Optional[Pattern]:
+    """
+    Compile a bytes equivalent of a text regex for buffer-wide scanning.
+
+    Returns None when the pattern could behave differently on bytes (non-ASCII
+    source, constructs that can match a newline, lookarounds, string anchors).
+    """
+    if not pattern.pattern.isascii() or pattern.flags & re.DOTALL:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    if not _is_line_local(list(parsed)):
+        return None
+
+    # Per-line ^/$ semantics become MULTILINE on the whole buffer
+    flags = (pattern.flags & ~(re.UNICODE | re.ASCII)) | re.MULTILINE
+    try:
+        return re.compile(pattern.pattern.encode('ascii'), flags)
+    except re.error:
+        return None
+
+
+def _is_line_local(items: List) -> bool:
+    """Check that no part of a parsed pattern can match a line break or look across lines."""
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            if av in (0x0a, 0x0d):
+                return False
+        elif op is sre_parse.ANY:
+            continue  # Never matches \n without DOTALL; one byte is one char on ASCII data
+        elif op is sre_parse.IN:
+            for item_op, item_av in av:
+                if item_op is sre_parse.NEGATE:
+                    return False
+                if item_op is sre_parse.LITERAL and item_av in (0x0a, 0x0d):
+                    return False
+                if item_op is sre_parse.RANGE and item_av[0] <= 0x0d and item_av[1] >= 0x0a:
+                    return False
+                if item_op is sre_parse.CATEGORY and item_av not in _SAFE_CATEGORIES:
+                    return False
+        elif op is sre_parse.AT:
+            if av not in _SAFE_AT_CODES:
+                return False
+        elif op is sre_parse.SUBPATTERN:
+            if not _is_line_local(list(av[-1])):
+                return False
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            if not _is_line_local(list(av[2])):
+                return False
+        elif op is sre_parse.BRANCH:
+            if not all(_is_line_local(list(alt)) for alt in av[1]):
+                return False
+        elif op is sre_parse.GROUPREF:
+            continue
+        else:
+            # NOT_LITERAL, lookarounds, conditionals, atomic groups, ...
+            return False
+    return True
+
+
+def scan_file(path, pattern: Pattern, bytes_pattern: Pattern,
+              context_lines: int) -> Optional[List[LineHit]]:
+    """
+    Scan one file through a memory map.
+
+    Returns the per-line hits (first match per line, as with a line-by-line
+    scan), or None if the file is not eligible and must be scanned as text.
+    """
+    try:
+        with open(path, 'rb') as f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return []  # Empty file
+    except OSError:
+        return None
+
+    try:
+        if _UNSAFE_BYTES.search(buffer):
+            return None
+
+        hits: List[LineHit] = []
+        size = len(buffer)
+        position = 0
+        line_number = 1
+        counted_to = 0
+
+        while position < size:
+            found = bytes_pattern.search(buffer, position)
+            if found is None:
+                break
+
+            line_start = buffer.rfind(b'\n', 0, found.start()) + 1
+            line_end = buffer.find(b'\n', found.start())
+            line_end = size if line_end == -1 else line_end
+
+            line_number += buffer[counted_to:line_start].count(b'\n')
+            counted_to = line_start
+
+            # Take the match from the decoded line so columns match the text scan
+            line = buffer[line_start:line_end].decode('ascii')
+            match = pattern.search(line)
+            if match:
+                hits.append((
+                    line_number, line.rstrip(), match.group(), match.start(), match.end(),
+                    _lines_before(buffer, line_start, context_lines),
+                    _lines_after(buffer, line_end, context_lines),
+                ))
+            position = line_end + 1
+
+        return hits
+    finally:
+        buffer.close()
+
+
+def _lines_before(buffer, line_start: int, count: int) -> List[str]:
+    """Return up to ``count`` lines preceding the line starting at ``line_start``."""
+    if count <= 0 or line_start == 0:
+        return []
+    end = line_start - 1  # The newline terminating the previous line
+    start = end
+    for _ in range(count):
+        start = buffer.rfind(b'\n', 0, start)
+        if start == -1:
+            break
+    return [line.rstrip() for line in buffer[start + 1:end].decode('ascii').split('\n')]
+
+
+def _lines_after(buffer, line_end: int, count: int) -> List[str]:
+    """Return up to ``count`` lines following the line ending at ``line_end``."""
+    size = len(buffer)
+    lines: List[str] = []
+    end = line_end
+    while len(lines) < count and end < size - 1:
+        next_end = buffer.find(b'\n', end + 1)
+        next_end = size if next_end == -1 else next_end
+        lines.append(buffer[end + 1:next_end].decode('ascii').rstrip())
+        end = next_end
+    return lines
@@ -4,13 +4,24 @@ Code search engine for Codexa with regex patterns, syntax-aware search, and cont
 
 import re
 import os
+import fnmatch
 from pathlib import Path
-from typing import List, Dict, Optional, Union, Pattern, Iterator, Set
+from typing import List, Dict, Optional, Union, Pattern, Iterator, Iterable, Set, AsyncIterator, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+import asyncio
+import multiprocessing
 import threading
 from enum import Enum
+from itertools import islice, repeat
+
+from .ignore_rules import IgnoreMatcher, get_ignore_matcher
+from .trigram_index import TrigramIndex
+from .byte_scanner import LineHit, compile_bytes_pattern, scan_file
+from .multi_pattern import MultiPatternScanner, ScanRule
+from .duplicate_detector import DuplicateDetector, FileFingerprint, fingerprint_file
+from .project_snapshot import SnapshotCache
 
 class SearchMode(Enum):
     """Search modes for different types of searches."""
@@ -45,14 +56,115 @@ class CodeMatch:
     confidence: float = 1.0
     metadata: Dict = field(default_factory=dict)
 
+# Compact match record returned by process-pool workers:
+# (path, line number, line, match text, column start, column end, context before, context after)
+MatchTuple = Tuple[str, int, str, str, int, int, Tuple[str, ...], Tuple[str, ...]]
+
+
+def _scan_lines(path, pattern: Pattern, bytes_pattern: Optional[Pattern],
+                context_lines: int) -> List[LineHit]:
+    """Find the first match of ``pattern`` on each line of a file."""
+    if bytes_pattern is not None:
+        hits = scan_file(path, pattern, bytes_pattern, context_lines)
+        if hits is not None:
+            return hits
+    
+    hits = []
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.readlines()
+    
+    for i, line in enumerate(lines):
+        match = pattern.search(line)
+        if match:
+            hits.append((
+                i + 1, line.rstrip(), match.group(), match.start(), match.end(),
+                [l.rstrip() for l in lines[max(0, i - context_lines):i]],
+                [l.rstrip() for l in lines[i + 1:i + 1 + context_lines]],
+            ))
+    return hits
+
+
+def _scan_files_chunk(paths: List[str], pattern: str, flags: int,
+                      context_lines: int, max_matches: int,
+                      use_mmap: bool = True) -> List[MatchTuple]:
+    """Scan a chunk of files in a worker process and return compact match tuples."""
+    regex = re.compile(pattern, flags)
+    bytes_regex = compile_bytes_pattern(regex) if use_mmap else None
+    results: List[MatchTuple] = []
+    
+    for path in paths:
+        try:
+            hits = _scan_lines(path, regex, bytes_regex, context_lines)
+        except OSError:
+            continue
+        
+        results.extend(
+            (path, line_number, line, match_text, start, end, tuple(before), tuple(after))
+            for line_number, line, match_text, start, end, before, after in hits
+        )
+        
+        if len(results) >= max_matches:
+            break
+    
+    return results
+
+
+def _process_context():
+    """
+    Start method for scan workers.
+
+    The pool starts inside a process that already runs an event loop and
+    thread pools, and forking a multi-threaded process can deadlock, so
+    workers come from a fork server (or are spawned where there is none).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
 class CodeSearchEngine:
     """Advanced code search engine with syntax awareness and intelligent matching."""
     
-    def __init__(self, base_path: Union[str, Path] = None):
-        """Initialize the code search engine."""
+    # Backends for scanning file contents
+    BACKEND_AUTO = "auto"
+    BACKEND_THREAD = "thread"
+    BACKEND_PROCESS = "process"
+    
+    def __init__(self, base_path: Union[str, Path] = None,
+                 use_trigram_index: bool = False,
+                 index_dir: Union[str, Path] = None,
+                 backend: str = BACKEND_AUTO,
+                 process_threshold: int = 3000,
+                 use_mmap: bool = True):
+        """
+        Initialize the code search engine.
+        
+        Args:
+            base_path: Root directory for searches (defaults to cwd)
+            use_trigram_index: Narrow literal/regex searches with the on-disk trigram index
+            index_dir: Override the directory holding the trigram index
+            backend: "thread", "process", or "auto" (processes for large file sets)
+            process_threshold: Minimum number of files for "auto" to pick processes
+                (see benchmarks/bench_search_backends.py for the crossover point)
+            use_mmap: Scan eligible files as memory-mapped bytes instead of decoded lines
+        """
+        if backend not in (self.BACKEND_AUTO, self.BACKEND_THREAD, self.BACKEND_PROCESS):
+            raise ValueError(f"Unknown search backend: {backend}")
         self.base_path = Path(base_path) if base_path else Path.cwd()
         self.max_workers = min(32, (os.cpu_count() or 1) + 4)
         self._lock = threading.RLock()
+        self.ignore_matcher: IgnoreMatcher = get_ignore_matcher(self.base_path)
+        self.use_trigram_index = use_trigram_index
+        self.trigram_index: Optional[TrigramIndex] = (
+            TrigramIndex(self.base_path, index_dir) if use_trigram_index else None
+        )
+        self.backend = backend
+        self.process_threshold = process_threshold
+        self.process_workers = os.cpu_count() or 1
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self.use_mmap = use_mmap
+        # Shared walk results, set by SearchManager so sibling engines reuse one walk
+        self.snapshots: Optional[SnapshotCache] = None
+        self._bytes_patterns: Dict[Pattern, Optional[Pattern]] = {}
         
         # File extensions to search by default
         self.default_extensions = {
@@ -111,6 +223,27 @@ class CodeSearchEngine:
             'ip_address': re.compile(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'),
             'hex_color': re.compile(r'#[0-9a-fA-F]{3,6}\b'),
         }
+        
+        # Rules for single-pass audit scans (see scan_patterns)
+        self.scan_rules = [
+            ScanRule('todo', self.common_patterns['todo'], MatchType.COMMENT, "TODO/FIXME search"),
+            ScanRule('url', self.common_patterns['url'], MatchType.STRING, "URL search"),
+            ScanRule('secret.password',
+                     re.compile(r'(password|pwd|passwd)\s*[:=]\s*["\'][^"\']+["\']', re.IGNORECASE),
+                     MatchType.STRING, "Security risk pattern 1"),
+            ScanRule('secret.api_key',
+                     re.compile(r'(api_key|apikey|secret_key)\s*[:=]\s*["\'][^"\']+["\']', re.IGNORECASE),
+                     MatchType.STRING, "Security risk pattern 2"),
+            ScanRule('secret.token',
+                     re.compile(r'(token|access_token)\s*[:=]\s*["\'][^"\']+["\']', re.IGNORECASE),
+                     MatchType.STRING, "Security risk pattern 3"),
+            ScanRule('secret.private_key',
+                     re.compile(r'(private_key|private-key)\s*[:=]', re.IGNORECASE),
+                     MatchType.STRING, "Security risk pattern 4"),
+            ScanRule('secret.pem_block',
+                     re.compile(r'-----BEGIN [A-Z ]+ KEY-----'),
+                     MatchType.STRING, "Security risk pattern 5"),
+        ]
 
     def search_code(self, 
                    pattern: str,
@@ -147,13 +280,22 @@ class CodeSearchEngine:
         # Find files to search
         files_to_search = self._find_searchable_files(file_patterns, search_extensions)
         
+        # Only open files whose trigrams can contain a match
+        if self.trigram_index and mode in (SearchMode.LITERAL, SearchMode.REGEX):
+            self.trigram_index.update(files_to_search)
+            files_to_search = self.trigram_index.candidates(files_to_search, regex_pattern)
+        
         if not files_to_search:
             return []
         
         # Perform search
         matches = []
         
-        if len(files_to_search) > 10:  # Use parallel search for many files
+        if self._use_process_backend(len(files_to_search)):
+            matches = self._process_code_search(
+                files_to_search, regex_pattern, context_lines, max_matches
+            )
+        elif len(files_to_search) > 10:  # Use parallel search for many files
             matches = self._parallel_code_search(
                 files_to_search, regex_pattern, context_lines, max_matches
             )
@@ -167,6 +309,99 @@ class CodeSearchEngine:
         
         return matches[:max_matches]
 
+    async def search_code_stream(self,
+                                 pattern: str,
+                                 mode: SearchMode = SearchMode.LITERAL,
+                                 file_patterns: List[str] = None,
+                                 extensions: Set[str] = None,
+                                 context_lines: int = 2,
+                                 case_sensitive: bool = False,
+                                 whole_words: bool = False,
+                                 max_matches: int = 1000) -> AsyncIterator[CodeMatch]:
+        """
+        Search for code patterns, yielding matches as soon as each file is scanned.
+        
+        The directory walk (and any trigram index update) runs on a background
+        thread that hands files over in bounded batches, so the event loop is
+        never blocked by discovery.  Files are scanned through a bounded set of
+        in-flight jobs, and outstanding work is cancelled once ``max_matches``
+        is reached.  Matches arrive in completion order, not sorted.
+        
+        Args:
+            Same as search_code()
+            
+        Yields:
+            CodeMatch objects
+        """
+        if not pattern.strip() or max_matches <= 0:
+            return
+        
+        search_extensions = extensions or self.default_extensions
+        regex_pattern = self._prepare_search_pattern(pattern, mode, case_sensitive, whole_words)
+        use_index = self.trigram_index and mode in (SearchMode.LITERAL, SearchMode.REGEX)
+        
+        def discover() -> Iterator[Path]:
+            # Runs entirely on the discovery thread, one batch at a time
+            files: Iterable[Path] = self._iter_searchable_files(file_patterns, search_extensions)
+            if use_index:
+                files = list(files)
+                self.trigram_index.update(files)
+                files = self.trigram_index.candidates(files, regex_pattern)
+            yield from files
+        
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        discovery_executor = ThreadPoolExecutor(max_workers=1)
+        files_iter = discover()
+        pending_files: List[Path] = []
+        discovery: Optional[asyncio.Future] = None
+        discovered_all = False
+        in_flight: Set[asyncio.Future] = set()
+        max_in_flight = self.max_workers * 2
+        emitted = 0
+        
+        def fill_queue():
+            nonlocal discovery
+            while len(in_flight) < max_in_flight and pending_files:
+                in_flight.add(loop.run_in_executor(
+                    executor, self._search_file_content, pending_files.pop(0), regex_pattern, context_lines
+                ))
+            # Keep at most one batch of discovered files waiting
+            if discovery is None and not discovered_all and len(pending_files) < max_in_flight:
+                discovery = loop.run_in_executor(
+                    discovery_executor, lambda: list(islice(files_iter, max_in_flight))
+                )
+        
+        try:
+            fill_queue()
+            while in_flight or discovery is not None:
+                waiting = in_flight | {discovery} if discovery is not None else in_flight
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if discovery in done:
+                    batch = discovery.result()
+                    discovery = None
+                    discovered_all = not batch
+                    pending_files.extend(batch)
+                for future in done & in_flight:
+                    in_flight.discard(future)
+                    try:
+                        file_matches = future.result()
+                    except Exception:
+                        continue
+                    for code_match in file_matches:
+                        yield code_match
+                        emitted += 1
+                        if emitted >= max_matches:
+                            return
+                fill_queue()
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if discovery is not None:
+                discovery.cancel()
+            executor.shutdown(wait=False)
+            discovery_executor.shutdown(wait=False)
+
     def search_functions(self, 
                         name_pattern: str = None,
                         content_pattern: str = None,
@@ -186,8 +421,7 @@ class CodeSearchEngine:
                 
                 for file_path in files_to_search:
                     try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = f.readlines()
+                        lines = self._read_lines(file_path)
                         
                         for i, line in enumerate(lines):
                             func_match = func_regex.search(line)
@@ -236,8 +470,7 @@ class CodeSearchEngine:
                 
                 for file_path in files_to_search:
                     try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = f.readlines()
+                        lines = self._read_lines(file_path)
                         
                         for i, line in enumerate(lines):
                             class_match = class_regex.search(line)
@@ -274,8 +507,7 @@ class CodeSearchEngine:
                 
                 for file_path in files_to_search:
                     try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = f.readlines()
+                        lines = self._read_lines(file_path)
                         
                         for i, line in enumerate(lines):
                             import_match = import_regex.search(line)
@@ -300,73 +532,96 @@ class CodeSearchEngine:
 
     def search_todos(self) -> List[CodeMatch]:
         """Search for TODO, FIXME, HACK, and similar comments."""
-        pattern = self.common_patterns['todo']
-        return self._search_with_pattern(pattern, MatchType.COMMENT, "TODO/FIXME search")
+        return self.scan_patterns(['todo'])
 
     def search_urls(self) -> List[CodeMatch]:
         """Search for URLs in code."""
-        pattern = self.common_patterns['url']
-        return self._search_with_pattern(pattern, MatchType.STRING, "URL search")
+        return self.scan_patterns(['url'])
 
     def search_secrets_risk(self) -> List[CodeMatch]:
         """Search for potential security risks like hardcoded secrets."""
-        risky_patterns = [
-            re.compile(r'(password|pwd|passwd)\s*[:=]\s*["\'][^"\']+["\']', re.IGNORECASE),
-            re.compile(r'(api_key|apikey|secret_key)\s*[:=]\s*["\'][^"\']+["\']', re.IGNORECASE),
-            re.compile(r'(token|access_token)\s*[:=]\s*["\'][^"\']+["\']', re.IGNORECASE),
-            re.compile(r'(private_key|private-key)\s*[:=]', re.IGNORECASE),
-            re.compile(r'-----BEGIN [A-Z ]+ KEY-----'),
-        ]
+        return self.scan_patterns([rule.rule_id for rule in self.scan_rules
+                                   if rule.rule_id.startswith('secret.')])
+
+    def scan_patterns(self, rule_ids: List[str] = None) -> List[CodeMatch]:
+        """
+        Scan the project for several rules in a single pass.
+        
+        Each file is read once no matter how many rules are checked, so a full
+        TODO + URL + security audit costs one walk of the tree.
+        
+        Args:
+            rule_ids: IDs from ``scan_rules`` to check (all rules if None)
+            
+        Returns:
+            Matches tagged with ``metadata['rule_id']``, ordered by file and line
+        """
+        if rule_ids is None:
+            rules = self.scan_rules
+        else:
+            known = {rule.rule_id: rule for rule in self.scan_rules}
+            unknown = [rule_id for rule_id in rule_ids if rule_id not in known]
+            if unknown:
+                raise ValueError(f"Unknown scan rule(s): {', '.join(unknown)}")
+            rules = [known[rule_id] for rule_id in rule_ids]
         
+        scanner = MultiPatternScanner(rules)
         matches = []
-        for i, pattern in enumerate(risky_patterns):
-            pattern_matches = self._search_with_pattern(
-                pattern, MatchType.STRING, f"Security risk pattern {i+1}"
-            )
-            matches.extend(pattern_matches)
+        
+        for file_path in self._find_searchable_files(None, self.default_extensions):
+            try:
+                if self.snapshots is not None:
+                    hits = list(scanner.scan_text(self.snapshots.get().read_text(file_path)))
+                else:
+                    hits = scanner.scan_file(file_path)
+            except (OSError, UnicodeDecodeError):
+                continue
+            
+            for rule, line_number, line, match in hits:
+                matches.append(CodeMatch(
+                    file_path=file_path,
+                    line_number=line_number,
+                    line_content=line.rstrip(),
+                    match_text=match.group(),
+                    match_type=rule.match_type,
+                    column_start=match.start(),
+                    column_end=match.end(),
+                    metadata={'search_type': rule.description, 'rule_id': rule.rule_id}
+                ))
         
         return matches
 
-    def find_duplicates(self, min_lines: int = 5) -> List[Dict]:
-        """Find duplicate code blocks."""
-        # This is a simplified implementation
-        # A full implementation would use more sophisticated algorithms
-        file_hashes = {}
-        duplicates = []
+    def find_duplicates(self, min_lines: int = 5, min_chars: int = 50) -> List[Dict]:
+        """
+        Find duplicated code blocks across the project.
         
-        files_to_search = self._find_searchable_files(None, self.default_extensions)
+        Lines are compared token by token with blank lines dropped, so clones
+        that differ only in whitespace are found too.
+        Files are fingerprinted in parallel and every occurrence of a clone is
+        reported in the same cluster, as one maximal region per occurrence.
         
-        for file_path in files_to_search:
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                
-                # Create sliding window of lines
-                for i in range(len(lines) - min_lines + 1):
-                    block = ''.join(lines[i:i + min_lines]).strip()
-                    if len(block) > 50:  # Only consider substantial blocks
-                        block_hash = hash(block)
-                        
-                        if block_hash in file_hashes:
-                            duplicates.append({
-                                'original': file_hashes[block_hash],
-                                'duplicate': {
-                                    'file': file_path,
-                                    'start_line': i + 1,
-                                    'end_line': i + min_lines,
-                                    'content': block[:100] + '...' if len(block) > 100 else block
-                                }
-                            })
-                        else:
-                            file_hashes[block_hash] = {
-                                'file': file_path,
-                                'start_line': i + 1,
-                                'end_line': i + min_lines,
-                                'content': block[:100] + '...' if len(block) > 100 else block
-                            }
+        Args:
+            min_lines: Minimum number of non-blank lines in a duplicated block
+            min_chars: Minimum size of a duplicated block (whitespace-normalized)
             
-            except (OSError, UnicodeDecodeError):
-                continue
+        Returns:
+            Clone clusters with their line count, occurrences and a content preview
+        """
+        detector = DuplicateDetector(min_lines, min_chars)
+        files = self._find_searchable_files(None, self.default_extensions)
+        clusters = detector.find_clones(self._fingerprint_files(files, detector))
+        
+        duplicates = []
+        for cluster in clusters:
+            first = cluster.regions[0]
+            duplicates.append({
+                'lines': cluster.lines,
+                'occurrences': [
+                    {'file': region.file_path, 'start_line': region.start_line, 'end_line': region.end_line}
+                    for region in cluster.regions
+                ],
+                'content': self._read_block(first.file_path, first.start_line, first.end_line),
+            })
         
         return duplicates
 
@@ -402,34 +657,43 @@ class CodeSearchEngine:
     def _find_searchable_files(self, file_patterns: List[str] = None, 
                               extensions: Set[str] = None) -> List[Path]:
         """Find files that should be searched."""
-        files = []
+        return list(self._iter_searchable_files(file_patterns, extensions))
+
+    def _iter_searchable_files(self, file_patterns: List[str] = None,
+                               extensions: Set[str] = None) -> Iterator[Path]:
+        """Lazily yield files that should be searched, in directory walk order."""
         search_extensions = extensions or self.default_extensions
         
-        if file_patterns:
-            # Use file patterns if provided
-            import fnmatch
-            for pattern in file_patterns:
-                for root, dirs, filenames in os.walk(self.base_path):
-                    for filename in filenames:
-                        if fnmatch.fnmatch(filename, pattern):
-                            file_path = Path(root) / filename
-                            if self._should_search_file(file_path, search_extensions):
-                                files.append(file_path)
-        else:
-            # Search all files with matching extensions
-            for root, dirs, filenames in os.walk(self.base_path):
-                # Skip hidden directories and common ignore patterns
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in {
-                    'node_modules', 'venv', 'env', '__pycache__', '.git', 
-                    'target', 'build', 'dist', 'vendor'
-                }]
-                
-                for filename in filenames:
-                    file_path = Path(root) / filename
-                    if self._should_search_file(file_path, search_extensions):
-                        files.append(file_path)
+        if self.snapshots is not None:
+            yield from self._snapshot_searchable_files(file_patterns, search_extensions)
+            return
         
-        return files
+        # Ignored subtrees (defaults, .gitignore, .codexaignore) are pruned by the walk;
+        # hidden directories are skipped as before
+        for root_path, dirs, filenames in self.ignore_matcher.walk(self.base_path):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            
+            for filename in filenames:
+                if file_patterns and not any(fnmatch.fnmatch(filename, p) for p in file_patterns):
+                    continue
+                file_path = root_path / filename
+                if self._should_search_file(file_path, search_extensions):
+                    yield file_path
+
+    def _snapshot_searchable_files(self, file_patterns: Optional[List[str]],
+                                   extensions: Set[str]) -> Iterator[Path]:
+        """Yield searchable files from the shared snapshot, with the same filters as the walk."""
+        snapshot = self.snapshots.get()
+        for rel_dir, filename, size, _, _ in snapshot.iter_files():
+            if rel_dir and any(part.startswith('.') for part in rel_dir.split('/')):
+                continue
+            if filename.startswith('.') or size > 10 * 1024 * 1024:
+                continue
+            if Path(filename).suffix.lower() not in extensions:
+                continue
+            if file_patterns and not any(fnmatch.fnmatch(filename, p) for p in file_patterns):
+                continue
+            yield snapshot.base_path / rel_dir / filename
 
     def _should_search_file(self, file_path: Path, extensions: Set[str]) -> bool:
         """Determine if a file should be searched."""
@@ -450,29 +714,126 @@ class CodeSearchEngine:
         
         return True
 
-    def _parallel_code_search(self, files: List[Path], pattern: Pattern,
+    def _parallel_code_search(self, files: Iterable[Path], pattern: Pattern,
                              context_lines: int, max_matches: int) -> List[CodeMatch]:
-        """Perform parallel code search across multiple files."""
+        """
+        Perform parallel code search across multiple files.
+        
+        Files are submitted through a bounded window of in-flight futures, and
+        queued work is cancelled as soon as ``max_matches`` is reached.
+        """
         matches = []
+        files_iter = iter(files)
+        future_to_file = {}
+        max_in_flight = self.max_workers * 2
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        
+        def fill_queue():
+            while len(future_to_file) < max_in_flight:
+                file_path = next(files_iter, None)
+                if file_path is None:
+                    return
+                future = executor.submit(self._search_file_content, file_path, pattern, context_lines)
+                future_to_file[future] = file_path
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_file = {
-                executor.submit(self._search_file_content, file_path, pattern, context_lines):
-                file_path for file_path in files
-            }
-            
-            for future in as_completed(future_to_file):
-                try:
-                    file_matches = future.result()
-                    matches.extend(file_matches)
-                    
-                    if len(matches) >= max_matches:
-                        break
-                        
-                except Exception as e:
-                    # Log error but continue
-                    file_path = future_to_file[future]
-                    print(f"Error searching {file_path}: {e}")
+        try:
+            fill_queue()
+            while future_to_file and len(matches) < max_matches:
+                done, _ = wait(future_to_file, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = future_to_file.pop(future)
+                    try:
+                        matches.extend(future.result())
+                    except Exception as e:
+                        # Log error but continue
+                        print(f"Error searching {file_path}: {e}")
+                fill_queue()
+        finally:
+            for future in future_to_file:
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        return matches
+
+    def shutdown(self):
+        """Shut down the worker process pool, if one was started."""
+        with self._lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False)
+                self._process_pool = None
+
+    def _use_process_backend(self, file_count: int) -> bool:
+        """Decide whether a search over ``file_count`` files should use worker processes."""
+        if self.backend == self.BACKEND_PROCESS:
+            return True
+        if self.backend == self.BACKEND_THREAD:
+            return False
+        # Regex scanning is CPU-bound, so processes only pay off with several
+        # cores and enough files to amortize pickling and IPC
+        return self.process_workers > 2 and file_count >= self.process_threshold
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Get the worker process pool, starting it on first use."""
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers,
+                                                         mp_context=_process_context())
+            return self._process_pool
+
+    def _process_code_search(self, files: List[Path], pattern: Pattern,
+                             context_lines: int, max_matches: int) -> List[CodeMatch]:
+        """
+        Perform code search in worker processes, bypassing the GIL.
+        
+        The file list is sharded into a few chunks per worker; workers send
+        back compact match tuples that are turned into CodeMatch objects here.
+        """
+        matches = []
+        chunk_count = max(1, min(len(files), self.process_workers * 4))
+        chunk_size = -(-len(files) // chunk_count)
+        chunks = [
+            [str(path) for path in files[i:i + chunk_size]]
+            for i in range(0, len(files), chunk_size)
+        ]
+        
+        try:
+            pool = self._get_process_pool()
+            futures = [
+                pool.submit(_scan_files_chunk, chunk, pattern.pattern, pattern.flags,
+                            context_lines, max_matches, self.use_mmap)
+                for chunk in chunks
+            ]
+        except (OSError, RuntimeError):
+            # Process pools may be unavailable (e.g. restricted sandboxes)
+            return self._parallel_code_search(files, pattern, context_lines, max_matches)
+        
+        pending = set(futures)
+        try:
+            while pending and len(matches) < max_matches:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        records = future.result()
+                    except Exception as e:
+                        print(f"Error in search worker: {e}")
+                        continue
+                    matches.extend(
+                        CodeMatch(
+                            file_path=Path(path),
+                            line_number=line_number,
+                            line_content=line,
+                            match_text=match_text,
+                            match_type=MatchType.PATTERN,
+                            context_before=list(before),
+                            context_after=list(after),
+                            column_start=start,
+                            column_end=end
+                        )
+                        for path, line_number, line, match_text, start, end, before, after in records
+                    )
+        finally:
+            for future in pending:
+                future.cancel()
         
         return matches
 
@@ -498,67 +859,64 @@ class CodeSearchEngine:
     def _search_file_content(self, file_path: Path, pattern: Pattern, 
                            context_lines: int) -> List[CodeMatch]:
         """Search for pattern in a single file."""
-        matches = []
-        
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-            
-            for i, line in enumerate(lines):
-                match = pattern.search(line)
-                if match:
-                    # Get context lines
-                    context_before = lines[max(0, i - context_lines):i]
-                    context_after = lines[i + 1:i + 1 + context_lines]
-                    
-                    code_match = CodeMatch(
-                        file_path=file_path,
-                        line_number=i + 1,
-                        line_content=line.rstrip(),
-                        match_text=match.group(),
-                        match_type=MatchType.PATTERN,
-                        context_before=[l.rstrip() for l in context_before],
-                        context_after=[l.rstrip() for l in context_after],
-                        column_start=match.start(),
-                        column_end=match.end()
-                    )
-                    matches.append(code_match)
-        
+            hits = _scan_lines(file_path, pattern, self._get_bytes_pattern(pattern), context_lines)
         except (OSError, UnicodeDecodeError):
-            pass  # Skip files we can't read
-        
-        return matches
+            return []  # Skip files we can't read
+        
+        return [
+            CodeMatch(
+                file_path=file_path,
+                line_number=line_number,
+                line_content=line,
+                match_text=match_text,
+                match_type=MatchType.PATTERN,
+                context_before=before,
+                context_after=after,
+                column_start=start,
+                column_end=end
+            )
+            for line_number, line, match_text, start, end, before, after in hits
+        ]
 
-    def _search_with_pattern(self, pattern: Pattern, match_type: MatchType, 
-                           search_name: str) -> List[CodeMatch]:
-        """Helper method to search with a specific pattern."""
-        files_to_search = self._find_searchable_files(None, self.default_extensions)
-        matches = []
-        
-        for file_path in files_to_search:
+    def _fingerprint_files(self, files: List[Path],
+                           detector: DuplicateDetector) -> List[FileFingerprint]:
+        """Fingerprint files for duplicate detection in worker processes or threads."""
+        if self._use_process_backend(len(files)):
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                
-                for i, line in enumerate(lines):
-                    match = pattern.search(line)
-                    if match:
-                        code_match = CodeMatch(
-                            file_path=file_path,
-                            line_number=i + 1,
-                            line_content=line.rstrip(),
-                            match_text=match.group(),
-                            match_type=match_type,
-                            column_start=match.start(),
-                            column_end=match.end(),
-                            metadata={'search_type': search_name}
-                        )
-                        matches.append(code_match)
-            
-            except (OSError, UnicodeDecodeError):
-                continue
+                pool = self._get_process_pool()
+                return list(pool.map(fingerprint_file, files, repeat(detector.k), repeat(detector.w),
+                                     chunksize=max(1, len(files) // (self.process_workers * 4))))
+            except (OSError, RuntimeError):
+                pass  # Process pools may be unavailable (e.g. restricted sandboxes)
         
-        return matches
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(detector.fingerprint, files))
+
+    def _read_lines(self, file_path: Path) -> List[str]:
+        """Read a file's lines, through the shared snapshot's content cache when there is one."""
+        if self.snapshots is not None:
+            return self.snapshots.get().read_lines(file_path)
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.readlines()
+
+    @staticmethod
+    def _read_block(file_path: Path, start_line: int, end_line: int, limit: int = 100) -> str:
+        """Read a block of lines for a short preview."""
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                block = ''.join(islice(f, start_line - 1, end_line)).strip()
+        except OSError:
+            return ""
+        return block[:limit] + '...' if len(block) > limit else block
+
+    def _get_bytes_pattern(self, pattern: Pattern) -> Optional[Pattern]:
+        """Get the cached bytes form of a pattern for mmap scanning (None if ineligible)."""
+        if not self.use_mmap:
+            return None
+        if pattern not in self._bytes_patterns:
+            self._bytes_patterns[pattern] = compile_bytes_pattern(pattern)
+        return self._bytes_patterns[pattern]
 
     def _find_files_by_language(self, language: str) -> List[Path]:
         """Find files for a specific programming language."""
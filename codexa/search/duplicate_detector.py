@@ -0,0 +1,229 @@
+"""
+Duplicate code detection for Codexa's code search engine.
+
+Each file is reduced to a sequence of normalized lines (the line's tokens
+joined by single spaces, so layout and spacing do not matter; blank lines are
+dropped), each line to a 64-bit hash, and windows of ``k`` line
+hashes to Rabin-Karp rolling hashes.  Winnowing keeps only the minimum hash of
+every ``w`` consecutive windows as the file's fingerprints, with ``k + w - 1``
+equal to ``min_lines`` so that any clone of at least ``min_lines`` lines is
+guaranteed to share a fingerprint.  Shared fingerprints are verified against
+the line hashes, extended to maximal regions and grouped into clusters of
+identical code.
+
+Fingerprinting is independent per file, so :func:`fingerprint_file` is a
+module-level function that can run in worker threads or processes.
+"""
+
+import hashlib
+import re
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+_MODULUS = (1 << 61) - 1
+_BASE = 1_000_003
+
+# Identifiers/numbers, or single punctuation characters
+_TOKEN = re.compile(r'\w+|[^\w\s]')
+
+
+@dataclass
+class FileFingerprint:
+    """Normalized line hashes and winnowed fingerprints of a single file."""
+    file_path: str
+    line_numbers: array  # Original line number of each normalized line
+    line_hashes: array
+    line_sizes: array  # Characters in each normalized line
+    fingerprints: List[Tuple[int, int]]  # (rolling hash, index of first line)
+
+
+@dataclass
+class CloneRegion:
+    """A contiguous block of code that is part of a clone cluster."""
+    file_path: Path
+    start_line: int
+    end_line: int
+
+
+@dataclass
+class CloneCluster:
+    """All known occurrences of one block of duplicated code."""
+    lines: int
+    regions: List[CloneRegion] = field(default_factory=list)
+
+
+def window_sizes(min_lines: int) -> Tuple[int, int]:
+    """Split ``min_lines`` into a k-gram size and winnowing window (k + w - 1 == min_lines)."""
+    k = max(1, (min_lines + 1) // 2)
+    return k, max(1, min_lines - k + 1)
+
+
+def _line_hash(line: str) -> int:
+    return int.from_bytes(hashlib.blake2b(line.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def fingerprint_file(file_path: Union[str, Path], k: int, w: int) -> Optional[FileFingerprint]:
+    """
+    Fingerprint one file.
+
+    Args:
+        file_path: File to read
+        k: Number of normalized lines per rolling-hash window
+        w: Winnowing window (number of consecutive k-grams per selected minimum)
+
+    Returns:
+        The file's fingerprint, or None if it cannot be read
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            raw_lines = f.readlines()
+    except OSError:
+        return None
+
+    line_numbers = array('L')
+    line_hashes = array('Q')
+    line_sizes = array('L')
+    for number, line in enumerate(raw_lines, 1):
+        normalized = ' '.join(_TOKEN.findall(line))
+        if normalized:
+            line_numbers.append(number)
+            line_hashes.append(_line_hash(normalized))
+            line_sizes.append(len(normalized))
+
+    # Rabin-Karp hashes of every window of k line hashes
+    kgrams: List[int] = []
+    if len(line_hashes) >= k:
+        drop = pow(_BASE, k - 1, _MODULUS)
+        rolling = 0
+        for i, value in enumerate(line_hashes):
+            if i >= k:
+                rolling = (rolling - line_hashes[i - k] % _MODULUS * drop) % _MODULUS
+            rolling = (rolling * _BASE + value % _MODULUS) % _MODULUS
+            if i >= k - 1:
+                kgrams.append(rolling)
+
+    # Robust winnowing: the rightmost minimum of each window of w k-grams
+    fingerprints: List[Tuple[int, int]] = []
+    last_selected = -1
+    for start in range(max(0, len(kgrams) - w + 1)):
+        window = kgrams[start:start + w]
+        smallest = min(window)
+        selected = start + max(i for i, value in enumerate(window) if value == smallest)
+        if selected != last_selected:
+            fingerprints.append((smallest, selected))
+            last_selected = selected
+    if kgrams and not fingerprints:
+        # Fewer k-grams than one winnowing window
+        smallest = min(kgrams)
+        fingerprints.append((smallest, kgrams.index(smallest)))
+
+    return FileFingerprint(str(file_path), line_numbers, line_hashes, line_sizes, fingerprints)
+
+
+class DuplicateDetector:
+    """Find clusters of duplicated code from per-file fingerprints."""
+
+    def __init__(self, min_lines: int = 5, min_chars: int = 50):
+        """
+        Initialize the detector.
+
+        Args:
+            min_lines: Minimum number of non-blank lines in a reported clone
+            min_chars: Minimum number of normalized characters in a reported clone
+        """
+        self.min_lines = max(1, min_lines)
+        self.min_chars = min_chars
+        self.k, self.w = window_sizes(self.min_lines)
+
+    def fingerprint(self, file_path: Union[str, Path]) -> Optional[FileFingerprint]:
+        """Fingerprint one file with this detector's window sizes."""
+        return fingerprint_file(file_path, self.k, self.w)
+
+    def find_clones(self, files: Iterable[FileFingerprint]) -> List[CloneCluster]:
+        """
+        Match fingerprints across files and group the clones found.
+
+        Returns:
+            Clusters ordered by clone length, then number of occurrences
+        """
+        files = [f for f in files if f is not None and f.fingerprints]
+
+        occurrences: Dict[int, List[Tuple[int, int]]] = {}
+        for file_index, fingerprint in enumerate(files):
+            for value, position in fingerprint.fingerprints:
+                occurrences.setdefault(value, []).append((file_index, position))
+
+        # Identical regions (keyed by their line hashes) -> set of (file index, start, end)
+        clusters: Dict[bytes, Set[Tuple[int, int, int]]] = {}
+        # (anchor file, other file, offset) -> anchor regions already extended
+        covered: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = {}
+
+        for locations in occurrences.values():
+            if len(locations) < 2:
+                continue
+            anchor_file, anchor_pos = locations[0]
+            for other_file, other_pos in locations[1:]:
+                key = (anchor_file, other_file, other_pos - anchor_pos)
+                if any(start <= anchor_pos < end for start, end in covered.get(key, ())):
+                    continue
+
+                region = self._extend(files[anchor_file], anchor_pos,
+                                      files[other_file], other_pos,
+                                      same_file=anchor_file == other_file)
+                if region is None:
+                    continue
+                start, end = region
+                covered.setdefault(key, []).append((start, end))
+
+                if not self._is_reportable(files[anchor_file], start, end):
+                    continue
+                offset = other_pos - anchor_pos
+                signature = files[anchor_file].line_hashes[start:end].tobytes()
+                members = clusters.setdefault(signature, set())
+                members.add((anchor_file, start, end))
+                members.add((other_file, start + offset, end + offset))
+
+        result = []
+        for signature, members in clusters.items():
+            cluster = CloneCluster(lines=len(signature) // 8)
+            for file_index, start, end in sorted(members):
+                fingerprint = files[file_index]
+                cluster.regions.append(CloneRegion(
+                    file_path=Path(fingerprint.file_path),
+                    start_line=fingerprint.line_numbers[start],
+                    end_line=fingerprint.line_numbers[end - 1],
+                ))
+            result.append(cluster)
+
+        result.sort(key=lambda c: (-c.lines, -len(c.regions), str(c.regions[0].file_path), c.regions[0].start_line))
+        return result
+
+    def _extend(self, a: FileFingerprint, a_pos: int, b: FileFingerprint, b_pos: int,
+                same_file: bool) -> Optional[Tuple[int, int]]:
+        """
+        Verify a shared k-gram and grow it to the maximal matching region.
+
+        Returns the region as (start, end) indexes into ``a``'s normalized lines.
+        """
+        a_hashes, b_hashes = a.line_hashes, b.line_hashes
+        if a_hashes[a_pos:a_pos + self.k] != b_hashes[b_pos:b_pos + self.k]:
+            return None  # Hash collision
+        offset = b_pos - a_pos
+        if same_file and offset < self.k:
+            return None  # Overlapping windows in the same file
+
+        start, end = a_pos, a_pos + self.k
+        while (start > 0 and start + offset > 0
+               and a_hashes[start - 1] == b_hashes[start - 1 + offset]
+               and not (same_file and end > start - 1 + offset)):
+            start -= 1
+        while (end < len(a_hashes) and end + offset < len(b_hashes)
+               and a_hashes[end] == b_hashes[end + offset]
+               and not (same_file and end >= start + offset)):
+            end += 1
+        return start, end
+
+    def _is_reportable(self, fingerprint: FileFingerprint, start: int, end: int) -> bool:
+        return end - start >= self.min_lines and sum(fingerprint.line_sizes[start:end]) >= self.min_chars
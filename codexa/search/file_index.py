@@ -0,0 +1,282 @@
+"""
+Persistent on-disk file index for Codexa's file search engine.
+
+The index lives under ``<base>/.codexa/index/`` and stores, for every
+directory that is not ignored, the directory's own mtime together with its
+subdirectories and the size, mtime and type of each file.  Refreshing the
+index only lists directories whose mtime changed since the last run, so a
+repeat search on a large tree skips the ``scandir()``, ignore matching and
+file type detection of every unchanged directory.
+
+A directory's mtime only changes when entries are added, removed or renamed,
+not when a file is edited in place.  Refreshing never ``stat()``-s files;
+instead callers check the entries a query actually returns with
+:meth:`FileIndex.stat_file`, so their size and mtime are never served stale.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .ignore_rules import IgnoreMatcher
+
+INDEX_VERSION = 1
+
+# (relative directory, file name, size, mtime, file type)
+IndexedFile = Tuple[str, str, int, float, str]
+
+
+class FileIndex:
+    """Incrementally refreshed index of the files below a base path."""
+
+    def __init__(self,
+                 base_path: Union[str, Path],
+                 ignore_matcher: IgnoreMatcher,
+                 get_file_type: Callable[[Path], str],
+                 index_dir: Union[str, Path] = None):
+        """
+        Initialize the file index.
+
+        Args:
+            base_path: Root directory covered by the index
+            ignore_matcher: Ignore rules used to prune the index
+            get_file_type: Maps a file path to its file type name
+            index_dir: Directory holding the index (defaults to <base>/.codexa/index)
+        """
+        self.base_path = Path(base_path)
+        self.index_dir = Path(index_dir) if index_dir else self.base_path / ".codexa" / "index"
+        self.index_file = self.index_dir / "files.json"
+        self.ignore_matcher = ignore_matcher
+        self.get_file_type = get_file_type
+        self.ignore_signature = hashlib.sha1(ignore_matcher.signature().encode("utf-8")).hexdigest()
+        self.logger = logging.getLogger("codexa.search.file_index")
+
+        self._lock = threading.RLock()
+        self._directories: Dict[str, Dict] = {}
+        self._loaded = False
+        self._dirty = False
+
+        self.stats = {'refreshes': 0, 'directories_rescanned': 0, 'directories_reused': 0,
+                      'files_checked': 0, 'files_updated': 0}
+
+    def refresh(self) -> None:
+        """Bring the index up to date, rescanning only directories that changed."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+                # Create the index directory up front so its parent's mtime is
+                # already settled when we record it below
+                try:
+                    self.index_dir.mkdir(parents=True, exist_ok=True)
+                except OSError:
+                    pass
+
+            previous = self._directories
+            current: Dict[str, Dict] = {}
+            rescanned = reused = 0
+
+            # (relative directory, rescan regardless of mtime)
+            stack = [("", False)]
+            while stack:
+                rel_dir, force = stack.pop()
+                abs_dir = self.base_path / rel_dir if rel_dir else self.base_path
+                try:
+                    dir_mtime = os.stat(abs_dir).st_mtime_ns
+                except OSError:
+                    continue
+
+                entry = previous.get(rel_dir)
+                if entry is not None and not force:
+                    # Edited ignore rules affect this directory and everything below it
+                    force = self._ignore_files_changed(abs_dir, entry)
+
+                if entry is None or force or entry['mtime'] != dir_mtime:
+                    self.ignore_matcher.refresh_level(rel_dir)
+                    new_entry = self._scan_directory(abs_dir, dir_mtime)
+                    if entry is not None and self._ignore_files_changed(abs_dir, entry, new_entry):
+                        force = True
+                    entry = new_entry
+                    rescanned += 1
+                else:
+                    reused += 1
+
+                current[rel_dir] = entry
+                for name in entry['dirs']:
+                    stack.append((f"{rel_dir}/{name}" if rel_dir else name, force))
+
+            if rescanned or len(current) != len(previous):
+                self._dirty = True
+            self._directories = current
+
+            self.stats['refreshes'] += 1
+            self.stats['directories_rescanned'] += rescanned
+            self.stats['directories_reused'] += reused
+
+            if self._dirty:
+                self._save()
+
+    def iter_files(self, rel_root: str = "") -> Iterator[IndexedFile]:
+        """Iterate over indexed files at or below ``rel_root`` (relative to base_path)."""
+        with self._lock:
+            directories = self._directories
+
+        prefix = rel_root + "/" if rel_root else ""
+        for rel_dir, entry in directories.items():
+            if rel_root and rel_dir != rel_root and not rel_dir.startswith(prefix):
+                continue
+            for name, (size, mtime, file_type) in entry['files'].items():
+                yield rel_dir, name, size, mtime, file_type
+
+    def stat_file(self, rel_dir: str, name: str) -> Optional[Tuple[int, float]]:
+        """
+        Get the current size and mtime of an indexed file, updating its record.
+
+        Returns:
+            (size, mtime), or None if the file no longer exists
+        """
+        try:
+            stat_result = os.stat(os.path.join(self.base_path, rel_dir, name))
+        except OSError:
+            stat_result = None
+
+        with self._lock:
+            self.stats['files_checked'] += 1
+            entry = self._directories.get(rel_dir)
+            record = entry['files'].get(name) if entry is not None else None
+            if stat_result is None:
+                # Removed without the directory mtime moving (e.g. clock skew)
+                if record is not None:
+                    del entry['files'][name]
+                    self.stats['files_updated'] += 1
+                    self._dirty = True
+                return None
+            if record is not None and (record[0] != stat_result.st_size or record[1] != stat_result.st_mtime):
+                record[0] = stat_result.st_size
+                record[1] = stat_result.st_mtime
+                self.stats['files_updated'] += 1
+                self._dirty = True
+        return stat_result.st_size, stat_result.st_mtime
+
+    def invalidate(self, path: Union[str, Path] = None) -> None:
+        """Force the directory containing ``path`` (or the whole index) to be rescanned."""
+        with self._lock:
+            if path is None:
+                self._directories = {}
+                self._dirty = True
+                return
+
+            try:
+                rel = Path(path).resolve().relative_to(self.base_path.resolve()).as_posix()
+            except (OSError, ValueError):
+                return
+            rel = "" if rel == "." else rel
+            for key in (rel, rel.rsplit("/", 1)[0] if "/" in rel else ""):
+                entry = self._directories.get(key)
+                if entry is not None:
+                    entry['mtime'] = -1
+
+    def directory_mtimes(self) -> Dict[str, int]:
+        """Return the recorded mtime (in ns) of every indexed directory."""
+        with self._lock:
+            return {rel_dir: entry['mtime'] for rel_dir, entry in self._directories.items()}
+
+    def file_count(self) -> int:
+        """Return the number of indexed files."""
+        with self._lock:
+            return sum(len(entry['files']) for entry in self._directories.values())
+
+    def _scan_directory(self, abs_dir: Path, dir_mtime: int) -> Dict:
+        """Read a single directory and build its index entry."""
+        subdirs: List[str] = []
+        files: Dict[str, List] = {}
+
+        try:
+            with os.scandir(abs_dir) as entries:
+                for item in entries:
+                    item_path = Path(item.path)
+                    if item_path == self.index_dir:
+                        continue
+                    try:
+                        is_dir = item.is_dir()
+                        if self.ignore_matcher.is_ignored(item_path, is_dir=is_dir, check_parents=False):
+                            continue
+                        if is_dir:
+                            # Mirror os.walk(followlinks=False): never descend into symlinks
+                            if not item.is_symlink():
+                                subdirs.append(item.name)
+                            continue
+                        stat_result = item.stat()
+                    except OSError:
+                        continue
+                    files[item.name] = [
+                        stat_result.st_size,
+                        stat_result.st_mtime,
+                        self.get_file_type(item_path),
+                    ]
+        except (PermissionError, OSError):
+            pass  # Skip directories we can't read
+
+        return {'mtime': dir_mtime, 'dirs': subdirs, 'files': files}
+
+    def _ignore_files_changed(self, abs_dir: Path, entry: Dict, new_entry: Dict = None) -> bool:
+        """Check whether a directory's ignore files differ from those recorded in ``entry``."""
+        for name in self.ignore_matcher.ignore_files:
+            recorded = entry['files'].get(name)
+            if new_entry is not None:
+                current = new_entry['files'].get(name)
+            elif recorded is None:
+                # A newly created ignore file also changes the directory mtime
+                continue
+            else:
+                try:
+                    stat_result = os.stat(abs_dir / name)
+                    current = [stat_result.st_size, stat_result.st_mtime]
+                except OSError:
+                    current = None
+            if (recorded is None) != (current is None):
+                return True
+            if recorded is not None and list(recorded[:2]) != list(current[:2]):
+                return True
+        return False
+
+    def _load(self) -> None:
+        """Load the persisted index, discarding it if it is stale or corrupt."""
+        self._loaded = True
+        if not self.index_file.exists():
+            return
+
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load file index: {e}")
+            return
+
+        if data.get('version') != INDEX_VERSION or data.get('ignore_signature') != self.ignore_signature:
+            self._dirty = True
+            return
+
+        self._directories = data.get('directories', {})
+
+    def _save(self) -> None:
+        """Persist the index atomically."""
+        data = {
+            'version': INDEX_VERSION,
+            'base_path': str(self.base_path),
+            'ignore_signature': self.ignore_signature,
+            'directories': self._directories,
+        }
+
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_file, self.index_file)
+            self._dirty = False
+        except OSError as e:
+            self.logger.warning(f"Could not save file index: {e}")
@@ -12,6 +12,11 @@ from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+from .file_index import FileIndex
+from .fuzzy import FuzzyMatcher
+from .project_snapshot import ProjectSnapshot, SnapshotCache
+from .ignore_rules import DEFAULT_IGNORE_PATTERNS, IgnoreMatcher, get_ignore_matcher
+
 @dataclass
 class SearchResult:
     """Represents a file search result."""
@@ -26,29 +31,29 @@ class SearchResult:
 class FileSearchEngine:
     """High-performance file search engine with glob patterns and intelligent filtering."""
     
-    def __init__(self, base_path: Union[str, Path] = None):
-        """Initialize the file search engine."""
+    def __init__(self, base_path: Union[str, Path] = None,
+                 use_index: bool = False,
+                 index_dir: Union[str, Path] = None):
+        """
+        Initialize the file search engine.
+        
+        Args:
+            base_path: Root directory for searches (defaults to cwd)
+            use_index: Serve searches from the persistent file index under .codexa/
+            index_dir: Override the directory holding the file index
+        """
         self.base_path = Path(base_path) if base_path else Path.cwd()
         self.max_workers = min(32, (os.cpu_count() or 1) + 4)
         self._lock = threading.RLock()
+        self.use_index = use_index
+        self.index_dir = index_dir
+        self._index: Optional[FileIndex] = None
+        # Shared walk results, set by SearchManager so sibling engines reuse one walk
+        self.snapshots: Optional[SnapshotCache] = None
         
-        # Default ignore patterns (similar to gitignore)
-        self.default_ignore_patterns = {
-            # Version control
-            '.git/**', '.svn/**', '.hg/**', '.bzr/**',
-            # Dependencies
-            'node_modules/**', 'venv/**', 'env/**', '.env/**',
-            'vendor/**', 'target/**', 'build/**', 'dist/**',
-            '__pycache__/**', '.pytest_cache/**', '.tox/**',
-            # IDE/Editor
-            '.vscode/**', '.idea/**', '*.swp', '*.swo', '*~',
-            '.DS_Store', 'Thumbs.db',
-            # Temporary files
-            '*.tmp', '*.temp', '*.log', '*.pid', '*.lock',
-            # Compiled files
-            '*.pyc', '*.pyo', '*.class', '*.o', '*.so',
-            '*.dylib', '*.dll', '*.exe',
-        }
+        # Default ignore patterns (.gitignore syntax); nested .gitignore and
+        # .codexaignore files are honoured on top of these
+        self.default_ignore_patterns = set(DEFAULT_IGNORE_PATTERNS)
         
         # File type mappings
         self.file_types = {
@@ -101,8 +106,15 @@ class FileSearchEngine:
         results = []
         
         try:
+            # Serve from the shared snapshot or persistent index when the search
+            # stays inside base_path
+            if (self.snapshots is not None or self.use_index) and self._is_within_base(search_path):
+                results = self._indexed_search(
+                    pattern, search_path, all_ignore_patterns,
+                    file_types, max_depth, include_hidden
+                )
             # Use parallel processing for large directory structures
-            if self._should_use_parallel_search(search_path):
+            elif self._should_use_parallel_search(search_path):
                 results = self._parallel_search(
                     pattern, search_path, all_ignore_patterns,
                     file_types, max_depth, include_hidden
@@ -153,6 +165,28 @@ class FileSearchEngine:
         
         return results
 
+    def find_fuzzy(self, query: str, limit: int = 20,
+                   path: Union[str, Path] = None) -> List[SearchResult]:
+        """
+        Find files whose relative path fuzzily matches ``query`` (fzf-style).
+        
+        Query characters must appear in order in the path; matches at path
+        separators, word boundaries and camelCase humps rank higher.
+        
+        Returns:
+            Up to ``limit`` results, best first, with the raw score in match_score
+        """
+        results = self.search_files("**/*", path)
+        ranked = FuzzyMatcher().rank(query, [result.relative_path for result in results], limit=limit)
+        
+        matches = []
+        for fuzzy_result in ranked:
+            result = results[fuzzy_result.index]
+            result.match_score = fuzzy_result.score
+            result.match_context = {'positions': fuzzy_result.positions}
+            matches.append(result)
+        return matches
+
     def find_by_extension(self, 
                          extensions: Union[str, List[str]],
                          path: Union[str, Path] = None) -> List[SearchResult]:
@@ -223,6 +257,9 @@ class FileSearchEngine:
                             max_depth: int = 3,
                             show_hidden: bool = False) -> Dict:
         """Get a tree structure of the project."""
+        if self.snapshots is not None:
+            return self._snapshot_structure(self.snapshots.get(), max_depth, show_hidden)
+        
         structure = {}
         
         def build_tree(path: Path, current_depth: int = 0):
@@ -264,6 +301,144 @@ class FileSearchEngine:
         build_tree(self.base_path)
         return structure
 
+    def _snapshot_structure(self, snapshot: ProjectSnapshot, max_depth: int,
+                            show_hidden: bool) -> Dict:
+        """Build the project tree from a snapshot instead of listing directories again."""
+        subdirs: Dict[str, List[str]] = {}
+        for rel_dir in snapshot.directories:
+            if rel_dir:
+                parent, _, name = rel_dir.rpartition('/')
+                subdirs.setdefault(parent, []).append(name)
+        files: Dict[str, List[tuple]] = {}
+        for rel_dir, name, size, mtime, file_type in snapshot.files:
+            files.setdefault(rel_dir, []).append((name, size, mtime, file_type))
+        
+        structure = {}
+        
+        def build_tree(rel_dir: str, current_depth: int = 0):
+            if max_depth and current_depth >= max_depth:
+                return
+            
+            # Sort: directories first, then files
+            for name in sorted(subdirs.get(rel_dir, []), key=str.lower):
+                if not show_hidden and name.startswith('.'):
+                    continue
+                child = f"{rel_dir}/{name}" if rel_dir else name
+                structure[str(Path(child))] = {
+                    'type': 'directory',
+                    'size': 0,
+                    'modified': datetime.fromtimestamp(snapshot.directories[child])
+                }
+                build_tree(child, current_depth + 1)
+            
+            for name, size, mtime, file_type in sorted(files.get(rel_dir, []), key=lambda f: f[0].lower()):
+                if not show_hidden and name.startswith('.'):
+                    continue
+                structure[str(Path(rel_dir, name))] = {
+                    'type': 'file',
+                    'size': size,
+                    'modified': datetime.fromtimestamp(mtime),
+                    'file_type': file_type
+                }
+        
+        build_tree("")
+        return structure
+
+    def take_snapshot(self) -> ProjectSnapshot:
+        """Walk the project once (or read the persistent index) into a shared snapshot."""
+        if self.use_index:
+            return ProjectSnapshot.from_index(self.get_index())
+        return ProjectSnapshot.from_walk(self.base_path, self._get_ignore_matcher(), self._get_file_type)
+
+    def get_index(self) -> FileIndex:
+        """Get the persistent file index, creating it on first use."""
+        with self._lock:
+            if self._index is None:
+                self._index = FileIndex(
+                    self.base_path,
+                    ignore_matcher=self._get_ignore_matcher(),
+                    get_file_type=self._get_file_type,
+                    index_dir=self.index_dir
+                )
+            return self._index
+
+    def invalidate_index(self, path: Union[str, Path] = None):
+        """Mark a path (or the whole index) as changed so the next search rescans it."""
+        if self._index is not None:
+            self._index.invalidate(path)
+
+    def _is_within_base(self, path: Path) -> bool:
+        """Check whether a path lies inside base_path."""
+        try:
+            path.resolve().relative_to(self.base_path.resolve())
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _indexed_search(self, pattern, search_path, ignore_patterns,
+                        file_types, max_depth, include_hidden) -> List[SearchResult]:
+        """Perform a file search against the shared snapshot or the persistent index."""
+        index = None
+        if self.snapshots is not None:
+            entries = self.snapshots.get().iter_files
+        else:
+            index = self.get_index()
+            index.refresh()
+            entries = index.iter_files
+        
+        rel_root = search_path.resolve().relative_to(self.base_path.resolve()).as_posix()
+        rel_root = "" if rel_root == "." else rel_root
+        
+        # Entries are already pruned with the default rules; only extras need checking
+        extra_patterns = set(ignore_patterns) - self.default_ignore_patterns
+        matcher = self._get_ignore_matcher(extra_patterns)
+        ignored_dirs: Dict[str, bool] = {}
+        results = []
+        
+        for rel_dir, file_name, size, mtime, file_type in entries(rel_root):
+            if not self._matches_pattern(file_name, pattern):
+                continue
+            if file_types and file_type not in file_types:
+                continue
+            
+            sub_dir = rel_dir[len(rel_root):].lstrip('/') if rel_root else rel_dir
+            parts = sub_dir.split('/') if sub_dir else []
+            
+            if max_depth and len(parts) >= max_depth:
+                continue
+            
+            if not include_hidden and (
+                file_name.startswith('.') or any(part.startswith('.') for part in parts)
+            ):
+                continue
+            
+            file_path = self.base_path / rel_dir / file_name
+            
+            if extra_patterns:
+                if rel_dir not in ignored_dirs:
+                    ignored_dirs[rel_dir] = bool(rel_dir) and matcher.is_ignored(rel_dir, is_dir=True)
+                if ignored_dirs[rel_dir] or matcher.is_ignored(
+                    file_path, is_dir=False, check_parents=False
+                ):
+                    continue
+            
+            if index is not None:
+                # Directory mtimes miss in-place edits: stat only what is returned
+                current = index.stat_file(rel_dir, file_name)
+                if current is None:
+                    continue
+                size, mtime = current
+            
+            results.append(SearchResult(
+                path=file_path,
+                relative_path=str(Path(rel_dir, file_name)),
+                size=size,
+                modified_time=datetime.fromtimestamp(mtime),
+                file_type=file_type
+            ))
+        
+        return results
+
     def _should_use_parallel_search(self, path: Path) -> bool:
         """Determine if parallel search should be used based on directory size."""
         try:
@@ -321,9 +496,10 @@ class FileSearchEngine:
                           file_types, max_depth, include_hidden) -> List[SearchResult]:
         """Perform sequential file search."""
         results = []
+        matcher = self._get_ignore_matcher(ignore_patterns)
         
-        for root, dirs, files in os.walk(search_path):
-            root_path = Path(root)
+        # The matcher prunes ignored and (optionally) hidden entries before we see them
+        for root_path, dirs, files in matcher.walk(search_path, include_hidden=include_hidden):
             current_depth = len(root_path.relative_to(search_path).parts)
             
             # Check max depth
@@ -331,25 +507,10 @@ class FileSearchEngine:
                 dirs.clear()  # Don't recurse deeper
                 continue
             
-            # Filter directories to skip
-            dirs[:] = [
-                d for d in dirs
-                if (include_hidden or not d.startswith('.')) and
-                not self._should_ignore_path(root_path / d, ignore_patterns)
-            ]
-            
             # Process files in current directory
             for file_name in files:
-                if not include_hidden and file_name.startswith('.'):
-                    continue
-                
-                file_path = root_path / file_name
-                
-                if self._should_ignore_path(file_path, ignore_patterns):
-                    continue
-                
                 if self._matches_pattern(file_name, pattern):
-                    result = self._create_search_result(file_path)
+                    result = self._create_search_result(root_path / file_name)
                     
                     # Filter by file type if specified
                     if file_types and result.file_type not in file_types:
@@ -370,7 +531,7 @@ class FileSearchEngine:
                     if not include_hidden and item.name.startswith('.'):
                         continue
                     
-                    if self._should_ignore_path(item, ignore_patterns):
+                    if self._should_ignore_path(item, ignore_patterns, is_dir=False):
                         continue
                     
                     if self._matches_pattern(item.name, pattern):
@@ -385,23 +546,18 @@ class FileSearchEngine:
         
         return results
 
-    def _should_ignore_path(self, path: Path, ignore_patterns: set = None) -> bool:
-        """Check if a path should be ignored based on patterns."""
-        if ignore_patterns is None:
-            ignore_patterns = self.default_ignore_patterns
-        
-        # Convert to relative path for pattern matching
-        try:
-            relative_path = str(path.relative_to(self.base_path))
-        except ValueError:
-            # Path is not relative to base_path
-            relative_path = str(path)
-        
-        for pattern in ignore_patterns:
-            if fnmatch.fnmatch(relative_path, pattern) or fnmatch.fnmatch(path.name, pattern):
-                return True
-        
-        return False
+    def _should_ignore_path(self, path: Path, ignore_patterns: set = None,
+                            is_dir: bool = None) -> bool:
+        """Check if a path should be ignored based on patterns and ignore files."""
+        matcher = self._get_ignore_matcher(ignore_patterns)
+        return matcher.is_ignored(path, is_dir=is_dir, check_parents=False)
+
+    def _get_ignore_matcher(self, ignore_patterns: set = None) -> IgnoreMatcher:
+        """Get the shared ignore matcher, extended with any non-default patterns."""
+        matcher = get_ignore_matcher(self.base_path, self.default_ignore_patterns)
+        if ignore_patterns:
+            matcher = matcher.with_patterns(set(ignore_patterns) - self.default_ignore_patterns)
+        return matcher
 
     def _matches_pattern(self, filename: str, pattern: str) -> bool:
         """Check if a filename matches the given pattern."""
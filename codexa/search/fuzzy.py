@@ -0,0 +1,453 @@
+"""
+Fast fuzzy matching for Codexa's search utilities.
+
+Two complementary algorithms:
+
+* Bit-parallel edit distance (Myers' algorithm) for "text that looks like the
+  pattern".  The DP column is packed into Python integers, so each character
+  of the text costs a handful of integer operations regardless of pattern
+  length, and the search variant finds the best approximate occurrence of a
+  pattern anywhere in a longer text.
+* An fzf-style subsequence scorer for file paths and command names: query
+  characters must appear in order, and matches earn bonuses at word
+  boundaries, camelCase humps and path separators.
+
+:class:`FuzzyMatcher` wraps both with batch APIs that score thousands of
+candidates per call; candidates are prefiltered with a single regex pass over
+all of them before any Python-level scoring happens.
+"""
+
+import heapq
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# fzf scoring constants
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+BONUS_BOUNDARY = SCORE_MATCH // 2
+BONUS_NON_WORD = SCORE_MATCH // 2
+BONUS_CAMEL_123 = BONUS_BOUNDARY + SCORE_GAP_EXTENSION
+BONUS_CONSECUTIVE = -(SCORE_GAP_START + SCORE_GAP_EXTENSION)
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+BONUS_BOUNDARY_WHITE = BONUS_BOUNDARY + 2
+BONUS_BOUNDARY_DELIMITER = BONUS_BOUNDARY + 1
+
+# Character classes, ordered so that everything above _NON_WORD is a word character
+_WHITE, _NON_WORD, _DELIMITER, _LOWER, _UPPER, _LETTER, _NUMBER = range(7)
+_DELIMITERS = set('/,:;|\\')
+
+
+@dataclass
+class FuzzyResult:
+    """A scored fuzzy match of one candidate."""
+    candidate: str
+    score: float
+    index: int
+    positions: List[int] = field(default_factory=list)
+
+
+def _char_class(char: str) -> int:
+    if char.islower():
+        return _LOWER
+    if char.isupper():
+        return _UPPER
+    if char.isdigit():
+        return _NUMBER
+    if char.isalpha():
+        return _LETTER
+    if char.isspace():
+        return _WHITE
+    if char in _DELIMITERS:
+        return _DELIMITER
+    return _NON_WORD
+
+
+def _bonus_for(prev_class: int, char_class: int) -> int:
+    if char_class > _NON_WORD and char_class != _DELIMITER:
+        if prev_class == _WHITE:
+            return BONUS_BOUNDARY_WHITE
+        if prev_class == _DELIMITER:
+            return BONUS_BOUNDARY_DELIMITER
+        if prev_class == _NON_WORD:
+            return BONUS_BOUNDARY
+    if (prev_class == _LOWER and char_class == _UPPER) or \
+            (prev_class != _NUMBER and char_class == _NUMBER):
+        return BONUS_CAMEL_123
+    if char_class in (_NON_WORD, _DELIMITER):
+        return BONUS_NON_WORD
+    if char_class == _WHITE:
+        return BONUS_BOUNDARY_WHITE
+    return 0
+
+
+def subsequence_score(query: str, candidate: str,
+                      case_sensitive: bool = False) -> Optional[Tuple[int, List[int]]]:
+    """
+    Score ``candidate`` against ``query`` the way fzf's v1 algorithm does.
+
+    Query characters must occur in order.  The shortest window ending at the
+    first complete occurrence is scored: +16 per matched character, bonuses
+    for boundaries and consecutive runs, penalties for gaps.
+
+    Returns:
+        (score, matched positions), or None if ``query`` is not a subsequence
+    """
+    if not query:
+        return 0, []
+
+    text = candidate if case_sensitive else candidate.lower()
+    if len(text) != len(candidate):
+        # Some characters lowercase to several; fold one character at a time
+        text = ''.join(char.lower()[0] for char in candidate)
+    pattern = query if case_sensitive else query.lower()
+
+    # Forward pass: where does the first full occurrence end?
+    pidx = 0
+    end = -1
+    for idx, char in enumerate(text):
+        if char == pattern[pidx]:
+            pidx += 1
+            if pidx == len(pattern):
+                end = idx + 1
+                break
+    if end < 0:
+        return None
+
+    # Backward pass: tighten the start of the window
+    pidx = len(pattern) - 1
+    start = end - 1
+    for idx in range(end - 1, -1, -1):
+        if text[idx] == pattern[pidx]:
+            pidx -= 1
+            if pidx < 0:
+                start = idx
+                break
+
+    score = 0
+    in_gap = False
+    consecutive = 0
+    first_bonus = 0
+    positions: List[int] = []
+    prev_class = _char_class(candidate[start - 1]) if start > 0 else _WHITE
+    pidx = 0
+
+    for idx in range(start, end):
+        char_class = _char_class(candidate[idx])
+        if pidx < len(pattern) and text[idx] == pattern[pidx]:
+            score += SCORE_MATCH
+            bonus = _bonus_for(prev_class, char_class)
+            if consecutive == 0:
+                first_bonus = bonus
+            else:
+                # Keep the bonus of a boundary that started this run
+                if bonus >= BONUS_BOUNDARY and bonus > first_bonus:
+                    first_bonus = bonus
+                bonus = max(bonus, first_bonus, BONUS_CONSECUTIVE)
+            score += bonus * BONUS_FIRST_CHAR_MULTIPLIER if pidx == 0 else bonus
+            positions.append(idx)
+            in_gap = False
+            consecutive += 1
+            pidx += 1
+        else:
+            score += SCORE_GAP_EXTENSION if in_gap else SCORE_GAP_START
+            in_gap = True
+            consecutive = 0
+            first_bonus = 0
+        prev_class = char_class
+
+    return score, positions
+
+
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _myers_columns(pattern: str, text: str, anywhere: bool) -> Iterable[int]:
+    """
+    Yield the last row of the edit-distance matrix, one text column at a time.
+
+    With ``anywhere`` the pattern may start at any text position (approximate
+    search); otherwise the whole of both strings is aligned (Levenshtein).
+    """
+    length = len(pattern)
+    masks = _pattern_masks(pattern)
+    full = (1 << length) - 1
+    high = 1 << (length - 1)
+    carry = 0 if anywhere else 1
+    positive = full
+    negative = 0
+    score = length
+
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        hp = negative | (~(xh | positive) & full)
+        hn = positive & xh
+        if hp & high:
+            score += 1
+        elif hn & high:
+            score -= 1
+        hp = ((hp << 1) | carry) & full
+        hn = (hn << 1) & full
+        positive = hn | (~(xv | hp) & full)
+        negative = hp & xv
+        yield score
+
+
+def edit_distance(a: str, b: str, max_distance: int = None) -> int:
+    """
+    Levenshtein distance between two strings (bit-parallel).
+
+    With ``max_distance``, gives up as soon as the result is known to exceed
+    it and returns ``max_distance + 1``.
+    """
+    if len(a) > len(b):
+        a, b = b, a  # Shorter string as the bit-vector
+    if not a:
+        distance = len(b)
+        return distance if max_distance is None else min(distance, max_distance + 1)
+
+    length = len(a)
+    masks = _pattern_masks(a)
+    full = (1 << length) - 1
+    high = 1 << (length - 1)
+    positive = full
+    negative = 0
+    score = length
+    remaining = len(b)
+
+    for char in b:
+        eq = masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        hp = negative | (~(xh | positive) & full)
+        hn = positive & xh
+        if hp & high:
+            score += 1
+        elif hn & high:
+            score -= 1
+        remaining -= 1
+        # The final score can drop by at most one per remaining character
+        if max_distance is not None and score - remaining > max_distance:
+            return max_distance + 1
+        hp = ((hp << 1) | 1) & full
+        hn = (hn << 1) & full
+        positive = hn | (~(xv | hp) & full)
+        negative = hp & xv
+
+    return score
+
+
+def similarity(a: str, b: str, min_similarity: float = None) -> float:
+    """
+    Edit-distance similarity in [0, 1] (1.0 means identical).
+
+    With ``min_similarity``, any result below it may be reported as 0.0.
+    """
+    longest = max(len(a), len(b))
+    if longest == 0:
+        return 1.0
+    max_distance = None
+    if min_similarity is not None:
+        max_distance = int(longest * (1.0 - min_similarity) + 1e-9)
+    distance = edit_distance(a, b, max_distance)
+    if max_distance is not None and distance > max_distance:
+        return 0.0
+    return 1.0 - distance / longest
+
+
+def _match_start(pattern: str, text: str, end: int, distance: int) -> int:
+    """Find where the shortest occurrence of ``pattern`` ending at ``end`` with ``distance`` edits starts."""
+    reversed_pattern = pattern[::-1]
+    reversed_text = text[end - 1::-1] if end else ""
+    for offset, score in enumerate(_myers_columns(reversed_pattern, reversed_text, anywhere=True)):
+        if score <= distance:
+            return end - offset - 1
+    return 0
+
+
+def find_approximate(pattern: str, text: str,
+                     max_distance: int) -> List[Tuple[int, int, int]]:
+    """
+    Find non-overlapping approximate occurrences of ``pattern`` in ``text``.
+
+    Returns:
+        (start, end, edit distance) of the best occurrence in each run of
+        matching end positions, in text order
+    """
+    if not pattern or max_distance < 0:
+        return []
+
+    # Group consecutive end positions within the bound; keep the best of each run
+    runs: List[Tuple[int, int]] = []
+    best: Optional[Tuple[int, int]] = None
+    previous_end = -2
+    for end, score in enumerate(_myers_columns(pattern, text, anywhere=True), 1):
+        if score > max_distance:
+            continue
+        if best is not None and end != previous_end + 1:
+            runs.append(best)
+            best = None
+        if best is None or score < best[1]:
+            best = (end, score)
+        previous_end = end
+    if best is not None:
+        runs.append(best)
+
+    results = []
+    last_end = 0
+    for end, distance in runs:
+        start = _match_start(pattern, text, end, distance)
+        if start < last_end:
+            # Overlaps the previous occurrence: take the best one after it instead,
+            # so the reported distance is that of the span actually returned
+            found = best_approximate(pattern, text[last_end:end], max_distance)
+            if found is None:
+                continue
+            start, end, distance = last_end + found[0], last_end + found[1], found[2]
+        results.append((start, end, distance))
+        last_end = end
+    return results
+
+
+def best_approximate(pattern: str, text: str,
+                     max_distance: int = None) -> Optional[Tuple[int, int, int]]:
+    """
+    Find the single best approximate occurrence of ``pattern`` in ``text``.
+
+    Returns:
+        (start, end, edit distance), or None if nothing is within ``max_distance``
+    """
+    if not pattern:
+        return None
+    limit = len(pattern) if max_distance is None else max_distance
+    best: Optional[Tuple[int, int]] = None
+    for end, score in enumerate(_myers_columns(pattern, text, anywhere=True), 1):
+        if score <= limit and (best is None or score < best[1]):
+            best = (end, score)
+            if score == 0:
+                break
+    if best is None:
+        return None
+    end, distance = best
+    return _match_start(pattern, text, end, distance), end, distance
+
+
+class FuzzyMatcher:
+    """Batch fuzzy scoring over large candidate lists."""
+
+    def __init__(self):
+        """Initialize the fuzzy matcher."""
+        self._prefilters: Dict[Tuple[str, bool], re.Pattern] = {}
+
+    def rank(self,
+             query: str,
+             candidates: Sequence[str],
+             limit: int = None,
+             min_score: float = None) -> List[FuzzyResult]:
+        """
+        Rank candidates by fzf-style subsequence score.
+
+        Uses smart case: the query is case-insensitive unless it contains an
+        uppercase letter.  Ties are broken by shorter candidate, then input order.
+
+        Args:
+            query: Characters to look for, in order
+            candidates: Strings to score (file paths, command names, ...)
+            limit: Maximum number of results
+            min_score: Minimum raw score to keep
+
+        Returns:
+            Results sorted best first
+        """
+        if not query:
+            results = [FuzzyResult(candidate, 0, i) for i, candidate in enumerate(candidates)]
+            return results[:limit] if limit else results
+
+        case_sensitive = query != query.lower()
+        scored = []
+        for index in self._prefilter(query, candidates, case_sensitive):
+            candidate = candidates[index]
+            match = subsequence_score(query, candidate, case_sensitive)
+            if match is None:
+                continue
+            score, positions = match
+            if min_score is not None and score < min_score:
+                continue
+            scored.append(FuzzyResult(candidate, score, index, positions))
+
+        def sort_key(result: FuzzyResult):
+            return result.score, -len(result.candidate), -result.index
+
+        if limit:
+            return heapq.nlargest(limit, scored, key=sort_key)
+        return sorted(scored, key=sort_key, reverse=True)
+
+    def rank_similar(self,
+                     text: str,
+                     candidates: Sequence[str],
+                     limit: int = None,
+                     min_similarity: float = 0.0) -> List[FuzzyResult]:
+        """
+        Rank candidates by edit-distance similarity to ``text`` (case-insensitive).
+
+        Candidates whose length difference alone rules out ``min_similarity``
+        are skipped without computing a distance.
+        """
+        text = text.lower()
+        scored = []
+        for index, candidate in enumerate(candidates):
+            longest = max(len(text), len(candidate))
+            if longest and 1.0 - abs(len(text) - len(candidate)) / longest < min_similarity:
+                continue
+            score = similarity(text, candidate.lower(), min_similarity or None)
+            if score >= min_similarity and (score > 0 or not min_similarity):
+                scored.append(FuzzyResult(candidate, score, index))
+
+        def sort_key(result: FuzzyResult):
+            return result.score, -result.index
+
+        if limit:
+            return heapq.nlargest(limit, scored, key=sort_key)
+        return sorted(scored, key=sort_key, reverse=True)
+
+    def _prefilter(self, query: str, candidates: Sequence[str],
+                   case_sensitive: bool) -> Iterable[int]:
+        """Return indexes of candidates containing ``query`` as a subsequence, in one regex pass."""
+        key = (query, case_sensitive)
+        regex = self._prefilters.get(key)
+        if regex is None:
+            body = '[^\\n]*?'.join(re.escape(char) for char in query)
+            regex = re.compile(body, 0 if case_sensitive else re.IGNORECASE)
+            if len(self._prefilters) > 256:
+                self._prefilters.clear()
+            self._prefilters[key] = regex
+
+        if any('\n' in candidate for candidate in candidates):
+            return [i for i, candidate in enumerate(candidates) if regex.search(candidate)]
+
+        joined = '\n'.join(candidates)
+        line_starts = [0]
+        for candidate in candidates[:-1]:
+            line_starts.append(line_starts[-1] + len(candidate) + 1)
+
+        indexes = []
+        line = 0
+        for match in regex.finditer(joined):
+            while line + 1 < len(line_starts) and line_starts[line + 1] <= match.start():
+                line += 1
+            if not indexes or indexes[-1] != line:
+                indexes.append(line)
+        return indexes
+
+
+def max_distance_for(pattern: str, threshold: float) -> int:
+    """Largest edit distance that keeps ``1 - distance / len(pattern)`` above ``threshold``."""
+    return math.ceil(len(pattern) * (1.0 - threshold)) - 1
@@ -0,0 +1,387 @@
+"""
+Compiled ignore rules with .gitignore semantics for Codexa's search engines.
+
+Patterns from the built-in defaults, the caller and every ``.gitignore`` /
+``.codexaignore`` found in the tree are compiled into a single combined regex
+per directory level.  A path is resolved by checking the deepest level first,
+and within a level the last matching rule wins (so ``!negations`` work as in
+git).  :meth:`IgnoreMatcher.walk` prunes ignored directories before they are
+entered, so whole subtrees such as ``node_modules/`` are never listed.
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
+
+# Built-in ignore patterns, in .gitignore syntax
+DEFAULT_IGNORE_PATTERNS = (
+    # Version control
+    '.git/', '.svn/', '.hg/', '.bzr/',
+    # Dependencies and build output
+    'node_modules/', 'venv/', 'env/', '.env/',
+    'vendor/', 'target/', 'build/', 'dist/',
+    '__pycache__/', '.pytest_cache/', '.tox/',
+    # IDE/Editor
+    '.vscode/', '.idea/', '*.swp', '*.swo', '*~',
+    '.DS_Store', 'Thumbs.db',
+    # Temporary files
+    '*.tmp', '*.temp', '*.log', '*.pid', '*.lock',
+    # Compiled files
+    '*.pyc', '*.pyo', '*.class', '*.o', '*.so',
+    '*.dylib', '*.dll', '*.exe',
+)
+
+# Per-directory ignore files, lowest priority first
+IGNORE_FILE_NAMES = ('.gitignore', '.codexaignore')
+
+
+def translate_glob(pattern: str, match_directory_itself: bool = False) -> str:
+    """
+    Translate a gitignore-style glob into a regex body (without anchors).
+
+    ``*`` and ``?`` never cross ``/``; ``**`` spans any number of directories.
+    All groups in the result are non-capturing so bodies can be combined.
+
+    Args:
+        pattern: Glob pattern relative to the directory it applies to
+        match_directory_itself: Let a trailing ``/**`` also match the directory itself
+    """
+    result = []
+    i, n = 0, len(pattern)
+
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                at_start = i == 0 or pattern[i - 1] == '/'
+                at_end = i + 2 == n
+                if at_start and pattern.startswith('**/', i):
+                    result.append('(?:.*/)?')
+                    i += 3
+                    continue
+                if at_start and at_end:
+                    if result and result[-1] == '/':
+                        result.pop()
+                        result.append('(?:/.*)?' if match_directory_itself else '/.*')
+                    else:
+                        result.append('.*')
+                    i += 2
+                    continue
+                result.append('[^/]*')
+                i += 2
+                continue
+            result.append('[^/]*')
+        elif c == '?':
+            result.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2 if pattern.startswith('[!', i) or pattern.startswith('[^', i) else i + 1)
+            if end == -1:
+                result.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                result.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        elif c == '/':
+            result.append('/')
+        else:
+            result.append(re.escape(c))
+        i += 1
+
+    return ''.join(result)
+
+
+class _IgnoreLevel:
+    """Rules from one directory level compiled into combined regexes."""
+
+    def __init__(self, patterns: Iterable[str]):
+        file_bodies: List[str] = []
+        dir_bodies: List[str] = []
+        self._file_negated: List[bool] = []
+        self._dir_negated: List[bool] = []
+
+        for raw in patterns:
+            rule = self._parse(raw)
+            if rule is None:
+                continue
+            pattern, negated, dir_only, anchored = rule
+            prefix = '' if anchored else '(?:.*/)?'
+            dir_bodies.append(prefix + translate_glob(pattern, match_directory_itself=True))
+            self._dir_negated.append(negated)
+            if not dir_only:
+                file_bodies.append(prefix + translate_glob(pattern))
+                self._file_negated.append(negated)
+
+        self.file_regex = self._combine(file_bodies)
+        self.dir_regex = self._combine(dir_bodies)
+        # Group N in the combined regex is rule index len - N (rules are reversed)
+        self.rule_count = len(dir_bodies)
+
+    @staticmethod
+    def _parse(raw: str) -> Optional[Tuple[str, bool, bool, bool]]:
+        """Parse one gitignore line into (pattern, negated, dir_only, anchored)."""
+        line = raw.rstrip('\n').rstrip('\r')
+        # Trailing spaces are ignored unless escaped
+        while line.endswith(' ') and not line.endswith('\\ '):
+            line = line[:-1]
+        if not line or line.startswith('#'):
+            return None
+
+        negated = False
+        if line.startswith('!'):
+            negated = True
+            line = line[1:]
+        elif line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+
+        anchored = '/' in line
+        line = line.lstrip('/')
+        return line, negated, dir_only, anchored
+
+    @staticmethod
+    def _combine(bodies: List[str]) -> Optional[Pattern]:
+        if not bodies:
+            return None
+        # Reverse so the first alternative to match is the last rule in file order
+        return re.compile('^(?:' + '|'.join(f'({body})' for body in reversed(bodies)) + ')$', re.DOTALL)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Return True/False if a rule decides the path, None if no rule matches."""
+        regex = self.dir_regex if is_dir else self.file_regex
+        if regex is None:
+            return None
+        m = regex.match(rel_path)
+        if m is None:
+            return None
+        negated = self._dir_negated if is_dir else self._file_negated
+        return not negated[len(negated) - m.lastindex]
+
+
+class IgnoreMatcher:
+    """Resolves ignore decisions for paths below a root directory."""
+
+    def __init__(self,
+                 root: Union[str, Path],
+                 patterns: Iterable[str] = DEFAULT_IGNORE_PATTERNS,
+                 extra_patterns: Iterable[str] = None,
+                 ignore_files: Tuple[str, ...] = IGNORE_FILE_NAMES,
+                 _levels: Dict = None):
+        """
+        Initialize the ignore matcher.
+
+        Args:
+            root: Directory the patterns are relative to
+            patterns: Base patterns, lowest priority (below any ignore file)
+            extra_patterns: Caller-supplied patterns that always take precedence
+            ignore_files: Names of per-directory ignore files to honour
+        """
+        self.root = Path(root)
+        self.patterns = tuple(patterns)
+        self.extra_patterns = tuple(extra_patterns or ())
+        self.ignore_files = tuple(ignore_files)
+
+        self._base_level = _IgnoreLevel(self.patterns)
+        self._extra_level = _IgnoreLevel(self.extra_patterns) if self.extra_patterns else None
+
+        self._lock = threading.RLock()
+        # rel_dir -> (ignore file mtimes, compiled level or None); shared with derived matchers
+        self._levels: Dict[str, Tuple[Tuple, Optional[_IgnoreLevel]]] = {} if _levels is None else _levels
+        self._derived: Dict[FrozenSet[str], 'IgnoreMatcher'] = {}
+
+    def signature(self) -> str:
+        """Identify the base and extra patterns (not the per-directory ignore files)."""
+        return '\n'.join(self.patterns + ('--',) + self.extra_patterns + ('--',) + self.ignore_files)
+
+    def with_patterns(self, extra_patterns: Iterable[str]) -> 'IgnoreMatcher':
+        """Get a matcher adding ``extra_patterns``, sharing this matcher's ignore-file cache."""
+        key = frozenset(extra_patterns or ())
+        if not key:
+            return self
+        with self._lock:
+            matcher = self._derived.get(key)
+            if matcher is None:
+                matcher = IgnoreMatcher(
+                    self.root, self.patterns, sorted(key | set(self.extra_patterns)),
+                    self.ignore_files, _levels=self._levels
+                )
+                self._derived[key] = matcher
+            return matcher
+
+    def is_ignored(self, path: Union[str, Path], is_dir: bool = None,
+                   check_parents: bool = True) -> bool:
+        """
+        Check whether a path is ignored.
+
+        Args:
+            path: Absolute path, or path relative to root
+            is_dir: Whether the path is a directory (looked up on disk if None)
+            check_parents: Also treat the path as ignored if any parent directory is
+        """
+        path = Path(path)
+        if is_dir is None:
+            is_dir = (path if path.is_absolute() else self.root / path).is_dir()
+
+        parts = self._relative_parts(path)
+        if parts is None:
+            # Outside the root: only name-based rules can apply
+            return self._match_parts((path.name,), is_dir, use_ignore_files=False)
+
+        if check_parents:
+            for i in range(1, len(parts)):
+                if self._match_parts(parts[:i], True):
+                    return True
+        return self._match_parts(parts, is_dir)
+
+    def walk(self, top: Union[str, Path] = None,
+             include_hidden: bool = True) -> Iterator[Tuple[Path, List[str], List[str]]]:
+        """
+        Walk the tree like ``os.walk`` with ignored entries already removed.
+
+        Ignored directories are never entered.  Callers may prune ``dirs``
+        further in place, as with ``os.walk``.
+        """
+        top = Path(top) if top else self.root
+        top_parts = self._relative_parts(top)
+        if top_parts is not None:
+            for i in range(len(top_parts)):
+                self.refresh_level(top_parts[:i])
+
+        for root, dirs, files in os.walk(top):
+            root_path = Path(root)
+            parts = self._relative_parts(root_path)
+            if parts is not None:
+                self.refresh_level(parts)
+                dirs[:] = [
+                    d for d in dirs
+                    if (include_hidden or not d.startswith('.'))
+                    and not self._match_parts(parts + (d,), True)
+                ]
+                files = [
+                    f for f in files
+                    if (include_hidden or not f.startswith('.'))
+                    and not self._match_parts(parts + (f,), False)
+                ]
+            yield root_path, dirs, files
+
+    def refresh_level(self, rel_dir: Union[str, Tuple[str, ...]]) -> bool:
+        """
+        Reload the ignore files of one directory if they changed on disk.
+
+        Returns:
+            True if the rules for that directory changed
+        """
+        key = self._level_key(rel_dir)
+        directory = self.root / key if key else self.root
+
+        mtimes = []
+        for name in self.ignore_files:
+            try:
+                mtimes.append(os.stat(directory / name).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        mtimes = tuple(mtimes)
+
+        with self._lock:
+            cached = self._levels.get(key)
+            if cached is not None and cached[0] == mtimes:
+                return False
+
+            level = None
+            if any(m is not None for m in mtimes):
+                lines: List[str] = []
+                for name, mtime in zip(self.ignore_files, mtimes):
+                    if mtime is None:
+                        continue
+                    try:
+                        with open(directory / name, 'r', encoding='utf-8', errors='ignore') as f:
+                            lines.extend(f.readlines())
+                    except OSError:
+                        continue
+                level = _IgnoreLevel(lines)
+
+            self._levels[key] = (mtimes, level)
+            return cached is not None or level is not None
+
+    def _match_parts(self, parts: Tuple[str, ...], is_dir: bool,
+                     use_ignore_files: bool = True) -> bool:
+        """Resolve a path (as relative parts) against every applicable level."""
+        rel_path = '/'.join(parts)
+
+        if self._extra_level is not None and self._extra_level.match(rel_path, is_dir):
+            return True
+
+        if use_ignore_files and self.ignore_files:
+            # Deepest directory first; its ignore file overrides its parents'
+            for i in range(len(parts) - 1, -1, -1):
+                level = self._get_level(parts[:i])
+                if level is None:
+                    continue
+                decision = level.match('/'.join(parts[i:]), is_dir)
+                if decision is not None:
+                    return decision
+
+        return bool(self._base_level.match(rel_path, is_dir))
+
+    def _get_level(self, rel_dir: Tuple[str, ...]) -> Optional[_IgnoreLevel]:
+        key = self._level_key(rel_dir)
+        cached = self._levels.get(key)
+        if cached is None:
+            self.refresh_level(key)
+            cached = self._levels.get(key)
+        return cached[1] if cached else None
+
+    @staticmethod
+    def _level_key(rel_dir: Union[str, Tuple[str, ...]]) -> str:
+        return rel_dir if isinstance(rel_dir, str) else '/'.join(rel_dir)
+
+    def _relative_parts(self, path: Path) -> Optional[Tuple[str, ...]]:
+        if not path.is_absolute():
+            return tuple(p for p in path.parts if p != '.')
+        try:
+            return path.relative_to(self.root).parts
+        except ValueError:
+            try:
+                return path.resolve().relative_to(self.root.resolve()).parts
+            except (OSError, ValueError):
+                return None
+
+
+def find_repo_root(path: Union[str, Path]) -> Path:
+    """
+    Find the repository root containing ``path``.
+
+    Returns the nearest ancestor (or ``path`` itself) holding a ``.git`` entry,
+    or ``path`` when it is not inside a repository.
+    """
+    path = Path(path).resolve()
+    for candidate in (path,) + tuple(path.parents):
+        if (candidate / '.git').exists():
+            return candidate
+    return path
+
+
+_shared_matchers: Dict[Tuple[str, Tuple[str, ...]], IgnoreMatcher] = {}
+_shared_lock = threading.Lock()
+
+
+def get_ignore_matcher(root: Union[str, Path],
+                       patterns: Iterable[str] = DEFAULT_IGNORE_PATTERNS) -> IgnoreMatcher:
+    """Get the shared matcher for a root, so compiled ignore files are reused across engines."""
+    key = (str(Path(root).resolve()), tuple(sorted(patterns)))
+    with _shared_lock:
+        matcher = _shared_matchers.get(key)
+        if matcher is None:
+            matcher = IgnoreMatcher(root, key[1])
+            _shared_matchers[key] = matcher
+        return matcher
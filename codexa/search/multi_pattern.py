@@ -0,0 +1,197 @@
+"""
+Single-pass multi-pattern scanning for Codexa's code search engine.
+
+Audit searches (TODOs, URLs, hardcoded secrets, ...) used to run one full
+walk-and-read of the project per pattern.  :class:`MultiPatternScanner` reads
+each file once and checks every rule against it.
+
+Most of the cost of a rule is the regex pass over lines that cannot match, so
+rather than one big alternation (which CPython's ``re`` cannot optimise for
+case-insensitive rules) the scanner derives the literals each rule's matches
+must contain, locates them in the case-folded file text with ``str.find`` and
+only runs the rules on the lines they land on.  Rules without a usable literal
+are covered by one combined regex.  Each match is tagged with the rule that
+produced it, and results match running every rule line by line on its own
+(for rules without lookarounds that peek past the line end).
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Pattern, Set, Tuple, Union
+
+from .trigram_index import _ASCII_CASE_FOLDS, TrigramQuery, build_query
+
+# Inline flag letters for the flags a rule can carry into the combined regex
+_INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+# String anchors mean "start/end of line" in a per-line scan but not on whole-file text
+_STRING_ANCHORS = re.compile(r'(?<!\\)(?:\\\\)*\\[AZ]')
+
+
+@dataclass
+class ScanRule:
+    """A named pattern for multi-pattern scans."""
+    rule_id: str
+    pattern: Pattern
+    match_type: Any = None
+    description: str = ""
+
+
+# (rule, line number, line, match)
+RuleHit = Tuple[ScanRule, int, str, 're.Match']
+
+
+def required_literals(query: TrigramQuery) -> Optional[Set[str]]:
+    """
+    Reduce a trigram query to lowercase literals, one of which every match contains.
+
+    Returns None when no such set can be derived.
+    """
+    if query is None:
+        return None
+
+    kind, value = query
+    if kind == 'lit':
+        return {value.lower()} if value and value.isascii() else None
+
+    options = [required_literals(sub) for sub in value]
+    if kind == 'and':
+        # Any one conjunct will do; prefer the one with the longest shortest literal
+        options = [option for option in options if option]
+        return max(options, key=lambda option: min(map(len, option))) if options else None
+
+    # 'or'
+    if any(option is None for option in options):
+        return None
+    literals = set().union(*options)
+    # A literal containing another one is redundant
+    return {lit for lit in literals if not any(other != lit and other in lit for other in literals)}
+
+
+class MultiPatternScanner:
+    """Scan files for many rules at once, reading each file a single time."""
+
+    def __init__(self, rules: Iterable[ScanRule]):
+        """
+        Initialize the scanner.
+
+        Args:
+            rules: Rules to scan for; rule IDs must be unique
+        """
+        self.rules: List[ScanRule] = list(rules)
+        ids = [rule.rule_id for rule in self.rules]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Scan rule IDs must be unique")
+
+        self.literals: Set[str] = set()
+        unfiltered: List[ScanRule] = []
+        for rule in self.rules:
+            literals = required_literals(build_query(rule.pattern))
+            if literals is None:
+                unfiltered.append(rule)
+            else:
+                self.literals.update(literals)
+
+        self.has_unfiltered = bool(unfiltered)
+        self.unfiltered = self._combine(unfiltered)
+        self.combined = self._combine(self.rules)
+
+    @staticmethod
+    def _combine(rules: List[ScanRule]) -> Optional[Pattern]:
+        """Build one alternation over ``rules`` (None if there are none or they cannot be combined)."""
+        parts = []
+        for rule in rules:
+            if _STRING_ANCHORS.search(rule.pattern.pattern):
+                return None
+            letters = ''.join(letter for flag, letter in _INLINE_FLAGS if rule.pattern.flags & flag)
+            # MULTILINE keeps ^/$ anchored to each line of the whole-file text
+            parts.append(f"(?m{letters}:{rule.pattern.pattern})")
+        if not parts:
+            return None
+        try:
+            return re.compile('|'.join(parts))
+        except re.error:
+            # e.g. numbered backreferences, whose group numbers shift when combined
+            return None
+
+    def scan_text(self, text: str) -> Iterator[RuleHit]:
+        """
+        Scan text for all rules.
+
+        Yields the first match of each rule on each line, in line order and
+        rule order, as a separate line-by-line pass per rule would.
+        """
+        if not self.rules or not text:
+            return
+
+        line_starts = self._candidate_lines(text)
+        line_number = 1
+        counted_to = 0
+
+        for line_start in line_starts:
+            line_end = text.find('\n', line_start)
+            line_end = len(text) if line_end == -1 else line_end + 1
+
+            line_number += text.count('\n', counted_to, line_start)
+            counted_to = line_start
+
+            line = text[line_start:line_end]
+            for rule in self.rules:
+                match = rule.pattern.search(line)
+                if match:
+                    yield rule, line_number, line, match
+
+    def scan_file(self, file_path: Union[str, Path]) -> List[RuleHit]:
+        """Read a file once and scan it for all rules."""
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            text = f.read()
+        return list(self.scan_text(text))
+
+    def _candidate_lines(self, text: str) -> List[int]:
+        """Return the start offsets of the lines any rule could match, in order."""
+        folded = text
+        if self.literals:
+            if not text.isascii() and any(chr(code) in text for code in _ASCII_CASE_FOLDS):
+                folded = folded.translate(_ASCII_CASE_FOLDS)
+            folded = folded.lower()
+        if len(folded) != len(text):
+            # Case folding moved offsets; let the combined regex find the lines
+            return self._regex_lines(text, self.combined)
+
+        starts: Set[int] = set()
+        for literal in self.literals:
+            position = folded.find(literal)
+            while position != -1:
+                starts.add(folded.rfind('\n', 0, position) + 1)
+                line_end = folded.find('\n', position)
+                if line_end == -1:
+                    break
+                position = folded.find(literal, line_end + 1)
+
+        if self.has_unfiltered:
+            starts.update(self._regex_lines(text, self.unfiltered))
+
+        return sorted(starts)
+
+    @staticmethod
+    def _regex_lines(text: str, pattern: Optional[Pattern]) -> List[int]:
+        """Return the start offsets of the lines ``pattern`` lands on (every line if None)."""
+        starts = []
+        size = len(text)
+        position = 0
+
+        while position < size:
+            if pattern is not None:
+                found = pattern.search(text, position)
+                if found is None:
+                    break
+                position = max(position, text.rfind('\n', 0, found.start()) + 1)
+
+            starts.append(position)
+            line_end = text.find('\n', position)
+            if line_end == -1:
+                break
+            position = line_end + 1
+
+        return starts
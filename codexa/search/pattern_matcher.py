@@ -3,11 +3,16 @@ Pattern matching utilities for advanced search operations.
 """
 
 import re
-import difflib
-from typing import List, Dict, Optional, Union, Pattern, Tuple
+from typing import List, Dict, Optional, Union, Pattern, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from .fuzzy import (FuzzyMatcher, FuzzyResult, best_approximate, find_approximate,
+                    max_distance_for, similarity)
+
+# Minimum similarity for a fuzzy match (1 - edit distance / pattern length)
+FUZZY_THRESHOLD = 0.6
+
 class PatternType(Enum):
     """Types of patterns for matching."""
     GLOB = "glob"
@@ -32,6 +37,7 @@ class PatternMatcher:
     def __init__(self):
         """Initialize the pattern matcher."""
         self.compiled_patterns = {}
+        self.fuzzy = FuzzyMatcher()
         
     def match(self, 
              text: str, 
@@ -126,27 +132,23 @@ class PatternMatcher:
                     break
         
         elif pattern_type == PatternType.FUZZY:
-            # For fuzzy matching, we'll use a sliding window approach
-            pattern_len = len(pattern)
+            # Approximate occurrences within the fuzzy edit-distance budget
             search_text = text if case_sensitive else text.lower()
             search_pattern = pattern if case_sensitive else pattern.lower()
+            max_distance = max_distance_for(search_pattern, FUZZY_THRESHOLD)
             
-            for i in range(len(text) - pattern_len + 1):
-                substring = search_text[i:i + pattern_len]
-                similarity = difflib.SequenceMatcher(None, search_pattern, substring).ratio()
+            for start, end, distance in find_approximate(search_pattern, search_text, max_distance):
+                result = MatchResult(
+                    matched=True,
+                    confidence=1.0 - distance / len(search_pattern),
+                    match_text=text[start:end],
+                    start_pos=start,
+                    end_pos=end
+                )
+                matches.append(result)
                 
-                if similarity > 0.6:  # Threshold for fuzzy match
-                    result = MatchResult(
-                        matched=True,
-                        confidence=similarity,
-                        match_text=text[i:i + pattern_len],
-                        start_pos=i,
-                        end_pos=i + pattern_len
-                    )
-                    matches.append(result)
-                    
-                    if len(matches) >= max_matches:
-                        break
+                if len(matches) >= max_matches:
+                    break
         
         return matches
 
@@ -187,7 +189,7 @@ class PatternMatcher:
         if not text1 or not text2:
             return 0.0
         
-        return difflib.SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+        return similarity(text1.lower(), text2.lower())
 
     def find_best_matches(self,
                          text: str,
@@ -195,17 +197,32 @@ class PatternMatcher:
                          max_results: int = 5,
                          min_similarity: float = 0.3) -> List[Tuple[str, float]]:
         """Find best matching candidates for given text."""
-        matches = []
+        if not text:
+            return []
         
-        for candidate in candidates:
-            similarity = self.calculate_similarity(text, candidate)
-            if similarity >= min_similarity:
-                matches.append((candidate, similarity))
+        results = self.fuzzy.rank_similar(text, candidates, limit=max_results,
+                                          min_similarity=min_similarity)
+        return [(result.candidate, result.score) for result in results]
+
+    def rank_candidates(self,
+                        query: str,
+                        candidates: Sequence[str],
+                        limit: int = None) -> List[FuzzyResult]:
+        """
+        Rank many candidates (file paths, command names, ...) against a query at once.
         
-        # Sort by similarity descending
-        matches.sort(key=lambda x: x[1], reverse=True)
+        Uses fzf-style subsequence scoring: every query character must appear
+        in order, with bonuses for word boundaries, camelCase and path separators.
         
-        return matches[:max_results]
+        Args:
+            query: Characters to look for, in order (smart case)
+            candidates: Strings to score
+            limit: Maximum number of results
+            
+        Returns:
+            FuzzyResult objects sorted best first, with matched positions
+        """
+        return self.fuzzy.rank(query, candidates, limit=limit)
 
     def extract_words(self, text: str, min_length: int = 2) -> List[str]:
         """Extract words from text."""
@@ -312,41 +329,29 @@ class PatternMatcher:
 
     def _fuzzy_match(self, text: str, pattern: str) -> MatchResult:
         """Perform fuzzy string matching."""
-        similarity = difflib.SequenceMatcher(None, pattern, text).ratio()
+        score = similarity(pattern, text)
         
-        if similarity > 0.6:  # Threshold for considering it a match
+        if score > FUZZY_THRESHOLD:  # Threshold for considering it a match
             return MatchResult(
                 matched=True,
-                confidence=similarity,
+                confidence=score,
                 match_text=text,
                 start_pos=0,
                 end_pos=len(text),
-                metadata={"similarity": similarity}
+                metadata={"similarity": score}
             )
         
-        # Try finding the best matching substring
-        best_similarity = 0
-        best_match = ""
-        best_start = 0
-        best_end = 0
-        
-        for i in range(len(text) - len(pattern) + 1):
-            substring = text[i:i + len(pattern)]
-            sim = difflib.SequenceMatcher(None, pattern, substring).ratio()
-            
-            if sim > best_similarity:
-                best_similarity = sim
-                best_match = substring
-                best_start = i
-                best_end = i + len(pattern)
-        
-        if best_similarity > 0.6:
+        # Try finding the best approximate occurrence inside the text
+        best = best_approximate(pattern, text, max_distance_for(pattern, FUZZY_THRESHOLD))
+        if best is not None:
+            start, end, distance = best
+            best_similarity = 1.0 - distance / len(pattern)
             return MatchResult(
                 matched=True,
                 confidence=best_similarity,
-                match_text=best_match,
-                start_pos=best_start,
-                end_pos=best_end,
+                match_text=text[start:end],
+                start_pos=start,
+                end_pos=end,
                 metadata={"similarity": best_similarity}
             )
         
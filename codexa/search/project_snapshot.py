@@ -0,0 +1,179 @@
+"""
+Shared project snapshots for Codexa's search engines.
+
+A :class:`ProjectSnapshot` is the result of walking the project once: every
+non-ignored file with its size, mtime and type, plus the directories seen.
+File contents are loaded lazily and kept in a bounded cache, so several
+searches over the same files (e.g. functions, classes, imports and TODOs for
+a project overview) read each file from disk only once.
+
+:class:`SnapshotCache` hands the same snapshot to every engine that shares
+it, rebuilding it once it is older than a TTL.  ``pinned()`` keeps a single
+snapshot for the duration of one request even if the TTL runs out midway.
+"""
+
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from .file_index import FileIndex, IndexedFile
+from .ignore_rules import IgnoreMatcher
+
+
+class ProjectSnapshot:
+    """One walk of a project: file list, stats and lazily loaded contents."""
+
+    def __init__(self,
+                 base_path: Union[str, Path],
+                 files: List[IndexedFile],
+                 directories: Dict[str, float],
+                 max_cached_chars: int = 64 * 1024 * 1024):
+        """
+        Initialize the snapshot.
+
+        Args:
+            base_path: Root directory of the snapshot
+            files: (relative directory, name, size, mtime, file type) of every file
+            directories: Relative directory -> mtime for every directory walked
+            max_cached_chars: Upper bound on the file text kept in memory (in characters)
+        """
+        self.base_path = Path(base_path)
+        self.files = files
+        self.directories = directories
+        self.created_at = time.monotonic()
+        self.max_cached_chars = max_cached_chars
+
+        self._lock = threading.RLock()
+        self._contents: "OrderedDict[str, str]" = OrderedDict()
+        self._cached_chars = 0
+        self.stats = {'reads': 0, 'cache_hits': 0}
+
+    @classmethod
+    def from_walk(cls, base_path: Union[str, Path], ignore_matcher: IgnoreMatcher,
+                  get_file_type: Callable[[Path], str]) -> "ProjectSnapshot":
+        """Build a snapshot by walking the project (hidden entries included)."""
+        base_path = Path(base_path)
+        files: List[IndexedFile] = []
+        directories: Dict[str, float] = {}
+
+        for root_path, _, filenames in ignore_matcher.walk(base_path):
+            rel_dir = root_path.relative_to(base_path).as_posix()
+            rel_dir = "" if rel_dir == "." else rel_dir
+            try:
+                directories[rel_dir] = os.stat(root_path).st_mtime
+            except OSError:
+                continue
+            for name in filenames:
+                file_path = root_path / name
+                try:
+                    stat_result = file_path.stat()
+                except OSError:
+                    continue
+                files.append((rel_dir, name, stat_result.st_size, stat_result.st_mtime,
+                              get_file_type(file_path)))
+
+        return cls(base_path, files, directories)
+
+    @classmethod
+    def from_index(cls, index: FileIndex) -> "ProjectSnapshot":
+        """Build a snapshot from a refreshed persistent file index."""
+        index.refresh()
+        files = list(index.iter_files())
+        directories = {rel_dir: mtime / 1e9 for rel_dir, mtime in index.directory_mtimes().items()}
+        return cls(index.base_path, files, directories)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return time.monotonic() - self.created_at
+
+    def iter_files(self, rel_root: str = "") -> Iterator[IndexedFile]:
+        """Iterate over files at or below ``rel_root`` (relative to base_path)."""
+        prefix = rel_root + "/" if rel_root else ""
+        for entry in self.files:
+            rel_dir = entry[0]
+            if rel_root and rel_dir != rel_root and not rel_dir.startswith(prefix):
+                continue
+            yield entry
+
+    def read_text(self, file_path: Union[str, Path]) -> str:
+        """Read a file's text (UTF-8, undecodable bytes dropped), caching the result."""
+        key = str(file_path)
+        with self._lock:
+            self.stats['reads'] += 1
+            text = self._contents.get(key)
+            if text is not None:
+                self._contents.move_to_end(key)
+                self.stats['cache_hits'] += 1
+                return text
+
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            text = f.read()
+
+        with self._lock:
+            if len(text) <= self.max_cached_chars and key not in self._contents:
+                self._contents[key] = text
+                self._cached_chars += len(text)
+                while self._cached_chars > self.max_cached_chars:
+                    _, evicted = self._contents.popitem(last=False)
+                    self._cached_chars -= len(evicted)
+        return text
+
+    def read_lines(self, file_path: Union[str, Path]) -> List[str]:
+        """Read a file as lines, like ``readlines()`` on a text-mode file."""
+        return io.StringIO(self.read_text(file_path), newline='\n').readlines()
+
+
+class SnapshotCache:
+    """Hands out a shared project snapshot, retaking it after a TTL."""
+
+    def __init__(self, factory: Callable[[], ProjectSnapshot], ttl: float = 5.0):
+        """
+        Initialize the snapshot cache.
+
+        Args:
+            factory: Takes a fresh snapshot of the project
+            ttl: Seconds a snapshot may be reused outside of a pinned request
+        """
+        self.factory = factory
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._snapshot: Optional[ProjectSnapshot] = None
+        self._pins = 0
+        self.stats = {'builds': 0, 'hits': 0}
+
+    def get(self) -> ProjectSnapshot:
+        """Get the current snapshot, taking a new one if it expired."""
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and (self._pins or snapshot.age < self.ttl):
+                self.stats['hits'] += 1
+                return snapshot
+
+            snapshot = self.factory()
+            self._snapshot = snapshot
+            self.stats['builds'] += 1
+            return snapshot
+
+    @contextmanager
+    def pinned(self):
+        """Keep serving the same snapshot until the block exits."""
+        with self._lock:
+            if not self._pins and self._snapshot is not None and self._snapshot.age >= self.ttl:
+                self._snapshot = None
+            self._pins += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pins -= 1
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot so the next request walks the project again."""
+        with self._lock:
+            self._snapshot = None
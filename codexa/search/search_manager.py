@@ -3,14 +3,16 @@ Unified search manager that coordinates file search, code search, and pattern ma
 """
 
 from pathlib import Path
-from typing import List, Dict, Optional, Union, Set, Any
+from typing import List, Dict, Optional, Union, Set, Any, AsyncIterator, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
+import copy
 import threading
 from datetime import datetime
 
 from .file_search import FileSearchEngine, SearchResult
+from .project_snapshot import ProjectSnapshot, SnapshotCache
 from .code_search import CodeSearchEngine, CodeMatch, SearchMode
 from .pattern_matcher import PatternMatcher, PatternType
 
@@ -41,17 +43,31 @@ class UnifiedSearchResult:
 class SearchManager:
     """Unified search manager providing high-level search operations."""
     
-    def __init__(self, base_path: Union[str, Path] = None):
-        """Initialize the search manager."""
+    def __init__(self, base_path: Union[str, Path] = None, use_index: bool = True,
+                 snapshot_ttl: float = 5.0):
+        """
+        Initialize the search manager.
+        
+        Args:
+            base_path: Root directory for searches (defaults to cwd)
+            use_index: Use the persistent file and trigram indexes under .codexa/
+            snapshot_ttl: Seconds a project walk is shared between requests
+        """
         self.base_path = Path(base_path) if base_path else Path.cwd()
         
         # Initialize search engines
-        self.file_engine = FileSearchEngine(self.base_path)
-        self.code_engine = CodeSearchEngine(self.base_path)
+        self.file_engine = FileSearchEngine(self.base_path, use_index=use_index)
+        self.code_engine = CodeSearchEngine(self.base_path, use_trigram_index=use_index)
         self.pattern_matcher = PatternMatcher()
         
+        # One walk of the project, shared by both engines
+        self.snapshots = SnapshotCache(self.file_engine.take_snapshot, ttl=snapshot_ttl)
+        self.file_engine.snapshots = self.snapshots
+        self.code_engine.snapshots = self.snapshots
+        
         self._lock = threading.RLock()
         self.search_history: List[UnifiedSearchResult] = []
+        self._overview_cache: Optional[Tuple[ProjectSnapshot, Dict[str, Any]]] = None
         
     def search(self, 
                query: str,
@@ -77,66 +93,68 @@ class SearchManager:
             execution_time=0.0
         )
         
-        try:
-            if search_type == SearchType.FILES or search_type == SearchType.MIXED:
-                file_results = self._search_files(query, kwargs)
-                result.file_matches = file_results
-                result.total_matches += len(file_results)
-            
-            if search_type == SearchType.CODE or search_type == SearchType.MIXED:
-                code_results = self._search_code(query, kwargs)
-                result.code_matches = code_results
-                result.total_matches += len(code_results)
-            
-            if search_type == SearchType.FUNCTIONS:
-                function_results = self._search_functions(query, kwargs)
-                result.code_matches = function_results
-                result.total_matches += len(function_results)
-            
-            if search_type == SearchType.CLASSES:
-                class_results = self._search_classes(query, kwargs)
-                result.code_matches = class_results
-                result.total_matches += len(class_results)
-            
-            if search_type == SearchType.IMPORTS:
-                import_results = self._search_imports(query, kwargs)
-                result.code_matches = import_results
-                result.total_matches += len(import_results)
-            
-            if search_type == SearchType.TODOS:
-                todo_results = self._search_todos()
-                result.code_matches = todo_results
-                result.total_matches += len(todo_results)
+        # All sub-searches share one walk of the project
+        with self.snapshots.pinned():
+            try:
+                if search_type == SearchType.FILES or search_type == SearchType.MIXED:
+                    file_results = self._search_files(query, kwargs)
+                    result.file_matches = file_results
+                    result.total_matches += len(file_results)
+                
+                if search_type == SearchType.CODE or search_type == SearchType.MIXED:
+                    code_results = self._search_code(query, kwargs)
+                    result.code_matches = code_results
+                    result.total_matches += len(code_results)
+                
+                if search_type == SearchType.FUNCTIONS:
+                    function_results = self._search_functions(query, kwargs)
+                    result.code_matches = function_results
+                    result.total_matches += len(function_results)
+                
+                if search_type == SearchType.CLASSES:
+                    class_results = self._search_classes(query, kwargs)
+                    result.code_matches = class_results
+                    result.total_matches += len(class_results)
+                
+                if search_type == SearchType.IMPORTS:
+                    import_results = self._search_imports(query, kwargs)
+                    result.code_matches = import_results
+                    result.total_matches += len(import_results)
+                
+                if search_type == SearchType.TODOS:
+                    todo_results = self._search_todos()
+                    result.code_matches = todo_results
+                    result.total_matches += len(todo_results)
+                
+                if search_type == SearchType.URLS:
+                    url_results = self._search_urls()
+                    result.code_matches = url_results
+                    result.total_matches += len(url_results)
+                
+                if search_type == SearchType.SECURITY_RISKS:
+                    security_results = self._search_security_risks()
+                    result.code_matches = security_results
+                    result.total_matches += len(security_results)
+                
+                if search_type == SearchType.DUPLICATES:
+                    duplicate_results = self._search_duplicates(kwargs)
+                    result.metadata['duplicates'] = duplicate_results
+                    result.total_matches += len(duplicate_results)
             
-            if search_type == SearchType.URLS:
-                url_results = self._search_urls()
-                result.code_matches = url_results
-                result.total_matches += len(url_results)
+            except Exception as e:
+                result.metadata['error'] = str(e)
             
-            if search_type == SearchType.SECURITY_RISKS:
-                security_results = self._search_security_risks()
-                result.code_matches = security_results
-                result.total_matches += len(security_results)
+            finally:
+                end_time = datetime.now()
+                result.execution_time = (end_time - start_time).total_seconds()
+                
+                # Add to search history
+                with self._lock:
+                    self.search_history.append(result)
+                    # Keep only last 100 searches
+                    if len(self.search_history) > 100:
+                        self.search_history.pop(0)
             
-            if search_type == SearchType.DUPLICATES:
-                duplicate_results = self._search_duplicates(kwargs)
-                result.metadata['duplicates'] = duplicate_results
-                result.total_matches += len(duplicate_results)
-        
-        except Exception as e:
-            result.metadata['error'] = str(e)
-        
-        finally:
-            end_time = datetime.now()
-            result.execution_time = (end_time - start_time).total_seconds()
-            
-            # Add to search history
-            with self._lock:
-                self.search_history.append(result)
-                # Keep only last 100 searches
-                if len(self.search_history) > 100:
-                    self.search_history.pop(0)
-        
         return result
 
     def quick_search(self, query: str, max_results: int = 50) -> UnifiedSearchResult:
@@ -177,6 +195,23 @@ class SearchManager:
             case_sensitive=False
         )
 
+    def search_code_stream(self, query: str, **kwargs) -> AsyncIterator[CodeMatch]:
+        """
+        Stream code matches as they are found.
+        
+        Accepts the same options as a CODE search; matches are yielded in the
+        order files finish scanning so callers can render the first hits early.
+        """
+        return self.code_engine.search_code_stream(
+            pattern=query,
+            mode=self._code_search_mode(kwargs),
+            extensions=kwargs.get('extensions'),
+            context_lines=kwargs.get('context_lines', 2),
+            case_sensitive=kwargs.get('case_sensitive', True),
+            whole_words=kwargs.get('whole_words', False),
+            max_matches=kwargs.get('max_matches', 100)
+        )
+
     def find_file(self, name: str, exact_match: bool = False) -> List[SearchResult]:
         """Find files by name."""
         return self.file_engine.find_by_name(name, exact_match=exact_match)
@@ -218,58 +253,86 @@ class SearchManager:
         """Find duplicate code blocks."""
         return self.code_engine.find_duplicates(min_lines)
 
+    def audit_project(self) -> Dict[str, List[CodeMatch]]:
+        """Find TODOs, URLs and security risks in a single pass over the project."""
+        audit = {'todos': [], 'urls': [], 'security_risks': []}
+        for match in self.code_engine.scan_patterns():
+            rule_id = match.metadata['rule_id']
+            if rule_id == 'todo':
+                audit['todos'].append(match)
+            elif rule_id == 'url':
+                audit['urls'].append(match)
+            else:
+                audit['security_risks'].append(match)
+        return audit
+
     def get_project_overview(self) -> Dict[str, Any]:
         """Get a comprehensive overview of the project."""
         overview = {}
         
-        try:
-            # File statistics
-            all_files = self.file_engine.search_files("**/*")
-            overview['total_files'] = len(all_files)
-            
-            # Group by file type
-            file_types = {}
-            total_size = 0
-            for file_result in all_files:
-                file_type = file_result.file_type
-                if file_type not in file_types:
-                    file_types[file_type] = {'count': 0, 'size': 0}
-                file_types[file_type]['count'] += 1
-                file_types[file_type]['size'] += file_result.size
-                total_size += file_result.size
-            
-            overview['file_types'] = file_types
-            overview['total_size'] = total_size
-            
-            # Code statistics
-            functions = self.code_engine.search_functions()
-            classes = self.code_engine.search_classes()
-            imports = self.code_engine.search_imports()
-            todos = self.code_engine.search_todos()
-            
-            overview['code_stats'] = {
-                'functions': len(functions),
-                'classes': len(classes),
-                'imports': len(imports),
-                'todos': len(todos)
-            }
+        # All sub-searches share one walk of the project
+        with self.snapshots.pinned():
+            snapshot = self.snapshots.get()
+            with self._lock:
+                # Nothing has been re-read since the last overview; reuse it
+                if self._overview_cache and self._overview_cache[0] is snapshot:
+                    return copy.deepcopy(self._overview_cache[1])
             
-            # Recent activity
-            recent_files = self.file_engine.find_recent_files(hours=24)
-            overview['recent_files'] = len(recent_files)
+            try:
+                # File statistics
+                all_files = self.file_engine.search_files("**/*")
+                overview['total_files'] = len(all_files)
+                
+                # Group by file type
+                file_types = {}
+                total_size = 0
+                for file_result in all_files:
+                    file_type = file_result.file_type
+                    if file_type not in file_types:
+                        file_types[file_type] = {'count': 0, 'size': 0}
+                    file_types[file_type]['count'] += 1
+                    file_types[file_type]['size'] += file_result.size
+                    total_size += file_result.size
+                
+                overview['file_types'] = file_types
+                overview['total_size'] = total_size
+                
+                # Code statistics
+                functions = self.code_engine.search_functions()
+                classes = self.code_engine.search_classes()
+                imports = self.code_engine.search_imports()
+                todos = self.code_engine.search_todos()
+                
+                overview['code_stats'] = {
+                    'functions': len(functions),
+                    'classes': len(classes),
+                    'imports': len(imports),
+                    'todos': len(todos)
+                }
+                
+                # Recent activity
+                recent_files = self.file_engine.find_recent_files(hours=24)
+                overview['recent_files'] = len(recent_files)
+                
+                # Project structure
+                structure = self.file_engine.get_project_structure(max_depth=2)
+                overview['structure_overview'] = {
+                    'directories': len([k for k, v in structure.items() if v['type'] == 'directory']),
+                    'max_depth_files': len([k for k, v in structure.items() if v['type'] == 'file'])
+                }
+                
+                with self._lock:
+                    self._overview_cache = (snapshot, copy.deepcopy(overview))
+                
+            except Exception as e:
+                overview['error'] = str(e)
             
-            # Project structure
-            structure = self.file_engine.get_project_structure(max_depth=2)
-            overview['structure_overview'] = {
-                'directories': len([k for k, v in structure.items() if v['type'] == 'directory']),
-                'max_depth_files': len([k for k, v in structure.items() if v['type'] == 'file'])
-            }
-            
-        except Exception as e:
-            overview['error'] = str(e)
-        
         return overview
 
+    def invalidate_snapshot(self):
+        """Forget the shared project walk, e.g. after files were created or edited."""
+        self.snapshots.invalidate()
+
     def get_search_suggestions(self, partial_query: str) -> List[str]:
         """Get search suggestions based on partial query."""
         suggestions = []
@@ -391,21 +454,23 @@ class SearchManager:
 
     def _search_code(self, query: str, kwargs: Dict) -> List[CodeMatch]:
         """Internal method to search code."""
-        mode = SearchMode.LITERAL
-        if kwargs.get('use_regex'):
-            mode = SearchMode.REGEX
-        elif kwargs.get('fuzzy'):
-            mode = SearchMode.FUZZY
-        
         return self.code_engine.search_code(
             pattern=query,
-            mode=mode,
+            mode=self._code_search_mode(kwargs),
             context_lines=kwargs.get('context_lines', 2),
             case_sensitive=kwargs.get('case_sensitive', True),
             whole_words=kwargs.get('whole_words', False),
             max_matches=kwargs.get('max_matches', 100)
         )
 
+    def _code_search_mode(self, kwargs: Dict) -> SearchMode:
+        """Map search options to a code search mode."""
+        if kwargs.get('use_regex'):
+            return SearchMode.REGEX
+        if kwargs.get('fuzzy'):
+            return SearchMode.FUZZY
+        return SearchMode.LITERAL
+
     def _search_functions(self, query: str, kwargs: Dict) -> List[CodeMatch]:
         """Internal method to search functions."""
         return self.code_engine.search_functions(
@@ -0,0 +1,292 @@
+"""
+Trigram content index for Codexa's code search engine.
+
+Every indexed file is reduced to the set of byte trigrams of its lowercased
+contents.  Before a literal or regex search, the query is analysed for the
+substrings any match must contain; only files whose trigram sets cover those
+substrings are opened.  The index is persisted in SQLite under
+``<base>/.codexa/index/`` and updated incrementally by comparing each file's
+mtime and size with the recorded values.
+"""
+
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple, Union
+
+if sys.version_info >= (3, 11):
+    from re import _parser as sre_parse
+else:
+    import sre_parse
+
+INDEX_VERSION = 1
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter
+_ASCII_CASE_FOLDS = {0x17f: 's', 0x212a: 'k', 0x130: 'i', 0x131: 'i'}
+
+# Query tree: None (no constraint), ('lit', text), ('and', [..]) or ('or', [..])
+TrigramQuery = Optional[Tuple[str, object]]
+
+
+def file_trigrams(data: bytes) -> array:
+    """Return the sorted, de-duplicated trigrams of ``data`` as 24-bit integers."""
+    data = data.lower()
+    grams = {data[i:i + 3] for i in range(len(data) - 2)}
+    if not data.isascii():
+        # Also index the case-folded text so ignore-case queries stay exact
+        folded = data.decode('utf-8', 'ignore').lower().translate(_ASCII_CASE_FOLDS).encode('utf-8')
+        grams.update(folded[i:i + 3] for i in range(len(folded) - 2))
+    return array('I', sorted(int.from_bytes(g, 'big') for g in grams))
+
+
+def literal_trigrams(text: str) -> Set[int]:
+    """Return the trigrams of a query literal, skipping any that contain non-ASCII bytes."""
+    data = text.lower().encode('utf-8')
+    return {
+        int.from_bytes(data[i:i + 3], 'big')
+        for i in range(len(data) - 2)
+        if max(data[i:i + 3]) < 0x80
+    }
+
+
+def build_query(pattern: Pattern) -> TrigramQuery:
+    """Derive the substrings every match of a compiled regex must contain."""
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    return _sequence_query(list(parsed))
+
+
+def _sequence_query(items: List) -> TrigramQuery:
+    parts: List = []
+    run: List[str] = []
+
+    def flush():
+        if run:
+            parts.append(('lit', ''.join(run)))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+
+        if op is sre_parse.SUBPATTERN:
+            sub = _sequence_query(list(av[-1]))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) or op is getattr(sre_parse, 'POSSESSIVE_REPEAT', None):
+            sub = _sequence_query(list(av[2])) if av[0] >= 1 else None
+        elif op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            sub = _sequence_query(list(av))
+        elif op is sre_parse.BRANCH:
+            alternatives = [_sequence_query(list(alt)) for alt in av[1]]
+            sub = None if any(alt is None for alt in alternatives) else ('or', alternatives)
+        else:
+            # Character classes, anchors, lookarounds, backreferences, ...
+            sub = None
+
+        if sub is not None:
+            parts.append(sub)
+
+    flush()
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else ('and', parts)
+
+
+class TrigramIndex:
+    """Incrementally maintained trigram index over file contents."""
+
+    def __init__(self, base_path: Union[str, Path], index_dir: Union[str, Path] = None):
+        """
+        Initialize the trigram index.
+
+        Args:
+            base_path: Root directory of the indexed files
+            index_dir: Directory holding the index (defaults to <base>/.codexa/index)
+        """
+        self.base_path = Path(base_path)
+        self.index_dir = Path(index_dir) if index_dir else self.base_path / ".codexa" / "index"
+        self.db_path = self.index_dir / "trigrams.db"
+        self.logger = logging.getLogger("codexa.search.trigram_index")
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        # path -> (file id, mtime, size)
+        self._files: Dict[str, Tuple[int, float, int]] = {}
+        self._grams: Dict[int, array] = {}
+        self._postings: Dict[int, Set[int]] = {}
+        self._next_id = 0
+
+        self.stats = {'files_indexed': 0, 'files_reused': 0, 'queries': 0, 'candidates': 0, 'searched': 0}
+
+    def update(self, files: Iterable[Path]) -> None:
+        """Re-index any of ``files`` whose mtime or size changed since they were last seen."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+            changed: List[Tuple[str, float, int, array]] = []
+            removed: List[str] = []
+
+            for file_path in files:
+                key = str(file_path)
+                try:
+                    stat_result = os.stat(file_path)
+                except OSError:
+                    if key in self._files:
+                        self._remove(key)
+                        removed.append(key)
+                    continue
+
+                known = self._files.get(key)
+                if known and known[1] == stat_result.st_mtime and known[2] == stat_result.st_size:
+                    self.stats['files_reused'] += 1
+                    continue
+
+                try:
+                    with open(file_path, 'rb') as f:
+                        grams = file_trigrams(f.read())
+                except OSError:
+                    continue
+
+                self._store(key, stat_result.st_mtime, stat_result.st_size, grams)
+                changed.append((key, stat_result.st_mtime, stat_result.st_size, grams))
+                self.stats['files_indexed'] += 1
+
+            if changed or removed:
+                self._save(changed, removed)
+
+    def candidates(self, files: List[Path], pattern: Pattern) -> List[Path]:
+        """
+        Filter ``files`` down to those that can contain a match for ``pattern``.
+
+        Files missing from the index are always kept, so the result is a
+        superset of the files with real matches.
+        """
+        with self._lock:
+            self.stats['queries'] += 1
+            self.stats['candidates'] += len(files)
+
+            allowed = self._evaluate(build_query(pattern))
+            if allowed is None:
+                self.stats['searched'] += len(files)
+                return files
+
+            result = []
+            for file_path in files:
+                known = self._files.get(str(file_path))
+                if known is None or known[0] in allowed:
+                    result.append(file_path)
+
+            self.stats['searched'] += len(result)
+            return result
+
+    def _evaluate(self, query: TrigramQuery) -> Optional[Set[int]]:
+        """Resolve a query tree to a set of file ids (None means every file)."""
+        if query is None:
+            return None
+
+        kind, value = query
+        if kind == 'lit':
+            grams = literal_trigrams(value)
+            if not grams:
+                return None
+            result: Optional[Set[int]] = None
+            # Intersect the rarest posting lists first
+            for gram in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+                posting = self._postings.get(gram, set())
+                result = set(posting) if result is None else result & posting
+                if not result:
+                    break
+            return result
+
+        results = [self._evaluate(sub) for sub in value]
+        if kind == 'and':
+            result = None
+            for sub_result in results:
+                if sub_result is None:
+                    continue
+                result = sub_result if result is None else result & sub_result
+            return result
+
+        # 'or'
+        if any(sub_result is None for sub_result in results):
+            return None
+        return set().union(*results)
+
+    def _store(self, key: str, mtime: float, size: int, grams: array) -> None:
+        if key in self._files:
+            self._remove(key)
+        file_id = self._next_id
+        self._next_id += 1
+        self._files[key] = (file_id, mtime, size)
+        self._grams[file_id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(file_id)
+
+    def _remove(self, key: str) -> None:
+        file_id = self._files.pop(key)[0]
+        for gram in self._grams.pop(file_id, ()):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(file_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def _connect(self) -> sqlite3.Connection:
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.db_path))
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, mtime REAL, size INTEGER, grams BLOB)"
+        )
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        return connection
+
+    def _load(self) -> None:
+        """Load the persisted index into memory."""
+        self._loaded = True
+        if not self.db_path.exists():
+            return
+
+        try:
+            connection = self._connect()
+            try:
+                row = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+                if row is None or row[0] != str(INDEX_VERSION):
+                    connection.execute("DELETE FROM files")
+                    connection.commit()
+                    return
+                for path, mtime, size, blob in connection.execute("SELECT path, mtime, size, grams FROM files"):
+                    grams = array('I')
+                    grams.frombytes(blob)
+                    self._store(path, mtime, size, grams)
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not load trigram index: {e}")
+
+    def _save(self, changed: List[Tuple[str, float, int, array]], removed: List[str]) -> None:
+        """Write changed and removed rows to disk."""
+        try:
+            connection = self._connect()
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (str(INDEX_VERSION),)
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO files (path, mtime, size, grams) VALUES (?, ?, ?, ?)",
+                    [(path, mtime, size, grams.tobytes()) for path, mtime, size, grams in changed]
+                )
+                connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+                connection.commit()
+            finally:
+                connection.close()
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"Could not save trigram index: {e}")
@@ -18,6 +18,7 @@ from rich.panel import Panel
 from .tools.base.tool_registry import ToolRegistry
 from .tools.base.tool_interface import ToolContext
 from .enhanced_config import EnhancedConfig
+from .prompt_caching import PromptCacheUsage, cache_conversation, cache_tools
 
 
 @dataclass
@@ -100,6 +101,8 @@ class SharedEventLoopAgent:
             raise ValueError("No API key found. Set ANTHROPIC_API_KEY or OPENAI_API_KEY environment variable.")
         
         self.anthropic_client = AsyncAnthropic(api_key=api_key)
+        self.prompt_caching = getattr(self.config, "anthropic_prompt_caching", True)
+        self.prompt_cache_usage = PromptCacheUsage()
         self.logger.info("Anthropic client initialized")
     
     def _setup_tool_registry(self):
@@ -107,6 +110,9 @@ class SharedEventLoopAgent:
         self.tool_registry = ToolRegistry()
         # Auto-discover tools
         discovered_count = self.tool_registry.discover_tools()
+        # Tool calls of one assistant turn run concurrently, up to this many at a time
+        self.max_parallel_tool_calls = max(1, int(
+            self.config.user_config.get("features", {}).get("max_parallel_tool_calls", 4)))
         self.logger.info(f"Tool registry initialized with {discovered_count} tools")
     
     def _setup_get_user_message_function(self):
@@ -215,6 +221,11 @@ class SharedEventLoopAgent:
             
             self.logger.debug(f"Running inference with {len(api_messages)} messages and {len(available_tools)} tools")
             
+            if self.prompt_caching:
+                # Tools and earlier turns are read from Anthropic's prompt cache on the next turn
+                api_messages = cache_conversation(api_messages)
+                available_tools = cache_tools(available_tools)
+            
             # Call Claude API
             response = await self.anthropic_client.messages.create(
                 model="claude-3-sonnet-20240229",
@@ -223,6 +234,7 @@ class SharedEventLoopAgent:
                 tools=available_tools if available_tools else None
             )
             
+            self.prompt_cache_usage.record(getattr(response, 'usage', None))
             self.logger.debug("Claude response received")
             return response
             
@@ -242,18 +254,44 @@ class SharedEventLoopAgent:
         """Execute tools following the tool execution loop from diagram."""
         self.logger.info("Executing tools...")
         
-        tool_results = []
-        
         # Extract tool calls from response
-        for content_block in claude_response.content:
-            if hasattr(content_block, 'type') and content_block.type == 'tool_use':
-                # Tool Execution Loop
-                result = await self._tool_execution_loop(content_block)
-                tool_results.append(result)
+        tool_calls = [content_block for content_block in claude_response.content
+                      if hasattr(content_block, 'type') and content_block.type == 'tool_use']
+        tools = [self.tool_registry.get_tool(tool_call.name) for tool_call in tool_calls]
+        
+        # Tool Execution Loop, run concurrently. A call waits for every earlier call
+        # whose tool cannot run in parallel with its own.
+        semaphore = asyncio.Semaphore(self.max_parallel_tool_calls)
+        tasks: List[asyncio.Task] = []
+        
+        async def run(index: int, blockers: List[asyncio.Task]) -> Dict[str, Any]:
+            if blockers:
+                await asyncio.wait(blockers)
+            async with semaphore:
+                return await self._tool_execution_loop(tool_calls[index])
+        
+        for index in range(len(tool_calls)):
+            blockers = [tasks[earlier] for earlier in range(index)
+                        if not self._can_run_together(tools[earlier], tools[index])]
+            tasks.append(asyncio.ensure_future(run(index, blockers)))
+        
+        # Results keep the order of the tool_use blocks
+        tool_results = list(await asyncio.gather(*tasks))
         
         # Collect Results and Send Results to Claude
         await self._send_tool_results_to_claude(tool_results)
     
+    def _can_run_together(self, tool, other_tool) -> bool:
+        """Whether two requested tools may execute at the same time."""
+        if tool is None or other_tool is None:
+            # Unknown tools only produce an error result
+            return True
+        try:
+            return tool.can_run_parallel_with(other_tool)
+        except Exception as e:
+            self.logger.debug(f"Serializing {tool.name} and {other_tool.name}: {e}")
+            return False
+    
     async def _tool_execution_loop(self, tool_call) -> Dict[str, Any]:
         """Execute individual tool following the tool execution loop diagram."""
         tool_name = tool_call.name
@@ -392,6 +430,7 @@ class SharedEventLoopAgent:
             "total_sessions": len(self.sessions),
             "tool_count": len(self.tool_registry.get_all_tools()),
             "anthropic_client_ready": self.anthropic_client is not None,
+            "prompt_cache": self.prompt_cache_usage.as_dict(),
             "components": {
                 "anthropic_client": bool(self.anthropic_client),
                 "tool_registry": bool(self.tool_registry),
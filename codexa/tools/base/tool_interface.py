@@ -33,6 +33,8 @@ except ImportError:
         def minor(self):
             return 0
 
+from ...mcp_result_cache import invalidate_paths
+
 
 class ToolStatus(Enum):
     """Tool execution status."""
@@ -632,6 +634,10 @@ class Tool(ABC):
             if not result.tool_name:
                 result.tool_name = self.name
             
+            # Cached MCP results computed from files this tool changed are stale now
+            if result.success and (result.files_created or result.files_modified):
+                invalidate_paths(result.files_created + result.files_modified)
+            
             # Record metrics
             execution_time = (datetime.now() - start_time).total_seconds()
             result.execution_time = execution_time
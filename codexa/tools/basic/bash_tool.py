@@ -11,7 +11,7 @@ import os
 import shlex
 from pathlib import Path
 
-from ..base.tool_interface import Tool, ToolResult, ToolContext, ToolPriority
+from ..base.tool_interface import Tool, ToolResult, ToolContext, ToolPriority, CoordinationConfig
 
 
 class BashTool(Tool):
@@ -29,6 +29,11 @@ class BashTool(Tool):
     def category(self) -> str:
         return "system"
 
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Commands may change any file: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+
     @property
     def capabilities(self) -> Set[str]:
         return {"command_execution", "shell", "system_operations"}
@@ -7,7 +7,7 @@ import subprocess
 import os
 import uuid
 from typing import Set, Dict, Any, Optional
-from ..base.tool_interface import Tool, ToolContext, ToolResult
+from ..base.tool_interface import Tool, ToolContext, ToolResult, CoordinationConfig
 
 
 class BashTool(Tool):
@@ -55,6 +55,11 @@ class BashTool(Tool):
     def category(self) -> str:
         return "claude_code"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Commands may change any file: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def required_context(self) -> Set[str]:
         return set()  # Command can be derived from user request
@@ -5,7 +5,7 @@ Edit tool - Performs exact string replacements in files.
 import os
 from pathlib import Path
 from typing import Set, Optional
-from ..base.tool_interface import Tool, ToolContext, ToolResult
+from ..base.tool_interface import Tool, ToolContext, ToolResult, CoordinationConfig
 
 
 class EditTool(Tool):
@@ -23,6 +23,11 @@ class EditTool(Tool):
     def category(self) -> str:
         return "claude_code"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Changes files: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def required_context(self) -> Set[str]:
         return set()  # No required context - will extract from request or ask
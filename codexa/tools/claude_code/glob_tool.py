@@ -4,9 +4,14 @@ Glob tool - Fast file pattern matching tool that works with any codebase size.
 
 import glob
 import os
+import re
 from pathlib import Path
 from typing import Set, List, Optional
 from ..base.tool_interface import Tool, ToolContext, ToolResult
+from ...search.ignore_rules import find_repo_root, get_ignore_matcher, translate_glob
+
+# Characters that make a pattern component a glob rather than a literal name
+GLOB_CHARS = '*?[\\'
 
 
 class GlobTool(Tool):
@@ -118,7 +123,47 @@ class GlobTool(Tool):
             )
     
     def _glob_search(self, pattern: str, search_path: Path) -> List[str]:
-        """Perform glob search in the specified path."""
+        """Perform glob search in the specified path, skipping ignored subtrees."""
+        pattern = pattern.replace(os.sep, '/')
+        while pattern.startswith('./'):
+            pattern = pattern[2:]
+        if os.path.isabs(pattern) or '..' in pattern.split('/'):
+            return self._plain_glob_search(pattern, search_path)
+        
+        # Compile the glob once and walk with the shared ignore matcher so that
+        # ignored directories (.git, node_modules, .gitignore entries) are pruned
+        regex = re.compile('^' + translate_glob(pattern) + '$')
+        # Like glob.glob, only match hidden entries when the pattern asks for them
+        include_hidden = any(part.startswith('.') for part in pattern.split('/'))
+        # Rooted at the repository so .gitignore files above search_path apply too
+        search_path = search_path.resolve()
+        matcher = get_ignore_matcher(find_repo_root(search_path))
+        
+        # Start at the pattern's literal directory prefix and, without "**",
+        # never descend deeper than the pattern has components
+        parts = [part for part in pattern.split('/') if part]
+        literal = 0
+        while literal < len(parts) - 1 and not any(c in parts[literal] for c in GLOB_CHARS):
+            literal += 1
+        start = search_path.joinpath(*parts[:literal])
+        if not start.is_dir():
+            return []
+        max_depth = None if '**' in pattern else len(parts) - literal - 1
+        
+        matches = []
+        for root_path, dirs, files in matcher.walk(start, include_hidden=include_hidden):
+            if max_depth is not None and len(root_path.relative_to(start).parts) >= max_depth:
+                dirs[:] = []
+            rel_root = root_path.relative_to(search_path).as_posix()
+            prefix = '' if rel_root == '.' else rel_root + '/'
+            for file_name in files:
+                if regex.match(prefix + file_name):
+                    matches.append(str((root_path / file_name).resolve()))
+        
+        return matches
+    
+    def _plain_glob_search(self, pattern: str, search_path: Path) -> List[str]:
+        """Perform an unfiltered glob search (used for absolute and parent-relative patterns)."""
         # Change to search directory for relative patterns
         original_cwd = os.getcwd()
         try:
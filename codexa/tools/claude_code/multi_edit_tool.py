@@ -5,7 +5,7 @@ MultiEdit tool - Makes multiple edits to a single file in one operation.
 import os
 from pathlib import Path
 from typing import Set, List, Dict, Any
-from ..base.tool_interface import Tool, ToolContext, ToolResult
+from ..base.tool_interface import Tool, ToolContext, ToolResult, CoordinationConfig
 
 
 class MultiEditTool(Tool):
@@ -23,6 +23,11 @@ class MultiEditTool(Tool):
     def category(self) -> str:
         return "claude_code"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Changes files: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def required_context(self) -> Set[str]:
         return {"file_path", "edits"}
@@ -6,7 +6,7 @@ import json
 import os
 from pathlib import Path
 from typing import Set, Dict, Any, Optional
-from ..base.tool_interface import Tool, ToolContext, ToolResult
+from ..base.tool_interface import Tool, ToolContext, ToolResult, CoordinationConfig
 
 
 class NotebookEditTool(Tool):
@@ -24,6 +24,11 @@ class NotebookEditTool(Tool):
     def category(self) -> str:
         return "claude_code"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Changes files: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def required_context(self) -> Set[str]:
         return {"notebook_path", "new_source"}
@@ -5,7 +5,7 @@ Write tool - Writes a file to the local filesystem.
 import os
 from pathlib import Path
 from typing import Set, Optional
-from ..base.tool_interface import Tool, ToolContext, ToolResult
+from ..base.tool_interface import Tool, ToolContext, ToolResult, CoordinationConfig
 
 
 class WriteTool(Tool):
@@ -40,6 +40,11 @@ class WriteTool(Tool):
     def category(self) -> str:
         return "claude_code"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Changes files: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def required_context(self) -> Set[str]:
         return set()  # No required context - will extract from request or ask
@@ -8,7 +8,7 @@ from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 import json
 
-from ..base.tool_interface import Tool, ToolResult, ToolContext, ToolStatus
+from ..base.tool_interface import Tool, ToolResult, ToolContext, ToolStatus, CoordinationConfig
 
 
 class CodeGenerationTool(Tool):
@@ -54,6 +54,11 @@ class CodeGenerationTool(Tool):
     def description(self) -> str:
         return "Generates code scaffolds, templates, and boilerplate for various programming languages and frameworks"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Changes files: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def version(self) -> str:
         return "1.0.0"
@@ -2,7 +2,7 @@
 Execution Tool - Handles code and command execution
 """
 
-from ..base.tool_interface import Tool, ToolResult, ToolContext, ToolStatus
+from ..base.tool_interface import Tool, ToolResult, ToolContext, ToolStatus, CoordinationConfig
 
 
 class ExecutionTool(Tool):
@@ -23,6 +23,11 @@ class ExecutionTool(Tool):
     def category(self) -> str:
         return "enhanced"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Commands may change any file: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     def can_handle_request(self, request: str, context: ToolContext) -> float:
         request_lower = request.lower()
         if any(word in request_lower for word in ['execute', 'run', 'command']):
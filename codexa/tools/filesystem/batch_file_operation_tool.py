@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import Set, List, Dict, Any
 import re
 
-from ..base.tool_interface import Tool, ToolResult, ToolContext
+from ..base.tool_interface import Tool, ToolResult, ToolContext, CoordinationConfig
 
 
 class BatchFileOperationTool(Tool):
@@ -24,6 +24,11 @@ class BatchFileOperationTool(Tool):
     def category(self) -> str:
         return "filesystem"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Changes files: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def capabilities(self) -> Set[str]:
         return {"batch", "bulk", "multi_file", "file_management"}
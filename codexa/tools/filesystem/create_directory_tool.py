@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import Set
 import re
 
-from ..base.tool_interface import Tool, ToolResult, ToolContext
+from ..base.tool_interface import Tool, ToolResult, ToolContext, CoordinationConfig
 
 
 class CreateDirectoryTool(Tool):
@@ -24,6 +24,11 @@ class CreateDirectoryTool(Tool):
     def category(self) -> str:
         return "filesystem"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Changes files: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def capabilities(self) -> Set[str]:
         return {"create", "mkdir", "directory_management"}
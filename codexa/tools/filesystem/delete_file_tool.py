@@ -7,7 +7,7 @@ from typing import Set
 import shutil
 import re
 
-from ..base.tool_interface import Tool, ToolResult, ToolContext
+from ..base.tool_interface import Tool, ToolResult, ToolContext, CoordinationConfig
 
 
 class DeleteFileTool(Tool):
@@ -25,6 +25,11 @@ class DeleteFileTool(Tool):
     def category(self) -> str:
         return "filesystem"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Changes files: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def capabilities(self) -> Set[str]:
         return {"delete", "remove", "cleanup", "file_management"}
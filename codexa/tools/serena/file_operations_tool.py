@@ -5,7 +5,7 @@ Serena-based file operations tools.
 from typing import Dict, Any, Set, List, Optional
 import re
 
-from ..base.tool_interface import ToolResult, ToolContext
+from ..base.tool_interface import ToolResult, ToolContext, CoordinationConfig
 from .base_serena_tool import BaseSerenaTool
 
 
@@ -20,6 +20,11 @@ class SerenaFileOperationsTool(BaseSerenaTool):
     def description(self) -> str:
         return "Read, create, and modify files with semantic awareness and regex operations"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Changes files: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def capabilities(self) -> Set[str]:
         return {
@@ -6,7 +6,7 @@ from typing import Dict, Any, Set, List, Optional
 import re
 import shlex
 
-from ..base.tool_interface import ToolResult, ToolContext
+from ..base.tool_interface import ToolResult, ToolContext, CoordinationConfig
 from .base_serena_tool import BaseSerenaTool
 
 
@@ -21,6 +21,11 @@ class ShellExecutionTool(BaseSerenaTool):
     def description(self) -> str:
         return "Execute shell commands with project context and enhanced error handling"
     
+    @property
+    def coordination_config(self) -> CoordinationConfig:
+        # Commands may change any file: never runs alongside other tool calls
+        return CoordinationConfig(prefer_parallel=False)
+    
     @property
     def capabilities(self) -> Set[str]:
         return {
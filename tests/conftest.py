@@ -0,0 +1,75 @@
+"""Shared fixtures for the test suite."""
+
+import asyncio
+import time
+
+import pytest
+
+from codexa.enhanced_config import ProviderConfig
+from codexa.enhanced_providers import EnhancedAIProvider
+from codexa.providers import AIProvider, StreamChunk
+
+
+class FakeProvider(AIProvider):
+    """
+    Scripted provider for tests.
+
+    Every request is counted in ``calls`` and, after ``delay`` seconds, answered
+    with ``error`` if set, otherwise with ``respond(prompt, model, call)``
+    (the provider's name by default).
+    """
+
+    def __init__(self, name="fake", delay=0.0, respond=None, error=None, model="default-model"):
+        self.name = name
+        self.model = model
+        self.delay = delay
+        self.respond = respond or (lambda prompt, model, call: self.name)
+        self.error = error
+        self.calls = 0
+
+    def ask(self, prompt, history=None, context=None, tools=None, model=None):
+        call = self._start()
+        time.sleep(self.delay)
+        return self._answer(prompt, model, call)
+
+    async def ask_async(self, prompt, history=None, context=None, tools=None, model=None):
+        call = self._start()
+        await asyncio.sleep(self.delay)
+        return self._answer(prompt, model, call)
+
+    async def ask_stream(self, prompt, history=None, context=None, tools=None, model=None):
+        call = self._start()
+        await asyncio.sleep(self.delay)
+        response = self._answer(prompt, model, call)
+        if not self.error:
+            yield StreamChunk('text', text=response)
+        yield StreamChunk('done', response=response)
+
+    def is_available(self):
+        return True
+
+    def get_available_models(self):
+        return []
+
+    def _start(self):
+        self.calls += 1
+        return self.calls
+
+    def _answer(self, prompt, model, call):
+        return self.error or self.respond(prompt, model or self.model, call)
+
+
+@pytest.fixture
+def make_provider():
+    """
+    Build EnhancedAIProviders around a FakeProvider.
+
+    Keyword arguments other than ``cache``, ``priority`` and ``models`` are
+    passed to FakeProvider; the provider config is named after it.
+    """
+    def make(name="fake", cache=None, priority=1, models=(), **behaviour):
+        config = ProviderConfig(name=name, api_key_env=f"{name.upper()}_API_KEY",
+                                priority=priority, models=list(models))
+        return EnhancedAIProvider(FakeProvider(name, **behaviour), config, cache)
+
+    return make
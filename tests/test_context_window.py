@@ -0,0 +1,103 @@
+"""Tests for token-budgeted context packing."""
+
+import os
+from unittest.mock import patch
+
+from codexa.config import Config
+from codexa.context_window import ContextWindow, count_tokens
+from codexa.providers import OpenRouterProvider
+
+
+def _turn(i, size=50):
+    return {"user": f"request {i} " + "word " * size, "assistant": f"answer {i} " + "word " * size}
+
+
+def test_small_history_is_kept_whole():
+    window = ContextWindow(max_input_tokens=10000)
+    history = [_turn(i) for i in range(20)]
+
+    system, kept = window.pack("system", history, "prompt")
+
+    assert system == "system"
+    assert kept == history
+
+
+def test_large_history_keeps_newest_turns_within_budget():
+    window = ContextWindow(max_input_tokens=2000, summary_tokens=100)
+    history = [_turn(i) for i in range(40)]
+
+    system, kept = window.pack("system", history, "prompt")
+
+    assert 0 < len(kept) < len(history)
+    assert kept == history[-len(kept):]
+    used = count_tokens(system) + sum(count_tokens(t["user"]) + count_tokens(t["assistant"]) for t in kept)
+    assert used <= 2000
+    assert "turns elided" in system
+    assert "request 0" in system
+
+
+def test_elided_prefix_stays_stable_while_the_conversation_grows():
+    """Turns are elided in blocks, so the summary and kept prefix change only now and then."""
+    window = ContextWindow(max_input_tokens=2000, summary_tokens=100, elision_block=8)
+    history = [_turn(i) for i in range(80)]
+
+    packed = [window.pack("system", history[:n], "prompt") for n in range(30, 80)]
+
+    changes = sum(1 for before, after in zip(packed, packed[1:])
+                  if before[0] != after[0] or before[1][0] != after[1][0])
+    assert changes <= len(packed) // 8 + 1
+    for system, kept in packed:
+        elided = int(system.split("(")[1].split(" ")[0])
+        assert elided % 8 == 0
+        used = count_tokens(system) + sum(count_tokens(t["user"]) + count_tokens(t["assistant"]) for t in kept)
+        assert used <= 2000
+
+
+def test_oversized_messages_are_truncated():
+    window = ContextWindow(max_input_tokens=10000, max_message_tokens=100)
+
+    _, kept = window.pack("system", [{"user": "start " + "x " * 5000 + " end", "assistant": "ok"}], "prompt")
+
+    text = kept[0]["user"]
+    assert count_tokens(text) < 200
+    assert text.startswith("start") and text.endswith("end")
+    assert "tokens elided" in text
+
+
+def test_model_budgets_override_the_default():
+    window = ContextWindow.from_config({"max_input_tokens": 1000, "models": {"big-model": 50000}})
+    history = [_turn(i) for i in range(40)]
+
+    assert len(window.pack("system", history, "prompt", model="big-model")[1]) == 40
+    assert len(window.pack("system", history, "prompt", model="small-model")[1]) < 40
+
+
+def test_tool_conversations_drop_whole_exchanges():
+    window = ContextWindow(max_input_tokens=1500, summary_tokens=100)
+    messages = [{"role": "system", "content": "system"}, {"role": "user", "content": "the task"}]
+    for i in range(20):
+        messages.append({"role": "assistant", "content": None,
+                         "tool_calls": [{"id": f"call_{i}", "type": "function",
+                                         "function": {"name": "read_file", "arguments": "{}"}}]})
+        messages.append({"role": "tool", "tool_call_id": f"call_{i}", "content": "line " * 100})
+
+    fitted = window.fit_messages(messages)
+
+    assert fitted[1] == {"role": "user", "content": "the task"}
+    assert "messages elided" in fitted[0]["content"]
+    assert fitted[-1] == messages[-1]
+    # No tool result is left without the call that requested it
+    call_ids = {call["id"] for message in fitted for call in message.get("tool_calls") or []}
+    assert all(m["tool_call_id"] in call_ids for m in fitted if m["role"] == "tool")
+
+
+def test_provider_packs_history_instead_of_last_ten_turns():
+    with patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
+        config = Config()
+    config.context_window = {"max_input_tokens": 100000}
+    provider = OpenRouterProvider(config)
+
+    messages = provider._build_messages("prompt", [_turn(i, size=5) for i in range(30)], None)
+
+    # System prompt, 30 user/assistant pairs and the prompt
+    assert len(messages) == 62
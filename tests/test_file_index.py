@@ -0,0 +1,111 @@
+"""Tests for the persistent file index used by FileSearchEngine."""
+
+import os
+import stat
+from pathlib import Path
+
+from codexa.search.file_search import FileSearchEngine
+
+
+def _make_tree(root: Path):
+    (root / "pkg" / "sub").mkdir(parents=True)
+    (root / "node_modules").mkdir()
+    (root / "pkg" / "a.py").write_text("print('a')\n")
+    (root / "pkg" / "sub" / "b.py").write_text("print('b')\n")
+    (root / "README.md").write_text("# readme\n")
+    (root / "node_modules" / "dep.js").write_text("module.exports = 1;\n")
+
+
+def test_indexed_search_matches_walk(tmp_path):
+    """Indexed results should match a plain directory walk."""
+    _make_tree(tmp_path)
+    walker = FileSearchEngine(tmp_path)
+    indexed = FileSearchEngine(tmp_path, use_index=True)
+
+    for pattern in ["*", "**/*.py", "*.md"]:
+        expected = sorted(r.relative_path for r in walker._sequential_search(
+            pattern, tmp_path, walker.default_ignore_patterns, None, None, False
+        ))
+        actual = sorted(r.relative_path for r in indexed.search_files(pattern))
+        assert actual == expected
+
+    assert (tmp_path / ".codexa" / "index" / "files.json").exists()
+
+
+def test_index_rescans_only_changed_directories(tmp_path):
+    """Only directories whose mtime changed should be rescanned."""
+    _make_tree(tmp_path)
+    engine = FileSearchEngine(tmp_path, use_index=True)
+    engine.search_files("*")
+    index = engine.get_index()
+    rescanned = index.stats['directories_rescanned']
+
+    engine.search_files("*")
+    assert index.stats['directories_rescanned'] == rescanned
+
+    new_file = tmp_path / "pkg" / "sub" / "c.py"
+    new_file.write_text("print('c')\n")
+    # Make sure the directory mtime moves even on coarse-grained filesystems
+    stat_result = os.stat(new_file.parent)
+    os.utime(new_file.parent, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+
+    names = {r.path.name for r in engine.search_files("**/*.py")}
+    assert "c.py" in names
+    assert index.stats['directories_rescanned'] == rescanned + 1
+
+
+def test_index_persists_across_engines(tmp_path):
+    """A new engine should reuse the index written by a previous one."""
+    _make_tree(tmp_path)
+    FileSearchEngine(tmp_path, use_index=True).search_files("*")
+
+    engine = FileSearchEngine(tmp_path, use_index=True)
+    results = engine.find_by_extension("py")
+    assert {r.path.name for r in results} == {"a.py", "b.py"}
+    assert engine.get_index().stats['directories_rescanned'] == 0
+
+
+def test_files_edited_in_place_are_not_served_stale(tmp_path):
+    """Size and mtime must follow in-place edits even if the directory mtime does not move."""
+    _make_tree(tmp_path)
+    FileSearchEngine(tmp_path, use_index=True).search_files("*")
+
+    target = tmp_path / "pkg" / "a.py"
+    dir_stat = os.stat(target.parent)
+    old_mtime = os.stat(target).st_mtime - 7200
+    os.utime(target, (old_mtime, old_mtime))
+    FileSearchEngine(tmp_path, use_index=True).search_files("*")
+
+    target.write_text("x" * 500)
+    os.utime(target.parent, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+    engine = FileSearchEngine(tmp_path, use_index=True)
+    assert [r.path.name for r in engine.find_by_size(min_size=100)] == ["a.py"]
+    assert "a.py" in {r.path.name for r in engine.find_recent_files(1)}
+    assert engine.get_index().stats['directories_rescanned'] == 0
+
+
+def test_repeat_query_stats_only_returned_files(tmp_path, monkeypatch):
+    """A refresh of an unchanged tree stats directories, never the files in them."""
+    _make_tree(tmp_path)
+    for i in range(50):
+        (tmp_path / "pkg" / f"f{i}.py").write_text("")
+    engine = FileSearchEngine(tmp_path, use_index=True)
+    engine.search_files("*")
+    rescanned = engine.get_index().stats['directories_rescanned']
+
+    stated = []
+    real_stat = os.stat
+
+    def recording_stat(path, *args, **kwargs):
+        result = real_stat(path, *args, **kwargs)
+        if not stat.S_ISDIR(result.st_mode):
+            stated.append(Path(path).name)
+        return result
+
+    monkeypatch.setattr(os, "stat", recording_stat)
+    results = engine.search_files("f1.py")
+
+    assert [r.path.name for r in results] == ["f1.py"]
+    assert [name for name in stated if name.endswith(".py")] == ["f1.py"]
+    assert engine.get_index().stats['directories_rescanned'] == rescanned
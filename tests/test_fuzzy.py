@@ -0,0 +1,75 @@
+"""Tests for the bit-parallel and fzf-style fuzzy matchers."""
+
+import random
+
+from codexa.search.fuzzy import (FuzzyMatcher, best_approximate, edit_distance,
+                                 find_approximate, subsequence_score)
+from codexa.search.pattern_matcher import PatternMatcher, PatternType
+
+
+def _levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        previous, row[0] = row[:], i
+        for j, char_b in enumerate(b, 1):
+            row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+    return row[-1]
+
+
+def test_edit_distance_matches_dynamic_programming():
+    """The bit-parallel distance agrees with the textbook DP, including long patterns."""
+    rng = random.Random(7)
+    for _ in range(500):
+        a = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 12)))
+        b = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 90)))
+        assert edit_distance(a, b) == _levenshtein(a, b)
+        assert edit_distance(a, b, max_distance=3) == min(_levenshtein(a, b), 4)
+
+    start, end, distance = best_approximate("recieve", "please receive the payload")
+    assert (distance, "please receive the payload"[start:end]) == (2, "receive")
+
+
+def test_find_approximate_reports_true_distances():
+    """Every reported span is within the bound, does not overlap and has the distance reported."""
+    rng = random.Random(11)
+    for _ in range(3000):
+        pattern = ''.join(rng.choice('ab') for _ in range(rng.randint(1, 8)))
+        text = ''.join(rng.choice('ab') for _ in range(rng.randint(0, 30)))
+        max_distance = rng.randint(0, 3)
+        last_end = 0
+        for start, end, distance in find_approximate(pattern, text, max_distance):
+            assert last_end <= start <= end
+            assert distance <= max_distance
+            assert edit_distance(pattern, text[start:end]) == distance
+            last_end = end
+
+    matches = PatternMatcher().find_all_matches("aaaaabaabbababbbbbba", "abbabbaa", PatternType.FUZZY)
+    for match in matches:
+        similarity = 1.0 - edit_distance("abbabbaa", match.match_text) / len("abbabbaa")
+        assert match.confidence == similarity
+
+
+def test_rank_prefers_boundaries_and_prefilters():
+    """Subsequence ranking favours path and word boundaries and drops non-matches."""
+    candidates = ["docs/search.md", "codexa/search/search_manager.py",
+                  "tests/test_smoke.py", "codexa/search/file_search.py"]
+    results = FuzzyMatcher().rank("srchmgr", candidates)
+    assert [r.candidate for r in results] == ["codexa/search/search_manager.py"]
+
+    results = FuzzyMatcher().rank("fs", candidates)
+    assert results[0].candidate == "codexa/search/file_search.py"
+    assert subsequence_score("fs", "file_search.py")[1] == [0, 5]
+    assert subsequence_score("FS", "file_search.py", case_sensitive=True) is None
+
+
+def test_pattern_matcher_fuzzy_apis():
+    """PatternMatcher fuzzy matching finds approximate substrings and similar candidates."""
+    matcher = PatternMatcher()
+    result = matcher.match("the quick brwn fox", "brown", PatternType.FUZZY)
+    assert result.matched and result.match_text == "brwn"
+
+    spans = [m.match_text for m in matcher.find_all_matches("brwn and brown", "brown", PatternType.FUZZY)]
+    assert spans == ["brwn", "brown"]
+
+    best = matcher.find_best_matches("serch", ["church", "search", "fetch", "s"], max_results=2)
+    assert [name for name, _ in best] == ["search", "fetch"]
@@ -0,0 +1,157 @@
+"""Tests for the pooled HTTP session used by OpenRouterProvider."""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from codexa.config import Config
+from codexa.http_session import HTTPSessionSettings, close_shared_async_sessions, create_session
+from codexa.providers import OpenRouterProvider
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections open between requests
+
+    def do_POST(self):
+        server = self.server
+        server.connections.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server.payloads.append(body)
+        number = len(server.payloads)
+        time.sleep(server.delay)
+
+        if server.failures:
+            server.failures -= 1
+            self._reply(server.failure_status, {"error": {"message": "busy"}}, server.retry_after)
+        else:
+            self._reply(200, {"choices": [{"message": {"content": f"reply {number}"}}]})
+
+    def _reply(self, status, data, retry_after=None):
+        encoded = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if retry_after is not None:
+            self.send_header("Retry-After", retry_after)
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.connections, server.payloads, server.failures, server.delay = set(), [], 0, 0
+    server.failure_status, server.retry_after = 503, "0"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _provider(server, **http):
+    with patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
+        config = Config()
+    config.openrouter_base_url = f"http://127.0.0.1:{server.server_address[1]}/api/v1"
+    config.openrouter_http = http
+    provider = OpenRouterProvider(config)
+    # A private session so connection counts do not depend on other tests
+    provider.session = create_session(provider.http_settings)
+    return provider
+
+
+def test_requests_reuse_one_connection(stub_server):
+    """Consecutive calls go over a single keep-alive connection."""
+    provider = _provider(stub_server)
+
+    replies = [provider.ask("hi"),
+               provider.ask_with_tools([{"role": "user", "content": "x"}], tools=[]),
+               provider.continue_with_tool_results([{"role": "user", "content": "y"}], tools=[])]
+
+    assert replies == ["reply 1", "reply 2", "reply 3"]
+    assert len(stub_server.connections) == 1
+    provider.session.close()
+
+
+def test_unavailable_responses_are_retried(stub_server):
+    """503s with Retry-After are retried with backoff until the configured limit."""
+    stub_server.failures = 2
+    provider = _provider(stub_server, max_retries=2, backoff_factor=0)
+    assert provider.ask("hi") == "reply 3"
+
+    stub_server.failures = 3
+    assert provider.ask("hi").startswith("OpenRouter API error (503)")
+    provider.session.close()
+
+
+@pytest.mark.parametrize("status, retry_after", [(502, "0"), (500, None), (503, None)])
+def test_posts_the_server_may_have_processed_are_not_resent(stub_server, status, retry_after):
+    """Completions are billed: a 5xx without Retry-After may come after the model ran."""
+    stub_server.failures, stub_server.failure_status, stub_server.retry_after = 1, status, retry_after
+    provider = _provider(stub_server, max_retries=2, backoff_factor=0)
+
+    assert provider.ask("hi").startswith(f"OpenRouter API error ({status})")
+    assert len(stub_server.payloads) == 1
+
+    async def ask():
+        try:
+            return await provider.ask_async("hi")
+        finally:
+            await close_shared_async_sessions()
+
+    stub_server.failures = 1
+    assert asyncio.run(ask()).startswith(f"OpenRouter API error ({status})")
+    assert len(stub_server.payloads) == 2
+    provider.session.close()
+
+
+def test_async_requests_run_concurrently_without_threads(stub_server):
+    """Async calls share one event loop: no worker thread per in-flight request."""
+    stub_server.delay = 0.3
+    provider = _provider(stub_server)
+
+    async def burst():
+        tasks = [asyncio.ensure_future(provider.ask_async(f"question {i}")) for i in range(20)]
+        await asyncio.sleep(0.1)
+        # The event loop's default executor names its worker threads asyncio_N
+        executor_threads = [t.name for t in threading.enumerate() if t.name.startswith("asyncio_")]
+        replies = await asyncio.gather(*tasks)
+        await close_shared_async_sessions()
+        return replies, executor_threads
+
+    started = time.monotonic()
+    replies, executor_threads = asyncio.run(burst())
+
+    assert sorted(replies) == sorted(f"reply {i}" for i in range(1, 21))
+    assert time.monotonic() - started < 3  # 20 x 0.3s if run one after another
+    assert executor_threads == []
+    provider.session.close()
+
+
+def test_async_unavailable_responses_are_retried(stub_server):
+    stub_server.failures = 2
+    provider = _provider(stub_server, max_retries=2, backoff_factor=0)
+
+    async def ask():
+        try:
+            return await provider.ask_async("hi")
+        finally:
+            await close_shared_async_sessions()
+
+    assert asyncio.run(ask()) == "reply 3"
+    provider.session.close()
+
+
+def test_settings_from_config():
+    settings = HTTPSessionSettings.from_dict({"pool_size": "4", "timeout": 5, "unknown": 1})
+    assert (settings.pool_size, settings.timeout, settings.max_retries) == (4, 5.0, 3)
+    assert HTTPSessionSettings.from_dict(None) == HTTPSessionSettings()
@@ -0,0 +1,107 @@
+"""Tests for the compiled .gitignore-style ignore matcher."""
+
+import asyncio
+import os
+from pathlib import Path
+
+from codexa.search.code_search import CodeSearchEngine
+from codexa.search.file_search import FileSearchEngine
+from codexa.search.ignore_rules import IgnoreMatcher
+from codexa.tools.base.tool_interface import ToolContext
+from codexa.tools.claude_code.glob_tool import GlobTool
+
+
+def test_gitignore_semantics(tmp_path):
+    """Negation, anchoring and directory-only rules follow git's behaviour."""
+    (tmp_path / ".gitignore").write_text("*.log\n!keep.log\n/build\ncache/\n")
+    matcher = IgnoreMatcher(tmp_path)
+
+    assert matcher.is_ignored("debug.log", is_dir=False)
+    assert not matcher.is_ignored("keep.log", is_dir=False)
+    assert matcher.is_ignored("build", is_dir=True)
+    assert not matcher.is_ignored("src/build", is_dir=False)
+    assert matcher.is_ignored("src/cache", is_dir=True)
+    assert not matcher.is_ignored("src/cache", is_dir=False)
+    # Built-in defaults still apply
+    assert matcher.is_ignored("lib/node_modules", is_dir=True)
+    assert matcher.is_ignored("lib/node_modules/pkg/index.js", is_dir=False)
+
+
+def test_nested_ignore_files_override_parents(tmp_path):
+    """Deeper .gitignore/.codexaignore files take precedence over their parents."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / ".gitignore").write_text("*.gen.py\n")
+    (tmp_path / "pkg" / ".codexaignore").write_text("!keep.gen.py\nfixtures/\n")
+    matcher = IgnoreMatcher(tmp_path)
+
+    assert matcher.is_ignored("other.gen.py", is_dir=False)
+    assert matcher.is_ignored("pkg/other.gen.py", is_dir=False)
+    assert not matcher.is_ignored("pkg/keep.gen.py", is_dir=False)
+    assert matcher.is_ignored("pkg/fixtures", is_dir=True)
+    assert not matcher.is_ignored("fixtures", is_dir=True)
+
+
+def test_search_engines_prune_ignored_subtrees(tmp_path):
+    """File and code search both skip directories listed in .gitignore."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "generated").mkdir()
+    (tmp_path / ".gitignore").write_text("generated/\n")
+    (tmp_path / "src" / "main.py").write_text("needle = 1\n")
+    (tmp_path / "generated" / "out.py").write_text("needle = 2\n")
+
+    file_results = FileSearchEngine(tmp_path).search_files("**/*.py")
+    assert [r.path.name for r in file_results] == ["main.py"]
+
+    code_matches = CodeSearchEngine(tmp_path).search_code("needle")
+    assert {Path(m.file_path).name for m in code_matches} == {"main.py"}
+
+
+def _glob(pattern, path):
+    """Run the Glob tool and return the matched paths relative to ``path``."""
+    context = ToolContext(shared_state={"pattern": pattern, "path": str(path)})
+    result = asyncio.run(GlobTool().execute(context))
+    assert result.success, result.error
+    return sorted(Path(f).relative_to(path.resolve()).as_posix() for f in result.data["files"])
+
+
+def test_glob_honours_ignore_files_above_the_search_path(tmp_path):
+    """Searching a subdirectory still applies the repository's root .gitignore."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("generated/\n*.bak\n")
+    pkg = tmp_path / "pkg"
+    (pkg / "generated").mkdir(parents=True)
+    (pkg / "mod.py").write_text("")
+    (pkg / "mod.py.bak").write_text("")
+    (pkg / "generated" / "out.py").write_text("")
+
+    assert _glob("**/*", pkg) == ["mod.py"]
+
+
+def test_glob_walks_only_the_directories_the_pattern_can_reach(tmp_path, monkeypatch):
+    """The walk starts at the literal prefix and stops at the pattern's depth without ``**``."""
+    for rel in ("src/a.py", "src/pkg/b.py", "src/pkg/deep/c.py", "docs/d.py"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("")
+
+    walked = []
+    real_walk = os.walk
+
+    def recording_walk(top, *args, **kwargs):
+        for root, dirs, files in real_walk(top, *args, **kwargs):
+            walked.append(Path(root).relative_to(tmp_path.resolve()).as_posix())
+            yield root, dirs, files
+
+    monkeypatch.setattr(os, "walk", recording_walk)
+
+    assert _glob("src/*.py", tmp_path) == ["src/a.py"]
+    assert walked == ["src"]
+
+    walked.clear()
+    assert _glob("src/*/*.py", tmp_path) == ["src/pkg/b.py"]
+    assert sorted(walked) == ["src", "src/pkg"]
+
+    walked.clear()
+    assert _glob("src/**/*.py", tmp_path) == ["src/a.py", "src/pkg/b.py", "src/pkg/deep/c.py"]
+    assert "docs" not in walked
+
+    assert _glob("missing/*.py", tmp_path) == []
@@ -0,0 +1,270 @@
+"""Tests for batched and pipelined MCP requests."""
+
+import asyncio
+import sys
+import textwrap
+
+from codexa.filesystem.mcp_filesystem import MCPFileSystem
+from codexa.mcp.connection_manager import MCPConnection, MCPServerConfig
+from codexa.mcp.serena_client import SerenaClient
+from codexa.mcp.protocol import MCPError
+
+# Answers out of order (each request sleeps params["sleep"] in its own thread).
+# Supports the comma-separated protocol versions in argv[1], answering initialize
+# with the requested one if supported; batches are accepted only on 2025-03-26.
+# argv[2] "reject" refuses every batch, "drop" ignores it like an unparsable line.
+SERVER = textwrap.dedent('''
+    import json, sys, threading, time
+    supported = sys.argv[1].split(",")
+    version = supported[0]
+    arrays = sys.argv[2] if len(sys.argv) > 2 else "answer"
+    lock = threading.Lock()
+    def send(data):
+        with lock:
+            print(json.dumps(data), flush=True)
+    def answer(message, batched=False):
+        params = message.get("params") or {}
+        if message["method"] == "initialize":
+            global version
+            if params.get("protocolVersion") in supported:
+                version = params["protocolVersion"]
+            return {"jsonrpc": "2.0", "id": message["id"], "result": {"protocolVersion": version, "capabilities": {}}}
+        if message["method"] == "fail":
+            return {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32000, "message": "failed"}}
+        time.sleep(params.get("sleep", 0))
+        return {"jsonrpc": "2.0", "id": message["id"], "result": {"n": params.get("n"), "batched": batched}}
+    for line in sys.stdin:
+        data = json.loads(line)
+        if isinstance(data, list):
+            if arrays == "drop":
+                continue
+            if version != "2025-03-26" or arrays == "reject":
+                send({"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batches not supported"}})
+                continue
+            send([answer(message, batched=True) for message in data if "id" in message])
+        elif "id" in data:
+            threading.Thread(target=lambda m=data: send(answer(m))).start()
+''')
+
+
+def _connection(version, batching=False, arrays="answer", timeout=10):
+    return MCPConnection(MCPServerConfig(name="batching", command=[sys.executable, "-c", SERVER],
+                                         args=[version, arrays], timeout=timeout, batching=batching))
+
+
+def test_pipelined_requests_are_correlated_by_id():
+    async def scenario():
+        connection = _connection("2024-11-05")
+        assert await connection.connect()
+        try:
+            assert not connection.supports_batch
+            # Later requests finish first; results still come back in request order
+            requests = [("work", {"n": n, "sleep": (20 - n) * 0.01}) for n in range(20)]
+            results = await connection.send_many(requests)
+            assert [result["n"] for result in results] == list(range(20))
+            assert not any(result["batched"] for result in results)
+            assert connection.metrics.total_requests == 20
+        finally:
+            await connection.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_batching_is_opt_in():
+    async def scenario():
+        connection = _connection("2025-03-26")
+        assert await connection.connect()
+        try:
+            assert not connection.supports_batch
+            results = await connection.send_many([("work", {"n": n}) for n in range(3)])
+            assert not any(result["batched"] for result in results)
+        finally:
+            await connection.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_batch_array_when_configured_and_protocol_supports_it():
+    async def scenario():
+        connection = _connection("2025-03-26", batching=True)
+        assert await connection.connect()
+        try:
+            assert connection.supports_batch
+            results = await connection.send_many([("work", {"n": n}) for n in range(5)])
+            assert [result["n"] for result in results] == list(range(5))
+            assert all(result["batched"] for result in results)
+        finally:
+            await connection.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_client_negotiates_the_batch_revision():
+    async def scenario():
+        # A server that also supports the older revision still agrees on 2025-03-26
+        connection = _connection("2024-11-05,2025-03-26", batching=True)
+        assert await connection.connect()
+        try:
+            assert connection.protocol_version == "2025-03-26"
+            assert connection.supports_batch
+            results = await connection.send_many([("work", {"n": n}) for n in range(3)])
+            assert all(result["batched"] for result in results)
+        finally:
+            await connection.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_no_batches_on_older_revisions():
+    async def scenario():
+        connection = _connection("2024-11-05", batching=True)
+        assert await connection.connect()
+        try:
+            assert not connection.supports_batch
+        finally:
+            await connection.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_rejected_batch_falls_back_to_pipelining():
+    async def scenario():
+        connection = _connection("2025-03-26", batching=True, arrays="reject")
+        assert await connection.connect()
+        try:
+            assert connection.supports_batch
+            results = await connection.send_many([("work", {"n": n}) for n in range(3)])
+            assert [result["n"] for result in results] == [0, 1, 2]
+            assert not any(result["batched"] for result in results)
+            assert not connection.supports_batch
+        finally:
+            await connection.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_silently_dropped_batch_falls_back_to_pipelining():
+    async def scenario():
+        connection = _connection("2025-03-26", batching=True, arrays="drop", timeout=1)
+        assert await connection.connect()
+        try:
+            results = await connection.send_many([("work", {"n": n}) for n in range(2)])
+            assert [result["n"] for result in results] == [0, 1]
+            assert not connection.supports_batch
+            # Later calls go straight to pipelining instead of timing out again
+            started = asyncio.get_running_loop().time()
+            results = await connection.send_many([("work", {"n": n}) for n in range(2)])
+            assert [result["n"] for result in results] == [0, 1]
+            assert asyncio.get_running_loop().time() - started < 1
+        finally:
+            await connection.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_errors_in_place_or_raised():
+    async def scenario():
+        connection = _connection("2024-11-05")
+        assert await connection.connect()
+        try:
+            results = await connection.send_many([("work", {"n": 1}), ("fail", None)], return_exceptions=True)
+            assert results[0]["n"] == 1
+            assert isinstance(results[1], MCPError)
+            try:
+                await connection.send_many([("fail", None)])
+                raise AssertionError("expected MCPError")
+            except MCPError as e:
+                assert "failed" in str(e)
+        finally:
+            await connection.disconnect()
+
+    asyncio.run(scenario())
+
+
+# Text answers of the MCP filesystem server, by tool
+TOOL_TEXT = {
+    "read_file": "contents of {path}",
+    "list_directory": "[DIR] sub\n[FILE] {path}.txt",
+    "get_file_info": "size: 12 bytes\nisDirectory: false",
+}
+
+
+class _Service:
+    """Records call_tools requests and answers in the filesystem server's text format."""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = fail
+
+    async def call_tools(self, server_name, calls, return_exceptions=False):
+        self.calls.append(calls)
+        return [
+            MCPError("not found") if arguments["path"] in self.fail
+            else {"content": [{"type": "text", "text": TOOL_TEXT[tool_name].format(**arguments)}]}
+            for tool_name, arguments in calls
+        ]
+
+
+def test_read_multiple_files_uses_one_batch():
+    service = _Service()
+    files = asyncio.run(MCPFileSystem(service).read_multiple_files(["a.py", "b.py"]))
+    assert files == {"a.py": "contents of a.py", "b.py": "contents of b.py"}
+    assert service.calls == [[("read_file", {"path": "a.py"}), ("read_file", {"path": "b.py"})]]
+
+
+def test_read_multiple_files_reports_failed_paths():
+    service = _Service(fail={"b.py"})
+    try:
+        asyncio.run(MCPFileSystem(service).read_multiple_files(["a.py", "b.py"]))
+        raise AssertionError("expected MCPError")
+    except MCPError as e:
+        assert "b.py" in str(e) and "a.py" not in str(e)
+
+
+def test_list_directories_parses_listings():
+    service = _Service()
+    listings = asyncio.run(MCPFileSystem(service).list_directories(["a", "b"]))
+    assert listings["a"] == [{"name": "sub", "type": "directory", "path": "a/sub"},
+                             {"name": "a.txt", "type": "file", "path": "a/a.txt"}]
+    assert [entry["name"] for entry in listings["b"]] == ["sub", "b.txt"]
+    assert service.calls == [[("list_directory", {"path": "a"}), ("list_directory", {"path": "b"})]]
+
+
+def test_get_multiple_file_info_uses_one_batch():
+    service = _Service()
+    info = asyncio.run(MCPFileSystem(service).get_multiple_file_info(["a.py", "b.py"]))
+    assert info["a.py"]["size"] == 12 and info["b.py"]["isdirectory"] == "false"
+    assert len(service.calls) == 1
+
+
+class _SerenaConnection:
+    """Records send_many batches and echoes each call's arguments as text."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def send_many(self, requests, return_exceptions=False):
+        self.batches.append(requests)
+        return [{"content": [{"type": "text", "text": repr(params["arguments"])}]} for _, params in requests]
+
+
+def _serena():
+    client = SerenaClient(MCPServerConfig(name="serena", command=["serena"]))
+    client.connection = _SerenaConnection()
+    client.available_tools = {"find_symbol": {}, "get_symbols_overview": {}}
+    return client
+
+
+def test_serena_helpers_send_one_batch():
+    client = _serena()
+    symbols = asyncio.run(client.find_symbols_many(["Foo", "Bar"], symbol_type="class"))
+    assert symbols == {
+        "Foo": repr({"query": "Foo", "local": False, "type_filter": "class"}),
+        "Bar": repr({"query": "Bar", "local": False, "type_filter": "class"}),
+    }
+    overviews = asyncio.run(client.get_files_symbols(["a.py", "b.py"]))
+    assert overviews == {"a.py": repr({"file_path": "a.py"}), "b.py": repr({"file_path": "b.py"})}
+
+    batches = client.connection.batches
+    assert [len(batch) for batch in batches] == [2, 2]
+    assert batches[1][0] == ("tools/call", {"name": "get_symbols_overview", "arguments": {"file_path": "a.py"}})
@@ -0,0 +1,187 @@
+"""Tests for the result cache of idempotent MCP tool calls."""
+
+import asyncio
+import logging
+import os
+import time
+
+from codexa.mcp_result_cache import MCPResultCache, invalidate_paths
+from codexa.mcp_service import MCPService
+from codexa.tools.base.tool_interface import Tool, ToolContext, ToolResult
+
+
+def _write(path, text):
+    path.write_text(text)
+    # Make sure the mtime differs even on coarse-grained file systems
+    stamp = time.time() + len(text)
+    os.utime(path, (stamp, stamp))
+
+
+def test_hit_miss_and_path_normalization(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    target = tmp_path / "a.py"
+    _write(target, "x = 1")
+    cache = MCPResultCache()
+
+    assert cache.get("fs", "read_file", {"path": "a.py"}) is None
+    assert cache.put("fs", "read_file", {"path": "a.py"}, {"text": "x = 1"})
+    # Relative and absolute forms of the path share an entry
+    assert cache.get("fs", "read_file", {"path": str(target)}) == {"text": "x = 1"}
+    # Results are per server
+    assert cache.get("other", "read_file", {"path": "a.py"}) is None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["servers"]["fs"]["hit_rate"] == 0.5
+
+
+def test_only_idempotent_tools_are_cached(tmp_path):
+    cache = MCPResultCache(idempotent_tools=["custom_lookup"])
+    assert not cache.put("fs", "write_file", {"path": str(tmp_path / "a")}, {"ok": True})
+    assert cache.put("fs", "custom_lookup", {"q": 1}, {"ok": True})
+    assert not MCPResultCache(enabled=False).put("fs", "read_file", {"path": "x"}, "x")
+
+
+def test_mtime_change_invalidates(tmp_path):
+    target = tmp_path / "a.py"
+    _write(target, "x = 1")
+    cache = MCPResultCache()
+    cache.put("fs", "read_file", {"path": str(target)}, "x = 1")
+
+    _write(target, "x = 22")
+    assert cache.get("fs", "read_file", {"path": str(target)}) is None
+    assert cache.get_stats()["stale"] == 1
+
+
+def test_invalidate_paths_reaches_listings_and_project_wide_results(tmp_path):
+    cache = MCPResultCache()
+    cache.put("fs", "list_directory", {"path": str(tmp_path)}, ["a.py"])
+    cache.put("fs", "read_file", {"path": str(tmp_path / "other.py")}, "y")
+    cache.put("serena", "find_symbol", {"query": "Foo"}, [{"name": "Foo"}])
+
+    invalidate_paths([str(tmp_path / "a.py")])
+
+    assert cache.get("fs", "list_directory", {"path": str(tmp_path)}) is None
+    assert cache.get("serena", "find_symbol", {"query": "Foo"}) is None
+    assert cache.get("fs", "read_file", {"path": str(tmp_path / "other.py")}) == "y"
+
+
+def test_results_computed_across_an_invalidation_are_not_stored(tmp_path):
+    cache = MCPResultCache()
+    arguments = {"path": str(tmp_path / "a.py")}
+    snapshot = cache.snapshot(arguments)
+    invalidate_paths([str(tmp_path / "a.py")])
+    assert not cache.put("fs", "read_file", arguments, "old contents", snapshot)
+
+
+def test_ttl_applies_to_results_mtimes_cannot_validate(tmp_path):
+    target = tmp_path / "a.py"
+    _write(target, "x = 1")
+    cache = MCPResultCache(ttl=0.05)
+    cache.put("fs", "search_files", {"path": str(tmp_path), "pattern": "*.py"}, ["a.py"])
+    cache.put("fs", "get_file_info", {"path": str(target)}, {"size": 5})
+    # References live in other files; a directory's mtime misses edits below it
+    cache.put("serena", "find_referencing_symbols", {"name_path": "Foo", "relative_path": str(target)}, [])
+    cache.put("serena", "find_symbol", {"name_path": "Foo", "relative_path": str(tmp_path)}, [])
+    cache.put("serena", "get_symbols_overview", {"relative_path": str(tmp_path)}, [])
+    time.sleep(0.1)
+    assert cache.get("fs", "search_files", {"path": str(tmp_path), "pattern": "*.py"}) is None
+    assert cache.get("serena", "find_referencing_symbols", {"name_path": "Foo", "relative_path": str(target)}) is None
+    assert cache.get("serena", "find_symbol", {"name_path": "Foo", "relative_path": str(tmp_path)}) is None
+    assert cache.get("serena", "get_symbols_overview", {"relative_path": str(tmp_path)}) is None
+    assert cache.get("fs", "get_file_info", {"path": str(target)}) == {"size": 5}
+
+
+def test_size_limits():
+    cache = MCPResultCache(max_entries=2, max_result_bytes=100)
+    assert not cache.put("fs", "find_symbol", {"query": "big"}, "x" * 200)
+    for query in ("a", "b", "c"):
+        cache.put("fs", "find_symbol", {"query": query}, query)
+    assert cache.get("fs", "find_symbol", {"query": "a"}) is None
+    assert cache.get("fs", "find_symbol", {"query": "c"}) == "c"
+    stats = cache.get_stats()
+    assert stats["oversized"] == 1 and stats["evicted"] == 1 and stats["entries"] == 2
+
+
+def test_mutating_calls_invalidate(tmp_path):
+    cache = MCPResultCache()
+    cache.put("fs", "read_file", {"path": str(tmp_path / "a.py")}, "x")
+    cache.put("fs", "read_file", {"path": str(tmp_path / "b.py")}, "y")
+
+    cache.record_call("move_file", {"source": str(tmp_path / "a.py"), "destination": str(tmp_path / "c.py")})
+    assert cache.get("fs", "read_file", {"path": str(tmp_path / "a.py")}) is None
+    assert cache.get("fs", "read_file", {"path": str(tmp_path / "b.py")}) == "y"
+
+    cache.record_call("execute_shell_command", {"command": "make"})
+    assert cache.get_stats()["entries"] == 0
+
+
+class _WriteTool(Tool):
+    name = "test_write"
+    description = "Writes a file"
+    category = "test"
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    async def execute(self, context):
+        _write(self.path, "new")
+        return ToolResult.success_result(files_modified=[str(self.path)])
+
+
+def test_codexa_tools_invalidate_what_they_modify(tmp_path):
+    target = tmp_path / "a.py"
+    cache = MCPResultCache()
+    cache.put("fs", "list_directory", {"path": str(tmp_path)}, [])
+
+    result = asyncio.run(_WriteTool(target).safe_execute(ToolContext()))
+    assert result.success
+    assert cache.get("fs", "list_directory", {"path": str(tmp_path)}) is None
+
+
+class _Manager:
+    def __init__(self):
+        self.requests = []
+
+    def get_routable_servers(self):
+        return ["filesystem"]
+
+    async def send_request(self, server_name, method, params):
+        self.requests.append(params)
+        return {"content": [{"type": "text", "text": f"call {len(self.requests)}"}]}
+
+
+class _Registry:
+    def update_performance(self, *args):
+        pass
+
+
+def _service():
+    service = MCPService.__new__(MCPService)
+    service.logger = logging.getLogger("test")
+    service.is_running = True
+    service.connection_manager = _Manager()
+    service.server_registry = _Registry()
+    service.result_cache = MCPResultCache()
+    return service
+
+
+def test_query_server_answers_repeated_reads_from_cache(tmp_path):
+    service = _service()
+    path = str(tmp_path / "a.py")
+
+    async def scenario():
+        first = await service.query_server("read_file", preferred_server="filesystem", context={"path": path})
+        second = await service.query_server("read_file", preferred_server="filesystem", context={"path": path})
+        assert first == second
+        assert len(service.connection_manager.requests) == 1
+
+        await service.query_server("write_file", preferred_server="filesystem",
+                                   context={"path": path, "content": "x"})
+        third = await service.query_server("read_file", preferred_server="filesystem", context={"path": path})
+        assert third != first
+        assert len(service.connection_manager.requests) == 3
+
+    asyncio.run(scenario())
+    assert service.result_cache.get_stats()["hits"] == 1
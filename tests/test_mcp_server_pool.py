@@ -0,0 +1,143 @@
+"""Tests for MCP server replica pools."""
+
+import asyncio
+import sys
+import textwrap
+
+from codexa.mcp.connection_manager import (
+    ConnectionState, MCPConnection, MCPConnectionManager, MCPConnectionPool, MCPServerConfig, create_connection
+)
+from codexa.mcp.protocol import MCPError
+
+# Answers with its pid after "sleep" seconds; "exit" makes the process die
+# and "invalid" is rejected with an invalid-params error reply
+SERVER = textwrap.dedent('''
+    import json, os, sys, threading, time
+    lock = threading.Lock()
+    def handle(message):
+        params = message.get("params") or {}
+        if message["method"] == "exit":
+            os._exit(1)
+        time.sleep(params.get("sleep", 0))
+        result = {"capabilities": {}} if message["method"] == "initialize" else {"pid": os.getpid()}
+        reply = {"jsonrpc": "2.0", "id": message["id"], "result": result}
+        if message["method"] == "invalid":
+            reply = {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32602, "message": "bad params"}}
+        with lock:
+            print(json.dumps(reply), flush=True)
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" in message:
+            threading.Thread(target=handle, args=(message,)).start()
+''')
+
+
+def _config(replicas):
+    return MCPServerConfig(name="pooled", command=[sys.executable, "-c", SERVER], timeout=10,
+                           replicas=replicas, retry_delay=0)
+
+
+def test_single_replica_keeps_plain_connection():
+    assert isinstance(create_connection(_config(1)), MCPConnection)
+    assert isinstance(create_connection(_config(3)), MCPConnectionPool)
+
+
+def test_requests_spread_over_replicas():
+    async def scenario():
+        manager = MCPConnectionManager()
+        manager.add_server(_config(3))
+        await manager.start()
+        try:
+            pool = manager.connections["pooled"]
+            assert pool.state == ConnectionState.CONNECTED
+            assert len({replica.process.pid for replica in pool.replicas}) == 3
+
+            # Concurrent slow requests go to the least-loaded replicas
+            results = await asyncio.gather(*(
+                manager.send_request("pooled", "work", {"sleep": 0.3}) for _ in range(6)
+            ))
+            pids = [result["pid"] for result in results]
+            assert len(set(pids)) == 3
+            assert all(pids.count(pid) == 2 for pid in set(pids))
+
+            status = manager.get_startup_status()["pooled"]
+            assert [replica["total_requests"] for replica in status["replicas"]] == [2, 2, 2]
+            assert pool.metrics.total_requests == 6
+        finally:
+            await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_failed_replica_is_respawned_without_interrupting_others():
+    async def scenario():
+        pool = MCPConnectionPool(_config(2))
+        assert await pool.connect()
+        try:
+            doomed, survivor = pool.replicas
+            doomed_pid = doomed.process.pid
+
+            # A slow request on the surviving replica is not interrupted
+            slow = asyncio.create_task(survivor.send_request("work", {"sleep": 0.5}))
+            try:
+                await doomed.send_request("exit")
+            except MCPError:
+                pass
+            assert not doomed.is_healthy
+            assert pool.is_healthy
+
+            # Requests keep flowing to the healthy replica while the other respawns
+            result = await pool.send_request("work")
+            assert result["pid"] == survivor.process.pid
+            pool.heal()
+            await asyncio.gather(*pool._respawn_tasks.values())
+
+            assert (await slow)["pid"] == survivor.process.pid
+            assert pool.replicas[1] is survivor
+            replacement = pool.replicas[0]
+            assert replacement is not doomed
+            assert replacement.is_healthy
+            assert replacement.process.pid not in (doomed_pid, survivor.process.pid)
+        finally:
+            await pool.disconnect()
+        assert all(replica.process is None for replica in pool.replicas)
+
+    asyncio.run(scenario())
+
+
+def test_error_replies_do_not_make_a_replica_unhealthy():
+    async def scenario():
+        pool = MCPConnectionPool(_config(2))
+        assert await pool.connect()
+        try:
+            pids = [replica.process.pid for replica in pool.replicas]
+            # Each replica's first request is rejected by the (working) server
+            for _ in range(4):
+                try:
+                    await pool.send_request("invalid")
+                    raise AssertionError("expected MCPError")
+                except MCPError as e:
+                    assert "bad params" in str(e)
+
+            assert all(replica.is_healthy for replica in pool.replicas)
+            assert not pool._respawn_tasks
+            assert [replica.process.pid for replica in pool.replicas] == pids
+        finally:
+            await pool.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_prefers_faster_replica_when_idle():
+    pool = MCPConnectionPool(_config(2))
+    fast, slow = pool.replicas
+    for replica, latency in ((fast, 0.1), (slow, 1.0)):
+        replica.state = ConnectionState.CONNECTED
+        replica.process = type("Process", (), {"returncode": None})()
+        replica.metrics.total_requests = 10
+        replica.metrics.average_response_time = latency
+
+    assert pool._pick_replica() is fast
+    # Until it has enough queued work to be slower than the idle replica
+    pool._in_flight[fast] = 10
+    assert pool._pick_replica() is slow
@@ -0,0 +1,114 @@
+"""Tests for concurrent, lazy and idle-aware MCP server startup."""
+
+import asyncio
+import sys
+import textwrap
+import time
+
+from codexa.mcp.connection_manager import ConnectionState, MCPConnectionManager, MCPServerConfig
+
+# A minimal MCP server that takes DELAY seconds to start, then echoes params
+SERVER = textwrap.dedent('''
+    import json, sys, time
+    time.sleep(float(sys.argv[1]))
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" in message:
+            result = {"capabilities": {}} if message["method"] == "initialize" else message.get("params")
+            print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+''')
+
+
+def _server(name, delay=0.0):
+    return MCPServerConfig(name=name, command=[sys.executable, "-c", SERVER], args=[str(delay)], timeout=10)
+
+
+def test_eager_startup_is_concurrent():
+    async def scenario():
+        manager = MCPConnectionManager()
+        for n in range(3):
+            manager.add_server(_server(f"s{n}", delay=0.5))
+        started = time.monotonic()
+        await manager.start()
+        try:
+            elapsed = time.monotonic() - started
+            assert sorted(manager.get_available_servers()) == ["s0", "s1", "s2"]
+            # Serial startup would take at least 1.5s
+            assert elapsed < 1.4
+            status = manager.get_startup_status()
+            assert all(entry["state"] == "connected" and entry["startup_seconds"] >= 0.5
+                       for entry in status.values())
+        finally:
+            await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_startup_deadline_leaves_slow_servers_starting():
+    async def scenario():
+        manager = MCPConnectionManager(startup_timeout=0.3)
+        manager.add_server(_server("fast"))
+        manager.add_server(_server("slow", delay=1.0))
+        await manager.start()
+        try:
+            assert manager.get_available_servers() == ["fast"]
+            assert manager.get_startup_status()["slow"]["state"] == "connecting"
+            # The slow server finishes in the background; requests wait for it
+            assert await manager.send_request("slow", "echo", {"n": 1}) == {"n": 1}
+        finally:
+            await manager.stop()
+        assert manager.connections == {}
+
+    asyncio.run(scenario())
+
+
+def test_lazy_startup_spawns_once_on_first_use():
+    async def scenario():
+        manager = MCPConnectionManager(startup_mode="lazy")
+        manager.add_server(_server("lazy", delay=0.2))
+        await manager.start()
+        try:
+            assert manager.get_available_servers() == []
+            assert manager.get_routable_servers() == ["lazy"]
+            assert manager.get_startup_status()["lazy"]["state"] == "not_started"
+
+            results = await asyncio.gather(*(manager.send_request("lazy", "echo", {"n": n}) for n in range(5)))
+            assert [result["n"] for result in results] == list(range(5))
+            assert manager.get_available_servers() == ["lazy"]
+        finally:
+            await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_idle_servers_are_stopped_and_restarted_on_demand():
+    async def scenario():
+        manager = MCPConnectionManager(idle_timeout=0.2)
+        manager.add_server(_server("idle"))
+        await manager.start()
+        try:
+            first_process = manager.connections["idle"].process
+            await asyncio.sleep(0.4)
+            await manager._stop_idle_servers()
+            assert manager.connections["idle"].state == ConnectionState.DISCONNECTED
+            assert manager.get_routable_servers() == ["idle"]
+
+            # Not treated as unhealthy by the reconnection loop
+            await manager._check_server_health()
+            assert manager.connections["idle"].state == ConnectionState.DISCONNECTED
+
+            assert await manager.send_request("idle", "echo", {"ok": True}) == {"ok": True}
+            assert manager.connections["idle"].process is not first_process
+        finally:
+            await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_unknown_startup_mode_is_rejected():
+    try:
+        MCPConnectionManager(startup_mode="sometimes")
+    except ValueError as e:
+        assert "sometimes" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
@@ -0,0 +1,107 @@
+"""Tests for the asyncio stdio transport of MCPConnection."""
+
+import asyncio
+import sys
+import textwrap
+
+from codexa.mcp.connection_manager import ConnectionState, MCPConnection, MCPServerConfig
+from codexa.mcp.protocol import MCPError
+
+# A minimal MCP server: answers initialize, echoes tools/call arguments,
+# writes noise to stderr and stdout, and exits on "quit".
+FAKE_SERVER = textwrap.dedent('''
+    import json, sys
+    for line in sys.stdin:
+        message = json.loads(line)
+        method = message.get("method")
+        if "id" not in message:
+            continue
+        sys.stderr.write("x" * 200000 + "\\n")
+        sys.stderr.flush()
+        if method == "initialize":
+            result = {"capabilities": {"tools": {"listChanged": False}}}
+        elif method == "quit":
+            sys.exit(0)
+        else:
+            print("not json, just a log line", flush=True)
+            result = message.get("params")
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+''')
+
+
+def _connection(**overrides):
+    config = MCPServerConfig(name="fake", command=[sys.executable, "-c", FAKE_SERVER], timeout=10, **overrides)
+    return MCPConnection(config)
+
+
+def test_handshake_and_large_messages():
+    async def scenario():
+        connection = _connection()
+        assert await connection.connect()
+        try:
+            assert connection.state == ConnectionState.CONNECTED
+            assert "tools" in connection.capabilities
+
+            # Far beyond the 64 KiB stream limit in both directions
+            payload = {"text": "y" * 1_000_000}
+            assert await connection.send_request("tools/call", payload) == payload
+
+            # Concurrent requests are matched to their own responses
+            results = await asyncio.gather(*(connection.send_request("echo", {"n": n}) for n in range(20)))
+            assert [result["n"] for result in results] == list(range(20))
+
+            # stderr was drained (the server would block otherwise) and kept for diagnostics
+            assert connection.stderr_tail
+        finally:
+            await connection.disconnect()
+        assert connection.process is None
+
+    asyncio.run(scenario())
+
+
+def test_oversized_message_is_discarded():
+    async def scenario():
+        connection = _connection(max_message_size=100_000)
+        assert await connection.connect()
+        try:
+            connection.config.timeout = 1
+            try:
+                await connection.send_request("tools/call", {"text": "y" * 200_000})
+                raise AssertionError("expected the oversized response to be dropped")
+            except MCPError as e:
+                assert e.code == -32002
+            # The connection is still usable afterwards
+            assert await connection.send_request("echo", {"ok": True}) == {"ok": True}
+        finally:
+            await connection.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_server_exit_fails_pending_requests():
+    async def scenario():
+        connection = _connection()
+        assert await connection.connect()
+        try:
+            try:
+                await connection.send_request("quit")
+                raise AssertionError("expected the request to fail")
+            except MCPError as e:
+                assert "closed" in str(e)
+            assert connection.state == ConnectionState.ERROR
+            assert not connection.is_healthy
+        finally:
+            await connection.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_missing_command_fails_cleanly():
+    async def scenario():
+        config = MCPServerConfig(name="missing", command=["codexa-no-such-mcp-server"])
+        connection = MCPConnection(config)
+        assert not await connection.connect()
+        assert connection.state == ConnectionState.ERROR
+        assert connection.last_error
+
+    asyncio.run(scenario())
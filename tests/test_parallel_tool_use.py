@@ -0,0 +1,117 @@
+"""Tests for concurrent execution of tool_use blocks in SharedEventLoopAgent."""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from codexa.shared_event_loop_agent import SharedEventLoopAgent
+
+
+class _Tool:
+    def __init__(self, name, parallel=True):
+        self.name = name
+        self.parallel = parallel
+
+    def can_run_parallel_with(self, other_tool):
+        return self.parallel and other_tool.parallel
+
+
+class _Registry:
+    def __init__(self, tools):
+        self.tools = {tool.name: tool for tool in tools}
+
+    def get_tool(self, name):
+        return self.tools.get(name)
+
+
+def _agent(tools, max_parallel=4):
+    """An agent whose tools only record when they run."""
+    agent = SharedEventLoopAgent.__new__(SharedEventLoopAgent)
+    agent.logger = logging.getLogger("test")
+    agent.tool_registry = _Registry(tools)
+    agent.max_parallel_tool_calls = max_parallel
+    agent.events = []
+    agent.running = 0
+    agent.peak = 0
+
+    async def fake_execution(tool_call):
+        agent.running += 1
+        agent.peak = max(agent.peak, agent.running)
+        agent.events.append(("start", tool_call.id))
+        await asyncio.sleep(0.05 if tool_call.id != "t0" else 0.1)
+        agent.events.append(("end", tool_call.id))
+        agent.running -= 1
+        return {"tool_use_id": tool_call.id, "type": "tool_result", "content": tool_call.name, "is_error": False}
+
+    async def capture(results):
+        agent.sent = results
+
+    agent._tool_execution_loop = fake_execution
+    agent._send_tool_results_to_claude = capture
+    return agent
+
+
+def _response(*names):
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text="reading")] + [
+        SimpleNamespace(type="tool_use", id=f"t{i}", name=name, input={}) for i, name in enumerate(names)])
+
+
+def _run(agent, response):
+    asyncio.run(agent._execute_tools(response))
+
+
+def test_independent_calls_run_concurrently_in_order():
+    agent = _agent([_Tool("read_file"), _Tool("grep")])
+
+    _run(agent, _response("read_file", "grep", "read_file", "grep", "read_file"))
+
+    assert agent.peak == 4
+    assert [result["tool_use_id"] for result in agent.sent] == ["t0", "t1", "t2", "t3", "t4"]
+
+
+def test_concurrency_limit_is_respected():
+    agent = _agent([_Tool("read_file")], max_parallel=2)
+
+    _run(agent, _response(*["read_file"] * 6))
+
+    assert agent.peak == 2
+    assert len(agent.sent) == 6
+
+
+def test_non_parallel_tools_are_serialized():
+    agent = _agent([_Tool("write_file", parallel=False), _Tool("read_file")])
+
+    _run(agent, _response("write_file", "read_file", "write_file"))
+
+    assert agent.peak == 1
+    assert agent.events.index(("end", "t0")) < agent.events.index(("start", "t1"))
+    assert [result["tool_use_id"] for result in agent.sent] == ["t0", "t1", "t2"]
+
+
+def test_unknown_tools_do_not_block_others():
+    agent = _agent([_Tool("read_file")])
+
+    _run(agent, _response("read_file", "missing_tool"))
+
+    assert agent.peak == 2
+
+
+def test_write_then_read_runs_in_order():
+    """File-changing tools never overlap with other calls of the same turn."""
+    from codexa.tools.claude_code.bash_tool import BashTool
+    from codexa.tools.claude_code.edit_tool import EditTool
+    from codexa.tools.claude_code.read_tool import ReadTool
+    from codexa.tools.claude_code.write_tool import WriteTool
+
+    agent = _agent([WriteTool(), ReadTool(), EditTool(), BashTool()])
+
+    _run(agent, _response("Write", "Read", "Read", "Edit", "Edit", "Bash"))
+
+    events = agent.events
+    assert events.index(("end", "t0")) < events.index(("start", "t1"))
+    # Reads may overlap each other, but not the edit after them
+    assert events.index(("start", "t2")) < events.index(("end", "t1"))
+    assert events.index(("end", "t2")) < events.index(("start", "t3"))
+    assert events.index(("end", "t3")) < events.index(("start", "t4"))
+    assert events.index(("end", "t4")) < events.index(("start", "t5"))
+    assert [result["tool_use_id"] for result in agent.sent] == ["t0", "t1", "t2", "t3", "t4", "t5"]
@@ -0,0 +1,50 @@
+"""Tests for the shared project snapshot used by SearchManager."""
+
+from pathlib import Path
+
+from codexa.search.search_manager import SearchManager, SearchType
+
+
+def _make_project(root: Path):
+    (root / "pkg").mkdir()
+    (root / "pkg" / "app.py").write_text("import os\n\nclass App:\n    def run(self):\n        pass  # TODO: implement\n")
+    (root / "pkg" / "util.py").write_text("def helper():\n    return 1\n")
+    (root / "README.md").write_text("# Project\n")
+    (root / ".hidden").mkdir()
+    (root / ".hidden" / "secret.py").write_text("def hidden():\n    pass\n")
+
+
+def test_mixed_search_walks_once(tmp_path):
+    """File and code sub-searches share one walk and match unshared engines."""
+    _make_project(tmp_path)
+    shared = SearchManager(tmp_path, use_index=False)
+    plain = SearchManager(tmp_path, use_index=False)
+    plain.file_engine.snapshots = plain.code_engine.snapshots = None
+
+    expected = plain.search("def", SearchType.MIXED)
+    actual = shared.search("def", SearchType.MIXED)
+
+    assert shared.snapshots.stats['builds'] == 1
+    assert sorted(r.relative_path for r in actual.file_matches) == \
+        sorted(r.relative_path for r in expected.file_matches)
+    assert sorted((m.file_path.name, m.line_number) for m in actual.code_matches) == \
+        sorted((m.file_path.name, m.line_number) for m in expected.code_matches)
+
+
+def test_overview_reuses_snapshot_within_ttl(tmp_path):
+    """Repeated overviews reuse the snapshot until it expires or is invalidated."""
+    _make_project(tmp_path)
+    manager = SearchManager(tmp_path, use_index=False, snapshot_ttl=60)
+
+    first = manager.get_project_overview()
+    assert first['code_stats'] == {'functions': 2, 'classes': 1, 'imports': 1, 'todos': 1}
+
+    (tmp_path / "pkg" / "more.py").write_text("def extra():\n    pass\n")
+    assert manager.get_project_overview() == first
+    assert manager.snapshots.stats['builds'] == 1
+
+    manager.invalidate_snapshot()
+    refreshed = manager.get_project_overview()
+    assert refreshed['total_files'] == first['total_files'] + 1
+    assert refreshed['code_stats']['functions'] == 3
+    assert manager.snapshots.stats['builds'] == 2
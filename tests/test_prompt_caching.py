@@ -0,0 +1,65 @@
+"""Tests for Anthropic prompt cache breakpoints and usage reporting."""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from codexa.config import Config
+from codexa.prompt_caching import PromptCacheUsage, cache_conversation, cache_system_prompt, cache_tools
+from codexa.providers import AnthropicProvider
+
+TOOLS = [{"name": "read_file", "input_schema": {"type": "object"}},
+         {"name": "write_file", "input_schema": {"type": "object"}}]
+
+
+def _provider(prompt_caching=True):
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):
+        config = Config()
+    config.anthropic_prompt_caching = prompt_caching
+    return AnthropicProvider(config)
+
+
+def test_breakpoints_mark_the_end_of_each_prefix():
+    assert cache_system_prompt("system") == [{"type": "text", "text": "system", "cache_control": {"type": "ephemeral"}}]
+
+    tools = cache_tools(TOOLS)
+    assert "cache_control" not in tools[0]
+    assert tools[1]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in TOOLS[1]
+
+    messages = cache_conversation([{"role": "user", "content": "first"},
+                                   {"role": "assistant", "content": "answer"},
+                                   {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "t1",
+                                                                 "content": "output"}]}])
+    assert messages[0]["content"] == "first"
+    assert messages[2]["content"][0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_anthropic_requests_carry_cache_breakpoints():
+    params = _provider()._request_params("prompt", [{"user": "hi", "assistant": "hello"}], None, TOOLS)
+
+    assert params["system"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert params["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert params["messages"][-1]["content"] == [{"type": "text", "text": "prompt",
+                                                  "cache_control": {"type": "ephemeral"}}]
+
+
+def test_prompt_caching_can_be_disabled():
+    params = _provider(prompt_caching=False)._request_params("prompt", None, None, TOOLS)
+
+    assert isinstance(params["system"], str)
+    assert params["tools"] == TOOLS
+    assert params["messages"][-1]["content"] == "prompt"
+
+
+def test_usage_totals_cache_reads_and_writes():
+    usage = PromptCacheUsage()
+    usage.record(SimpleNamespace(input_tokens=10, cache_creation_input_tokens=2000, cache_read_input_tokens=0))
+    usage.record({"input_tokens": 20, "cache_creation_input_tokens": 0, "cache_read_input_tokens": 2000})
+    usage.record(None)
+
+    totals = usage.as_dict()
+    assert totals["requests"] == 2
+    assert totals["cache_write_tokens"] == 2000
+    assert totals["cache_read_tokens"] == 2000
+    assert abs(totals["cache_hit_rate"] - 2000 / 4030) < 1e-9
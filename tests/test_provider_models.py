@@ -0,0 +1,37 @@
+"""Tests for per-call model selection in EnhancedAIProvider."""
+
+import asyncio
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def provider(make_provider):
+    # Answers with the model it was asked to use, slowly enough for calls to overlap
+    return make_provider("echo", delay=0.05, respond=lambda prompt, model, call: model)
+
+
+def test_concurrent_calls_use_their_own_models(provider):
+    results = {}
+
+    def call(model):
+        results[model] = provider.ask("hi", model=model)
+
+    threads = [threading.Thread(target=call, args=(f"model-{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {f"model-{i}": f"model-{i}" for i in range(8)}
+    assert provider.ask("hi") == "default-model"
+    assert provider.base_provider.model == "default-model"
+
+
+def test_async_calls_pass_model_through(provider):
+    async def ask_both():
+        return await asyncio.gather(provider.ask_async("plan", model="strong"),
+                                    provider.ask_async("evaluate", model="cheap"))
+
+    assert asyncio.run(ask_both()) == ["strong", "cheap"]
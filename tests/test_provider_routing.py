@@ -0,0 +1,125 @@
+"""Tests for latency-aware provider routing and hedged requests."""
+
+import asyncio
+import logging
+
+import pytest
+
+from codexa.enhanced_providers import EnhancedProviderFactory, LatencyWindow, ProviderRouter
+from codexa.providers import ProviderError
+
+
+@pytest.fixture
+def enhanced(make_provider):
+    """Build providers that answer with their own name after a fixed delay."""
+    def make(name, delay, error=None, priority=1):
+        return make_provider(name, delay=delay, error=error, priority=priority, model=f"{name}-model")
+
+    return make
+
+
+def _factory(*providers, **routing):
+    factory = EnhancedProviderFactory.__new__(EnhancedProviderFactory)
+    factory.providers = {provider.config.name: provider for provider in providers}
+    factory.routing = {"hedging": True, "hedge_min_delay": 0.05, **routing}
+    factory.router = ProviderRouter(min_samples=3)
+    factory.logger = logging.getLogger("test")
+    return factory
+
+
+def _collect(stream):
+    async def collect():
+        return [chunk async for chunk in stream]
+    return asyncio.run(collect())
+
+
+def _record(provider, seconds, count=10, success=True, model=None):
+    for _ in range(count):
+        provider.metrics.update_request(success, seconds, model)
+
+
+def test_latency_window_percentiles():
+    window = LatencyWindow(size=100)
+    for i in range(1, 101):
+        window.add(i / 100)
+    window.add(50.0, success=False)
+
+    assert window.percentile(50) == pytest.approx(0.51)
+    assert window.percentile(95) == pytest.approx(0.96)
+    assert window.percentile(99) == pytest.approx(1.0)
+    assert window.count == 100
+    assert window.error_rate == pytest.approx(0.01)
+
+
+def test_router_prefers_lower_predicted_latency(enhanced):
+    fast, slow = enhanced("fast", 0), enhanced("slow", 0, priority=5)
+    _record(fast, 0.5)
+    _record(slow, 3.0)
+    router = ProviderRouter(min_samples=3)
+
+    assert router.rank_providers({"fast": fast, "slow": slow}) == ["fast", "slow"]
+    assert router.select_provider({"fast": fast, "slow": slow}, {}) == "fast"
+
+
+def test_router_penalizes_errors_and_uses_priority_without_data(enhanced):
+    flaky, steady = enhanced("flaky", 0), enhanced("steady", 0)
+    _record(flaky, 0.5, count=5)
+    _record(flaky, 0.5, count=15, success=False)
+    _record(steady, 1.0)
+    router = ProviderRouter(min_samples=3)
+    assert router.rank_providers({"flaky": flaky, "steady": steady})[0] == "steady"
+
+    low, high = enhanced("low", 0, priority=1), enhanced("high", 0, priority=3)
+    assert router.rank_providers({"low": low, "high": high})[0] == "high"
+
+
+def test_router_uses_per_model_latency(enhanced):
+    provider = enhanced("p", 0)
+    _record(provider, 0.2, model="quick")
+    _record(provider, 4.0, model="deep")
+    router = ProviderRouter(min_samples=3)
+
+    assert router.predict_latency(provider, "quick") < router.predict_latency(provider, "deep")
+    assert set(provider.get_status()["metrics"]["model_latency"]) == {"quick", "deep"}
+
+
+def test_hedged_request_takes_the_faster_backup(enhanced):
+    slow, fast = enhanced("slow", 0.5), enhanced("fast", 0.01)
+    _record(slow, 0.05)
+
+    assert asyncio.run(_factory(slow, fast).ask_hedged("hi", primary="slow")) == "fast"
+    assert fast.base_provider.calls == 1
+
+
+def test_fast_primary_is_not_hedged(enhanced):
+    primary, backup = enhanced("primary", 0.01), enhanced("backup", 0.01)
+    _record(primary, 0.2)
+
+    assert asyncio.run(_factory(primary, backup).ask_hedged("hi", primary="primary")) == "primary"
+    assert backup.base_provider.calls == 0
+
+
+def test_failed_primary_falls_back_to_backup(enhanced):
+    broken, backup = enhanced("broken", 0, error=ProviderError("OpenRouter request timed out. Please try again.")), enhanced("backup", 0.01)
+
+    assert asyncio.run(_factory(broken, backup, hedge_default_delay=10).ask_hedged("hi", primary="broken")) == "backup"
+
+
+def test_hedging_disabled_uses_only_the_primary(enhanced):
+    slow, fast = enhanced("slow", 0.1), enhanced("fast", 0)
+
+    assert asyncio.run(_factory(slow, fast, hedging=False).ask_hedged("hi", primary="slow")) == "slow"
+    assert fast.base_provider.calls == 0
+
+
+def test_hedged_stream_follows_the_first_token(enhanced):
+    slow, fast = enhanced("slow", 0.5), enhanced("fast", 0.01)
+    for _ in range(5):
+        slow.metrics.first_token.add(0.05)
+
+    chunks = _collect(_factory(slow, fast).ask_stream_hedged("hi", primary="slow"))
+
+    assert [chunk.text for chunk in chunks if chunk.type == 'text'] == ["fast"]
+    assert chunks[-1].response == "fast"
+    # The abandoned stream is not counted as a latency sample
+    assert slow.metrics.total_requests == 0
@@ -0,0 +1,98 @@
+"""Tests for in-flight request coalescing in the provider layer."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from codexa.request_coalescing import RequestCoalescer
+
+
+@pytest.fixture
+def provider(make_provider):
+    # Counts requests and answers slowly enough for identical calls to overlap
+    return make_provider("slow", delay=0.1, respond=lambda prompt, model, call: {"answer": prompt})
+
+
+def test_concurrent_identical_calls_share_one_request(provider):
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(provider.ask("same"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"answer": "same"}] * 5
+    assert provider.base_provider.calls == 1
+    assert provider.get_status()["coalescing"]["coalesced"] == 4
+    # Joined callers get their own copy
+    assert len({id(result) for result in results}) == 5
+
+
+def test_different_or_sequential_calls_are_not_coalesced(provider):
+    provider.ask("one")
+    provider.ask("one")
+    provider.ask("two")
+    assert provider.base_provider.calls == 3
+
+
+def test_async_identical_calls_share_one_request(provider):
+    async def ask_all():
+        return await asyncio.gather(*(provider.ask_async("same") for _ in range(5)),
+                                    provider.ask_async("other"))
+
+    results = asyncio.run(ask_all())
+
+    assert results[:5] == [{"answer": "same"}] * 5
+    assert results[5] == {"answer": "other"}
+    assert provider.base_provider.calls == 2
+
+
+def test_errors_reach_every_waiting_caller():
+    coalescer = RequestCoalescer()
+    started = threading.Event()
+    errors = []
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("boom")
+
+    def call():
+        try:
+            coalescer.do("key", fail)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert errors == ["boom", "boom"]
+    assert coalescer.get_stats() == {"executed": 1, "coalesced": 1, "in_flight": 0}
+
+
+def test_cancelled_caller_does_not_cancel_shared_request():
+    coalescer = RequestCoalescer()
+
+    async def answer():
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(coalescer.do_async("key", answer))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(coalescer.do_async("key", answer))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
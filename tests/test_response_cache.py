@@ -0,0 +1,121 @@
+"""Tests for the persistent provider response cache."""
+
+import asyncio
+import time
+
+import pytest
+
+from codexa.enhanced_config import ModelConfig
+from codexa.providers import ProviderError
+from codexa.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cached_provider(make_provider):
+    """Build providers that answer with a call counter so repeated requests are distinguishable."""
+    def make(cache, temperature=0.0):
+        models = [ModelConfig("default-model", "counting", temperature=temperature),
+                  ModelConfig("other-model", "counting", temperature=temperature)]
+        return make_provider("counting", cache=cache, models=models,
+                             respond=lambda prompt, model, call: f"{prompt}:{model}:{call}")
+
+    return make
+
+
+def test_identical_requests_hit_the_cache(tmp_path, cached_provider):
+    provider = cached_provider(ResponseCache(tmp_path))
+
+    first = provider.ask("hi", context="ctx")
+    assert provider.ask("hi", context="ctx") == first
+    assert provider.ask("hi", context="other") != first
+    assert provider.ask("hi", context="ctx", model="other-model") != first
+    assert provider.base_provider.calls == 3
+
+    stats = provider.get_status()["response_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+
+
+def test_cache_survives_restart(tmp_path, cached_provider):
+    first = cached_provider(ResponseCache(tmp_path)).ask("hi")
+
+    restarted = cached_provider(ResponseCache(tmp_path))
+    assert restarted.ask("hi") == first
+    assert restarted.base_provider.calls == 0
+    assert restarted.response_cache.get_stats()["disk_hits"] == 1
+
+
+def test_expired_entries_are_refetched(tmp_path, cached_provider):
+    provider = cached_provider(ResponseCache(tmp_path, ttl=0.05))
+
+    first = provider.ask("hi")
+    time.sleep(0.1)
+    assert provider.ask("hi") != first
+    assert provider.response_cache.get_stats()["expired"] >= 1
+
+
+def test_size_limits_evict_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path, max_memory_entries=2, max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+
+    stats = cache.get_stats()
+    assert stats["memory_entries"] == 2
+    assert stats["disk_entries"] == 2
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+
+
+def test_max_temperature_skips_sampled_requests(tmp_path, cached_provider):
+    provider = cached_provider(ResponseCache(tmp_path, max_temperature=0.0), temperature=0.7)
+
+    assert provider.ask("hi") != provider.ask("hi")
+    assert provider.response_cache.get_stats()["stores"] == 0
+
+
+def test_keyed_on_the_temperature_actually_sent(tmp_path, cached_provider):
+    provider = cached_provider(ResponseCache(tmp_path))
+    assert provider.base_provider.temperature_for() == 0.0
+
+    # Models without a configured temperature go out at the provider default (0.3)
+    assert provider.base_provider.temperature_for("unlisted") == 0.3
+    assert provider.ask("hi", model="unlisted") != provider.ask("hi", model="unlisted")
+    assert provider.response_cache.get_stats()["stores"] == 0
+
+    # Sampled requests are cached only when explicitly allowed
+    assert not ResponseCache(tmp_path).accepts(0.3)
+    assert ResponseCache(tmp_path, max_temperature=None).accepts(0.3)
+
+
+def test_error_responses_are_not_cached(tmp_path, cached_provider):
+    provider = cached_provider(ResponseCache(tmp_path))
+    calls = []
+
+    def fail(*args, **kwargs):
+        calls.append(args)
+        # Worded like OpenRouterProvider's HTTP errors, not "Error: ..."
+        return ProviderError("OpenRouter API error (429): rate limited")
+
+    provider.base_provider.ask = fail
+    provider.ask("hi")
+    provider.ask("hi")
+    assert len(calls) == 2
+    assert provider.response_cache.get_stats()["stores"] == 0
+    assert provider.metrics.failed_requests == 2
+
+
+def test_async_calls_share_the_cache(tmp_path, cached_provider):
+    provider = cached_provider(ResponseCache(tmp_path, persist=False))
+
+    async def ask_twice():
+        return await provider.ask_async("hi"), await provider.ask_async("hi")
+
+    first, second = asyncio.run(ask_twice())
+    assert second == first
+    assert provider.base_provider.calls == 1
+
+
+def test_disabled_by_default():
+    assert ResponseCache.from_config(None) is None
+    assert ResponseCache.from_config({"enabled": False}) is None
+    assert isinstance(ResponseCache.from_config({"enabled": True, "persist": False}), ResponseCache)
@@ -0,0 +1,108 @@
+"""Tests for streamed provider responses."""
+
+import asyncio
+import io
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from rich.console import Console
+
+from codexa.config import Config
+from codexa.display.stream_renderer import StreamRenderer
+from codexa.http_session import close_shared_async_sessions
+from codexa.providers import OpenRouterProvider
+
+
+def _sse(delta, finish_reason=None):
+    return {"choices": [{"delta": delta, "finish_reason": finish_reason}]}
+
+
+TEXT_EVENTS = [_sse({"role": "assistant", "content": ""}), _sse({"content": "Hello"}),
+               _sse({"content": ", world"}), _sse({}, "stop")]
+
+TOOL_EVENTS = [
+    _sse({"tool_calls": [{"index": 0, "id": "call_1", "type": "function",
+                          "function": {"name": "read_file", "arguments": ""}}]}),
+    _sse({"tool_calls": [{"index": 0, "function": {"arguments": '{"path": '}}]}),
+    _sse({"tool_calls": [{"index": 0, "function": {"arguments": '"a.py"}'}}]}),
+    _sse({}, "tool_calls"),
+]
+
+
+class _SSEHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert body["stream"] is True
+        events = TOOL_EVENTS if body.get("tools") else TEXT_EVENTS
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._chunk(": OPENROUTER PROCESSING\n\n")
+        for event in events:
+            self._chunk(f"data: {json.dumps(event)}\n\n")
+        self._chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, text):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def provider():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SSEHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
+        config = Config()
+    config.openrouter_base_url = f"http://127.0.0.1:{server.server_address[1]}/api/v1"
+    yield OpenRouterProvider(config)
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_yields_text_then_final_response(provider):
+    chunks = list(provider.stream("hi"))
+    assert [c.text for c in chunks if c.type == "text"] == ["Hello", ", world"]
+    assert chunks[-1].type == "done" and chunks[-1].response == "Hello, world"
+
+
+def test_stream_assembles_tool_call_deltas(provider):
+    tools = [{"type": "function", "function": {"name": "read_file", "parameters": {}}}]
+    chunks = list(provider.stream("read a.py", tools=tools))
+
+    deltas = [c.tool_call for c in chunks if c.type == "tool_call"]
+    assert [d["arguments"] for d in deltas] == ["", '{"path": ', '"a.py"}']
+    assert all(d["name"] == "read_file" and d["id"] == "call_1" for d in deltas)
+
+    response = chunks[-1].response
+    assert response["type"] == "tool_calls" and response["finish_reason"] == "tool_calls"
+    assert response["tool_calls"] == [{"id": "call_1", "type": "function",
+                                       "function": {"name": "read_file", "arguments": '{"path": "a.py"}'}}]
+
+
+def test_ask_stream_renders_tokens(provider):
+    output = io.StringIO()
+    renderer = StreamRenderer(Console(file=output, width=80), markdown=False)
+
+    async def render():
+        try:
+            return await renderer.render_async(provider.ask_stream("hi"))
+        finally:
+            await close_shared_async_sessions()
+
+    response = asyncio.run(render())
+
+    assert response == "Hello, world"
+    assert "Hello, world" in output.getvalue()